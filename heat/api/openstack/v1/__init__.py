@@ -251,6 +251,12 @@ class API(wsgi.Router):
                         'action': 'export',
                         'method': 'GET'
                     },
+                    {
+                        'name': 'stack_timeline',
+                        'url': '/stacks/{stack_name}/{stack_id}/timeline',
+                        'action': 'timeline',
+                        'method': 'GET'
+                    },
                     {
                         'name': 'stack_snapshot',
                         'url': '/stacks/{stack_name}/{stack_id}/snapshots',
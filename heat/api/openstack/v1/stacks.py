@@ -452,8 +452,16 @@ class StackController(object):
                 p_name, params[p_name])
         else:
             resolve_outputs = True
+
+        p_name = rpc_api.REFRESH_OUTPUTS
+        if p_name in params:
+            refresh_outputs = self._extract_bool_param(
+                p_name, params[p_name])
+        else:
+            refresh_outputs = False
         stack_list = self.rpc_client.show_stack(req.context,
-                                                identity, resolve_outputs)
+                                                identity, resolve_outputs,
+                                                refresh_outputs)
 
         if not stack_list:
             raise exc.HTTPInternalServerError()
@@ -613,6 +621,16 @@ class StackController(object):
         """
         return self.rpc_client.export_stack(req.context, identity)
 
+    @util.registered_identified_stack
+    def timeline(self, req, identity):
+        """Gets the timeline of the most recent operation on a stack.
+
+        The timeline shows when each resource became ready, started and
+        finished, and the critical path through the operation.
+        """
+        return {'timeline': self.rpc_client.get_stack_timeline(req.context,
+                                                               identity)}
+
     @util.registered_policy_enforce
     def validate_template(self, req, body):
         """Implements the ValidateTemplate API action.
@@ -125,6 +125,35 @@ def do_migrate():
         raise Exception(ex.message)
 
 
+def do_traversal_timings():
+    """Print the per-phase timings of a stack's convergence traversal."""
+    messaging.setup()
+    client = rpc_client.EngineClient()
+    ctxt = context.get_admin_context()
+    try:
+        timings = client.get_traversal_timings(ctxt, CONF.command.stack_id,
+                                               CONF.command.traversal_id)
+    except exception.NotFound:
+        raise Exception(_("Stack with id %s can not be found.")
+                        % CONF.command.stack_id)
+    except exception.NotSupported as ex:
+        raise Exception(ex.message)
+
+    print(_('Traversal %(traversal)s (reported by %(engines)s engines)') %
+          {'traversal': timings['traversal_id'],
+           'engines': timings['engines']})
+    print_format = "%-16s %10s %12s %12s %12s"
+    print(print_format % (_('Phase'), _('Count'), _('Total (s)'),
+                          _('Mean (s)'), _('Max (s)')))
+    for phase, hist in sorted(timings['phases'].items()):
+        print(print_format % (phase, hist['count'],
+                              '%.3f' % hist['total'],
+                              '%.4f' % (hist['total'] / hist['count']),
+                              '%.4f' % hist['max']))
+    for counter, value in sorted(timings['counters'].items()):
+        print("%-16s %10s" % (counter, value))
+
+
 def purge_deleted():
     """Remove database records that have been previously soft deleted."""
     db_api.purge_deleted(CONF.command.age,
@@ -145,6 +174,14 @@ def do_crypt_parameters_and_properties():
             ctxt, prev_encryption_key, CONF.command.verbose_update_params)
 
 
+def do_compact_templates():
+    """Convert stored templates to the compact, deduplicated format."""
+    ctxt = context.get_admin_context()
+    converted = db_api.raw_template_compact_all(
+        ctxt, int(CONF.command.batch_size))
+    print(_('Converted %d templates.') % converted)
+
+
 def do_properties_data_migrate():
     print(
         'This command has been deprecated and is now a no-op. '
@@ -168,6 +205,15 @@ def add_command_parsers(subparsers):
     parser.set_defaults(func=do_migrate)
     parser.add_argument('stack_id')
 
+    # traversal_timings parser
+    parser = subparsers.add_parser('traversal_timings')
+    parser.set_defaults(func=do_traversal_timings)
+    parser.add_argument('stack_id',
+                        help=_('Stack id'))
+    parser.add_argument('--traversal-id',
+                        help=_('Traversal id, defaults to the current '
+                               'traversal of the stack'))
+
     # purge_deleted parser
     parser = subparsers.add_parser('purge_deleted')
     parser.set_defaults(func=purge_deleted)
@@ -219,6 +265,14 @@ def add_command_parsers(subparsers):
     parser.add_argument('stack_id',
                         help=_('Stack id'))
 
+    # compact_templates parser
+    parser = subparsers.add_parser('compact_templates')
+    parser.set_defaults(func=do_compact_templates)
+    # optional parameter, can be skipped. default='50'
+    parser.add_argument(
+        '-b', '--batch_size', default='50',
+        help=_('Number of templates to read from the database at a time.'))
+
     # migrate properties_data parser
     parser = subparsers.add_parser('migrate_properties_data')
     parser.set_defaults(func=do_properties_data_migrate)
@@ -82,6 +82,20 @@ service_opts = [
     cfg.StrOpt('stack_domain_admin_password',
                secret=True,
                help=_('Keystone password for stack_domain_admin user.')),
+    cfg.IntOpt('stack_user_pool_size',
+               default=0,
+               min=0,
+               help=_('Maximum number of users that an engine creates in '
+                      'advance in the stack domain project of a stack once '
+                      'one of its resources has needed a stack domain '
+                      'user. No more users are created in advance than '
+                      'there are other resources in the stack that may '
+                      'need one. Resources of the stack that need a user '
+                      'subsequently take one from this pool, and users are '
+                      'deleted in the background when their resource is '
+                      'deleted. Pooled users that are left over are deleted '
+                      'with the stack domain project. Set to 0 to create '
+                      'and delete each user when it is needed.')),
     cfg.IntOpt('max_template_size',
                default=524288,
                help=_('Maximum raw byte size of any template.')),
@@ -180,6 +194,74 @@ engine_opts = [
                help=_('Number of times to retry when a client encounters an '
                       'expected intermittent error. Set to 0 to disable '
                       'retries.')),
+    cfg.IntOpt('constraint_lookup_workers',
+               default=8,
+               min=0,
+               help=_('Maximum number of concurrent lookups made to check '
+                      'the values of custom constraints (such as images, '
+                      'flavors and networks) before the resources of a '
+                      'stack are validated. Set to 0 to look up each value '
+                      'only when the resource using it is validated.')),
+    cfg.IntOpt('nested_validation_workers',
+               default=4,
+               min=0,
+               help=_('Maximum number of distinct nested stacks that are '
+                      'validated concurrently when a stack is validated. '
+                      'Identical nested stacks are validated only once '
+                      'regardless. Set to 0 to validate each nested stack '
+                      'in turn.')),
+    cfg.IntOpt('resource_action_workers',
+               default=0,
+               min=0,
+               help=_('Number of threads shared by the stacks in an engine '
+                      'on which the steps of resource actions (such as '
+                      'create and check) are run when not using '
+                      'convergence, so that a resource waiting for a slow '
+                      'API call does not delay the other resources of its '
+                      'stack. Set to 0 to run the resources of a stack in '
+                      'turn in a single thread.')),
+    cfg.Opt('resource_action_concurrency_limits',
+            type=types.Dict(value_type=types.Integer(min=1),
+                            key_value_separator='='),
+            default={},
+            help=_('Maximum numbers of concurrent resource actions run '
+                   'by resource_action_workers, as a comma-separated list '
+                   'of key=limit pairs, where each key is either a resource '
+                   'type, which may contain wildcards, or the name of a '
+                   'client plugin used by the resources. For example '
+                   '"OS::Nova::Server=20,neutron=50".')),
+    cfg.IntOpt('stack_cleanup_workers',
+               default=0,
+               min=0,
+               help=_('Number of threads each engine uses to delete the '
+                      'stack domain project and the trust of a deleted '
+                      'stack in the background, retrying failed deletions, '
+                      'so that the stack delete completes as soon as its '
+                      'resources are deleted. The stored credentials of the '
+                      'stack are kept until both are deleted, and any that '
+                      'remain are cleaned up by the next engine to start. '
+                      'Set to 0 to delete them before the stack delete '
+                      'completes.')),
+    cfg.BoolOpt('cache_stack_outputs',
+                default=False,
+                help=_('Store the resolved outputs of stacks when they are '
+                       'shown, and show the stored outputs again for as '
+                       'long as the stack and its resources have not '
+                       'changed or been signalled. Output values that are '
+                       'looked up from other services are then not updated '
+                       'until the stack changes, unless the stack is shown '
+                       'with refresh_outputs. Outputs are never stored when '
+                       'encrypt_parameters_and_properties is enabled.')),
+    cfg.IntOpt('template_files_cache_size',
+               default=64 * 1024 * 1024,
+               min=0,
+               help=_('Maximum total size in bytes of the template files '
+                      'of stored templates that each engine keeps in '
+                      'memory after their stacks are no longer loaded, so '
+                      'that they are not read from the database again when '
+                      'the stack or its nested stacks are next loaded. Set '
+                      'to 0 to keep them only while a loaded stack uses '
+                      'them.')),
     # Server host name limit to 53 characters by due to typical default
     # linux HOST_NAME_MAX of 64, minus the .novalocal appended to the name
     cfg.IntOpt('max_server_name_length',
@@ -225,6 +307,37 @@ engine_opts = [
                       '200/event_purge_batch_size percent of the time. '
                       'Older events are deleted when events are purged. '
                       'Set to 0 for unlimited events per stack.')),
+    cfg.BoolOpt('compact_template_storage',
+                default=False,
+                help=_('Store templates in the database as a list of '
+                       'references to their sections and resource '
+                       'definitions, which are stored once and shared '
+                       'between all templates containing them. Templates '
+                       'already stored are still read, and may be converted '
+                       'with "heat-manage compact_templates".')),
+    cfg.BoolOpt('compact_software_config_storage',
+                default=False,
+                help=_('Store the config, outputs and options of software '
+                       'configs in the database once, shared between all '
+                       'software configs with the same content, such as '
+                       'those derived for each server of a software '
+                       'deployment group. Only the inputs are stored with '
+                       'each software config. Software configs already '
+                       'stored are still read.')),
+    cfg.IntOpt('template_compression_threshold',
+               default=4096,
+               min=0,
+               help=_('Size in bytes above which the parts of templates '
+                      'and software configs stored by '
+                      'compact_template_storage and '
+                      'compact_software_config_storage are compressed. '
+                      'Set to 0 to disable compression.')),
+    cfg.IntOpt('properties_data_compression_threshold',
+               default=0,
+               min=0,
+               help=_('Size in bytes above which resource properties data '
+                      'is stored compressed in the database. Set to 0 to '
+                      'disable compression.')),
     cfg.IntOpt('stack_action_timeout',
                default=3600,
                help=_('Timeout in seconds for stack action (ie. create or'
@@ -251,6 +364,32 @@ engine_opts = [
                 help=_('Enables engine with convergence architecture. All '
                        'stacks with this option will be created using '
                        'convergence engine.')),
+    cfg.FloatOpt('convergence_kickoff_rate',
+                 default=100.0,
+                 min=0,
+                 help=_('Maximum average number of resources per second for '
+                        'which work is dispatched to the engine workers when '
+                        'a convergence stack operation starts. Set to 0 for '
+                        'no limit.')),
+    cfg.IntOpt('convergence_kickoff_burst',
+               default=100,
+               min=1,
+               help=_('Number of resources for which work is dispatched '
+                      'immediately when a convergence stack operation '
+                      'starts, before convergence_kickoff_rate is '
+                      'applied.')),
+    cfg.BoolOpt('notify_traversal_timings',
+                default=False,
+                help=_('Include the per-phase timings of a convergence '
+                       'traversal, collected from all engines, in the '
+                       'notification sent when the stack operation '
+                       'completes.')),
+    cfg.BoolOpt('record_stack_timeline',
+                default=False,
+                help=_('Record when each resource in a stack operation '
+                       'became ready, started and finished, so that the '
+                       'critical path of the most recent operation on a '
+                       'stack can be retrieved from the API.')),
     cfg.BoolOpt('observe_on_update',
                 default=False,
                 help=_('On update, enables heat to collect existing resource '
@@ -340,7 +479,16 @@ engine_opts = [
                  default=60,
                  min=0,
                  help=_('Timeout in seconds for metadata update for '
-                        'software deployment'))
+                        'software deployment')),
+    cfg.FloatOpt('deployment_metadata_push_delay',
+                 default=0,
+                 min=0,
+                 help=_('Time in seconds to wait before pushing the '
+                        'software deployment metadata of a server. Changes '
+                        'to the deployments of the same server during this '
+                        'time are combined into a single push. By default '
+                        'the metadata is pushed immediately after every '
+                        'change.'))
     ]
 
 rpc_opts = [
@@ -26,6 +26,7 @@ from oslo_db.sqlalchemy import enginefacade
 from oslo_log import log as logging
 import oslo_messaging
 from oslo_utils import importutils
+import requests
 
 from heat.common import config
 from heat.common import endpoint_utils
@@ -38,6 +39,22 @@ LOG = logging.getLogger(__name__)
 
 cfg.CONF.import_opt('client_retry_limit', 'heat.common.config')
 
+# HTTP adapter shared by the keystone sessions of all request contexts, so
+# that connections to the OpenStack service endpoints are pooled and reused
+# across requests instead of being re-established for every context.
+_http_adapter = None
+
+
+def _get_http_session():
+    global _http_adapter
+    if _http_adapter is None:
+        _http_adapter = session.TCPKeepAliveAdapter()
+    http_session = requests.Session()
+    for scheme in list(http_session.adapters):
+        http_session.mount(scheme, _http_adapter)
+    return http_session
+
+
 # Note, we yield the options via list_opts to enable generation of the
 # sample heat.conf, but we don't register these options directly via
 # cfg.CONF.register*, it's done via ks_loading.register_auth_conf_options
@@ -101,6 +118,7 @@ class RequestContext(context.RequestContext):
         self._session = None
         self._clients = None
         self._keystone_session = session.Session(
+            session=_get_http_session(),
             connect_retries=cfg.CONF.client_retry_limit,
             **config.get_ssl_options('keystone'))
         self.trust_id = trust_id
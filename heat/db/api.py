@@ -13,12 +13,16 @@
 
 """Implementation of SQLAlchemy backend."""
 
+import collections
 import copy
 import datetime
 import functools
+import hashlib
 import itertools
 import random
 from urllib.parse import urlparse
+import uuid
+import zlib
 
 from oslo_config import cfg
 from oslo_db import api as oslo_db_api
@@ -27,6 +31,7 @@ from oslo_db import options
 from oslo_db.sqlalchemy import enginefacade
 from oslo_db.sqlalchemy import utils
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import timeutils
 import sqlalchemy
 from sqlalchemy import and_
@@ -44,8 +49,11 @@ from heat.engine import environment as heat_environment
 from heat.rpc import api as rpc_api
 
 CONF = cfg.CONF
+CONF.import_opt('compact_template_storage', 'heat.common.config')
 CONF.import_opt('hidden_stack_tags', 'heat.common.config')
 CONF.import_opt('max_events_per_stack', 'heat.common.config')
+CONF.import_opt('properties_data_compression_threshold', 'heat.common.config')
+CONF.import_opt('template_compression_threshold', 'heat.common.config')
 CONF.import_group('profiler', 'heat.common.config')
 CONF.import_opt('db_max_retries', 'oslo_db.options', group='database')
 CONF.import_opt('db_retry_interval', 'oslo_db.options', group='database')
@@ -177,6 +185,186 @@ def _soft_delete_aware_query(context, *args, **kwargs):
 # raw template
 
 
+def _is_duplicate_error(exc):
+    return isinstance(exc, db_exception.DBDuplicateEntry)
+
+
+# Key marking a raw_template whose content is stored as references to
+# shared raw_template_blob rows
+_COMPACT_TEMPLATE = '__heat_compact_template__'
+_COMPACT_TEMPLATE_LIKE = '{"%s"%%' % _COMPACT_TEMPLATE
+_TEMPLATE_RESOURCES_SECTIONS = ('resources', 'Resources')
+_BATCH_SIZE = 500
+
+
+def _is_compact_template(template):
+    return isinstance(template, dict) and _COMPACT_TEMPLATE in template
+
+
+def _template_blob(data, blobs):
+    content = jsonutils.dumps(data).encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    blobs[digest] = content
+    return digest
+
+
+def _compact_template(template):
+    """Split a template into shared blobs.
+
+    Returns the compact form of the template to store in the raw_template
+    row and a dict mapping the digests of the blobs it refers to to their
+    serialised content. Scalar sections are kept inline, each resource
+    definition is stored as a separate blob and other sections are stored
+    whole.
+    """
+    blobs = {}
+    sections = {}
+    for key, value in template.items():
+        if (key in _TEMPLATE_RESOURCES_SECTIONS and
+                isinstance(value, dict)):
+            sections[key] = {'resources': dict(
+                (name, _template_blob(snippet, blobs))
+                for name, snippet in value.items())}
+        elif isinstance(value, (dict, list)):
+            sections[key] = {'blob': _template_blob(value, blobs)}
+        else:
+            sections[key] = {'value': value}
+    return {_COMPACT_TEMPLATE: 1, 'sections': sections}, blobs
+
+
+def _compact_template_refs(template):
+    """Return a Counter of the blobs referenced by a compact template."""
+    refs = collections.Counter()
+    if not _is_compact_template(template):
+        return refs
+    for section in template['sections'].values():
+        if 'blob' in section:
+            refs[section['blob']] += 1
+        elif 'resources' in section:
+            refs.update(section['resources'].values())
+    return refs
+
+
+def _batches(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), _BATCH_SIZE):
+        yield ids[i:i + _BATCH_SIZE]
+
+
+def _group_by_count(refs):
+    by_count = collections.defaultdict(list)
+    for ref_id, count in refs.items():
+        by_count[count].append(ref_id)
+    return by_count.items()
+
+
+def _raw_template_blobs_acquire(conn, refs, blobs):
+    """Take references to template blobs, storing those that are new."""
+    blob = models.RawTemplateBlob.__table__
+    for count, digests in _group_by_count(refs):
+        for batch in _batches(digests):
+            conn.execute(blob.update().where(
+                blob.c.id.in_(batch)).values(
+                    refcount=blob.c.refcount + count))
+
+    existing = set()
+    for batch in _batches(refs):
+        existing.update(row[0] for row in conn.execute(
+            sqlalchemy.select(blob.c.id).where(blob.c.id.in_(batch))))
+
+    threshold = CONF.template_compression_threshold
+    new_blobs = []
+    for digest in set(refs) - existing:
+        data = blobs[digest]
+        compressed = bool(threshold) and len(data) > threshold
+        if compressed:
+            data = zlib.compress(data)
+        new_blobs.append({'id': digest, 'data': data,
+                          'compressed': compressed,
+                          'refcount': refs[digest]})
+    if new_blobs:
+        conn.execute(blob.insert(), new_blobs)
+
+
+def _raw_template_blobs_release(conn, refs):
+    """Drop references to template blobs, deleting those now unused."""
+    blob = models.RawTemplateBlob.__table__
+    for count, digests in _group_by_count(refs):
+        for batch in _batches(digests):
+            conn.execute(blob.update().where(
+                blob.c.id.in_(batch)).values(
+                    refcount=blob.c.refcount - count))
+    for batch in _batches(refs):
+        conn.execute(blob.delete().where(
+            blob.c.id.in_(batch), blob.c.refcount <= 0))
+
+
+def raw_template_expand(context, template):
+    """Return the full content of a stored template.
+
+    Templates not stored in the compact format are returned unchanged.
+    """
+    if not _is_compact_template(template):
+        return template
+    return _raw_template_expand(context, template)
+
+
+@context_manager.reader
+def _raw_template_expand(context, template):
+    blob = models.RawTemplateBlob.__table__
+    contents = {}
+    for batch in _batches(_compact_template_refs(template)):
+        for digest, data, compressed in context.session.execute(
+                sqlalchemy.select(blob.c.id, blob.c.data,
+                                  blob.c.compressed).where(
+                    blob.c.id.in_(batch))):
+            contents[digest] = zlib.decompress(data) if compressed else data
+
+    def load(digest):
+        try:
+            return jsonutils.loads(contents[digest])
+        except KeyError:
+            raise exception.NotFound(
+                _('raw template blob %s not found') % digest)
+
+    expanded = {}
+    for key, section in template['sections'].items():
+        if 'blob' in section:
+            expanded[key] = load(section['blob'])
+        elif 'resources' in section:
+            expanded[key] = dict((name, load(digest)) for name, digest
+                                 in section['resources'].items())
+        else:
+            expanded[key] = section['value']
+    return expanded
+
+
+def _raw_template_stored(context, template_id):
+    """Return the template of a raw_template as stored in the database."""
+    return context.session.query(models.RawTemplate.template).filter_by(
+        id=template_id).scalar()
+
+
+def _raw_template_store(context, raw_template_ref, template, stored=None):
+    """Set the template to store, sharing its blobs if enabled.
+
+    Returns True if the stored template changed.
+    """
+    blobs = {}
+    if CONF.compact_template_storage and isinstance(template, dict):
+        new_stored, blobs = _compact_template(template)
+    else:
+        new_stored = template
+    if new_stored == stored:
+        return False
+    _raw_template_blobs_acquire(context.session,
+                                _compact_template_refs(new_stored), blobs)
+    _raw_template_blobs_release(context.session,
+                                _compact_template_refs(stored))
+    raw_template_ref.template = new_stored
+    return True
+
+
 @context_manager.reader
 def raw_template_get(context, template_id):
     return _raw_template_get(context, template_id)
@@ -191,17 +379,38 @@ def _raw_template_get(context, template_id):
     return result
 
 
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
 @context_manager.writer
 def raw_template_create(context, values):
     raw_template_ref = models.RawTemplate()
     raw_template_ref.update(values)
+    if 'template' in values:
+        _raw_template_store(context, raw_template_ref, values['template'])
     raw_template_ref.save(context.session)
+    if 'template' in values:
+        # Callers always see the full template
+        orm.attributes.set_committed_value(raw_template_ref, 'template',
+                                           values['template'])
     return raw_template_ref
 
 
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
 @context_manager.writer
 def raw_template_update(context, template_id, values):
     raw_template_ref = _raw_template_get(context, template_id)
+    values = dict(values)
+    if 'template' in values:
+        template = values.pop('template')
+        if _raw_template_store(context, raw_template_ref, template,
+                               _raw_template_stored(context, template_id)):
+            context.session.flush()
+        orm.attributes.set_committed_value(raw_template_ref, 'template',
+                                           template)
+
     # get only the changed values
     values = dict((k, v) for k, v in values.items()
                   if getattr(raw_template_ref, k) != v)
@@ -220,6 +429,8 @@ def raw_template_delete(context, template_id):
         # Ignore not found
         return
     raw_tmpl_files_id = raw_template.files_id
+    _raw_template_blobs_release(context.session, _compact_template_refs(
+        _raw_template_stored(context, template_id)))
     context.session.delete(raw_template)
     if raw_tmpl_files_id is None:
         return
@@ -237,6 +448,50 @@ def raw_template_delete(context, template_id):
         context.session.delete(raw_tmpl_files)
 
 
+def raw_template_compact_all(context, batch_size=50):
+    """Convert all stored templates to the compact format.
+
+    Returns the number of templates converted.
+    """
+    converted = 0
+    last_id = 0
+    while True:
+        template_ids = _raw_template_legacy_ids(context, last_id, batch_size)
+        if not template_ids:
+            return converted
+        for template_id in template_ids:
+            if _raw_template_compact(context, template_id):
+                converted += 1
+        last_id = template_ids[-1]
+
+
+@context_manager.reader
+def _raw_template_legacy_ids(context, last_id, batch_size):
+    template = sqlalchemy.type_coerce(models.RawTemplate.template,
+                                      sqlalchemy.Text)
+    query = context.session.query(models.RawTemplate.id).filter(
+        models.RawTemplate.id > last_id,
+        sqlalchemy.not_(template.like(_COMPACT_TEMPLATE_LIKE)),
+    ).order_by(models.RawTemplate.id).limit(batch_size)
+    return [row[0] for row in query]
+
+
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
+@context_manager.writer
+def _raw_template_compact(context, template_id):
+    raw_template_ref = _raw_template_get(context, template_id)
+    stored = _raw_template_stored(context, template_id)
+    if not isinstance(stored, dict) or _is_compact_template(stored):
+        return False
+    compact, blobs = _compact_template(stored)
+    _raw_template_blobs_acquire(context.session,
+                                _compact_template_refs(compact), blobs)
+    raw_template_ref.template = compact
+    return True
+
+
 # raw template files
 
 
@@ -282,6 +537,30 @@ def _resource_create(context, values):
     return resource_ref
 
 
+@retry_on_db_error
+@context_manager.writer
+def resource_create_all(context, values_list):
+    """Create a number of resources in a single bulk insert.
+
+    Returns the id, uuid and created_at of each new resource, in the same
+    order as values_list. Since not all backends return the primary keys
+    generated by a multi-row insert, the new rows are read back by uuid.
+    """
+    if not values_list:
+        return []
+    values_list = [_truncate_status_reason(
+        dict(values, uuid=values.get('uuid') or str(uuid.uuid4())))
+        for values in values_list]
+    context.session.execute(sqlalchemy.insert(models.Resource), values_list)
+
+    uuids = [values['uuid'] for values in values_list]
+    rows = context.session.query(
+        models.Resource.id, models.Resource.uuid, models.Resource.created_at,
+    ).filter(models.Resource.uuid.in_(uuids))
+    by_uuid = dict((row.uuid, row) for row in rows)
+    return [by_uuid[u] for u in uuids]
+
+
 @retry_on_db_error
 @context_manager.writer
 def resource_create_replacement(context,
@@ -408,6 +687,25 @@ def _resource_get(context, resource_id, refresh=False, refresh_data=False):
     return result
 
 
+@context_manager.reader
+def resource_get_state_summary_by_root_stack(context, root_stack_id):
+    """Return a summary of the state of the resources in a tree of stacks.
+
+    The summary is a list of tuples of the columns that change when a
+    resource changes state, without loading its data, properties or metadata.
+    """
+    return [tuple(row) for row in context.session.query(
+        models.Resource.id,
+        models.Resource.action,
+        models.Resource.status,
+        models.Resource.atomic_key,
+        models.Resource.updated_at,
+        models.Resource.physical_resource_id,
+        models.Resource.rsrc_prop_data_id,
+        models.Resource.attr_data_id,
+    ).filter_by(root_stack_id=root_stack_id).order_by(models.Resource.id)]
+
+
 @context_manager.reader
 def resource_get_by_name_and_stack(context, resource_name, stack_id):
     result = context.session.query(
@@ -702,6 +1000,86 @@ def resource_data_delete(context, resource_id, key):
 # resource properties data
 
 
+# Shared data reused within this time is not deleted even when no longer
+# referenced, so that it is not deleted before the resource reusing it is
+# stored
+_RPD_REUSE_GRACE_PERIOD = datetime.timedelta(minutes=5)
+
+
+def _resource_prop_data_values(values, shared=False):
+    """Return the column values to store resource properties data."""
+    values = dict(values)
+    if 'data' not in values:
+        return values
+    data = values['data']
+    values['digest'] = None
+    values['compressed_data'] = None
+    if data is None:
+        return values
+
+    content = jsonutils.dumps(data).encode('utf-8')
+    if shared and not values.get('encrypted'):
+        values['digest'] = hashlib.sha256(content).hexdigest()
+    threshold = CONF.properties_data_compression_threshold
+    if threshold and len(content) > threshold:
+        values['compressed_data'] = zlib.compress(content)
+        values['data'] = None
+    return values
+
+
+def resource_prop_data_content(rpd):
+    """Return the (possibly encrypted) data of a resource_properties_data."""
+    compressed_data = rpd.get('compressed_data')
+    if compressed_data is not None:
+        return jsonutils.loads(zlib.decompress(compressed_data))
+    return rpd['data']
+
+
+def _resource_prop_data_acquire(conn, refs):
+    rpd = models.ResourcePropertiesData.__table__
+    for count, rpd_ids in _group_by_count(refs):
+        for batch in _batches(rpd_ids):
+            conn.execute(rpd.update().where(
+                rpd.c.id.in_(batch)).values(
+                    refcount=rpd.c.refcount + count,
+                    updated_at=rpd.c.updated_at))
+
+
+def _resource_prop_data_release(conn, refs, rpd_ids=()):
+    """Drop references to resource properties data.
+
+    The data in refs, and any other data in rpd_ids, is deleted if no
+    longer referred to by any event or resource.
+    """
+    rpd = models.ResourcePropertiesData.__table__
+    resource = models.Resource.__table__
+    for count, ids in _group_by_count(refs):
+        for batch in _batches(ids):
+            conn.execute(rpd.update().where(
+                rpd.c.id.in_(batch)).values(
+                    refcount=rpd.c.refcount - count,
+                    updated_at=rpd.c.updated_at))
+
+    reused_after = timeutils.utcnow() - _RPD_REUSE_GRACE_PERIOD
+    for batch in _batches(set(refs) | set(rpd_ids)):
+        unused = set(row[0] for row in conn.execute(
+            sqlalchemy.select(rpd.c.id).where(
+                rpd.c.id.in_(batch),
+                rpd.c.refcount <= 0,
+                or_(rpd.c.digest.is_(None),
+                    rpd.c.updated_at.is_(None),
+                    rpd.c.updated_at < reused_after))))
+        if not unused:
+            continue
+        for column in (resource.c.rsrc_prop_data_id,
+                       resource.c.attr_data_id):
+            unused.difference_update(row[0] for row in conn.execute(
+                sqlalchemy.select(column).where(column.in_(unused))))
+        if unused:
+            conn.execute(rpd.delete().where(rpd.c.id.in_(unused),
+                                            rpd.c.refcount <= 0))
+
+
 @context_manager.writer
 def resource_prop_data_create_or_update(context, values, rpd_id=None):
     return _resource_prop_data_create_or_update(context, values, rpd_id=rpd_id)
@@ -714,7 +1092,7 @@ def _resource_prop_data_create_or_update(context, values, rpd_id=None):
             models.ResourcePropertiesData).filter_by(id=rpd_id).first()
     if obj_ref is None:
         obj_ref = models.ResourcePropertiesData()
-    obj_ref.update(values)
+    obj_ref.update(_resource_prop_data_values(values))
     obj_ref.save(context.session)
     return obj_ref
 
@@ -724,6 +1102,30 @@ def resource_prop_data_create(context, values):
     return _resource_prop_data_create_or_update(context, values)
 
 
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
+@context_manager.writer
+def resource_prop_data_get_or_create(context, values):
+    """Return stored resource properties data identical to that given.
+
+    Unencrypted data is shared between all resources and events with the
+    same properties, and stored only if it is not already.
+    """
+    values = _resource_prop_data_values(values, shared=True)
+    if values.get('digest') is not None:
+        obj_ref = context.session.query(
+            models.ResourcePropertiesData).filter_by(
+                digest=values['digest']).first()
+        if obj_ref is not None:
+            obj_ref.updated_at = timeutils.utcnow()
+            return obj_ref
+    obj_ref = models.ResourcePropertiesData()
+    obj_ref.update(values)
+    obj_ref.save(context.session)
+    return obj_ref
+
+
 @context_manager.reader
 def resource_prop_data_get(context, resource_prop_data_id):
     result = context.session.get(
@@ -893,12 +1295,12 @@ def _query_stack_get_all(context, show_deleted=False,
     if not context.is_admin:
         query = query.filter_by(tenant=context.project_id)
 
-    query = query.options(orm.subqueryload(models.Stack.tags))
+    # Tag filters are correlated EXISTS subqueries, so that they neither
+    # multiply the rows returned nor need a separate query
     if tags:
         for tag in tags:
-            tag_alias = orm.aliased(models.StackTag)
-            query = query.join(tag_alias, models.Stack.tags)
-            query = query.filter(tag_alias.tag == tag)
+            query = query.filter(
+                models.Stack.tags.any(models.StackTag.tag == tag))
 
     if tags_any:
         query = query.filter(
@@ -906,15 +1308,9 @@ def _query_stack_get_all(context, show_deleted=False,
                 models.StackTag.tag.in_(tags_any)))
 
     if not_tags:
-        subquery = _soft_delete_aware_query(
-            context, models.Stack, show_deleted=show_deleted
-        )
-        for tag in not_tags:
-            tag_alias = orm.aliased(models.StackTag)
-            subquery = subquery.join(tag_alias, models.Stack.tags)
-            subquery = subquery.filter(tag_alias.tag == tag)
-        not_stack_ids = [s.id for s in subquery.all()]
-        query = query.filter(models.Stack.id.notin_(not_stack_ids))
+        query = query.filter(~and_(*[
+            models.Stack.tags.any(models.StackTag.tag == tag)
+            for tag in not_tags]))
 
     if not_tags_any:
         query = query.filter(
@@ -941,12 +1337,61 @@ def stack_get_all(context, limit=None, sort_keys=None, marker=None,
                                  show_hidden=show_hidden, tags=tags,
                                  tags_any=tags_any, not_tags=not_tags,
                                  not_tags_any=not_tags_any)
+    query = query.options(orm.subqueryload(models.Stack.tags))
     if eager_load:
         query = query.options(orm.joinedload(models.Stack.raw_template))
     return _filter_and_page_query(context, query, limit, sort_keys,
                                   marker, sort_dir, filters).all()
 
 
+_STACK_SUMMARY_COLUMNS = (
+    models.Stack.id, models.Stack.name, models.Stack.tenant,
+    models.Stack.action, models.Stack.status, models.Stack.status_reason,
+    models.Stack.created_at, models.Stack.updated_at,
+    models.Stack.deleted_at, models.Stack.username, models.Stack.owner_id,
+    models.Stack.stack_user_project_id,
+)
+
+
+@context_manager.reader
+def stack_get_all_summaries(context, limit=None, sort_keys=None, marker=None,
+                            sort_dir=None, filters=None,
+                            show_deleted=False, show_nested=False,
+                            show_hidden=False, tags=None, tags_any=None,
+                            not_tags=None, not_tags_any=None):
+    """Return the columns of stacks needed to list them.
+
+    Unlike stack_get_all(), only the summary columns of each stack are
+    selected, and no ORM objects are built. The result is a list of dicts
+    keyed by column name, each with the list of the stack's tags (or None)
+    added under 'tags'. The tags of all of the stacks are fetched in a
+    single query.
+    """
+    query = _query_stack_get_all(context,
+                                 show_deleted=show_deleted,
+                                 show_nested=show_nested,
+                                 show_hidden=show_hidden, tags=tags,
+                                 tags_any=tags_any, not_tags=not_tags,
+                                 not_tags_any=not_tags_any)
+    query = query.with_entities(*_STACK_SUMMARY_COLUMNS)
+    summaries = [row._asdict() for row in _filter_and_page_query(
+        context, query, limit, sort_keys, marker, sort_dir, filters)]
+
+    stack_tags = collections.defaultdict(list)
+    for ids in _batches([s['id'] for s in summaries]):
+        tag_rows = context.session.query(
+            models.StackTag.stack_id, models.StackTag.tag
+        ).filter(
+            models.StackTag.stack_id.in_(ids)
+        ).order_by(models.StackTag.id)
+        for stack_id, tag in tag_rows:
+            stack_tags[stack_id].append(tag)
+
+    for summary in summaries:
+        summary['tags'] = stack_tags.get(summary['id'])
+    return summaries
+
+
 def _filter_and_page_query(context, query, limit=None, sort_keys=None,
                            marker=None, sort_dir=None, filters=None):
     if filters is None:
@@ -1139,10 +1584,6 @@ def _stack_tags_get(context, stack_id):
 # stack lock
 
 
-def _is_duplicate_error(exc):
-    return isinstance(exc, db_exception.DBDuplicateEntry)
-
-
 @oslo_db_api.wrap_db_retry(max_retries=3, retry_on_deadlock=True,
                            retry_on_disconnect=True,
                            retry_interval=0.5,
@@ -1270,6 +1711,22 @@ def user_creds_get(context, user_creds_id):
     return result
 
 
+@context_manager.reader
+def user_creds_get_all_of_deleted_stacks(context):
+    """Return the credentials still held by deleted root stacks.
+
+    Each item is a tuple of the ID of the credentials and the stack domain
+    project of the stack.
+    """
+    query = context.session.query(
+        models.Stack.user_creds_id,
+        models.Stack.stack_user_project_id).filter(
+            models.Stack.deleted_at.isnot(None),
+            models.Stack.owner_id.is_(None),
+            models.Stack.user_creds_id.isnot(None))
+    return [tuple(row) for row in query.distinct()]
+
+
 @db_utils.retry_on_stale_data_error
 @context_manager.writer
 def user_creds_delete(context, user_creds_id):
@@ -1362,102 +1819,32 @@ def _event_count_all_by_stack(context, stack_id):
     return query.filter_by(stack_id=stack_id).scalar()
 
 
-def _find_rpd_references(context, stack_id):
-    ev_ref_ids = set(
-        e.rsrc_prop_data_id for e
-        in context.session.query(models.Event).filter_by(
-            stack_id=stack_id,
-        ).all()
-    )
-    rsrc_ref_ids = set(
-        r.rsrc_prop_data_id for r
-        in context.session.query(models.Resource).filter_by(
-            stack_id=stack_id,
-        ).all()
-    )
-    return ev_ref_ids | rsrc_ref_ids
-
-
-def _all_backup_stack_ids(context, stack_id):
-    """Iterate over all the IDs of all stacks related as stack/backup pairs.
-
-    All backup stacks of a main stack, past and present (i.e. including those
-    that are soft deleted), are included. The main stack itself is also
-    included if the initial ID passed in is for a backup stack. The initial ID
-    passed in is never included in the output.
-    """
-    stack = context.session.get(models.Stack, stack_id)
-    if stack is None:
-        LOG.error('Stack %s not found', stack_id)
-        return
-    is_backup = stack.name.endswith('*')
-
-    if is_backup:
-        main = context.session.get(models.Stack, stack.owner_id)
-        if main is None:
-            LOG.error('Main stack for backup "%s" %s not found',
-                      stack.name, stack_id)
-            return
-        yield main.id
-        for backup_id in _all_backup_stack_ids(context, main.id):
-            if backup_id != stack_id:
-                yield backup_id
-    else:
-        q_backup = context.session.query(models.Stack).filter(sqlalchemy.or_(
-            models.Stack.tenant == context.project_id,
-            models.Stack.stack_user_project_id == context.project_id))
-        q_backup = q_backup.filter_by(name=stack.name + '*')
-        q_backup = q_backup.filter_by(owner_id=stack_id)
-        for backup in q_backup.all():
-            yield backup.id
-
-
 def _delete_event_rows(context, stack_id, limit):
     # MySQL does not support LIMIT in subqueries,
     # sqlite does not support JOIN in DELETE.
     # So we must manually supply the IN() values.
     # pgsql SHOULD work with the pure DELETE/JOIN below but that must be
     # confirmed via integration tests.
-    query = context.session.query(models.Event).filter_by(
+    query = context.session.query(
+        models.Event.id, models.Event.rsrc_prop_data_id,
+    ).filter_by(
         stack_id=stack_id,
     )
     query = query.order_by(models.Event.id).limit(limit)
-    id_pairs = [(e.id, e.rsrc_prop_data_id) for e in query.all()]
+    id_pairs = query.all()
     if not id_pairs:
         return 0
-    (ids, rsrc_prop_ids) = zip(*id_pairs)
-    max_id = ids[-1]
+    max_id = id_pairs[-1][0]
     # delete the events
     retval = context.session.query(models.Event).filter(
         models.Event.id <= max_id).filter(
             models.Event.stack_id == stack_id).delete()
 
     # delete unreferenced resource_properties_data
-    def del_rpd(rpd_ids):
-        if not rpd_ids:
-            return
-        q_rpd = context.session.query(models.ResourcePropertiesData)
-        q_rpd = q_rpd.filter(models.ResourcePropertiesData.id.in_(rpd_ids))
-        q_rpd.delete(synchronize_session=False)
-
-    if rsrc_prop_ids:
-        clr_prop_ids = set(rsrc_prop_ids) - _find_rpd_references(context,
-                                                                 stack_id)
-        clr_prop_ids.discard(None)
-        try:
-            del_rpd(clr_prop_ids)
-        except db_exception.DBReferenceError:
-            LOG.debug('Checking backup/stack pairs for RPD references')
-            found = False
-            for partner_stack_id in _all_backup_stack_ids(context,
-                                                          stack_id):
-                found = True
-                clr_prop_ids -= _find_rpd_references(context,
-                                                     partner_stack_id)
-            if not found:
-                LOG.debug('No backup/stack pairs found for %s', stack_id)
-                raise
-            del_rpd(clr_prop_ids)
+    rpd_refs = collections.Counter(rpd_id for event_id, rpd_id in id_pairs
+                                   if rpd_id is not None)
+    if rpd_refs:
+        _resource_prop_data_release(context.session, rpd_refs)
 
     return retval
 
@@ -1486,6 +1873,9 @@ def event_create(context, values):
     event_ref = models.Event()
     event_ref.update(values)
     event_ref.save(context.session)
+    if event_ref.rsrc_prop_data_id is not None:
+        _resource_prop_data_acquire(context.session,
+                                    {event_ref.rsrc_prop_data_id: 1})
 
     result = context.session.query(models.Event).filter_by(
         id=event_ref.id,
@@ -1499,11 +1889,88 @@ def event_create(context, values):
 # software config
 
 
+# Key marking a software_config whose shared content is stored in a
+# raw_template_blob row
+_COMPACT_SOFTWARE_CONFIG = '__heat_compact_config__'
+_SOFTWARE_CONFIG_SHARED_KEYS = (rpc_api.SOFTWARE_CONFIG_CONFIG,
+                                rpc_api.SOFTWARE_CONFIG_OUTPUTS,
+                                rpc_api.SOFTWARE_CONFIG_OPTIONS)
+
+
+def _is_compact_software_config(config):
+    return isinstance(config, dict) and _COMPACT_SOFTWARE_CONFIG in config
+
+
+def _compact_software_config(config):
+    """Split a software config into a shared blob and its inputs.
+
+    The config, outputs and options are usually identical for all of the
+    configs derived from the same source, so they are stored once; the
+    inputs, which hold the values for each deployment, stay inline.
+    """
+    blobs = {}
+    shared = dict((k, v) for k, v in config.items()
+                  if k in _SOFTWARE_CONFIG_SHARED_KEYS)
+    compact = dict((k, v) for k, v in config.items() if k not in shared)
+    compact[_COMPACT_SOFTWARE_CONFIG] = _template_blob(shared, blobs)
+    return compact, blobs
+
+
+def _compact_software_config_refs(config):
+    refs = collections.Counter()
+    if _is_compact_software_config(config):
+        refs[config[_COMPACT_SOFTWARE_CONFIG]] += 1
+    return refs
+
+
+def software_config_expand(context, config):
+    """Return the full content of a stored software config.
+
+    Software configs not stored in the compact format are returned
+    unchanged.
+    """
+    if not _is_compact_software_config(config):
+        return config
+    return _software_config_expand(context, config)
+
+
+@context_manager.reader
+def _software_config_expand(context, config):
+    blob = models.RawTemplateBlob.__table__
+    digest = config[_COMPACT_SOFTWARE_CONFIG]
+    row = context.session.execute(
+        sqlalchemy.select(blob.c.data, blob.c.compressed).where(
+            blob.c.id == digest)).first()
+    if row is None:
+        raise exception.NotFound(
+            _('raw template blob %s not found') % digest)
+    data, compressed = row
+    expanded = dict((k, v) for k, v in config.items()
+                    if k != _COMPACT_SOFTWARE_CONFIG)
+    expanded.update(jsonutils.loads(zlib.decompress(data) if compressed
+                                    else data))
+    return expanded
+
+
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
 @context_manager.writer
 def software_config_create(context, values):
     obj_ref = models.SoftwareConfig()
     obj_ref.update(values)
+    config = values.get('config')
+    compact = (CONF.compact_software_config_storage and
+               isinstance(config, dict))
+    if compact:
+        obj_ref.config, blobs = _compact_software_config(config)
+        _raw_template_blobs_acquire(
+            context.session,
+            _compact_software_config_refs(obj_ref.config), blobs)
     obj_ref.save(context.session)
+    if compact:
+        # Callers always see the full config
+        orm.attributes.set_committed_value(obj_ref, 'config', config)
     return obj_ref
 
 
@@ -1551,6 +2018,8 @@ def software_config_delete(context, config_id):
         msg = (_("Software config with id %s can not be deleted as "
                  "it is referenced.") % config_id)
         raise exception.InvalidRestrictedAction(message=msg)
+    _raw_template_blobs_release(context.session,
+                                _compact_software_config_refs(config.config))
     context.session.delete(config)
 
 
@@ -1913,8 +2382,6 @@ def _purge_stacks(stack_infos, engine, meta):
         resource = sqlalchemy.Table('resource', meta, autoload_with=conn)
         resource_data = sqlalchemy.Table(
             'resource_data', meta, autoload_with=conn)
-        resource_properties_data = sqlalchemy.Table(
-            'resource_properties_data', meta, autoload_with=conn)
         event = sqlalchemy.Table('event', meta, autoload_with=conn)
         raw_template = sqlalchemy.Table(
             'raw_template', meta, autoload_with=conn)
@@ -1922,6 +2389,10 @@ def _purge_stacks(stack_infos, engine, meta):
             'raw_template_files', meta, autoload_with=conn)
         user_creds = sqlalchemy.Table('user_creds', meta, autoload_with=conn)
         syncpoint = sqlalchemy.Table('sync_point', meta, autoload_with=conn)
+        stack_timeline = sqlalchemy.Table(
+            'stack_timeline', meta, autoload_with=conn)
+        output_snapshot = sqlalchemy.Table(
+            'stack_output_snapshot', meta, autoload_with=conn)
 
     stack_info_str = ','.join([str(i) for i in stack_infos])
     LOG.info("Purging stacks %s", stack_info_str)
@@ -1957,6 +2428,18 @@ def _purge_stacks(stack_infos, engine, meta):
     with engine.connect() as conn, conn.begin():
         conn.execute(sync_del)
 
+    # delete stack timelines
+    timeline_del = stack_timeline.delete().where(
+        stack_timeline.c.stack_id.in_(stack_ids))
+    with engine.connect() as conn, conn.begin():
+        conn.execute(timeline_del)
+
+    # delete stack output snapshots
+    output_snapshot_del = output_snapshot.delete().where(
+        output_snapshot.c.stack_id.in_(stack_ids))
+    with engine.connect() as conn, conn.begin():
+        conn.execute(output_snapshot_del)
+
     # get rsrc_prop_data_ids to delete
     rsrc_prop_data_where = sqlalchemy.select(
         resource.c.rsrc_prop_data_id,
@@ -1978,12 +2461,14 @@ def _purge_stacks(stack_infos, engine, meta):
 
     rsrc_prop_data_where = sqlalchemy.select(
         event.c.rsrc_prop_data_id,
+        func.count(event.c.id),
     ).where(
-        event.c.stack_id.in_(stack_ids))
+        event.c.stack_id.in_(stack_ids),
+        event.c.rsrc_prop_data_id.isnot(None),
+    ).group_by(event.c.rsrc_prop_data_id)
     with engine.connect() as conn, conn.begin():
-        rsrc_prop_data_ids.update(
-            [i[0] for i in list(conn.execute(rsrc_prop_data_where))]
-        )
+        rsrc_prop_data_refs = collections.Counter(
+            dict(conn.execute(rsrc_prop_data_where).all()))
 
     # delete events
     event_del = event.delete().where(event.c.stack_id.in_(stack_ids))
@@ -1995,30 +2480,12 @@ def _purge_stacks(stack_infos, engine, meta):
     with engine.connect() as conn, conn.begin():
         conn.execute(res_del)
 
-    # delete resource_properties_data
-    if rsrc_prop_data_ids:  # keep rpd's in events
-        rsrc_prop_data_where = sqlalchemy.select(
-            event.c.rsrc_prop_data_id,
-        ).where(
-            event.c.rsrc_prop_data_id.in_(rsrc_prop_data_ids))
-        with engine.connect() as conn, conn.begin():
-            ids = list(conn.execute(rsrc_prop_data_where))
-        rsrc_prop_data_ids.difference_update([i[0] for i in ids])
-
-    if rsrc_prop_data_ids:  # keep rpd's in resources
-        rsrc_prop_data_where = sqlalchemy.select(
-            resource.c.rsrc_prop_data_id,
-        ).where(
-            resource.c.rsrc_prop_data_id.in_(rsrc_prop_data_ids))
-        with engine.connect() as conn, conn.begin():
-            ids = list(conn.execute(rsrc_prop_data_where))
-        rsrc_prop_data_ids.difference_update([i[0] for i in ids])
-
-    if rsrc_prop_data_ids:  # delete if we have any
-        rsrc_prop_data_del = resource_properties_data.delete().where(
-            resource_properties_data.c.id.in_(rsrc_prop_data_ids))
+    # delete resource_properties_data no longer referenced
+    rsrc_prop_data_ids.discard(None)
+    if rsrc_prop_data_ids or rsrc_prop_data_refs:
         with engine.connect() as conn, conn.begin():
-            conn.execute(rsrc_prop_data_del)
+            _resource_prop_data_release(conn, rsrc_prop_data_refs,
+                                        rsrc_prop_data_ids)
 
     # delete the stacks
     stack_del = stack.delete().where(stack.c.id.in_(stack_ids))
@@ -2053,9 +2520,19 @@ def _purge_stacks(stack_infos, engine, meta):
             raw_tmpl_file_ids = [i[0] for i in conn.execute(
                 raw_tmpl_file_sel)]
 
+        raw_tmpl_compact_sel = sqlalchemy.select(
+            raw_template.c.template,
+        ).where(
+            raw_template.c.id.in_(raw_template_ids),
+            raw_template.c.template.like(_COMPACT_TEMPLATE_LIKE))
         raw_templ_del = raw_template.delete().where(
             raw_template.c.id.in_(raw_template_ids))
         with engine.connect() as conn, conn.begin():
+            blob_refs = collections.Counter()
+            for row in conn.execute(raw_tmpl_compact_sel):
+                blob_refs.update(_compact_template_refs(
+                    jsonutils.loads(row[0])))
+            _raw_template_blobs_release(conn, blob_refs)
             conn.execute(raw_templ_del)
 
         if raw_tmpl_file_ids:  # keep _files still referenced
@@ -2112,6 +2589,16 @@ def sync_point_create(context, values):
     return sync_point_ref
 
 
+@retry_on_db_error
+@context_manager.writer
+def sync_point_create_all(context, values_list):
+    if values_list:
+        context.session.execute(
+            sqlalchemy.insert(models.SyncPoint),
+            [dict(values, entity_id=str(values['entity_id']))
+             for values in values_list])
+
+
 @context_manager.reader
 def sync_point_get(context, entity_id, traversal_id, is_update):
     entity_id = str(entity_id)
@@ -2140,6 +2627,58 @@ def sync_point_update_input_data(context, entity_id,
     return rows_updated
 
 
+# stack timeline
+
+
+@context_manager.writer
+def stack_timeline_create_all(context, values_list):
+    if values_list:
+        context.session.execute(
+            sqlalchemy.insert(models.StackTimeline), values_list)
+
+
+@context_manager.reader
+def stack_timeline_get_all_by_stack(context, stack_id, traversal_id=None):
+    query = context.session.query(models.StackTimeline).filter_by(
+        stack_id=stack_id)
+    if traversal_id is not None:
+        query = query.filter_by(traversal_id=traversal_id)
+    return query.order_by(models.StackTimeline.id).all()
+
+
+@context_manager.writer
+def stack_timeline_delete_all_by_stack(context, stack_id):
+    return context.session.query(models.StackTimeline).filter_by(
+        stack_id=stack_id).delete()
+
+
+# stack output snapshot
+
+
+@context_manager.reader
+def stack_output_snapshot_get(context, stack_id):
+    return context.session.get(models.StackOutputSnapshot, stack_id)
+
+
+@oslo_db_api.wrap_db_retry(max_retries=3, retry_interval=0.5,
+                           inc_retry_interval=True,
+                           exception_checker=_is_duplicate_error)
+@context_manager.writer
+def stack_output_snapshot_set(context, stack_id, values):
+    snapshot = context.session.get(models.StackOutputSnapshot, stack_id)
+    if snapshot is None:
+        snapshot = models.StackOutputSnapshot(stack_id=stack_id)
+        context.session.add(snapshot)
+    snapshot.update(values)
+    return snapshot
+
+
+@context_manager.writer
+def stack_output_snapshot_delete_all_by_root_stack(context, root_stack_id):
+    return context.session.query(models.StackOutputSnapshot).filter_by(
+        root_stack_id=root_stack_id).delete()
+
+
 def _crypt_action(encrypt):
     if encrypt:
         return _('encrypt')
@@ -2174,8 +2713,11 @@ def _encrypt_or_decrypt_template_params(
 
                 newenv = copy.deepcopy(env)
                 if encrypt:
-                    tmpl = template.Template.load(
-                        context, raw_template.id, raw_template)
+                    tmpl = template.Template(
+                        raw_template_expand(context, raw_template.template),
+                        template_id=raw_template.id,
+                        env=heat_environment.Environment(env),
+                        files=raw_template.files or raw_template.files_id)
                     param_schemata = tmpl.param_schemata()
                     if not param_schemata:
                         continue
@@ -2236,17 +2778,19 @@ def _encrypt_or_decrypt_resource_prop_data(
     next_batch = list(itertools.islice(rpd_batches, batch_size))
     while next_batch:
         for rpd in next_batch:
-            if not rpd.data:
+            data = resource_prop_data_content(rpd)
+            if not data:
                 continue
             try:
                 if verbose:
                     LOG.info("Processing resource_properties_data %s...",
                              rpd.id)
                 if encrypt:
-                    result = crypt.encrypted_dict(rpd.data, encryption_key)
+                    result = crypt.encrypted_dict(data, encryption_key)
                 else:
-                    result = crypt.decrypted_dict(rpd.data, encryption_key)
-                rpd.update({'data': result, 'encrypted': encrypt})
+                    result = crypt.decrypted_dict(data, encryption_key)
+                rpd.update(_resource_prop_data_values(
+                    {'data': result, 'encrypted': encrypt}))
             except Exception as exc:
                 LOG.exception(
                     "Failed to %(crypt_action)s "
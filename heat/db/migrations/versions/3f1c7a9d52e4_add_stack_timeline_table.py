@@ -0,0 +1,54 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add stack_timeline table
+
+Revision ID: 3f1c7a9d52e4
+Revises: 97b2a986f922
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c7a9d52e4'
+down_revision = '97b2a986f922'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stack_timeline',
+        sa.Column('id', sa.Integer, primary_key=True, nullable=False),
+        sa.Column('stack_id', sa.String(36),
+                  sa.ForeignKey('stack.id'), nullable=False),
+        sa.Column('traversal_id', sa.String(36), nullable=False),
+        sa.Column('node', sa.String(255), nullable=False),
+        sa.Column('resource_name', sa.String(255)),
+        sa.Column('is_update', sa.Boolean),
+        sa.Column('blocked_by', sa.String(255)),
+        sa.Column('ready_at', sa.BigInteger),
+        sa.Column('started_at', sa.BigInteger),
+        sa.Column('finished_at', sa.BigInteger),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime),
+        sa.Index('ix_stack_timeline_stack_id', 'stack_id'),
+        mysql_engine='InnoDB',
+    )
+
+
+def downgrade():
+    op.drop_table('stack_timeline')
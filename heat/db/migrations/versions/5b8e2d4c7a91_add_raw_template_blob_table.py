@@ -0,0 +1,48 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add raw_template_blob table
+
+Revision ID: 5b8e2d4c7a91
+Revises: 3f1c7a9d52e4
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+import heat.db.types
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2d4c7a91'
+down_revision = '3f1c7a9d52e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'raw_template_blob',
+        sa.Column('id', sa.String(64), primary_key=True, nullable=False),
+        sa.Column('data', heat.db.types.LongBinary(), nullable=False),
+        sa.Column('compressed', sa.Boolean, nullable=False),
+        sa.Column('refcount', sa.Integer, nullable=False),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime),
+        mysql_engine='InnoDB',
+    )
+
+
+def downgrade():
+    op.drop_table('raw_template_blob')
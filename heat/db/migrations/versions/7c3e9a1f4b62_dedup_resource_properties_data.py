@@ -0,0 +1,68 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add sharing and compression to resource_properties_data
+
+Revision ID: 7c3e9a1f4b62
+Revises: 5b8e2d4c7a91
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+import heat.db.types
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a1f4b62'
+down_revision = '5b8e2d4c7a91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('resource_properties_data',
+                  sa.Column('digest', sa.String(64), nullable=True))
+    op.add_column('resource_properties_data',
+                  sa.Column('compressed_data', heat.db.types.LongBinary(),
+                            nullable=True))
+    op.add_column('resource_properties_data',
+                  sa.Column('refcount', sa.Integer, nullable=False,
+                            server_default='0'))
+    op.create_index('ix_resource_properties_data_digest',
+                    'resource_properties_data', ['digest'], unique=True)
+
+    connection = op.get_bind()
+    rpd_table = sa.Table('resource_properties_data', sa.MetaData(),
+                         autoload_with=connection)
+    event_table = sa.Table('event', sa.MetaData(),
+                           autoload_with=connection)
+    event_count = sa.select(
+        sa.func.count(event_table.c.id)
+    ).where(
+        event_table.c.rsrc_prop_data_id == rpd_table.c.id
+    ).scalar_subquery()
+    op.execute(
+        rpd_table.update().values({
+            'refcount': event_count
+        })
+    )
+
+
+def downgrade():
+    op.drop_index('ix_resource_properties_data_digest',
+                  'resource_properties_data')
+    op.drop_column('resource_properties_data', 'refcount')
+    op.drop_column('resource_properties_data', 'compressed_data')
+    op.drop_column('resource_properties_data', 'digest')
@@ -0,0 +1,51 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add stack_output_snapshot table
+
+Revision ID: e4a7b9c2d816
+Revises: 7c3e9a1f4b62
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+import heat.db.types
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a7b9c2d816'
+down_revision = '7c3e9a1f4b62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stack_output_snapshot',
+        sa.Column('stack_id', sa.String(36),
+                  sa.ForeignKey('stack.id'), primary_key=True,
+                  nullable=False),
+        sa.Column('root_stack_id', sa.String(36)),
+        sa.Column('version', sa.String(64), nullable=False),
+        sa.Column('outputs', heat.db.types.Json),
+        sa.Column('created_at', sa.DateTime),
+        sa.Column('updated_at', sa.DateTime),
+        sa.Index('ix_stack_output_snapshot_root_stack_id', 'root_stack_id'),
+        mysql_engine='InnoDB',
+    )
+
+
+def downgrade():
+    op.drop_table('stack_output_snapshot')
@@ -63,6 +63,24 @@ class RawTemplateFiles(BASE, HeatBase):
     files = sqlalchemy.Column(types.Json)
 
 
+class RawTemplateBlob(BASE, HeatBase):
+    """A part of a template, shared by all raw_templates containing it.
+
+    The shared content of software configs is stored in the same way.
+    Blobs are identified by the SHA-256 digest of their uncompressed JSON
+    content, and deleted when no raw_template or software_config refers to
+    them any longer.
+    """
+
+    __tablename__ = 'raw_template_blob'
+    id = sqlalchemy.Column(sqlalchemy.String(64), primary_key=True)
+    data = sqlalchemy.Column(types.LongBinary, nullable=False)
+    compressed = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False,
+                                   default=False)
+    refcount = sqlalchemy.Column(sqlalchemy.Integer, nullable=False,
+                                 default=0)
+
+
 class StackTag(BASE, HeatBase):
     """Key/value store of arbitrary stack tags."""
 
@@ -101,6 +119,52 @@ class SyncPoint(BASE, HeatBase):
     extra_data = sqlalchemy.Column(types.Json)
 
 
+class StackTimeline(BASE, HeatBase):
+    """Represents the timing of a node in a stack traversal.
+
+    Times are stored as integer milliseconds since the epoch.
+    """
+
+    __tablename__ = 'stack_timeline'
+    __table_args__ = (
+        sqlalchemy.Index('ix_stack_timeline_stack_id', 'stack_id'),
+    )
+
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    stack_id = sqlalchemy.Column(sqlalchemy.String(36),
+                                 sqlalchemy.ForeignKey('stack.id'),
+                                 nullable=False)
+    traversal_id = sqlalchemy.Column(sqlalchemy.String(36), nullable=False)
+    node = sqlalchemy.Column(sqlalchemy.String(255), nullable=False)
+    resource_name = sqlalchemy.Column(sqlalchemy.String(255))
+    is_update = sqlalchemy.Column(sqlalchemy.Boolean)
+    blocked_by = sqlalchemy.Column(sqlalchemy.String(255))
+    ready_at = sqlalchemy.Column(sqlalchemy.BigInteger)
+    started_at = sqlalchemy.Column(sqlalchemy.BigInteger)
+    finished_at = sqlalchemy.Column(sqlalchemy.BigInteger)
+
+
+class StackOutputSnapshot(BASE, HeatBase):
+    """Represents the resolved outputs of a stack.
+
+    The version identifies the state of the stack and its resources from
+    which the outputs were resolved.
+    """
+
+    __tablename__ = 'stack_output_snapshot'
+    __table_args__ = (
+        sqlalchemy.Index('ix_stack_output_snapshot_root_stack_id',
+                         'root_stack_id'),
+    )
+
+    stack_id = sqlalchemy.Column(sqlalchemy.String(36),
+                                 sqlalchemy.ForeignKey('stack.id'),
+                                 primary_key=True)
+    root_stack_id = sqlalchemy.Column(sqlalchemy.String(36))
+    version = sqlalchemy.Column(sqlalchemy.String(64), nullable=False)
+    outputs = sqlalchemy.Column(types.Json)
+
+
 class Stack(BASE, HeatBase, SoftDelete, StateAware):
     """Represents a stack created by the heat engine."""
 
@@ -187,10 +251,21 @@ class ResourcePropertiesData(BASE, HeatBase):
     """Represents resource properties data, current or older"""
 
     __tablename__ = 'resource_properties_data'
+    __table_args__ = (
+        sqlalchemy.Index('ix_resource_properties_data_digest', 'digest',
+                         unique=True),
+    )
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     data = sqlalchemy.Column('data', types.Json)
     encrypted = sqlalchemy.Column('encrypted', sqlalchemy.Boolean)
+    # SHA-256 of the data, set only on rows that may be shared
+    digest = sqlalchemy.Column(sqlalchemy.String(64))
+    # Set instead of data when the data is stored compressed
+    compressed_data = sqlalchemy.Column(types.LongBinary)
+    # Number of events referring to this data
+    refcount = sqlalchemy.Column(sqlalchemy.Integer, nullable=False,
+                                 default=0, server_default='0')
 
 
 class Event(BASE, HeatBase):
@@ -32,6 +32,18 @@ class LongText(types.TypeDecorator):
             return self.impl
 
 
+class LongBinary(types.TypeDecorator):
+
+    impl = types.LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(mysql.LONGBLOB())
+        else:
+            return self.impl
+
+
 class Json(LongText):
 
     cache_ok = True
@@ -0,0 +1,68 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import fnmatch
+import threading
+
+from oslo_config import cfg
+
+from heat.engine import shared_object
+
+
+class ActionPool(object):
+    """Threads on which the steps of resource actions are run.
+
+    The pool is shared by all of the stacks in an engine, as are the limits on
+    the number of concurrent actions on resources of a given type or using a
+    given client plugin.
+    """
+
+    def __init__(self, max_workers, limits=None):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='heat-resource-action')
+        self._semaphores = dict((key, threading.BoundedSemaphore(limit))
+                                for key, limit in self.limits.items())
+
+    def resource_limits(self, res):
+        """Return the semaphores limiting concurrent actions on a resource."""
+        res_type = res.type()
+        client_name = res.default_client_name
+        return [semaphore for key, semaphore in self._semaphores.items()
+                if key == client_name or fnmatch.fnmatchcase(res_type, key)]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+def _create_pool():
+    max_workers = cfg.CONF.resource_action_workers
+    if max_workers > 0:
+        return ActionPool(max_workers,
+                          cfg.CONF.resource_action_concurrency_limits)
+
+
+_pool = shared_object.SharedObject(_create_pool)
+
+
+def get_pool():
+    """Return the shared ActionPool, or None if none is configured."""
+    return _pool.get()
+
+
+def shutdown():
+    """Stop the threads of the shared ActionPool."""
+    _pool.shutdown()
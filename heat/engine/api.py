@@ -17,6 +17,7 @@ from oslo_log import log as logging
 from oslo_utils import timeutils
 
 from heat.common.i18n import _
+from heat.common import identifier
 from heat.common import param_utils
 from heat.common import template_format
 from heat.common import timeutils as heat_timeutils
@@ -194,11 +195,12 @@ def format_stack_output(output_defn, resolve_value=True):
     return result
 
 
-def format_stack(stack, preview=False, resolve_outputs=True):
+def format_stack(stack, preview=False, resolve_outputs=True, outputs=None):
     """Return a representation of the given stack.
 
     Return a representation of the given stack that matches the API output
-    expectations.
+    expectations. If already formatted outputs are supplied, they are used
+    instead of resolving the outputs of the stack.
     """
     updated_time = heat_timeutils.isotime(stack.updated_time)
     created_time = heat_timeutils.isotime(stack.created_time or
@@ -234,8 +236,9 @@ def format_stack(stack, preview=False, resolve_outputs=True):
     # allow users to view the outputs of stacks
     if (not (stack.action == stack.DELETE and stack.status == stack.COMPLETE)
             and resolve_outputs):
-        info[rpc_api.STACK_OUTPUTS] = format_stack_outputs(stack.outputs,
-                                                           resolve_value=True)
+        if outputs is None:
+            outputs = format_stack_outputs(stack.outputs, resolve_value=True)
+        info[rpc_api.STACK_OUTPUTS] = outputs
 
     return info
 
@@ -246,27 +249,54 @@ def format_stack_db_object(stack):
     Given a stack versioned DB object, return a representation of the given
     stack for a stack listing.
     """
-    updated_time = heat_timeutils.isotime(stack.updated_at)
-    created_time = heat_timeutils.isotime(stack.created_at)
-    deleted_time = heat_timeutils.isotime(stack.deleted_at)
-
     tags = None
     if stack.tags:
         tags = [t.tag for t in stack.tags]
+    return format_stack_summary({
+        'id': stack.id,
+        'name': stack.name,
+        'tenant': stack.tenant,
+        'action': stack.action,
+        'status': stack.status,
+        'status_reason': stack.status_reason,
+        'created_at': stack.created_at,
+        'updated_at': stack.updated_at,
+        'deleted_at': stack.deleted_at,
+        'username': stack.username,
+        'owner_id': stack.owner_id,
+        'stack_user_project_id': stack.stack_user_project_id,
+        'tags': tags,
+    })
+
+
+def format_stack_summary(summary):
+    """Return a summary representation of a stack.
+
+    Given a dict of the summary columns of a stack, as returned by
+    Stack.get_all_summaries(), return a representation of the stack for a
+    stack listing.
+    """
+    updated_time = heat_timeutils.isotime(summary['updated_at'])
+    created_time = heat_timeutils.isotime(summary['created_at'])
+    deleted_time = heat_timeutils.isotime(summary['deleted_at'])
+
+    stack_identity = identifier.HeatIdentifier(summary['tenant'],
+                                               summary['name'],
+                                               summary['id'])
     info = {
-        rpc_api.STACK_ID: dict(stack.identifier()),
-        rpc_api.STACK_NAME: stack.name,
+        rpc_api.STACK_ID: dict(stack_identity),
+        rpc_api.STACK_NAME: summary['name'],
         rpc_api.STACK_DESCRIPTION: '',
-        rpc_api.STACK_ACTION: stack.action,
-        rpc_api.STACK_STATUS: stack.status,
-        rpc_api.STACK_STATUS_DATA: stack.status_reason,
+        rpc_api.STACK_ACTION: summary['action'],
+        rpc_api.STACK_STATUS: summary['status'],
+        rpc_api.STACK_STATUS_DATA: summary['status_reason'],
         rpc_api.STACK_CREATION_TIME: created_time,
         rpc_api.STACK_UPDATED_TIME: updated_time,
         rpc_api.STACK_DELETION_TIME: deleted_time,
-        rpc_api.STACK_OWNER: stack.username,
-        rpc_api.STACK_PARENT: stack.owner_id,
-        rpc_api.STACK_USER_PROJECT_ID: stack.stack_user_project_id,
-        rpc_api.STACK_TAGS: tags,
+        rpc_api.STACK_OWNER: summary['username'],
+        rpc_api.STACK_PARENT: summary['owner_id'],
+        rpc_api.STACK_USER_PROJECT_ID: summary['stack_user_project_id'],
+        rpc_api.STACK_TAGS: summary['tags'] or None,
     }
 
     return info
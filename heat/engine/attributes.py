@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+import contextlib
 import functools
 
 from oslo_utils import strutils
@@ -144,12 +145,31 @@ class Attributes(collections.abc.Mapping):
     def __init__(self, res_name, schema, resolver):
         self._resource_name = res_name
         self._resolver = resolver
+        self._bulk_values = {}
         self.set_schema(schema)
         self.reset_resolved_values()
 
         assert ALL_ATTRIBUTES not in schema, \
             "Invalid attribute name '%s'" % ALL_ATTRIBUTES
 
+    @contextlib.contextmanager
+    def resolved_together(self, values):
+        """Use values resolved in bulk in place of calling the resolver.
+
+        The values are only used within the context, so that attributes that
+        are not cached are still resolved afresh afterwards.
+        """
+        self._bulk_values = values
+        try:
+            yield
+        finally:
+            self._bulk_values = {}
+
+    def _resolve(self, key):
+        if key in self._bulk_values:
+            return self._bulk_values[key]
+        return self._resolver(key)
+
     def reset_resolved_values(self):
         if hasattr(self, '_resolved_values'):
             self._has_new_resolved = len(self._resolved_values) > 0
@@ -270,12 +290,12 @@ class Attributes(collections.abc.Mapping):
 
         attrib = self._attributes.get(key)
         if attrib.schema.cache_mode == Schema.CACHE_NONE:
-            return self._resolver(key)
+            return self._resolve(key)
 
         if key in self._resolved_values:
             return self._resolved_values[key]
 
-        value = self._resolver(key)
+        value = self._resolve(key)
 
         if value is not None:
             # validate the value against its type
@@ -32,6 +32,8 @@ class FindInMap(function.Function):
                               "value" ] }
     """
 
+    __slots__ = ('_mapkey', '_mapname', '_mapvalue')
+
     def __init__(self, stack, fn_name, args):
         super(FindInMap, self).__init__(stack, fn_name, args)
 
@@ -55,6 +57,8 @@ class GetAZs(function.Function):
         { "Fn::GetAZs" : "<region>" }
     """
 
+    __slots__ = tuple()
+
     def result(self):
         # TODO(therve): Implement region scoping
 
@@ -72,6 +76,8 @@ class ParamRef(function.Function):
         { "Ref" : "<param_name>" }
     """
 
+    __slots__ = ('parameters',)
+
     def __init__(self, stack, fn_name, args):
         super(ParamRef, self).__init__(stack, fn_name, args)
 
@@ -114,6 +120,8 @@ class GetAtt(hot_funcs.GetAttThenSelect):
                            "<attribute_name>" ] }
     """
 
+    __slots__ = tuple()
+
     def _parse_args(self):
         try:
             resource_name, attribute = self.args
@@ -139,6 +147,8 @@ class Select(function.Function):
     string.
     """
 
+    __slots__ = ('_lookup', '_strings')
+
     def __init__(self, stack, fn_name, args):
         super(Select, self).__init__(stack, fn_name, args)
 
@@ -209,6 +219,8 @@ class Join(hot_funcs.Join):
         "<string_1><delim><string_2><delim>..."
     """
 
+    __slots__ = tuple()
+
 
 class Split(function.Function):
     """A function for splitting strings.
@@ -222,6 +234,8 @@ class Split(function.Function):
         [ "<string_1>", "<string_2>", ... ]
     """
 
+    __slots__ = ('_delim', '_strings')
+
     def __init__(self, stack, fn_name, args):
         super(Split, self).__init__(stack, fn_name, args)
 
@@ -270,6 +284,8 @@ class Replace(hot_funcs.Replace):
     of equal length, lexicographically smaller keys are preferred.
     """
 
+    __slots__ = tuple()
+
     def _parse_args(self):
 
         example = ('{"%s": '
@@ -303,6 +319,8 @@ class Base64(function.Function):
     in plain text.
     """
 
+    __slots__ = tuple()
+
     def result(self):
         resolved = function.resolve(self.args)
         if not isinstance(resolved, str):
@@ -328,6 +346,8 @@ class MemberListToMap(function.Function):
     The first two arguments are the names of the key and value.
     """
 
+    __slots__ = ('_keyname', '_list', '_valuename')
+
     def __init__(self, stack, fn_name, args):
         super(MemberListToMap, self).__init__(stack, fn_name, args)
 
@@ -379,6 +399,8 @@ class ResourceFacade(hot_funcs.ResourceFacade):
     "UpdatePolicy".
     """
 
+    __slots__ = tuple()
+
     _RESOURCE_ATTRIBUTES = (
         METADATA, DELETION_POLICY, UPDATE_POLICY,
     ) = (
@@ -400,6 +422,8 @@ class If(hot_funcs.If):
     evaluates to false.
     """
 
+    __slots__ = tuple()
+
 
 class Equals(hot_funcs.Equals):
     """A function for comparing whether two values are equal.
@@ -412,6 +436,8 @@ class Equals(hot_funcs.Equals):
     if the two values are equal or false if they aren't.
     """
 
+    __slots__ = tuple()
+
 
 class Not(hot_funcs.Not):
     """A function that acts as a NOT operator on a condition.
@@ -424,6 +450,8 @@ class Not(hot_funcs.Not):
     returns false for a condition that evaluates to true.
     """
 
+    __slots__ = tuple()
+
     def _check_args(self):
         msg = _('Arguments to "%s" must be of the form: '
                 '[condition]') % self.fn_name
@@ -448,6 +476,8 @@ class And(hot_funcs.And):
     of conditions that you can include is 2.
     """
 
+    __slots__ = tuple()
+
 
 class Or(hot_funcs.Or):
     """A function that acts as an OR operator on conditions.
@@ -460,3 +490,5 @@ class Or(hot_funcs.Or):
     or returns false if all of the conditions evaluates to false. The minimum
     number of conditions that you can include is 2.
     """
+
+    __slots__ = tuple()
@@ -13,7 +13,6 @@
 
 import functools
 
-from heat.common import exception
 from heat.common.i18n import _
 from heat.engine.cfn import functions as cfn_funcs
 from heat.engine.cfn import parameters as cfn_params
@@ -111,38 +110,6 @@ class CfnTemplateBase(template_common.CommonTemplate):
                                         user_params=user_params,
                                         param_defaults=param_defaults)
 
-    def resource_definitions(self, stack):
-        resources = self.t.get(self.RESOURCES) or {}
-
-        conditions = self.conditions(stack)
-
-        def defns():
-            for name, snippet in resources.items():
-                try:
-                    defn_data = dict(self._rsrc_defn_args(stack, name,
-                                                          snippet))
-                except (TypeError, ValueError, KeyError) as ex:
-                    msg = str(ex)
-                    raise exception.StackValidationFailed(message=msg)
-
-                defn = rsrc_defn.ResourceDefinition(name, **defn_data)
-                cond_name = defn.condition()
-
-                if cond_name is not None:
-                    try:
-                        enabled = conditions.is_enabled(cond_name)
-                    except ValueError as exc:
-                        path = [self.RESOURCES, name, self.RES_CONDITION]
-                        message = str(exc)
-                        raise exception.StackValidationFailed(path=path,
-                                                              message=message)
-                    if not enabled:
-                        continue
-
-                yield name, defn
-
-        return dict(defns())
-
     def add_resource(self, definition, name=None):
         if name is None:
             name = definition.name
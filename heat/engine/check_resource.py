@@ -26,6 +26,8 @@ from heat.engine import scheduler
 from heat.engine import snapshots
 from heat.engine import stack as parser
 from heat.engine import sync_point
+from heat.engine import timeline
+from heat.engine import traversal_timing
 from heat.objects import resource as resource_objects
 from heat.objects import snapshot as snapshot_objects
 from heat.rpc import api as rpc_api
@@ -50,12 +52,14 @@ class CheckResource(object):
                  rpc_client,
                  thread_group_mgr,
                  msg_queue,
-                 input_data):
+                 input_data,
+                 node_timing=None):
         self.engine_id = engine_id
         self._rpc_client = rpc_client
         self.thread_group_mgr = thread_group_mgr
         self.msg_queue = msg_queue
         self.input_data = input_data
+        self.node_timing = node_timing
 
     def _stale_resource_needs_retry(self, cnxt, rsrc, prev_template_id):
         """Determine whether a resource needs retrying after failure to lock.
@@ -247,7 +251,9 @@ class CheckResource(object):
         def _get_input_data(req_node, input_forward_data=None):
             if req_node.is_update:
                 if input_forward_data is None:
-                    return rsrc.node_data().as_dict()
+                    with traversal_timing.measure(current_traversal,
+                                                  traversal_timing.NODE_DATA):
+                        return rsrc.node_data().as_dict()
                 else:
                     # do not re-resolve attrs
                     return input_forward_data
@@ -332,6 +338,15 @@ class CheckResource(object):
         The node may be associated with either an update or a cleanup of its
         associated resource.
         """
+        with traversal_timing.measure(current_traversal,
+                                      traversal_timing.CHECK_RESOURCE):
+            self._check(cnxt, resource_id, current_traversal,
+                        resource_data, is_update, adopt_stack_data,
+                        rsrc, stack, skip_propagate, accumulated_failures)
+
+    def _check(self, cnxt, resource_id, current_traversal,
+               resource_data, is_update, adopt_stack_data,
+               rsrc, stack, skip_propagate, accumulated_failures):
         if stack.has_timed_out():
             self._handle_stack_timeout(cnxt, stack)
             return
@@ -350,6 +365,10 @@ class CheckResource(object):
                 )
 
             if check_done:
+                if self.node_timing is not None:
+                    timeline.record_node(cnxt, stack.id, current_traversal,
+                                         resource_id, is_update, rsrc.name,
+                                         self.node_timing)
                 # Merge own failure with accumulated failures from predecessors
                 merged_failures = dict(accumulated_failures or {})
                 if rsrc_failure:
@@ -372,8 +391,11 @@ class CheckResource(object):
 def load_resource(cnxt, resource_id, resource_data,
                   current_traversal, is_update):
     try:
-        return resource.Resource.load(cnxt, resource_id, current_traversal,
-                                      is_update, resource_data)
+        with traversal_timing.measure(current_traversal,
+                                      traversal_timing.RESOURCE_LOAD):
+            return resource.Resource.load(cnxt, resource_id,
+                                          current_traversal, is_update,
+                                          resource_data)
     except (exception.ResourceNotFound, exception.NotFound):
         # can be ignored
         return None, None, None
@@ -484,6 +506,9 @@ def propagate_check_resource(cnxt, rpc_client, next_res_id,
                              abandon=False):
     """Trigger processing of node if all of its dependencies are satisfied."""
     def do_check(entity_id, data, rsrc_failures, skip_propagate):
+        if timeline.enabled():
+            blocked_by = timeline.node_key(sender_key[0], sender_key[1])
+            timeline.add_to_rpc_data(data, blocked_by=blocked_by)
         # Pass accumulated failures through RPC so they propagate to dependents
         rpc_client.check_resource(cnxt, entity_id, current_traversal,
                                   data, is_update, adopt_stack_data,
@@ -493,11 +518,13 @@ def propagate_check_resource(cnxt, rpc_client, next_res_id,
                                   node_type=node_type,
                                   abandon=abandon)
 
-    sync_point.sync(cnxt, next_res_id, current_traversal,
-                    is_update, do_check, predecessors,
-                    {sender_key: sender_data},
-                    new_resource_failures=rsrc_failure,
-                    is_skip=is_skip)
+    with traversal_timing.measure(current_traversal,
+                                  traversal_timing.PROPAGATE):
+        sync_point.sync(cnxt, next_res_id, current_traversal,
+                        is_update, do_check, predecessors,
+                        {sender_key: sender_data},
+                        new_resource_failures=rsrc_failure,
+                        is_skip=is_skip)
 
 
 def _check_for_message(msg_queue):
@@ -12,6 +12,8 @@
 #    under the License.
 
 import abc
+import collections
+import threading
 import weakref
 
 from keystoneauth1 import exceptions
@@ -27,6 +29,22 @@ from heat.common import exception as heat_exception
 
 cfg.CONF.import_opt('client_retry_limit', 'heat.common.config')
 
+# Process-wide counts of clients created and reused, keyed by
+# (service name, kind, outcome).
+_client_counts = collections.Counter()
+_client_counts_lock = threading.Lock()
+
+
+def get_client_counts():
+    """Return a snapshot of the client construction and reuse counters."""
+    with _client_counts_lock:
+        return dict(_client_counts)
+
+
+def reset_client_counts():
+    with _client_counts_lock:
+        _client_counts.clear()
+
 
 class ClientPlugin(object, metaclass=abc.ABCMeta):
 
@@ -66,8 +84,10 @@ class ClientPlugin(object, metaclass=abc.ABCMeta):
             version = self.default_version
 
         if version in self._client_instances:
+            self._count_client_reuse()
             return self._client_instances[version]
 
+        self._count_client_creation()
         # Back-ward compatibility
         if version is None:
             self._client_instances[version] = self._create()
@@ -86,6 +106,34 @@ class ClientPlugin(object, metaclass=abc.ABCMeta):
         """Return a newly created client."""
         pass
 
+    def _count_client_creation(self, kind='client'):
+        self._count_client(kind, 'created')
+
+    def _count_client_reuse(self, kind='client'):
+        self._count_client(kind, 'reused')
+
+    def _count_client(self, kind, outcome):
+        key = (self._get_counter_name(), kind, outcome)
+        with _client_counts_lock:
+            _client_counts[key] += 1
+
+    def _get_counter_name(self):
+        if self.service_types:
+            return self.service_types[0]
+        return type(self).__name__
+
+    def _get_endpoint_key(self, endpoint_type):
+        """Return a key identifying the endpoint this plugin talks to.
+
+        Endpoints are selected from the service catalog by service type,
+        region and interface, so together with the identity service these
+        identify the endpoint without the need for a catalog lookup.
+        """
+        return (self.context.auth_url,
+                self._get_region_name(),
+                tuple(self.service_types),
+                endpoint_type)
+
     def _get_region_name(self):
         reg = self.context.region_name or cfg.CONF.region_name_for_services
         # If Shared Services configured, override region for image/volumes
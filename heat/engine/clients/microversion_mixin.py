@@ -12,9 +12,27 @@
 #    under the License.
 
 import abc
+import threading
+import time
 
 from heat.common import exception
 
+# Number of seconds for which a discovered max microversion is used before it
+# is discovered again, so that an upgrade of the service is picked up.
+DISCOVERED_MICROVERSION_TTL = 3600
+
+# The maximum microversion supported by each service endpoint, as discovered
+# from the API, and the time at which it expires. This does not depend on the
+# requesting user, so it is shared between the client plugins of all contexts
+# in the process.
+_discovered_max_microversions = {}
+_discovered_max_microversions_lock = threading.Lock()
+
+
+def reset_discovered_max_microversions():
+    with _discovered_max_microversions_lock:
+        _discovered_max_microversions.clear()
+
 
 class MicroversionMixin(object, metaclass=abc.ABCMeta):
     """Mixin For microversion support."""
@@ -28,11 +46,35 @@ class MicroversionMixin(object, metaclass=abc.ABCMeta):
                 service=self._get_service_name())
 
         if version in self._client_instances:
+            self._count_client_reuse()
             return self._client_instances[version]
 
         self._client_instances[version] = self._create(version=version)
+        self._count_client_creation()
         return self._client_instances[version]
 
+    def _get_discovered_max_microversion(self, endpoint_type, discover):
+        """Return the endpoint's max microversion, calling discover() once.
+
+        The result is memoised per service endpoint for
+        DISCOVERED_MICROVERSION_TTL seconds, so that only the first client
+        plugin to need it in that time pays for the version discovery request.
+        """
+        key = self._get_endpoint_key(endpoint_type)
+        with _discovered_max_microversions_lock:
+            version, expires = _discovered_max_microversions.get(key,
+                                                                 (None, 0))
+        if version is not None and time.monotonic() < expires:
+            self._count_client_reuse('microversion')
+            return version
+
+        version = discover()
+        with _discovered_max_microversions_lock:
+            _discovered_max_microversions[key] = (
+                version, time.monotonic() + DISCOVERED_MICROVERSION_TTL)
+        self._count_client_creation('microversion')
+        return version
+
     @abc.abstractmethod
     def get_max_microversion(self):
         pass
@@ -73,12 +73,17 @@ class CinderClientPlugin(microversion_mixin.MicroversionMixin,
 
     def get_max_microversion(self):
         if not self.max_microversion:
-            current_version = api_versions.get_highest_version(self._create())
-            self.max_microversion = min(
-                api_versions.APIVersion(api_versions.MAX_VERSION),
-                current_version).get_string()
+            endpoint_type = self._get_client_option(CLIENT_NAME,
+                                                    'endpoint_type')
+            self.max_microversion = self._get_discovered_max_microversion(
+                endpoint_type, self._discover_max_microversion)
         return self.max_microversion
 
+    def _discover_max_microversion(self):
+        current_version = api_versions.get_highest_version(self._create())
+        return min(api_versions.APIVersion(api_versions.MAX_VERSION),
+                   current_version).get_string()
+
     def is_version_supported(self, version):
         api_ver = api_versions.APIVersion(version)
         max_api_ver = api_versions.APIVersion(self.get_max_microversion())
@@ -110,9 +110,16 @@ class FakeKeystoneClient(object):
     def create_stack_domain_user(self, username, project_id, password=None):
         return self.user_id
 
+    def update_stack_domain_user(self, user_id, project_id, username=None,
+                                 password=None):
+        pass
+
     def delete_stack_domain_user(self, user_id, project_id):
         pass
 
+    def delete_stack_domain_users(self, project_id, name_prefix):
+        pass
+
     def create_stack_domain_user_keypair(self, user_id, project_id):
         return self.creds
 
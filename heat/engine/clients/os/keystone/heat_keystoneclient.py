@@ -428,6 +428,40 @@ class KsClientWrapper(object):
         except ks_exception.NotFound:
             pass
 
+    def delete_stack_domain_users(self, project_id, name_prefix):
+        """Delete the users of a stack domain project with a name prefix."""
+        if not self.stack_domain:
+            # FIXME(shardy): Legacy fallback for folks using old heat.conf
+            # files which lack domain configuration
+            return
+
+        users = self.domain_admin_client.users.list(
+            domain=self.stack_domain_id, default_project=project_id)
+        for user in users:
+            if not user.name.startswith(name_prefix):
+                continue
+            try:
+                self.domain_admin_client.users.delete(user.id)
+            except ks_exception.NotFound:
+                pass
+
+    def update_stack_domain_user(self, user_id, project_id, username=None,
+                                 password=None):
+        """Rename a stack domain user and/or change its password."""
+        kwargs = {}
+        if username is not None:
+            kwargs['name'] = self._get_username(username)
+        if password is not None:
+            kwargs['password'] = password
+        if not kwargs:
+            return
+        if not self.stack_domain:
+            # FIXME(shardy): Legacy fallback for folks using old heat.conf
+            # files which lack domain configuration
+            self.client.users.update(user=user_id, **kwargs)
+            return
+        self.domain_admin_client.users.update(user=user_id, **kwargs)
+
     def delete_stack_user(self, user_id):
         try:
             self.client.users.delete(user=user_id)
@@ -13,11 +13,16 @@
 
 import collections
 import email
-from email.mime import multipart
 from email.mime import text
+import functools
+import hashlib
 import os
 import pkgutil
+import random
+import re
 import string
+import sys
+import threading
 from urllib import parse as urlparse
 
 from neutronclient.common import exceptions as q_exceptions
@@ -44,6 +49,140 @@ LOG = logging.getLogger(__name__)
 
 CLIENT_NAME = 'nova'
 
+# Number of assembled user data blobs, and of parsed multipart user data, to
+# keep in memory
+USERDATA_CACHE_SIZE = 64
+
+_userdata_cache = collections.OrderedDict()
+_userdata_parts_cache = collections.OrderedDict()
+_userdata_cache_lock = threading.Lock()
+
+
+def _digest(data):
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _cache_get(cache, key):
+    with _userdata_cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache, key, value):
+    with _userdata_cache_lock:
+        cache[key] = value
+        while len(cache) > USERDATA_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_cloudinit_file(fn):
+    return pkgutil.get_data('heat', 'cloudinit/%s' % fn).decode('utf-8')
+
+
+@functools.lru_cache(maxsize=32)
+def _cloudinit_user_parts(instance_user):
+    """Return the cloud-config and boot hook parts for an instance user."""
+    if instance_user:
+        config_custom_user = 'user: %s' % instance_user
+        # FIXME(shadower): compatibility workaround for cloud-init 0.6.3.
+        # We can drop this once we stop supporting 0.6.3 (which ships
+        # with Ubuntu 12.04 LTS).
+        #
+        # See bug https://bugs.launchpad.net/heat/+bug/1257410
+        boothook_custom_user = r"""useradd -m %s
+echo -e '%s\tALL=(ALL)\tNOPASSWD: ALL' >> /etc/sudoers
+""" % (instance_user, instance_user)
+    else:
+        config_custom_user = ''
+        boothook_custom_user = ''
+
+    cloudinit_config = string.Template(
+        _read_cloudinit_file('config')).safe_substitute(
+            add_custom_user=config_custom_user)
+    cloudinit_boothook = string.Template(
+        _read_cloudinit_file('boothook.sh')).safe_substitute(
+            add_custom_user=boothook_custom_user)
+    return cloudinit_config, cloudinit_boothook
+
+
+def _make_subpart(content, filename, subtype=None):
+    if subtype is None:
+        subtype = os.path.splitext(filename)[0]
+    if content is None:
+        content = ''
+    try:
+        content.encode('us-ascii')
+        charset = 'us-ascii'
+    except UnicodeEncodeError:
+        charset = 'utf-8'
+    msg = (text.MIMEText(content, _subtype=subtype, _charset=charset)
+           if subtype else text.MIMEText(content, _charset=charset))
+
+    msg.add_header('Content-Disposition', 'attachment',
+                   filename=filename)
+    return msg
+
+
+def _encode_part(content, filename, subtype=None):
+    """Return a user data attachment serialised as a MIME part."""
+    return _make_subpart(content, filename, subtype).as_string()
+
+
+_encode_shared_part = functools.lru_cache(maxsize=64)(_encode_part)
+
+
+def _assemble_multipart(part_texts):
+    """Join serialised MIME parts into a multipart/mixed message.
+
+    This produces the same output as serialising a MIMEMultipart of the
+    parts, without the cost of serialising each part again.
+    """
+    # Choose a boundary that doesn't appear in any of the parts, as the
+    # email package does.
+    alltext = '\n'.join(part_texts)
+    token = ('=' * 15) + ('%019d' % random.randrange(sys.maxsize)) + '=='
+    boundary = token
+    counter = 0
+    while re.search('^--' + re.escape(boundary) + '(--)?$', alltext,
+                    re.MULTILINE):
+        boundary = '%s.%d' % (token, counter)
+        counter += 1
+
+    header = ('Content-Type: multipart/mixed; boundary="%s"\n'
+              'MIME-Version: 1.0\n\n' % boundary)
+    delimiter = '--%s\n' % boundary
+    return (header + delimiter + ('\n' + delimiter).join(part_texts) +
+            '\n--%s--\n' % boundary)
+
+
+def _userdata_parts(userdata):
+    """Return the parts of multipart user data as attachments.
+
+    Returns None if the user data is not a multipart message. The result is
+    cached, as the same user data is typically supplied to many servers.
+    """
+    if not isinstance(userdata, str):
+        return None
+    key = _digest(userdata)
+    parts = _cache_get(_userdata_parts_cache, key)
+    if parts is None:
+        parts = ()
+        userdata_parts = None
+        try:
+            userdata_parts = email.message_from_string(userdata)
+        except Exception:
+            pass
+        if userdata_parts and userdata_parts.is_multipart():
+            parts = tuple((part.get_payload(),
+                           part.get_filename(),
+                           part.get_content_subtype())
+                          for part in userdata_parts.get_payload())
+        _cache_put(_userdata_parts_cache, key, parts)
+    return parts or None
+
 
 class NovaClientPlugin(microversion_mixin.MicroversionMixin,
                        client_plugin.ClientPlugin):
@@ -95,16 +234,21 @@ class NovaClientPlugin(microversion_mixin.MicroversionMixin,
 
     def get_max_microversion(self):
         if not self.max_microversion:
-            client = self._create()
-            current_version = client.versions.get_current().version
-            # TODO(tkajinam): Make sure that the version is supported by
-            # novaclient. We should consider replacing it by openstacksdk to
-            # remove this cap.
-            self.max_microversion = min(
-                api_versions.get_api_version(current_version),
-                novaclient.API_MAX_VERSION).get_string()
+            endpoint_type = self._get_client_option(CLIENT_NAME,
+                                                    'endpoint_type')
+            self.max_microversion = self._get_discovered_max_microversion(
+                endpoint_type, self._discover_max_microversion)
         return self.max_microversion
 
+    def _discover_max_microversion(self):
+        client = self._create()
+        current_version = client.versions.get_current().version
+        # TODO(tkajinam): Make sure that the version is supported by
+        # novaclient. We should consider replacing it by openstacksdk to
+        # remove this cap.
+        return min(api_versions.get_api_version(current_version),
+                   novaclient.API_MAX_VERSION).get_string()
+
     def is_version_supported(self, version):
         api_ver = api_versions.get_api_version(version)
         max_api_ver = api_versions.get_api_version(
@@ -338,89 +482,55 @@ class NovaClientPlugin(microversion_mixin.MicroversionMixin,
                 NovaClientPlugin.is_ignition_format(userdata)):
             return NovaClientPlugin.build_ignition_data(metadata, userdata)
 
-        def make_subpart(content, filename, subtype=None):
-            if subtype is None:
-                subtype = os.path.splitext(filename)[0]
-            if content is None:
-                content = ''
-            try:
-                content.encode('us-ascii')
-                charset = 'us-ascii'
-            except UnicodeEncodeError:
-                charset = 'utf-8'
-            msg = (text.MIMEText(content, _subtype=subtype, _charset=charset)
-                   if subtype else text.MIMEText(content, _charset=charset))
-
-            msg.add_header('Content-Disposition', 'attachment',
-                           filename=filename)
-            return msg
-
-        def read_cloudinit_file(fn):
-            return pkgutil.get_data(
-                'heat', 'cloudinit/%s' % fn).decode('utf-8')
-
-        if instance_user:
-            config_custom_user = 'user: %s' % instance_user
-            # FIXME(shadower): compatibility workaround for cloud-init 0.6.3.
-            # We can drop this once we stop supporting 0.6.3 (which ships
-            # with Ubuntu 12.04 LTS).
-            #
-            # See bug https://bugs.launchpad.net/heat/+bug/1257410
-            boothook_custom_user = r"""useradd -m %s
-echo -e '%s\tALL=(ALL)\tNOPASSWD: ALL' >> /etc/sudoers
-""" % (instance_user, instance_user)
-        else:
-            config_custom_user = ''
-            boothook_custom_user = ''
+        metadata_json = jsonutils.dumps(metadata) if metadata else None
+        cfn_md_url = is_secure = vcerts = None
+        if is_cfntools:
+            heat_client_plugin = self.context.clients.client_plugin('heat')
+            cfn_md_url = heat_client_plugin.get_cfn_metadata_server_url()
+            is_secure = cfg.CONF.instance_connection_is_secure
+            vcerts = cfg.CONF.instance_connection_https_validate_certificates
+
+        cache_key = (user_data_format, instance_user,
+                     metadata_json and _digest(metadata_json),
+                     isinstance(userdata, str) and _digest(userdata),
+                     cfn_md_url, is_secure, vcerts)
+        cached = _cache_get(_userdata_cache, cache_key)
+        if cached is not None:
+            return cached
 
-        cloudinit_config = string.Template(
-            read_cloudinit_file('config')).safe_substitute(
-                add_custom_user=config_custom_user)
-        cloudinit_boothook = string.Template(
-            read_cloudinit_file('boothook.sh')).safe_substitute(
-                add_custom_user=boothook_custom_user)
+        cloudinit_config, cloudinit_boothook = _cloudinit_user_parts(
+            instance_user)
 
         attachments = [(cloudinit_config, 'cloud-config'),
                        (cloudinit_boothook, 'boothook.sh', 'cloud-boothook'),
-                       (read_cloudinit_file('part_handler.py'),
+                       (_read_cloudinit_file('part_handler.py'),
                         'part-handler.py')]
         if is_cfntools:
             attachments.append((userdata, 'cfn-userdata', 'x-cfninitdata'))
         elif is_software_config:
             # attempt to parse userdata as a multipart message, and if it
             # is, add each part as an attachment
-            userdata_parts = None
-            try:
-                userdata_parts = email.message_from_string(userdata)
-            except Exception:
-                pass
-            if userdata_parts and userdata_parts.is_multipart():
-                for part in userdata_parts.get_payload():
-                    attachments.append((part.get_payload(),
-                                        part.get_filename(),
-                                        part.get_content_subtype()))
+            userdata_parts = _userdata_parts(userdata)
+            if userdata_parts:
+                attachments.extend(userdata_parts)
             else:
                 attachments.append((userdata, ''))
 
         if is_cfntools:
-            attachments.append((read_cloudinit_file('loguserdata.py'),
+            attachments.append((_read_cloudinit_file('loguserdata.py'),
                                'loguserdata.py', 'x-shellscript'))
 
         if metadata:
-            attachments.append((jsonutils.dumps(metadata),
+            attachments.append((metadata_json,
                                 'cfn-init-data', 'x-cfninitdata'))
 
         if is_cfntools:
-            heat_client_plugin = self.context.clients.client_plugin('heat')
-            cfn_md_url = heat_client_plugin.get_cfn_metadata_server_url()
             attachments.append((cfn_md_url,
                                 'cfn-metadata-server', 'x-cfninitdata'))
 
             # Create a boto config which the cfntools on the host use to know
             # where the cfn API is to be accessed
             cfn_url = urlparse.urlparse(cfn_md_url)
-            is_secure = cfg.CONF.instance_connection_is_secure
-            vcerts = cfg.CONF.instance_connection_https_validate_certificates
             boto_cfg = "\n".join(["[Boto]",
                                   "debug = 0",
                                   "is_secure = %s" % is_secure,
@@ -431,10 +541,15 @@ echo -e '%s\tALL=(ALL)\tNOPASSWD: ALL' >> /etc/sudoers
             attachments.append((boto_cfg,
                                 'cfn-boto-cfg', 'x-cfninitdata'))
 
-        subparts = [make_subpart(*args) for args in attachments]
-        mime_blob = multipart.MIMEMultipart(_subparts=subparts)
+        # The metadata differs for every server; every other part is
+        # typically shared by many servers, so its encoding is reused.
+        part_texts = [_encode_part(*args) if args[1] == 'cfn-init-data'
+                      else _encode_shared_part(*args)
+                      for args in attachments]
 
-        return mime_blob.as_string()
+        result = _assemble_multipart(part_texts)
+        _cache_put(_userdata_cache, cache_key, result)
+        return result
 
     @staticmethod
     def is_ignition_format(userdata):
@@ -631,9 +746,13 @@ echo -e '%s\tALL=(ALL)\tNOPASSWD: ALL' >> /etc/sudoers
             LOG.warning('Instance (%(server)s) not found: %(ex)s',
                         {'server': server, 'ex': ex})
         else:
-            for n in sorted(server.networks, reverse=True):
-                if len(server.networks[n]) > 0:
-                    return server.networks[n][0]
+            return self.server_first_ipaddress(server)
+
+    def server_first_ipaddress(self, server):
+        """Return the IP address of a server fetched from Nova."""
+        for n in sorted(server.networks, reverse=True):
+            if len(server.networks[n]) > 0:
+                return server.networks[n][0]
 
     @tenacity.retry(
         stop=tenacity.stop_after_attempt(
@@ -12,6 +12,7 @@
 #    under the License.
 
 import collections
+from concurrent import futures
 import json
 import numbers
 import re
@@ -678,6 +679,8 @@ class BaseCustomConstraint(object):
             "value": value, "message": self._error_message}
 
     def validate(self, value, context):
+        if context.cache(ValidatedValues).is_valid(type(self), value):
+            return True
 
         @MEMOIZE
         def check_cache_or_validate_value(cache_value_prefix,
@@ -724,3 +727,75 @@ class BaseCustomConstraint(object):
             raise exception.InvalidSchemaError(
                 message=_('Client name and resource getter name must be '
                           'specified.'))
+
+
+class ValidatedValues(object):
+    """Context-scoped record of values that passed custom constraints."""
+
+    def __init__(self):
+        self._valid = set()
+
+    @staticmethod
+    def _key(constraint_class, value):
+        key = (constraint_class, value)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def is_valid(self, constraint_class, value):
+        key = self._key(constraint_class, value)
+        return key is not None and key in self._valid
+
+    def add(self, constraint_class, value):
+        key = self._key(constraint_class, value)
+        if key is not None:
+            self._valid.add(key)
+
+
+def prefetch_custom_constraints(context, constraint_values, max_workers):
+    """Look up the values of custom constraints concurrently.
+
+    Each distinct value of each constraint in the iterable of
+    (CustomConstraint, value) pairs is checked once, using a pool of at most
+    max_workers threads, and those found to be valid are recorded in the
+    context so that validating them again in the same request does not
+    repeat the lookup. Values that are not valid are not recorded, so that
+    the error is reported when the value is validated as usual.
+    """
+    validated = context.cache(ValidatedValues)
+    pending = {}
+    for constraint, value in constraint_values:
+        custom_constraint = constraint.custom_constraint
+        if not isinstance(custom_constraint, BaseCustomConstraint):
+            continue
+        constraint_class = type(custom_constraint)
+        key = ValidatedValues._key(constraint_class, value)
+        if key is not None and not validated.is_valid(constraint_class,
+                                                      value):
+            pending[key] = (constraint_class, value)
+
+    if not pending or max_workers < 1:
+        return
+
+    def check(constraint_class, value):
+        # Use a separate instance for each lookup, since the error message
+        # of a failed validation is stored on the constraint.
+        return constraint_class().validate(value, context)
+
+    workers = min(max_workers, len(pending))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        lookups = dict((executor.submit(check, *cv), cv)
+                       for cv in pending.values())
+        for lookup in futures.as_completed(lookups):
+            constraint_class, value = lookups[lookup]
+            try:
+                valid = lookup.result()
+            except Exception as ex:
+                LOG.debug('Unable to look up %(value)s for %(name)s: %(ex)s',
+                          {'value': value, 'name': constraint_class.__name__,
+                           'ex': ex})
+                continue
+            if valid:
+                validated.add(constraint_class, value)
@@ -23,6 +23,8 @@ from heat.common.i18n import _
 class Function(metaclass=abc.ABCMeta):
     """Abstract base class for template functions."""
 
+    __slots__ = ('_stackref', 'fn_name', 'args')
+
     def __init__(self, stack, fn_name, args):
         """Initialise with a Stack, the function name and the arguments.
 
@@ -164,6 +166,9 @@ class Macro(Function, metaclass=abc.ABCMeta):
     parsed. As such, it operates on the syntax tree itself, not on the parsed
     output.
     """
+
+    __slots__ = ('_tmplref', 'parsed')
+
     def __init__(self, stack, fn_name, raw_args, parse_func, template):
         """Initialise with the argument syntax tree and parser function."""
         super(Macro, self).__init__(stack, fn_name, raw_args)
@@ -390,6 +395,8 @@ class Invalid(Function):
     supported in condition definition.
     """
 
+    __slots__ = tuple()
+
     def __init__(self, stack, fn_name, args):
         raise ValueError(_('The function "%s" '
                            'is invalid in this context') % fn_name)
@@ -64,6 +64,8 @@ class GetParam(function.Function):
           - ...
     """
 
+    __slots__ = ('parameters',)
+
     def __init__(self, stack, fn_name, args):
         super(GetParam, self).__init__(stack, fn_name, args)
 
@@ -135,6 +137,8 @@ class GetResource(function.Function):
         get_resource: <resource_name>
     """
 
+    __slots__ = tuple()
+
     def _resource(self, path='unknown'):
         resource_name = function.resolve(self.args)
 
@@ -164,6 +168,8 @@ class GetAttThenSelect(function.Function):
           - ...
     """
 
+    __slots__ = ('_attribute', '_path_components', '_resource_name')
+
     def __init__(self, stack, fn_name, args):
         super(GetAttThenSelect, self).__init__(stack, fn_name, args)
 
@@ -278,6 +284,8 @@ class GetAtt(GetAttThenSelect):
           - ...
     """
 
+    __slots__ = tuple()
+
     def result(self):
         path_components = function.resolve(self._path_components)
         attribute = function.resolve(self._attribute)
@@ -313,6 +321,8 @@ class GetAttAllAttributes(GetAtt):
     Else function returns resolved resource's attribute.
     """
 
+    __slots__ = tuple()
+
     def _parse_args(self):
         if not self.args:
             raise ValueError(_('Arguments to "%s" can be of the next '
@@ -369,6 +379,8 @@ class Replace(function.Function):
     of equal length, lexicographically smaller keys are preferred.
     """
 
+    __slots__ = ('_mapping', '_string')
+
     _strict = False
     _allow_empty_value = True
 
@@ -481,6 +493,8 @@ class ReplaceJson(Replace):
     being substituted in.
     """
 
+    __slots__ = tuple()
+
     def _validate_replacement(self, value, param):
 
         def _raise_empty_param_value_error():
@@ -526,6 +540,8 @@ class ReplaceJsonStrict(ReplaceJson):
     a ValueError is raised if any of the params are not present in
     the template.
     """
+
+    __slots__ = tuple()
     _strict = True
 
 
@@ -536,6 +552,8 @@ class ReplaceJsonVeryStrict(ReplaceJsonStrict):
     function, only a ValueError is raised if any of the params are
     None or empty.
     """
+
+    __slots__ = tuple()
     _allow_empty_value = False
 
 
@@ -550,6 +568,8 @@ class GetFile(function.Function):
     key.
     """
 
+    __slots__ = ('files',)
+
     def __init__(self, stack, fn_name, args):
         super(GetFile, self).__init__(stack, fn_name, args)
 
@@ -588,6 +608,8 @@ class Join(function.Function):
         "<string_1><delim><string_2><delim>..."
     """
 
+    __slots__ = ('_delim', '_strings')
+
     def __init__(self, stack, fn_name, args):
         super(Join, self).__init__(stack, fn_name, args)
 
@@ -649,6 +671,8 @@ class JoinMultiple(function.Function):
     Optionally multiple lists may be specified, which will also be joined.
     """
 
+    __slots__ = ('_delim', '_joinlists')
+
     def __init__(self, stack, fn_name, args):
         super(JoinMultiple, self).__init__(stack, fn_name, args)
         example = '"%s" : [ " ", [ "str1", "str2"] ...]' % fn_name
@@ -724,6 +748,8 @@ class MapMerge(function.Function):
 
     """
 
+    __slots__ = ('fmt_data',)
+
     def __init__(self, stack, fn_name, args):
         super(MapMerge, self).__init__(stack, fn_name, args)
         example = (_('"%s" : [ { "key1": "val1" }, { "key2": "val2" } ]')
@@ -773,6 +799,8 @@ class MapReplace(function.Function):
 
     """
 
+    __slots__ = ('fmt_data',)
+
     def __init__(self, stack, fn_name, args):
         super(MapReplace, self).__init__(stack, fn_name, args)
         example = (_('"%s" : [ { "key1": "val1" }, '
@@ -848,6 +876,8 @@ class ResourceFacade(function.Function):
     "update_policy".
     """
 
+    __slots__ = tuple()
+
     _RESOURCE_ATTRIBUTES = (
         METADATA, DELETION_POLICY, UPDATE_POLICY,
     ) = (
@@ -881,6 +911,8 @@ class Removed(function.Function):
     Check the HOT guide for an equivalent native function.
     """
 
+    __slots__ = tuple()
+
     def validate(self):
         exp = (_("The function %s is not supported in this version of HOT.") %
                self.fn_name)
@@ -906,6 +938,8 @@ class Repeat(function.Function):
     corresponding item of <list>.
     """
 
+    __slots__ = ('_for_each', '_nested_loop', '_template')
+
     def __init__(self, stack, fn_name, args):
         super(Repeat, self).__init__(stack, fn_name, args)
         self._parse_args()
@@ -1002,6 +1036,8 @@ class RepeatWithMap(Repeat):
     corresponding item of <list> or key of <dict>.
     """
 
+    __slots__ = tuple()
+
     def _valid_arg(self, arg):
         if not (isinstance(arg, (collections.abc.Sequence,
                                  collections.abc.Mapping,
@@ -1047,6 +1083,8 @@ class RepeatWithNestedLoop(RepeatWithMap):
     and the list args all have to be of the same length.
     """
 
+    __slots__ = tuple()
+
     def _parse_args(self):
         super(RepeatWithNestedLoop, self)._parse_args()
         self._nested_loop = self.args.get('permutations', True)
@@ -1075,6 +1113,8 @@ class Digest(function.Function):
     sha224, sha256, sha384, and sha512) or any one provided by OpenSSL.
     """
 
+    __slots__ = tuple()
+
     def validate_usage(self, args):
         if not (isinstance(args, list) and
                 all([isinstance(a, str) for a in args])):
@@ -1121,6 +1161,8 @@ class StrSplit(function.Function):
     path based attributes accessing lists.
     """
 
+    __slots__ = ('fmt_data',)
+
     def __init__(self, stack, fn_name, args):
         super(StrSplit, self).__init__(stack, fn_name, args)
         example = '"%s" : [ ",", "apples,pears", <index>]' % fn_name
@@ -1182,6 +1224,8 @@ class Yaql(function.Function):
     Evaluates expression <body> on the given data.
     """
 
+    __slots__ = ('_data', '_expression')
+
     _parser = None
 
     @classmethod
@@ -1251,6 +1295,8 @@ class Equals(function.Function):
     if the two values are equal or false if they aren't.
     """
 
+    __slots__ = ('value1', 'value2')
+
     def __init__(self, stack, fn_name, args):
         super(Equals, self).__init__(stack, fn_name, args)
         try:
@@ -1285,6 +1331,8 @@ class If(function.Macro):
     evaluates to false.
     """
 
+    __slots__ = tuple()
+
     def _read_args(self):
         return self.args
 
@@ -1335,6 +1383,8 @@ class IfNullable(If):
           - <value_if_true>
     """
 
+    __slots__ = tuple()
+
     def _read_args(self):
         if not (2 <= len(self.args) <= 3):
             raise ValueError()
@@ -1349,6 +1399,8 @@ class IfNullable(If):
 class ConditionBoolean(function.Function):
     """Abstract parent class of boolean condition functions."""
 
+    __slots__ = tuple()
+
     def __init__(self, stack, fn_name, args):
         super(ConditionBoolean, self).__init__(stack, fn_name, args)
         self._check_args()
@@ -1381,6 +1433,8 @@ class Not(ConditionBoolean):
     returns false for a condition that evaluates to true.
     """
 
+    __slots__ = ('condition',)
+
     def _check_args(self):
         self.condition = self.args
         if self.args is None:
@@ -1407,6 +1461,8 @@ class And(ConditionBoolean):
     of conditions that you can include is 2.
     """
 
+    __slots__ = tuple()
+
     def result(self):
         return all(self._get_condition(cd)
                    for cd in function.resolve(self.args))
@@ -1427,6 +1483,8 @@ class Or(ConditionBoolean):
     number of conditions that you can include is 2.
     """
 
+    __slots__ = tuple()
+
     def result(self):
         return any(self._get_condition(cd)
                    for cd in function.resolve(self.args))
@@ -1443,6 +1501,9 @@ class Filter(function.Function):
 
     Returns a new list without the values.
     """
+
+    __slots__ = ('_sequence', '_values')
+
     def __init__(self, stack, fn_name, args):
         super(Filter, self).__init__(stack, fn_name, args)
 
@@ -1499,6 +1560,8 @@ class MakeURL(function.Function):
     components.
     """
 
+    __slots__ = tuple()
+
     _ARG_KEYS = (
         SCHEME, USERNAME, PASSWORD, HOST, PORT,
         PATH, QUERY, FRAGMENT,
@@ -1617,6 +1680,8 @@ class ListConcat(function.Function):
 
     """
 
+    __slots__ = ('fmt_data',)
+
     _unique = False
 
     def __init__(self, stack, fn_name, args):
@@ -1668,6 +1733,8 @@ class ListConcatUnique(ListConcat):
     contains unique items in retuning list.
     """
 
+    __slots__ = tuple()
+
     _unique = True
 
 
@@ -1684,6 +1751,8 @@ class Contains(function.Function):
     if the specific value is in the sequence, otherwise returns false.
     """
 
+    __slots__ = ('sequence', 'value')
+
     def __init__(self, stack, fn_name, args):
         super(Contains, self).__init__(stack, fn_name, args)
         example = '"%s" : [ "value1", [ "value1", "value2"]]' % self.fn_name
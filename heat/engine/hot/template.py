@@ -219,44 +219,11 @@ class HOTemplate20130523(template_common.CommonTemplate):
                                         user_params=user_params,
                                         param_defaults=param_defaults)
 
-    def resource_definitions(self, stack):
-        resources = self.t.get(self.RESOURCES) or {}
-        conditions = self.conditions(stack)
-
-        valid_keys = frozenset(self._RESOURCE_KEYS)
-
-        def defns():
-            for name, snippet in resources.items():
-                try:
-                    invalid_keys = set(snippet) - valid_keys
-                    if invalid_keys:
-                        raise ValueError(_('Invalid keyword(s) inside a '
-                                           'resource definition: '
-                                           '%s') % ', '.join(invalid_keys))
-
-                    defn_data = dict(self._rsrc_defn_args(stack, name,
-                                                          snippet))
-                except (TypeError, ValueError, KeyError) as ex:
-                    msg = str(ex)
-                    raise exception.StackValidationFailed(message=msg)
-
-                defn = rsrc_defn.ResourceDefinition(name, **defn_data)
-                cond_name = defn.condition()
-
-                if cond_name is not None:
-                    try:
-                        enabled = conditions.is_enabled(cond_name)
-                    except ValueError as exc:
-                        path = [self.RESOURCES, name, self.RES_CONDITION]
-                        message = str(exc)
-                        raise exception.StackValidationFailed(path=path,
-                                                              message=message)
-                    if not enabled:
-                        continue
-
-                yield name, defn
-
-        return dict(defns())
+    def _check_resource_keys(self, snippet):
+        invalid_keys = set(snippet) - frozenset(self._RESOURCE_KEYS)
+        if invalid_keys:
+            raise ValueError(_('Invalid keyword(s) inside a resource '
+                               'definition: %s') % ', '.join(invalid_keys))
 
     def add_resource(self, definition, name=None):
         if name is None:
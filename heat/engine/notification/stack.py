@@ -11,8 +11,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+
 from heat.engine import api as engine_api
 from heat.engine import notification
+from heat.engine import traversal_timing
+from heat.rpc import api as rpc_api
 
 
 def send(stack):
@@ -35,5 +39,10 @@ def send(stack):
                                stack.action.lower(),
                                suffix)
 
-    notification.notify(stack.context, event_type, level,
-                        engine_api.format_notification_body(stack))
+    body = engine_api.format_notification_body(stack)
+    if (suffix != 'start' and stack.convergence and stack.current_traversal
+            and cfg.CONF.notify_traversal_timings):
+        body[rpc_api.NOTIFY_TRAVERSAL_TIMINGS] = traversal_timing.collect(
+            stack.context, stack.current_traversal)
+
+    notification.notify(stack.context, event_type, level, body)
@@ -80,7 +80,7 @@ class ParentResourceProxy(object):
     def t(self):
         """The resource definition."""
         stk = self._stack()
-        return stk.t.resource_definitions(stk)[self.name]
+        return stk.t.resource_definition(stk, self.name)
 
 
 def use_parent_stack(parent_proxy, stack):
@@ -290,8 +290,15 @@ class Property(object):
                                     context=self.context,
                                     parent_name=self.path,
                                     translation=translation)
+            # The child values were resolved along with the parent's, whose
+            # dependencies have already been checked
+            properties._resolved = True
             if validate:
-                properties.validate()
+                # Reuse the values resolved during validation rather than
+                # resolving them (and their children) all over again
+                values = properties._validate()
+                return ((k, values[k] if k in values else properties[k])
+                        for k in keys)
 
             return ((k, properties[k]) for k in keys)
         else:
@@ -392,6 +399,7 @@ class Properties(collections.abc.Mapping):
         self.translation = (trans.Translation(properties=self)
                             if translation is None else translation)
         self.rsrc_description = rsrc_description or None
+        self._resolved = False
 
     def update_translation(self, rules, client_resolve=True,
                            ignore_resolve_error=False):
@@ -411,6 +419,11 @@ class Properties(collections.abc.Mapping):
         return {}
 
     def validate(self, with_value=True):
+        self._validate(with_value)
+
+    def _validate(self, with_value=True):
+        """Validate the properties, returning the values resolved to do so."""
+        values = {}
         try:
             for key in self.data:
                 if key not in self.props:
@@ -423,7 +436,8 @@ class Properties(collections.abc.Mapping):
                     continue
                 if with_value:
                     try:
-                        self._get_property_value(key, validate=True)
+                        values[key] = self._get_property_value(key,
+                                                               validate=True)
                     except exception.StackValidationFailed as ex:
                         path = [key]
                         path.extend(ex.path)
@@ -452,6 +466,42 @@ class Properties(collections.abc.Mapping):
                 path=path,
                 message=ex.error_message
             )
+        return values
+
+    def custom_constraint_values(self):
+        """Yield each custom constraint and the value it applies to.
+
+        Values of properties (or of their sub-properties) that have custom
+        constraints are resolved without validation, and any that cannot be
+        resolved are skipped.
+        """
+        def constraint_values(schema, value):
+            if value is None or value == '':
+                return
+            for constraint in schema.constraints:
+                if isinstance(constraint, constr.CustomConstraint):
+                    yield constraint, value
+            if schema.schema is None:
+                return
+            if (schema.type == schema.MAP and
+                    isinstance(value, collections.abc.Mapping)):
+                for k, v in value.items():
+                    if k in schema.schema:
+                        yield from constraint_values(schema.schema[k], v)
+            elif (schema.type == schema.LIST and
+                    isinstance(value, collections.abc.Sequence) and
+                    not isinstance(value, str)):
+                for i, v in enumerate(value):
+                    yield from constraint_values(schema.schema[i], v)
+
+        for key, prop in self.props.items():
+            if key not in self.data:
+                continue
+            try:
+                value = self._get_property_value(key)
+            except Exception:
+                continue
+            yield from constraint_values(prop.schema, value)
 
     def _find_deps_any_in_init(self, unresolved_value):
         deps = function.dependencies(unresolved_value)
@@ -484,7 +534,7 @@ class Properties(collections.abc.Mapping):
 
         try:
             unresolved_value = self.data[key]
-            if validate:
+            if validate and not self._resolved:
                 if self._find_deps_any_in_init(unresolved_value):
                     validate = False
 
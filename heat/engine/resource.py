@@ -1120,15 +1120,18 @@ class Resource(status.ResourceStatus):
                                           load_all=load_all)
 
         # Ensure all attributes referenced in outputs get cached
+        out_attrs = set()
         if for_outputs is False and self.stack.convergence:
             out_attrs = self.referenced_attrs(stk_defn, in_resources=False,
-                                              load_all=load_all)
-            for e in get_attrs(out_attrs - dep_attrs, cacheable_only=True):
+                                              load_all=load_all) - dep_attrs
+
+        with self._attributes_resolved_together(dep_attrs | out_attrs):
+            for e in get_attrs(out_attrs, cacheable_only=True):
                 pass
 
-        # Calculate attribute values *before* reference ID, to potentially
-        # save an extra RPC call in TemplateResource
-        attribute_values = dict(get_attrs(dep_attrs))
+            # Calculate attribute values *before* reference ID, to potentially
+            # save an extra RPC call in TemplateResource
+            attribute_values = dict(get_attrs(dep_attrs))
 
         return node_data.NodeData(self.id, self.name, self.uuid,
                                   self.FnGetRefId(), attribute_values,
@@ -2109,11 +2112,7 @@ class Resource(status.ResourceStatus):
             except Exception as ex:
                 LOG.warning('DB error %s', ex)
 
-    def store(self, set_metadata=False, lock=LOCK_NONE):
-        """Create the resource in the database.
-
-        If self.id is set, we update the existing stack.
-        """
+    def _store_values(self, set_metadata=False):
         if not self.root_stack_id:
             self.root_stack_id = self.stack.root_stack_id()
 
@@ -2139,6 +2138,15 @@ class Resource(status.ResourceStatus):
             rs['rsrc_metadata'] = metadata
             self._rsrc_metadata = metadata
 
+        return rs
+
+    def store(self, set_metadata=False, lock=LOCK_NONE):
+        """Create the resource in the database.
+
+        If self.id is set, we update the existing stack.
+        """
+        rs = self._store_values(set_metadata)
+
         if self.id is not None:
             if (lock == self.LOCK_NONE or
                 (lock in {self.LOCK_ACQUIRE, self.LOCK_RELEASE} and
@@ -2156,6 +2164,28 @@ class Resource(status.ResourceStatus):
             self.uuid = new_rs.uuid
             self.created_time = new_rs.created_at
 
+    @staticmethod
+    def store_all(context, resources):
+        """Create a number of new resources in the database at once.
+
+        This is equivalent to calling store() on each resource, but writes
+        all of the new records in a single bulk insert. Resources that have
+        already been stored are updated individually.
+        """
+        new_rsrcs = []
+        for rsrc in resources:
+            if rsrc.id is not None:
+                rsrc.store()
+            else:
+                new_rsrcs.append(rsrc)
+
+        new_rs = resource_objects.Resource.create_all(
+            context, [rsrc._store_values() for rsrc in new_rsrcs])
+        for rsrc, rs in zip(new_rsrcs, new_rs):
+            rsrc.id = rs.id
+            rsrc.uuid = rs.uuid
+            rsrc.created_time = rs.created_at
+
     def _store_with_lock(self, rs, lock):
         if lock == self.LOCK_ACQUIRE:
             rs['engine_id'] = self._calling_engine_id
@@ -2312,6 +2342,46 @@ class Resource(status.ResourceStatus):
                     resource_properties.data.update(
                         {key: live_properties.get(key)})
 
+    def resolve_attributes(self, names):
+        """Resolve several of the resource's attributes at once.
+
+        Should be overridden by resources whose attributes are all resolved
+        from the same data, so that it is fetched only once.
+
+        :param names: the names of the attributes to resolve, which may
+                      include base attributes
+        :returns: a dict of attribute values; any attributes omitted from it
+                  are resolved individually
+        """
+        # By default, resolve each attribute individually
+        return {}
+
+    @contextlib.contextmanager
+    def _attributes_resolved_together(self, attrs):
+        """Resolve the given attributes in bulk for use within the context.
+
+        The attributes may be names or paths, as passed to FnGetAtt().
+        """
+        names = set(attr if isinstance(attr, str) else attr[0]
+                    for attr in attrs)
+        names = [n for n in names
+                 if n in self.attributes and
+                 n not in self.attributes.cached_attrs]
+        if (not names or self.action == self.INIT or
+                type(self).resolve_attributes == Resource.resolve_attributes):
+            yield
+            return
+
+        try:
+            values = self.resolve_attributes(names)
+        except Exception as exc:
+            # Leave it to resolving each attribute to report the error
+            LOG.debug('Failed to resolve attributes of %(name)s together: '
+                      '%(exc)s', {'name': self.name, 'exc': exc})
+            values = {}
+        with self.attributes.resolved_together(values):
+            yield
+
     def _resolve_attribute(self, name):
         """Default implementation of resolving resource's attributes.
 
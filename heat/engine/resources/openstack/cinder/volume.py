@@ -305,11 +305,25 @@ class CinderVolume(vb.BaseVolume, sh.SchedulerHintsMixin):
 
         return arguments
 
+    def resolve_attributes(self, names):
+        # Resolve all of the attributes from a single get of the volume
+        if self.resource_id is None:
+            return {}
+        vol = self.client().volumes.get(self.resource_id)
+        values = dict((n, self._volume_attribute(vol, n))
+                      for n in names if n not in self.base_attributes_schema)
+        if self.SHOW in names:
+            values[self.SHOW] = vol.to_dict()
+        return values
+
     def _resolve_attribute(self, name):
         if self.resource_id is None:
             return
         cinder = self.client()
         vol = cinder.volumes.get(self.resource_id)
+        return self._volume_attribute(vol, name)
+
+    def _volume_attribute(self, vol, name):
         if name == self.METADATA_ATTR:
             return str(jsonutils.dumps(vol.metadata))
         elif name == self.METADATA_VALUES_ATTR:
@@ -32,6 +32,8 @@ from heat.engine.resources import stack_resource
 from heat.engine import rsrc_defn
 from heat.engine import scheduler
 from heat.engine import support
+from heat.engine import template
+from heat.objects import stack as stack_object
 from heat.scaling import rolling_update
 from heat.scaling import template as scl_template
 
@@ -293,15 +295,24 @@ class ResourceGroup(stack_resource.StackResource):
         )
     }
 
+    # Resource data key recording that the nested stack is being updated to
+    # new member definitions, so that its members may not all match either
+    # the old or the new ones until the group's update completes.
+    _RES_DEF_UPDATING = 'resource_def_updating'
+
+    # Properties that change only which members the group has, and not the
+    # definitions of existing members.
+    _RESIZE_PROPERTIES = (COUNT, REMOVAL_POLICIES)
+
     def get_size(self):
         return self.properties.get(self.COUNT)
 
-    def validate_nested_stack(self):
+    def nested_stack_for_validation(self):
         # Only validate the resource definition (which may be a
         # nested template) if count is non-zero, to enable folks
         # to disable features via a zero count if they wish
         if not self.get_size():
-            return
+            return None
 
         first_name = next(self._resource_names())
         test_tmpl = self._assemble_nested([first_name],
@@ -310,18 +321,7 @@ class ResourceGroup(stack_resource.StackResource):
         # make sure we can resolve the nested resource type
         self.stack.env.get_class_to_instantiate(res_def.resource_type)
 
-        try:
-            name = "%s-%s" % (self.stack.name, self.name)
-            nested_stack = self._parse_nested_stack(
-                name,
-                test_tmpl,
-                self.child_params())
-            nested_stack.strict_validate = False
-            nested_stack.validate()
-        except Exception as ex:
-            path = "%s<%s>" % (self.name, self.template_url)
-            raise exception.StackValidationFailed(
-                ex, path=[self.stack.t.RESOURCES, path])
+        return self._nested_stack_to_validate(test_tmpl)
 
     def _current_skiplist(self):
         db_rsrc_names = self.data().get('name_blacklist')
@@ -453,6 +453,8 @@ class ResourceGroup(stack_resource.StackResource):
                 checker.start()
             if not checker.step():
                 return False
+        if self.data().get(self._RES_DEF_UPDATING):
+            self.data_delete(self._RES_DEF_UPDATING)
         return True
 
     def res_def_changed(self, prop_diff):
@@ -470,15 +472,24 @@ class ResourceGroup(stack_resource.StackResource):
         self.properties = json_snippet.properties(self.properties_schema,
                                                   self.context)
         self._update_name_skiplist(self.properties)
+        resize_only = set(prop_diff or ()) <= set(self._RESIZE_PROPERTIES)
+        if not resize_only:
+            self.data_set(self._RES_DEF_UPDATING, 'True')
         if prop_diff and self.res_def_changed(prop_diff):
             updaters = self._try_rolling_update()
             if updaters:
                 checkers.extend(updaters)
 
         if not checkers:
+            names = list(self._resource_names())
+            nested_tmpl = None
+            if resize_only:
+                nested_tmpl = self._assemble_resized(names)
+            if nested_tmpl is None:
+                nested_tmpl = self._assemble_nested(names)
             resizer = scheduler.TaskRunner(
                 self._run_to_completion,
-                self._assemble_nested(self._resource_names()),
+                nested_tmpl,
                 self.stack.timeout_mins)
             checkers.append(resizer)
 
@@ -577,14 +588,15 @@ class ResourceGroup(stack_resource.StackResource):
         yield output.OutputDefinition(self.REFS_MAP, value)
 
     def build_resource_definition(self, res_name, res_defn):
-        res_def = copy.deepcopy(res_defn)
-
-        props = res_def.get(self.RESOURCE_DEF_PROPERTIES)
+        # Parts of the definition that do not contain the index variable are
+        # shared between members rather than copied, since resource
+        # definitions are never modified in place.
+        props = res_defn.get(self.RESOURCE_DEF_PROPERTIES)
         if props:
             props = self._handle_repl_val(res_name, props)
 
-        res_type = res_def[self.RESOURCE_DEF_TYPE]
-        meta = res_def[self.RESOURCE_DEF_METADATA]
+        res_type = res_defn[self.RESOURCE_DEF_TYPE]
+        meta = res_defn[self.RESOURCE_DEF_METADATA]
 
         return rsrc_defn.ResourceDefinition(res_name, res_type, props, meta)
 
@@ -643,15 +655,21 @@ class ResourceGroup(stack_resource.StackResource):
         repl_var = self.properties[self.INDEX_VAR]
 
         def recurse(x):
-            return self._handle_repl_val(res_name, x)
-
-        if isinstance(val, str):
-            return val.replace(repl_var, res_name)
-        elif isinstance(val, collections.abc.Mapping):
-            return {k: recurse(v) for k, v in val.items()}
-        elif isinstance(val, collections.abc.Sequence):
-            return [recurse(v) for v in val]
-        return val
+            if isinstance(x, str):
+                return x.replace(repl_var, res_name)
+            elif isinstance(x, collections.abc.Mapping):
+                items = [(k, recurse(v)) for k, v in x.items()]
+                if all(v is x[k] for k, v in items):
+                    return x
+                return dict(items)
+            elif isinstance(x, collections.abc.Sequence):
+                values = [recurse(v) for v in x]
+                if all(new is old for new, old in zip(values, x)):
+                    return x
+                return values
+            return x
+
+        return recurse(val)
 
     def _add_output_defns_to_template(self, tmpl, resource_names):
         att_func = 'get_attr'
@@ -674,6 +692,49 @@ class ResourceGroup(stack_resource.StackResource):
         self._add_output_defns_to_template(tmpl, [k for k, d in definitions])
         return tmpl
 
+    def _assemble_resized(self, names,
+                          template_version=('heat_template_version',
+                                            '2015-04-30')):
+        """Return the nested template for a change in the group's size only.
+
+        The definitions of existing members are copied unchanged from the
+        current nested template, so that only those of new members need to be
+        generated. Returns None if the existing members may not match the
+        group's definition, because an earlier update to a new definition did
+        not complete.
+        """
+        if (self.resource_id is None or
+                self.data().get(self._RES_DEF_UPDATING)):
+            return None
+
+        try:
+            nested = stack_object.Stack.get_by_id(self.context,
+                                                  self.resource_id)
+        except exception.NotFound:
+            return None
+        if nested is None or nested.status != self.COMPLETE:
+            return None
+
+        current = nested.raw_template.template
+        version_key, version = template_version
+        if current.get(version_key) != version:
+            return None
+
+        current_resources = current.get('resources') or {}
+        tmpl = template.Template({
+            version_key: version,
+            'resources': dict((n, current_resources[n]) for n in names
+                              if n in current_resources)})
+        new_names = [n for n in names if n not in current_resources]
+        if new_names:
+            res_def = self.get_resource_def()
+            for name in new_names:
+                tmpl.add_resource(self.build_resource_definition(name,
+                                                                 res_def),
+                                  name)
+        self._add_output_defns_to_template(tmpl, names)
+        return tmpl
+
     def child_template_files(self, child_env):
         is_rolling_update = (self.action == self.UPDATE
                              and self.update_policy[self.ROLLING_UPDATE])
@@ -694,21 +755,20 @@ class ResourceGroup(stack_resource.StackResource):
                            if n not in name_skiplist]
 
         targ_cap = self.get_size()
+        indices = dict((name, index) for index, name in enumerate(names))
 
         def replace_priority(res_item):
             name, defn = res_item
-            try:
-                index = names.index(name)
-            except ValueError:
+            index = indices.get(name)
+            if index is None:
                 # High priority - delete immediately
                 return 0
+            elif index < targ_cap:
+                # Update higher indices first
+                return targ_cap - index
             else:
-                if index < targ_cap:
-                    # Update higher indices first
-                    return targ_cap - index
-                else:
-                    # Low priority - don't update
-                    return total_capacity
+                # Low priority - don't update
+                return total_capacity
 
         old_resources = sorted(valid_resources, key=replace_priority)
         existing_names = set(n for n, d in valid_resources)
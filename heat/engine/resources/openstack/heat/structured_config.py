@@ -12,7 +12,6 @@
 #    under the License.
 
 import collections
-import copy
 import functools
 
 from heat.common import exception
@@ -223,7 +222,7 @@ class StructuredDeploymentGroup(sd.SoftwareDeploymentGroup):
     }
 
     def build_resource_definition(self, res_name, res_defn):
-        props = copy.deepcopy(res_defn)
+        props = dict(res_defn)
         servers = props.pop(self.SERVERS)
         props[StructuredDeployment.SERVER] = servers.get(res_name)
         return rsrc_defn.ResourceDefinition(res_name,
@@ -45,6 +45,9 @@ class NeutronResource(resource.Resource):
 
     res_info_key = None
 
+    # The result of _show_resource() while attributes are resolved together
+    _shown_resource = None
+
     def get_resource_plural(self):
         """Return the plural of resource type.
 
@@ -151,6 +154,8 @@ class NeutronResource(resource.Resource):
         return [self.resource_id]
 
     def _show_resource(self):
+        if self._shown_resource is not None:
+            return self._shown_resource
         try:
             method_name = 'show_' + self.entity
             client_method = getattr(self.client(), method_name)
@@ -161,6 +166,16 @@ class NeutronResource(resource.Resource):
         except AttributeError as ex:
             LOG.warning("Resolving 'show' attribute has failed : %s", ex)
 
+    def resolve_attributes(self, names):
+        # Resolve all of the attributes from a single show of the resource
+        if self.resource_id is None:
+            return {}
+        self._shown_resource = self._show_resource()
+        try:
+            return dict((n, self._resolve_any_attribute(n)) for n in names)
+        finally:
+            self._shown_resource = None
+
     def _resolve_attribute(self, name):
         if self.resource_id is None:
             return
@@ -161,6 +161,12 @@ class Server(server_base.BaseServer, sh.SchedulerHintsMixin,
         'os_collect_config'
     )
 
+    # Attributes that are read from the server itself
+    _SERVER_ATTRIBUTES = (
+        ADDRESSES, NETWORKS_ATTR, FIRST_ADDRESS, INSTANCE_NAME, ACCESSIPV4,
+        ACCESSIPV6, CONSOLE_URLS, TAGS_ATTR,
+    )
+
     # Image Statuses
     IMAGE_STATUSES = (IMAGE_ACTIVE, IMAGE_ERROR,
                       IMAGE_DELETED) = ('active', 'error', 'deleted')
@@ -1230,6 +1236,24 @@ class Server(server_base.BaseServer, sh.SchedulerHintsMixin,
                 nets[net_id] = nets[key]
         return nets
 
+    def resolve_attributes(self, names):
+        # Resolve all of the attributes that are read from the server with a
+        # single request
+        names = [n for n in names
+                 if n in self._SERVER_ATTRIBUTES or n == self.SHOW]
+        if self.resource_id is None or not names:
+            return {}
+        try:
+            server = self.client().servers.get(self.resource_id)
+        except Exception as e:
+            self.client_plugin().ignore_not_found(e)
+            return dict((n, '') for n in names if n != self.SHOW)
+        values = dict((n, self._server_attribute(server, n))
+                      for n in names if n != self.SHOW)
+        if self.SHOW in names:
+            values[self.SHOW] = self._server_show(server)
+        return values
+
     def _resolve_attribute(self, name):
         if self.resource_id is None:
             return
@@ -1245,6 +1269,11 @@ class Server(server_base.BaseServer, sh.SchedulerHintsMixin,
         except Exception as e:
             self.client_plugin().ignore_not_found(e)
             return ''
+        return self._server_attribute(server, name)
+
+    def _server_attribute(self, server, name):
+        if name == self.FIRST_ADDRESS:
+            return self.client_plugin().server_first_ipaddress(server) or ''
         if name == self.ADDRESSES:
             return self._get_server_addresses(server)
         if name == self.NETWORKS_ATTR:
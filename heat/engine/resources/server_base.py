@@ -320,7 +320,14 @@ class BaseServer(stack_user.StackUser):
             return True
 
     def _show_resource(self):
-        rsrc_dict = super(BaseServer, self)._show_resource()
+        return self._server_show(super(BaseServer, self)._show_resource())
+
+    def _server_show(self, server):
+        """Return the value of the 'show' attribute for the given server.
+
+        The server is either the client's server object or its dict.
+        """
+        rsrc_dict = server if isinstance(server, dict) else server.to_dict()
         rsrc_dict.setdefault(
             self.OS_COLLECT_CONFIG,
             self.metadata_get().get('os-collect-config', {}))
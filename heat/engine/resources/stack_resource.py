@@ -55,6 +55,7 @@ class StackResource(resource.Resource):
         self._nested = None
         self._outputs = None
         self.resource_info = None
+        self._nested_to_validate = None
 
     def validate(self):
         super(StackResource, self).validate()
@@ -64,15 +65,38 @@ class StackResource(resource.Resource):
         if self.stack.nested_depth == 0 or not self.stack.strict_validate:
             self.validate_nested_stack()
 
+    def nested_stack_for_validation(self):
+        """Return the parsed nested stack to validate, or None."""
+        return self._nested_stack_to_validate(self.child_template())
+
+    def _nested_stack_to_validate(self, child_template):
+        name = "%s-%s" % (self.stack.name, self.name)
+        nested_stack = self._parse_nested_stack(name,
+                                                child_template,
+                                                self.child_params())
+        nested_stack.strict_validate = False
+        return nested_stack
+
+    def prepare_nested_validation(self):
+        """Parse the nested stack ahead of it being validated.
+
+        The parsed stack is used by the next call to validate_nested_stack(),
+        rather than parsing the nested stack again.
+        """
+        self._nested_to_validate = self.nested_stack_for_validation()
+        return self._nested_to_validate
+
     def validate_nested_stack(self):
         try:
-            name = "%s-%s" % (self.stack.name, self.name)
-            nested_stack = self._parse_nested_stack(
-                name,
-                self.child_template(),
-                self.child_params())
-            nested_stack.strict_validate = False
-            nested_stack.validate()
+            nested_stack = self._nested_to_validate
+            if nested_stack is None:
+                nested_stack = self.nested_stack_for_validation()
+            else:
+                self._nested_to_validate = None
+            if nested_stack is not None:
+                validations = self.context.cache(
+                    parser.NestedStackValidations)
+                validations.validate(nested_stack)
         except AssertionError:
             raise
         except Exception as ex:
@@ -17,6 +17,7 @@ from oslo_log import log as logging
 from heat.common import exception
 from heat.common.i18n import _
 from heat.engine import resource
+from heat.engine import stack_user_pool
 
 LOG = logging.getLogger(__name__)
 
@@ -40,6 +41,14 @@ class StackUser(resource.Resource):
                 self.stack.id)
             self.stack.set_stack_user_project_id(project_id)
 
+        pool = stack_user_pool.get_pool()
+        if pool is not None:
+            user_id = pool.get(self.keystone(),
+                               self.stack.stack_user_project_id,
+                               self._other_stack_users)
+            if user_id is not None and self._take_pooled_user(user_id):
+                return
+
         # Create a keystone user in the stack domain project
         user_id = self.keystone().create_stack_domain_user(
             username=self.physical_resource_name(),
@@ -49,6 +58,33 @@ class StackUser(resource.Resource):
         # Store the ID in resource data, for compatibility with SignalResponder
         self.data_set('user_id', user_id)
 
+    def _other_stack_users(self):
+        """Return how many other resources of the stack may need a user."""
+        count = 0
+        for name in self.stack.defn.enabled_rsrc_names() - {self.name}:
+            res_type = self.stack.defn.resource_definition(name).resource_type
+            try:
+                res_class = self.stack.env.get_class_to_instantiate(res_type,
+                                                                    name)
+            except exception.StackValidationFailed:
+                continue
+            if issubclass(res_class, StackUser):
+                count += 1
+        return count
+
+    def _take_pooled_user(self, user_id):
+        try:
+            self.keystone().update_stack_domain_user(
+                user_id=user_id,
+                project_id=self.stack.stack_user_project_id,
+                username=self.physical_resource_name(),
+                password=getattr(self, 'password', None))
+        except kc_exception.NotFound:
+            # Another engine has deleted the pooled users of the project
+            return False
+        self.data_set('user_id', user_id)
+        return True
+
     def _user_token(self):
         project_id = self.stack.stack_user_project_id
         if not project_id:
@@ -79,6 +115,16 @@ class StackUser(resource.Resource):
         if user_id is None:
             return
 
+        pool = stack_user_pool.get_pool()
+        if pool is not None and self.stack.stack_user_project_id:
+            # Delete the user and its keypair in the background
+            pool.reclaim(self.keystone(), self.stack.stack_user_project_id,
+                         user_id, self.data().get('credential_id'))
+            for data_key in ('access_key', 'secret_key', 'credential_id',
+                             'user_id'):
+                self.data_delete(data_key)
+            return
+
         # the user is going away, so we want the keypair gone as well
         self._delete_keypair()
 
@@ -131,17 +177,20 @@ class StackUser(resource.Resource):
             raise exception.Error(_("Error creating ec2 keypair for user %s") %
                                   user_id)
         else:
-            try:
-                credential_id = kp.id
-            except AttributeError:
-                # keystone v2 keypairs do not have an id attribute. Use the
-                # access key instead.
-                credential_id = kp.access
-            self.data_set('credential_id', credential_id, redact=True)
-            self.data_set('access_key', kp.access, redact=True)
-            self.data_set('secret_key', kp.secret, redact=True)
+            self._store_keypair(kp)
         return kp
 
+    def _store_keypair(self, kp):
+        try:
+            credential_id = kp.id
+        except AttributeError:
+            # keystone v2 keypairs do not have an id attribute. Use the
+            # access key instead.
+            credential_id = kp.access
+        self.data_set('credential_id', credential_id, redact=True)
+        self.data_set('access_key', kp.access, redact=True)
+        self.data_set('secret_key', kp.secret, redact=True)
+
     def _delete_keypair(self):
         # Subclasses may optionally call this to delete a keypair created
         # via _create_keypair
@@ -41,6 +41,8 @@ class ResourceDefinition(object):
     class Diff(object):
         """A diff between two versions of the same resource definition."""
 
+        __slots__ = ('old_defn', 'new_defn')
+
         def __init__(self, old_defn, new_defn):
             if not (isinstance(old_defn, ResourceDefinition) and
                     isinstance(new_defn, ResourceDefinition)):
@@ -75,6 +77,12 @@ class ResourceDefinition(object):
         'Delete', 'Retain', 'Snapshot',
     )
 
+    __slots__ = ('name', 'resource_type', 'description',
+                 '_properties', '_metadata', '_depends', '_deletion_policy',
+                 '_update_policy', '_external_id', '_condition',
+                 '_hash', '_rendering', '_dep_names', '_all_dep_attrs',
+                 '_rules', '_client_resolve', '_frozen')
+
     def __init__(self, name, resource_type, properties=None, metadata=None,
                  depends=None, deletion_policy=None, update_policy=None,
                  description=None, external_id=None, condition=None):
@@ -109,6 +117,7 @@ class ResourceDefinition(object):
         self._rendering = None
         self._dep_names = None
         self._all_dep_attrs = None
+        self._frozen = False
 
         assert isinstance(self.description, str)
 
@@ -130,7 +139,6 @@ class ResourceDefinition(object):
 
         if deletion_policy is not None:
             assert deletion_policy in self.DELETION_POLICIES
-            self._hash ^= _hash_data(deletion_policy)
 
         if update_policy is not None:
             assert isinstance(update_policy, (collections.abc.Mapping,
@@ -143,6 +151,9 @@ class ResourceDefinition(object):
             self._hash ^= _hash_data(external_id)
             self._deletion_policy = self.RETAIN
 
+        if self._deletion_policy is not None:
+            self._hash ^= _hash_data(self._deletion_policy)
+
         if condition is not None:
             assert isinstance(condition, (str, bool,
                                           function.Function))
@@ -157,7 +168,7 @@ class ResourceDefinition(object):
         intrinsic functions). Named arguments passed to this method override
         the values passed as arguments to the constructor.
         """
-        if getattr(self, '_frozen', False) and not overrides:
+        if self._frozen and not overrides:
             return self
 
         def arg_item(attr_name):
@@ -189,8 +200,7 @@ class ResourceDefinition(object):
         being interpreted in any context that it should be enabled in that
         context.
         """
-        assert not getattr(self, '_frozen', False
-                           ), "Cannot re-parse a frozen definition"
+        assert not self._frozen, "Cannot re-parse a frozen definition"
 
         def reparse_snippet(snippet):
             return template.parse(stack, copy.deepcopy(snippet))
@@ -359,7 +369,7 @@ class ResourceDefinition(object):
                 for key, attr in attrs.items():
                     value = getattr(self, attr)
                     if value is not None:
-                        yield key, copy.deepcopy(value)
+                        yield key, _render_data(value)
 
             self._rendering = dict(rawattrs())
 
@@ -387,6 +397,11 @@ class ResourceDefinition(object):
         if not isinstance(other, ResourceDefinition):
             return NotImplemented
 
+        # Definitions that compare equal always have the same hash, so this
+        # avoids rendering and comparing definitions that differ.
+        if self._hash != other._hash:
+            return False
+
         return self.render_hot() == other.render_hot()
 
     def __ne__(self, other):
@@ -440,3 +455,32 @@ def _hash_data(data):
             return functools.reduce(operator.xor, item_hashes, 0)
 
     return hash(data)
+
+
+def _render_data(data):
+    """Return a parsed data snippet with any functions in their raw form.
+
+    Only the parts of the snippet that contain functions are copied; any
+    sub-trees containing no functions are shared with the original, so that
+    definitions built from a common snippet (such as the members of a group)
+    do not each render a separate copy of it.
+    """
+    if isinstance(data, function.Function):
+        return copy.deepcopy(data)
+
+    if type(data) is dict:
+        rendered = dict((k, _render_data(v)) for k, v in data.items())
+        if all(rendered[k] is v for k, v in data.items()):
+            return data
+        return rendered
+
+    if type(data) is list:
+        rendered = [_render_data(v) for v in data]
+        if all(r is v for r, v in zip(rendered, data)):
+            return data
+        return rendered
+
+    if isinstance(data, (str, int, float, bool, type(None))):
+        return data
+
+    return copy.deepcopy(data)
@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import sys
 import time
 import types
@@ -28,6 +29,10 @@ LOG = logging.getLogger(__name__)
 # Whether TaskRunner._sleep actually does a sleep when called.
 ENABLE_SLEEP = True
 
+# Maximum time in seconds a DependencyTaskGroup running its subtasks on an
+# executor waits for their steps to complete before yielding.
+STEP_WAIT_TIME = 0.5
+
 
 def task_description(task):
     """Return a human-readable string description of a task.
@@ -108,6 +113,37 @@ class ExceptionGroup(Exception):
         return str([str(ex) for ex in self.exceptions])
 
 
+class RateLimiter(object):
+    """A token bucket limiting the rate at which an action is performed.
+
+    Up to ``burst`` actions may be performed immediately, after which they
+    are limited to an average of ``rate`` per second. A rate of zero means
+    that there is no limit.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+
+    def wait(self):
+        """Wait, if necessary, until the action may next be performed."""
+        if self.rate <= 0:
+            return
+
+        now = time.monotonic()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+        # Borrow against future tokens, so that the time spent sleeping here
+        # counts towards refilling the bucket on the next call.
+        self._tokens -= 1
+        if self._tokens < 0 and ENABLE_SLEEP:
+            time.sleep(-self._tokens / self.rate)
+
+
 class TaskRunner(object):
     """Wrapper for a resumable task (co-routine)."""
 
@@ -307,7 +343,8 @@ class DependencyTaskGroup(object):
 
     def __init__(self, dependencies, task=lambda o: o(),
                  reverse=False, name=None, error_wait_time=None,
-                 aggregate_exceptions=False):
+                 aggregate_exceptions=False, timeline=None,
+                 executor=None, limits=None):
         """Initialise with the task dependencies.
 
         A task to run on each dependency may optionally be specified.  If no
@@ -327,12 +364,31 @@ class DependencyTaskGroup(object):
         will not be cancelled in the event of an error (operations downstream
         of the error will be cancelled). Once all chains are complete, any
         errors will be rolled up into an ExceptionGroup exception.
+
+        If a timeline dictionary is supplied, it is populated with an entry
+        for each task that runs, mapping its dependency key to a list of
+        [ready, started, finished, blocked_by]. The first three are wall clock
+        times and blocked_by is the key of the last dependency to complete
+        before the task became ready, or None if it had no dependencies.
+
+        If an executor (such as a ThreadPoolExecutor) is supplied, each step
+        of the subtasks is run on it, so that a subtask taking a long time to
+        complete a step does not delay the others. The subtasks are still
+        stepped no more than once per step of the group. If a limits function
+        is also supplied, it is called with each dependency key to get a list
+        of semaphores, all of which are held while that subtask runs; a
+        subtask whose semaphores are not all available is not started.
         """
         self._keys = list(dependencies)
         self._runners = dict((o, TaskRunner(task, o)) for o in self._keys)
         self._graph = dependencies.graph(reverse=reverse)
         self.error_wait_time = error_wait_time
         self.aggregate_exceptions = aggregate_exceptions
+        self.timeline = timeline
+        self._executor = executor
+        self._limits = limits
+        self._in_flight = {}
+        self._held = {}
 
         if name is None:
             name = '(%s) %s' % (getattr(task, '__name__',
@@ -347,16 +403,28 @@ class DependencyTaskGroup(object):
 
     def __call__(self):
         """Return a co-routine which runs the task group."""
+        if self._executor is not None:
+            return self._run_in_executor()
+        return self._run()
+
+    def _run(self):
         raised_exceptions = []
         thrown_exceptions = []
 
+        if self.timeline is not None:
+            start_time = time.time()
+            self._blocked_by = {}
+            self._finished = {}
+
         try:
             while any(self._runners.values()):
                 try:
                     for k, r in self._ready():
+                        if self.timeline is not None:
+                            self._record_start(k, start_time)
                         r.start()
                         if not r:
-                            del self._graph[k]
+                            self._complete(k)
 
                     if self._graph:
                         try:
@@ -367,8 +435,11 @@ class DependencyTaskGroup(object):
 
                     for k, r in self._running():
                         if r.step():
-                            del self._graph[k]
+                            self._complete(k)
                 except Exception as err:
+                    if (self.timeline is not None and k in self.timeline and
+                            self.timeline[k][2] is None):
+                        self.timeline[k][2] = time.time()
                     if self.aggregate_exceptions:
                         self._cancel_recursively(k, r)
                     else:
@@ -390,6 +461,119 @@ class DependencyTaskGroup(object):
             del raised_exceptions
             del thrown_exceptions
 
+    def _run_in_executor(self):
+        raised_exceptions = []
+        thrown_exceptions = []
+
+        start_time = time.time()
+        if self.timeline is not None:
+            self._blocked_by = {}
+            self._finished = {}
+
+        try:
+            while any(self._runners.values()):
+                # The subtask whose step raised, if any. An exception thrown
+                # into the group belongs to none of them.
+                failed = None
+                try:
+                    self._submit_steps(start_time)
+
+                    for k, r, f in self._completed_steps():
+                        if f.exception() is not None:
+                            failed = k, r
+                        f.result()
+                        if r.done() and k in self._graph:
+                            self._complete(k)
+                    self._release_done()
+
+                    if self._graph:
+                        try:
+                            yield
+                        except Exception as err:
+                            thrown_exceptions.append(err)
+                            raise
+                except Exception as err:
+                    if failed is not None:
+                        k, r = failed
+                        if (self.timeline is not None and
+                                k in self.timeline and
+                                self.timeline[k][2] is None):
+                            self.timeline[k][2] = time.time()
+                    if self.aggregate_exceptions:
+                        if failed is not None and k in self._graph:
+                            self._cancel_recursively(k, r)
+                    else:
+                        self.cancel_all(grace_period=self.error_wait_time)
+                    self._release_done()
+                    raised_exceptions.append(err)
+                except:  # noqa
+                    with excutils.save_and_reraise_exception():
+                        self.cancel_all()
+
+            if raised_exceptions:
+                if self.aggregate_exceptions:
+                    raise ExceptionGroup(err for err in raised_exceptions)
+                else:
+                    if thrown_exceptions:
+                        raise thrown_exceptions[-1]
+                    else:
+                        raise raised_exceptions[0]
+        finally:
+            del raised_exceptions
+            del thrown_exceptions
+            futures.wait(list(self._in_flight.values()))
+            self._in_flight.clear()
+            for semaphores in self._held.values():
+                for semaphore in semaphores:
+                    semaphore.release()
+            self._held.clear()
+
+    def _submit_steps(self, start_time):
+        """Submit the next step of each idle subtask to the executor."""
+        for k, r in self._ready():
+            if k in self._in_flight or not self._acquire(k):
+                continue
+            if self.timeline is not None:
+                self._record_start(k, start_time)
+            self._in_flight[k] = self._executor.submit(r.start)
+
+        for k, r in self._running():
+            if k not in self._in_flight:
+                self._in_flight[k] = self._executor.submit(r.step)
+
+    def _completed_steps(self):
+        """Wait for steps to complete and iterate over those that have.
+
+        Each item is a tuple of the key, the TaskRunner and the Future for
+        the step.
+        """
+        futures.wait(list(self._in_flight.values()), timeout=STEP_WAIT_TIME)
+        for k, f in list(self._in_flight.items()):
+            if f.done():
+                del self._in_flight[k]
+                yield k, self._runners[k], f
+
+    def _acquire(self, key):
+        """Acquire all of the semaphores limiting a subtask, if possible."""
+        if self._limits is None:
+            return True
+        acquired = []
+        for semaphore in self._limits(key):
+            if not semaphore.acquire(blocking=False):
+                for held in acquired:
+                    held.release()
+                return False
+            acquired.append(semaphore)
+        self._held[key] = acquired
+        return True
+
+    def _release_done(self):
+        """Release the semaphores held by subtasks that have finished."""
+        for k in list(self._held):
+            if self._runners[k].done() and k not in self._in_flight:
+                for semaphore in self._held.pop(k):
+                    semaphore.release()
+
     def cancel_all(self, grace_period=None):
         if callable(grace_period):
             get_grace_period = grace_period
@@ -402,11 +586,31 @@ class DependencyTaskGroup(object):
                 gp = None
             else:
                 gp = get_grace_period(k)
+            if gp is None and k in self._in_flight:
+                # A task cannot be closed while a step of it is running
+                futures.wait([self._in_flight[k]])
             try:
                 r.cancel(grace_period=gp)
             except Exception as ex:
                 LOG.debug('Exception cancelling task: %s', str(ex))
 
+    def _record_start(self, key, start_time):
+        blocked_by = self._blocked_by.get(key)
+        if blocked_by is None:
+            ready = start_time
+        else:
+            ready = self._finished[blocked_by]
+        self.timeline[key] = [ready, time.time(), None, blocked_by]
+
+    def _complete(self, key):
+        """Remove a completed subtask from the graph."""
+        if self.timeline is not None and key in self.timeline:
+            now = self._finished[key] = time.time()
+            self.timeline[key][2] = now
+            for dependent in self._graph[key].required_by():
+                self._blocked_by[dependent] = key
+        del self._graph[key]
+
     def _cancel_recursively(self, key, runner):
         try:
             runner.cancel()
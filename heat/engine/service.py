@@ -46,10 +46,12 @@ from heat.common import identifier
 from heat.common import messaging as rpc_messaging
 from heat.common import policy
 from heat.common import service_utils
+from heat.engine import action_pool
 from heat.engine import api
 from heat.engine import attributes
 from heat.engine.cfn import template as cfntemplate
 from heat.engine import clients
+from heat.engine.clients import client_plugin
 from heat.engine import environment
 from heat.engine.hot import functions as hot_functions
 from heat.engine import parameter_groups
@@ -59,10 +61,14 @@ from heat.engine import service_software_config
 from heat.engine import snapshots
 from heat.engine import stack as parser
 from heat.engine import stack_lock
+from heat.engine import stack_reaper
+from heat.engine import stack_user_pool
 from heat.engine import stk_defn
 from heat.engine import support
 from heat.engine import template as templatem
 from heat.engine import template_files
+from heat.engine import timeline
+from heat.engine import traversal_timing
 from heat.engine import update
 from heat.engine import worker
 from heat.objects import event as event_object
@@ -70,6 +76,7 @@ from heat.objects import resource as resource_objects
 from heat.objects import service as service_objects
 from heat.objects import snapshot as snapshot_object
 from heat.objects import stack as stack_object
+from heat.objects import user_creds as ucreds_object
 from heat.rpc import api as rpc_api
 from heat.rpc import worker_api as rpc_worker_api
 
@@ -358,6 +365,8 @@ class EngineListener(object):
     support.
     """
 
+    RPC_API_VERSION = '1.1'
+
     ACTIONS = (STOP_STACK, SEND) = ('stop_stack', 'send')
 
     def __init__(self, host, engine_id, thread_group_mgr):
@@ -368,6 +377,7 @@ class EngineListener(object):
 
     def start(self):
         self.target = messaging.Target(
+            version=self.RPC_API_VERSION,
             server=self.engine_id,
             topic=rpc_api.LISTENER_TOPIC)
         self._server = rpc_messaging.get_rpc_server(self.target, self)
@@ -400,6 +410,10 @@ class EngineListener(object):
         stack_id = stack_identity['stack_id']
         self.thread_group_mgr.send(stack_id, message)
 
+    def get_traversal_timings(self, ctxt, traversal_id):
+        """Return the timings this engine recorded for a traversal."""
+        return traversal_timing.get(traversal_id)
+
 
 @profiler.trace_cls("rpc")
 class EngineService(service.ServiceBase):
@@ -413,7 +427,7 @@ class EngineService(service.ServiceBase):
     by the RPC caller.
     """
 
-    RPC_API_VERSION = '1.36'
+    RPC_API_VERSION = '1.39'
 
     def __init__(self, host, topic):
         resources.initialise()
@@ -476,6 +490,7 @@ class EngineService(service.ServiceBase):
         self.manage_thread_grp.add_timer(cfg.CONF.periodic_interval,
                                          self.service_manage_report)
         self.manage_thread_grp.add_thread(self.reset_stack_status)
+        self.manage_thread_grp.add_thread(self.finish_stack_cleanup)
 
     def _configure_db_conn_pool_size(self):
         # bug #1491185
@@ -509,6 +524,8 @@ class EngineService(service.ServiceBase):
         if self.worker_service:
             self.worker_service.stop()
 
+        self.software_config.stop()
+
         # Wait for all active threads to be finished
         if self.thread_group_mgr:
             for stack_id in list(self.thread_group_mgr.groups.keys()):
@@ -520,6 +537,12 @@ class EngineService(service.ServiceBase):
                 # Stop threads gracefully
                 self.thread_group_mgr.stop(stack_id, True)
                 LOG.info("Stack %s processing was finished", stack_id)
+
+        # Finish cleaning up the stacks deleted by those threads
+        stack_reaper.shutdown()
+        stack_user_pool.shutdown()
+        action_pool.shutdown()
+
         if self.manage_thread_grp:
             self.manage_thread_grp.stop()
             ctxt = context.get_admin_context()
@@ -582,7 +605,8 @@ class EngineService(service.ServiceBase):
         return s
 
     @context.request_context
-    def show_stack(self, cnxt, stack_identity, resolve_outputs=True):
+    def show_stack(self, cnxt, stack_identity, resolve_outputs=True,
+                   refresh_outputs=False):
         """Return detailed information about one or all stacks.
 
         :param cnxt: RPC context.
@@ -590,6 +614,8 @@ class EngineService(service.ServiceBase):
             to show all
         :param resolve_outputs: If True, outputs for given stack/stacks will
             be resolved
+        :param refresh_outputs: If True, outputs are resolved again even if
+            stored outputs of the stack are still current
         """
         if stack_identity is not None:
             db_stack = self._get_stack(cnxt, stack_identity, show_deleted=True)
@@ -598,7 +624,11 @@ class EngineService(service.ServiceBase):
             stacks = parser.Stack.load_all(cnxt)
 
         def show(stack):
-            if resolve_outputs:
+            outputs = None
+            if resolve_outputs and not refresh_outputs:
+                outputs = stack.get_output_snapshot()
+
+            if resolve_outputs and outputs is None:
                 for res in stack._explicit_dependencies():
                     ensure_cache = stack.convergence and res.id is not None
                     node_data = res.node_data(for_resources=ensure_cache,
@@ -616,7 +646,11 @@ class EngineService(service.ServiceBase):
                     if ensure_cache:
                         res.store_attributes()
 
-            return api.format_stack(stack, resolve_outputs=resolve_outputs)
+            info = api.format_stack(stack, resolve_outputs=resolve_outputs,
+                                    outputs=outputs)
+            if outputs is None and rpc_api.STACK_OUTPUTS in info:
+                stack.store_output_snapshot(info[rpc_api.STACK_OUTPUTS])
+            return info
 
         return [show(stack) for stack in stacks]
 
@@ -664,7 +698,7 @@ class EngineService(service.ServiceBase):
         if not tenant_safe:
             cnxt = context.get_admin_context()
 
-        stacks = stack_object.Stack.get_all(
+        stacks = stack_object.Stack.get_all_summaries(
             cnxt,
             limit=limit,
             sort_keys=sort_keys,
@@ -678,7 +712,7 @@ class EngineService(service.ServiceBase):
             tags_any=tags_any,
             not_tags=not_tags,
             not_tags_any=not_tags_any)
-        return [api.format_stack_db_object(stack) for stack in stacks]
+        return [api.format_stack_summary(stack) for stack in stacks]
 
     @context.request_context
     def count_stacks(self, cnxt, filters=None, tenant_safe=True,
@@ -1474,6 +1508,24 @@ class EngineService(service.ServiceBase):
                                         for_outputs={output_key})
         return api.format_stack_output(outputs[output_key])
 
+    @context.request_context
+    def get_stack_timeline(self, cnxt, stack_identity):
+        """Return the timeline of the most recent operation on a stack.
+
+        The timeline includes, for each resource, when it became ready, when
+        work on it started and when it finished, and the critical path through
+        the operation.
+
+        :param cnxt: RPC context.
+        :param stack_identity: Name of the stack you want to see.
+        """
+        s = self._get_stack(cnxt, stack_identity, show_deleted=True)
+        result = timeline.get_timeline(cnxt, s)
+        if result is None:
+            raise exception.NotFound(_('No timeline has been recorded for '
+                                       'stack %s.') % s.name)
+        return result
+
     def _remote_call(self, cnxt, lock_engine_id, timeout, call, **kwargs):
         self.cctxt = self._client.prepare(
             version='1.0',
@@ -1962,6 +2014,7 @@ class EngineService(service.ServiceBase):
         def _resource_signal(stack, rsrc, details, need_check):
             LOG.debug("signaling resource %s:%s", stack.name, rsrc.name)
             needs_metadata_updates = rsrc.signal(details, need_check)
+            stack.invalidate_output_snapshots()
 
             if not needs_metadata_updates:
                 return
@@ -2476,6 +2529,26 @@ class EngineService(service.ServiceBase):
                   for srv in service_objects.Service.get_all(cnxt)]
         return result
 
+    @context.request_context
+    def get_traversal_timings(self, ctxt, stack_id, traversal_id=None):
+        """Return the per-phase timings of a convergence traversal.
+
+        The timings are collected from all running engines.
+
+        :param ctxt: RPC context
+        :param stack_id: ID of the stack
+        :param traversal_id: ID of the traversal; defaults to the stack's
+                             current traversal
+        """
+        s = stack_object.Stack.get_by_id(ctxt, stack_id, show_deleted=True)
+        if s is None:
+            raise exception.EntityNotFound(entity='Stack', name=stack_id)
+        if not s.convergence:
+            raise exception.NotSupported(
+                feature=_('Traversal timings of legacy stacks'))
+        return traversal_timing.collect(ctxt,
+                                        traversal_id or s.current_traversal)
+
     @context.request_context
     def migrate_convergence_1(self, ctxt, stack_id):
         parent_stack = parser.Stack.load(ctxt,
@@ -2547,6 +2620,27 @@ class EngineService(service.ServiceBase):
                       'failed: %(error)s',
                       {'service_id': self.service_id, 'error': ex})
 
+        counts = client_plugin.get_client_counts()
+        if counts:
+            LOG.debug('Clients of service %(service_id)s created and '
+                      'reused: %(counts)s',
+                      {'service_id': self.service_id,
+                       'counts': ', '.join(
+                           '%s %s %s: %d' % (key + (count,))
+                           for key, count in sorted(counts.items()))})
+
+        files_cache = template_files.cache_info()
+        if files_cache.hits or files_cache.misses:
+            LOG.debug('Template files cache of service %(service_id)s: '
+                      '%(hits)d hits, %(misses)d misses, hit rate '
+                      '%(hit_rate).2f, %(entries)d entries, %(bytes)d bytes',
+                      {'service_id': self.service_id,
+                       'hits': files_cache.hits,
+                       'misses': files_cache.misses,
+                       'hit_rate': files_cache.hit_rate,
+                       'entries': files_cache.entries,
+                       'bytes': files_cache.resident_bytes})
+
     def service_manage_cleanup(self):
         cnxt = context.get_admin_context()
         last_updated_window = (3 * cfg.CONF.periodic_interval)
@@ -2565,6 +2659,23 @@ class EngineService(service.ServiceBase):
                 LOG.debug('Service %s was aborted', service_ref['id'])
                 service_objects.Service.delete(cnxt, service_ref['id'])
 
+    def finish_stack_cleanup(self):
+        """Finish the cleanup that deleted stacks have left behind.
+
+        The engine that deletes a stack may delete its stack domain project
+        and trust in the background, in which case the stored credentials of
+        the stack are only deleted afterwards. Any credentials that remain
+        were left by an engine that stopped or gave up first.
+        """
+        cnxt = context.get_admin_context()
+        for user_creds_id, project_id in (
+                ucreds_object.UserCreds.get_all_of_deleted_stacks(cnxt)):
+            try:
+                parser.Stack.finish_cleanup(cnxt, user_creds_id, project_id)
+            except Exception:
+                LOG.exception('Failed to finish the cleanup of stored '
+                              'credentials %s', user_creds_id)
+
     def reset_stack_status(self):
         filters = {
             'status': parser.Stack.IN_PROGRESS,
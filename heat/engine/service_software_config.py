@@ -12,6 +12,7 @@
 #    under the License.
 
 import itertools
+import threading
 import uuid
 
 from oslo_config import cfg
@@ -37,10 +38,75 @@ from heat.rpc import api as rpc_api
 LOG = logging.getLogger(__name__)
 
 cfg.CONF.import_opt('metadata_put_timeout', 'heat.common.config')
+cfg.CONF.import_opt('deployment_metadata_push_delay', 'heat.common.config')
+
+
+class MetadataPushScheduler(object):
+    """Combine pushes of the deployment metadata of a server.
+
+    The first request to push the metadata of a server starts a timer; any
+    further requests for the same server before it fires are absorbed into
+    that push. Requests that arrive while a push is running cause exactly
+    one more push once it completes, so the last push for a server always
+    reflects every change that preceded it, and pushes for a given server
+    are never run concurrently.
+    """
+
+    def __init__(self, push):
+        self._push = push
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timers = {}
+        self._running = set()
+
+    def schedule(self, delay, cnxt, server_id, stack_user_project_id):
+        with self._lock:
+            queued = server_id in self._pending or server_id in self._running
+            self._pending[server_id] = (cnxt, stack_user_project_id)
+            if queued:
+                return
+            timer = threading.Timer(delay, self._run, args=(server_id,))
+            timer.daemon = True
+            self._timers[server_id] = timer
+        timer.start()
+
+    def _run(self, server_id):
+        with self._lock:
+            self._timers.pop(server_id, None)
+            if server_id in self._running:
+                return
+            self._running.add(server_id)
+        while True:
+            with self._lock:
+                args = self._pending.pop(server_id, None)
+                if args is None:
+                    self._running.discard(server_id)
+                    return
+            cnxt, stack_user_project_id = args
+            try:
+                self._push(cnxt, server_id, stack_user_project_id)
+            except Exception:
+                LOG.exception('Failed to push deployment metadata of '
+                              'server %s', server_id)
+
+    def flush(self):
+        """Cancel the pending timers and push their metadata immediately."""
+        with self._lock:
+            timers = list(self._timers.items())
+        for server_id, timer in timers:
+            timer.cancel()
+            self._run(server_id)
 
 
 class SoftwareConfigService(object):
 
+    def __init__(self):
+        self._metadata_pusher = MetadataPushScheduler(
+            self._update_metadata_software_deployments)
+
+    def stop(self):
+        self._metadata_pusher.flush()
+
     def show_software_config(self, cnxt, config_id):
         sc = software_config_object.SoftwareConfig.get_by_id(cnxt, config_id)
         return api.format_software_config(sc)
@@ -105,9 +171,19 @@ class SoftwareConfigService(object):
         result = [api.format_software_config(sd.config) for sd in flt_sd_s]
         return result
 
-    @resource_objects.retry_on_conflict
     def _push_metadata_software_deployments(
             self, cnxt, server_id, stack_user_project_id):
+        delay = cfg.CONF.deployment_metadata_push_delay
+        if not delay:
+            self._update_metadata_software_deployments(
+                cnxt, server_id, stack_user_project_id)
+            return
+        self._metadata_pusher.schedule(delay, cnxt, server_id,
+                                       stack_user_project_id)
+
+    @resource_objects.retry_on_conflict
+    def _update_metadata_software_deployments(
+            self, cnxt, server_id, stack_user_project_id):
         rs = db_api.resource_get_by_physical_resource_id(cnxt, server_id)
         if not rs:
             return
@@ -0,0 +1,46 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+
+class SharedObject(object):
+    """An object shared by everything in an engine, created on first use.
+
+    The object is returned by create(), which reads its configuration and
+    returns None if it is disabled. Once created, the object is kept until
+    the engine stops and calls shutdown(), so work that is running on it is
+    never cut off from it.
+    """
+
+    def __init__(self, create):
+        self._create = create
+        self._obj = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the shared object, or None if it is disabled."""
+        obj = self._obj
+        if obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = self._create()
+                obj = self._obj
+        return obj
+
+    def shutdown(self, *args, **kwargs):
+        """Shut down the shared object, if there is one, and forget it."""
+        with self._lock:
+            obj, self._obj = self._obj, None
+        if obj is not None:
+            obj.shutdown(*args, **kwargs)
@@ -12,7 +12,6 @@
 #    under the License.
 
 import tenacity
-import time
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -95,14 +94,14 @@ class Snapshot(object):
             start_time = self.start_time.strftime(
                 heat_timeutils.str_duration_format)
 
+            kickoff = scheduler.RateLimiter(cfg.CONF.convergence_kickoff_rate,
+                                            cfg.CONF.convergence_kickoff_burst)
             for rsrc_name in self.resources:
+                kickoff.wait()
                 self.worker_client.check_resource_delete_snapshot(
                     self.context, self.id, rsrc_name, start_time,
                     is_stack_delete=self.is_stack_delete,
                     current_traversal=self.current_traversal)
-
-            if scheduler.ENABLE_SLEEP:
-                time.sleep(1)
         else:
             self.mark_complete()
 
@@ -12,11 +12,16 @@
 #    under the License.
 
 import collections
+from concurrent import futures
 import contextlib
 import copy
 import functools
+import hashlib
+import itertools
+import json
 import queue
 import re
+import threading
 import time
 
 from oslo_config import cfg
@@ -32,7 +37,9 @@ from heat.common import exception
 from heat.common.i18n import _
 from heat.common import identifier
 from heat.common import lifecycle_plugin_utils
+from heat.engine import action_pool
 from heat.engine import api
+from heat.engine import constraints
 from heat.engine import dependencies
 from heat.engine import environment
 from heat.engine import event
@@ -43,15 +50,19 @@ from heat.engine import resource
 from heat.engine import resources
 from heat.engine import scheduler
 from heat.engine import snapshots
+from heat.engine import stack_reaper
+from heat.engine import stack_user_pool
 from heat.engine import status
 from heat.engine import stk_defn
 from heat.engine import sync_point
 from heat.engine import template as tmpl
+from heat.engine import timeline
 from heat.engine import update
 from heat.objects import raw_template as raw_template_object
 from heat.objects import resource as resource_objects
 from heat.objects import snapshot as snapshot_object
 from heat.objects import stack as stack_object
+from heat.objects import stack_output_snapshot as output_object
 from heat.objects import stack_tag as stack_tag_object
 from heat.objects import user_creds as ucreds_object
 from heat.rpc import api as rpc_api
@@ -130,6 +141,67 @@ def reset_state_on_error(func):
     return handle_exceptions
 
 
+class NestedStackValidations(object):
+    """Keep track of the nested stacks validated for a request.
+
+    Nested stacks are identified by a digest of their template, environment
+    (which includes their parameters), files and nesting depth, so that
+    identical nested stacks are validated only once. If another thread is
+    already validating an identical nested stack, wait for its result rather
+    than repeating the work. Failures are not recorded, so that the error is
+    always reported by the resource that is being validated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_progress = {}
+        self._valid = set()
+
+    @staticmethod
+    def digest(nested_stack):
+        """Return a digest identifying the nested stack, or None."""
+        try:
+            content = json.dumps([nested_stack.t.t,
+                                  nested_stack.env.env_as_dict(),
+                                  dict(nested_stack.t.files),
+                                  nested_stack.nested_depth],
+                                 sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def validate(self, nested_stack):
+        key = self.digest(nested_stack)
+        if key is None:
+            nested_stack.validate()
+            return
+
+        with self._lock:
+            if key in self._valid:
+                return
+            done = self._in_progress.get(key)
+            if done is None:
+                done = self._in_progress[key] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            done.wait()
+            if key not in self._valid:
+                nested_stack.validate()
+            return
+
+        try:
+            nested_stack.validate()
+            with self._lock:
+                self._valid.add(key)
+        finally:
+            with self._lock:
+                del self._in_progress[key]
+            done.set()
+
+
 class Stack(collections.abc.Mapping):
 
     ACTIONS = (
@@ -355,12 +427,24 @@ class Stack(collections.abc.Mapping):
                 for n in self.defn.enabled_output_names()}
 
     def _resources_for_defn(self, stack_defn):
-        return {
-            name: resource.Resource(name,
-                                    stack_defn.resource_definition(name),
-                                    self)
-            for name in stack_defn.enabled_rsrc_names()
-        }
+        prefetched = False
+        if (self._db_resources is None and self.id is not None and
+                not self.in_convergence_check):
+            # Look up the stored resources once for all of the Resource
+            # objects. An empty result is not cached, so would otherwise be
+            # queried again for each one.
+            self._db_resources = self._db_resources_get()
+            prefetched = not self._db_resources
+        try:
+            return {
+                name: resource.Resource(name,
+                                        stack_defn.resource_definition(name),
+                                        self)
+                for name in stack_defn.enabled_rsrc_names()
+            }
+        finally:
+            if prefetched:
+                self._db_resources = None
 
     @property
     def resources(self):
@@ -548,6 +632,55 @@ class Stack(collections.abc.Mapping):
             stack_id = self.id
         return stack_object.Stack.count_total_resources(self.context, stack_id)
 
+    def _can_snapshot_outputs(self):
+        return (cfg.CONF.cache_stack_outputs and
+                not cfg.CONF.encrypt_parameters_and_properties and
+                self.id is not None and
+                self.status != self.IN_PROGRESS)
+
+    def _output_snapshot_version(self, root_stack_id):
+        """Return a digest of the state from which outputs are resolved."""
+        summary = resource_objects.Resource.get_state_summary_by_root_stack(
+            self.context, root_stack_id)
+        state = [self.t.id, self.action, self.status, self.current_traversal,
+                 self.created_time, self.updated_time, summary]
+        return hashlib.sha256(
+            json.dumps(state, default=str).encode('utf-8')).hexdigest()
+
+    def get_output_snapshot(self):
+        """Return the stored resolved outputs, or None if they are stale."""
+        if not self._can_snapshot_outputs():
+            return None
+        snapshot = output_object.StackOutputSnapshot.get_by_stack(
+            self.context, self.id)
+        if snapshot is None:
+            return None
+        if snapshot.version != self._output_snapshot_version(
+                self.root_stack_id()):
+            return None
+        return snapshot.outputs
+
+    def store_output_snapshot(self, outputs):
+        """Store the resolved outputs of the stack.
+
+        The outputs are returned by get_output_snapshot() until the stack or
+        any resource in its tree changes.
+        """
+        if not self._can_snapshot_outputs():
+            return
+        root_stack_id = self.root_stack_id()
+        output_object.StackOutputSnapshot.set(
+            self.context, self.id,
+            {'root_stack_id': root_stack_id,
+             'version': self._output_snapshot_version(root_stack_id),
+             'outputs': outputs})
+
+    def invalidate_output_snapshots(self):
+        """Discard the stored outputs of every stack in the tree."""
+        if cfg.CONF.cache_stack_outputs and self.id is not None:
+            output_object.StackOutputSnapshot.delete_all_by_root_stack(
+                self.context, self.root_stack_id())
+
     def _set_param_stackid(self):
         """Update self.parameters with the current ARN.
 
@@ -1000,6 +1133,16 @@ class Stack(collections.abc.Mapping):
         unique_defns = set(res.t for res in resources.values())
         unique_defn_names = set(defn.name for defn in unique_defns)
 
+        if self.strict_validate and not validate_res_tmpl_only:
+            self._prefetch_constraint_values(
+                res for res in resources.values()
+                if res.name in unique_defn_names and res.external_id is None)
+            if self.nested_depth == 0:
+                self._validate_nested_stacks(
+                    res for res in resources.values()
+                    if (res.name in unique_defn_names and
+                        res.external_id is None))
+
         for res in iter_rsc:
             # Don't validate identical definitions multiple times
             if res.name not in unique_defn_names:
@@ -1042,6 +1185,63 @@ class Stack(collections.abc.Mapping):
                     path=path,
                     message=ex.error_message)
 
+    def _prefetch_constraint_values(self, resources):
+        """Look up the custom constraint values of resources concurrently.
+
+        This avoids looking up each image, flavor, network &c. in turn as the
+        resources that use them are validated.
+        """
+        max_workers = cfg.CONF.constraint_lookup_workers
+        if max_workers < 1:
+            return
+
+        constraint_values = itertools.chain.from_iterable(
+            res.properties.custom_constraint_values() for res in resources)
+        constraints.prefetch_custom_constraints(self.context,
+                                                constraint_values,
+                                                max_workers)
+
+    def _validate_nested_stacks(self, resources):
+        """Validate the distinct nested stacks of resources concurrently.
+
+        Any errors are ignored here; they are reported when each resource is
+        subsequently validated in turn, at which point nested stacks already
+        found to be valid are not validated again.
+        """
+        max_workers = cfg.CONF.nested_validation_workers
+        if max_workers < 1:
+            return
+
+        validations = self.context.cache(NestedStackValidations)
+        nested_stacks = {}
+        for res in resources:
+            prepare = getattr(res, 'prepare_nested_validation', None)
+            if prepare is None:
+                continue
+            try:
+                nested_stack = prepare()
+            except Exception as exc:
+                LOG.debug('Unable to parse nested stack of %(res)s: %(exc)s',
+                          {'res': res.name, 'exc': exc})
+                continue
+            if nested_stack is not None:
+                key = validations.digest(nested_stack) or id(nested_stack)
+                nested_stacks.setdefault(key, nested_stack)
+
+        # With a single nested stack there is nothing to run concurrently
+        if len(nested_stacks) < 2:
+            return
+
+        num_workers = min(max_workers, len(nested_stacks))
+        with futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = [executor.submit(validations.validate, nested_stack)
+                       for nested_stack in nested_stacks.values()]
+            for result in results:
+                try:
+                    result.result()
+                except Exception as exc:
+                    LOG.debug('Nested stack validation failed: %s', exc)
+
     def requires_deferred_auth(self):
         """Determine whether to perform API requests with deferred auth.
 
@@ -1306,12 +1506,16 @@ class Stack(collections.abc.Mapping):
         def get_error_wait_time(resource):
             return resource.cancel_grace_period()
 
+        pool = action_pool.get_pool()
         action_task = scheduler.DependencyTaskGroup(
             self.dependencies,
             resource_action,
             reverse,
             error_wait_time=get_error_wait_time,
-            aggregate_exceptions=aggregate_exceptions)
+            aggregate_exceptions=aggregate_exceptions,
+            timeline={} if timeline.enabled() else None,
+            executor=pool.executor if pool is not None else None,
+            limits=pool.resource_limits if pool is not None else None)
 
         try:
             yield from action_task()
@@ -1326,6 +1530,9 @@ class Stack(collections.abc.Mapping):
             # see scheduler.py line 395-399
             stack_status = self.FAILED
             reason = 'Resource %s failed: %s' % (action, str(ex))
+        finally:
+            self._store_timeline(action_task.timeline,
+                                 lambda r: (r.name, action != self.DELETE))
 
         if pre_completion_func:
             pre_completion_func(self, action, stack_status, reason)
@@ -1337,6 +1544,12 @@ class Stack(collections.abc.Mapping):
         lifecycle_plugin_utils.do_post_ops(self.context, self, None, action,
                                            (self.status == self.FAILED))
 
+    def _store_timeline(self, task_timeline, node_info):
+        """Store the timeline of a legacy operation on the stack."""
+        if task_timeline and self.id is not None:
+            timeline.store_legacy(self.context, self.id,
+                                  task_timeline, node_info)
+
     @profiler.trace('Stack.check', hide_args=False)
     @reset_state_on_error
     def check(self, notify=None):
@@ -1531,20 +1744,27 @@ class Stack(collections.abc.Mapping):
         LOG.debug('Starting traversal %s with dependencies: %s',
                   self.current_traversal, self.convergence_dependencies)
 
-        # create sync_points for all nodes (resources and snapshots) in DB
-        for node in self.convergence_dependencies:
-            sync_point.create(self.context, node.rsrc_id,
-                              self.current_traversal, node.is_update,
-                              self.id)
-        # create sync_point entry for stack
-        sync_point.create(
-            self.context, self.id, self.current_traversal, True, self.id)
+        record_timeline = timeline.enabled()
+        if record_timeline:
+            timeline.clear(self.context, self.id)
+
+        # create sync_points for all nodes (resources and snapshots) and for
+        # the stack in DB
+        sync_point.create_all(
+            self.context, self.current_traversal, self.id,
+            itertools.chain(((node.rsrc_id, node.is_update)
+                             for node in self.convergence_dependencies),
+                            [(self.id, True)]))
 
         leaves = set(self.convergence_dependencies.leaves())
         if not leaves:
             self.mark_complete()
         else:
+            ready = timeline.now()
+            kickoff = scheduler.RateLimiter(cfg.CONF.convergence_kickoff_rate,
+                                            cfg.CONF.convergence_kickoff_burst)
             for node in sorted(leaves, key=lambda n: n.is_update):
+                kickoff.wait()
                 if node.node_type == NODE_TYPE_SNAPSHOT:
                     LOG.info("Triggering snapshot %s for deletion",
                              node.rsrc_id)
@@ -1555,6 +1775,8 @@ class Stack(collections.abc.Mapping):
                     LOG.info("Triggering resource %s for cleanup",
                              node.rsrc_id)
                 input_data = sync_point.serialize_input_data({})
+                if record_timeline:
+                    timeline.add_to_rpc_data(input_data, ready=ready)
                 self.worker_client.check_resource(self.context, node.rsrc_id,
                                                   self.current_traversal,
                                                   input_data, node.is_update,
@@ -1562,8 +1784,6 @@ class Stack(collections.abc.Mapping):
                                                   self.converge,
                                                   node_type=node.node_type,
                                                   abandon=abandon)
-                if scheduler.ENABLE_SLEEP:
-                    time.sleep(1)
 
     def rollback(self):
         old_tmpl_id = self.prev_raw_template_id
@@ -1620,15 +1840,18 @@ class Stack(collections.abc.Mapping):
         self.ext_rsrcs_db = self.db_active_resources_get()
 
         rsrcs = {}
+        new_rsrcs = []
 
         for rsrc in reversed(self.dependencies):
             existing_rsrc_db = self._get_best_existing_rsrc_db(rsrc.name)
             if existing_rsrc_db is None:
                 rsrc.current_template_id = self.t.id
-                rsrc.store()
+                new_rsrcs.append(rsrc)
                 rsrcs[rsrc.name] = rsrc
             else:
                 rsrcs[existing_rsrc_db.name] = existing_rsrc_db
+
+        resource.Resource.store_all(self.context, new_rsrcs)
         return rsrcs
 
     def _compute_convg_dependencies(self, existing_resources,
@@ -1803,6 +2026,8 @@ class Stack(collections.abc.Mapping):
                                            progress_callback=check_message)
             finally:
                 self.reset_dependencies()
+                self._store_timeline(update_task.timeline,
+                                     update_task.timeline_node_info)
 
             self.status_reason = 'Stack %s completed successfully' % action
             self.status = self.COMPLETE
@@ -2021,9 +2246,71 @@ class Stack(collections.abc.Mapping):
             self.user_creds_id = None
         return stack_status, reason
 
+    @classmethod
+    def _finish_cleanup_of(cls, cnxt_dict, user_creds_id, project_id):
+        # Avoid sharing the database session of the deleting context with
+        # the background thread
+        cnxt = common_context.RequestContext.from_dict(cnxt_dict)
+        cls.finish_cleanup(cnxt, user_creds_id, project_id)
+
+    @classmethod
+    def finish_cleanup(cls, cnxt, user_creds_id, project_id):
+        """Delete what a deleted stack left to be deleted in the background.
+
+        The stack domain project, if any, is deleted first, then the trust of
+        the stored credentials and finally the credentials themselves, which
+        mark the cleanup as unfinished until then. The stored context is used
+        to delete the trust unless the given context is that of the trustor.
+        """
+        user_creds = ucreds_object.UserCreds.get_by_id(cnxt, user_creds_id)
+        if user_creds is None:
+            # Already deleted, e.g. when the stack was purged
+            return
+
+        if project_id:
+            cls._delete_domain_project(cnxt.clients.client('keystone'),
+                                       project_id)
+
+        trust_id = user_creds.get('trust_id')
+        if trust_id:
+            trust_cnxt = cnxt
+            if cnxt.user_id != user_creds.get('trustor_user_id'):
+                creds = user_creds.obj_to_primitive()["versioned_object.data"]
+                trust_cnxt = common_context.StoredContext.from_dict(
+                    creds, request_id=cnxt.request_id,
+                    is_admin=False, overwrite=False)
+            try:
+                trust_cnxt.clients.client('keystone').delete_trust(trust_id)
+            except exception.AuthorizationFailure:
+                LOG.warning("The stored context is no longer valid. "
+                            "Skip deleting the trust %s.", trust_id)
+
+        try:
+            ucreds_object.UserCreds.delete(cnxt, user_creds_id)
+        except exception.NotFound:
+            pass
+
+    @staticmethod
+    def _delete_domain_project(keystone, project_id):
+        pool = stack_user_pool.get_pool()
+        if pool is not None:
+            pool.release_project(project_id)
+            stack_user_pool.delete_leftover_users(keystone, project_id)
+        keystone.delete_stack_domain_project(project_id=project_id)
+
     def _delete_credentials(self, stack_status, reason, abandon):
         # The stack_status and reason passed in are current values, which
         # may get rewritten and returned from this method
+        reaper = None if abandon else stack_reaper.get_reaper()
+        if reaper is not None and self.user_creds_id:
+            # The deleted stack still refers to the stored credentials until
+            # they are deleted last, so that another engine can finish the
+            # cleanup if this one stops first
+            reaper.submit('clean up deleted stack %s' % self.id,
+                          self._finish_cleanup_of, self.context.to_dict(),
+                          self.user_creds_id, self.stack_user_project_id)
+            return stack_status, reason
+
         stack_status, reason = self._delete_user_cred(stack_status, reason)
         try:
             self.store()
@@ -2034,9 +2321,8 @@ class Stack(collections.abc.Mapping):
         # If the stack has a domain project, delete it
         if self.stack_user_project_id and not abandon:
             try:
-                keystone = self.clients.client('keystone')
-                keystone.delete_stack_domain_project(
-                    project_id=self.stack_user_project_id)
+                self._delete_domain_project(self.clients.client('keystone'),
+                                            self.stack_user_project_id)
             except Exception as ex:
                 LOG.exception("Error deleting project")
                 stack_status = self.FAILED
@@ -2095,9 +2381,11 @@ class Stack(collections.abc.Mapping):
                                'Failed stack pre-ops: %s' % str(e))
                 return
 
-        action_task = scheduler.DependencyTaskGroup(self.dependencies,
-                                                    resource.Resource.destroy,
-                                                    reverse=True)
+        action_task = scheduler.DependencyTaskGroup(
+            self.dependencies,
+            resource.Resource.destroy,
+            reverse=True,
+            timeline={} if timeline.enabled() and not backup else None)
         try:
             scheduler.TaskRunner(action_task)(timeout=self.timeout_secs())
         except exception.ResourceFailure as ex:
@@ -2106,6 +2394,9 @@ class Stack(collections.abc.Mapping):
         except scheduler.Timeout:
             stack_status = self.FAILED
             reason = '%s timed out' % action.title()
+        finally:
+            self._store_timeline(action_task.timeline,
+                                 lambda r: (r.name, False))
 
         # If the stack delete succeeded, this is not a backup stack and it's
         # not a nested stack, we should delete the credentials
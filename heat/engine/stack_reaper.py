@@ -0,0 +1,91 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+
+from oslo_config import cfg
+from oslo_log import log as logging
+import tenacity
+
+from heat.engine import shared_object
+
+LOG = logging.getLogger(__name__)
+
+# Number of times a cleanup task is attempted before it is given up on, and
+# the maximum number of seconds to wait between attempts.
+RETRY_ATTEMPTS = 5
+RETRY_MAX_WAIT = 60
+
+
+class StackReaper(object):
+    """Threads on which deleted stacks are cleaned up.
+
+    Cleanup tasks, such as deleting the stack domain project and the trust
+    of a stack, are run once its
+    resources have been deleted and retried if they fail, without holding up
+    the completion of the stack delete. Tasks must leave a record that lets
+    EngineService.finish_stack_cleanup() complete them should they not run.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='heat-stack-reaper')
+
+    def _run(self, description, func, args):
+        def log_retry(retry_state):
+            LOG.warning('Failed to %(task)s, retrying: %(error)s',
+                        {'task': description,
+                         'error': retry_state.outcome.exception()})
+
+        retrying = tenacity.Retrying(
+            stop=tenacity.stop_after_attempt(RETRY_ATTEMPTS),
+            wait=tenacity.wait_random_exponential(max=RETRY_MAX_WAIT),
+            before_sleep=log_retry,
+            reraise=True)
+        try:
+            retrying(func, *args)
+        except Exception:
+            LOG.exception('Failed to %s', description)
+
+    def submit(self, description, func, *args):
+        """Run func(*args) in the background until it succeeds.
+
+        The description completes the sentence "Failed to ..." in the
+        messages logged when it does not.
+        """
+        return self._executor.submit(self._run, description, func, args)
+
+    def shutdown(self, wait=True):
+        """Stop the background threads once the queued tasks are done."""
+        self._executor.shutdown(wait=wait)
+
+
+def _create_reaper():
+    max_workers = cfg.CONF.stack_cleanup_workers
+    if max_workers > 0:
+        return StackReaper(max_workers)
+
+
+_reaper = shared_object.SharedObject(_create_reaper)
+
+
+def get_reaper():
+    """Return the engine's StackReaper, or None if cleanup is done inline."""
+    return _reaper.get()
+
+
+def shutdown():
+    """Wait for the queued cleanup tasks of this engine to finish."""
+    _reaper.shutdown()
@@ -0,0 +1,199 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from concurrent import futures
+import threading
+import uuid
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from heat.common import password_gen
+from heat.engine import shared_object
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of stack domain projects for which an engine keeps pooled
+# users. The users pooled for the least recently used project are deleted
+# when another project is added.
+MAX_PROJECTS = 32
+
+USERNAME_PREFIX = 'heat-pool-'
+
+
+class _ProjectPool(object):
+    def __init__(self, keystone, expected):
+        self.keystone = keystone
+        self.users = collections.deque()
+        # The number of further users the stack may need
+        self.expected = expected
+        self.filling = False
+
+
+class StackUserPool(object):
+    """Stack domain users created in advance.
+
+    Users are pooled per stack domain project. The first user taken for a
+    project starts filling its pool in the background, up to the number of
+    other resources of the stack that may need a user, so that those only
+    have to rename one. Users that are no longer needed are deleted in the
+    background too.
+
+    Pooled users are named with USERNAME_PREFIX and have the stack domain
+    project as their default project, so that any that are left over, e.g.
+    because an engine stopped abruptly, are deleted with the project.
+    """
+
+    def __init__(self, size, max_workers=4):
+        self.size = size
+        self._lock = threading.Lock()
+        self._projects = collections.OrderedDict()
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='heat-stack-user-pool')
+
+    def _target(self, pool):
+        return min(self.size, pool.expected)
+
+    def get(self, keystone, project_id, count_expected):
+        """Take a user from the pool of a project.
+
+        Returns the ID of the user, or None if no user is available, in
+        which case the caller should create one itself. The first time a
+        project is seen, count_expected() is called to find the number of
+        other resources of the stack that may need a user, which is the most
+        that are created in advance for it. The pool is topped up in the
+        background.
+        """
+        with self._lock:
+            new_project = project_id not in self._projects
+        expected = count_expected() if new_project else 0
+
+        evicted = []
+        user_id = None
+        with self._lock:
+            pool = self._projects.get(project_id)
+            if pool is None:
+                pool = self._projects[project_id] = _ProjectPool(keystone,
+                                                                 expected)
+                while len(self._projects) > MAX_PROJECTS:
+                    evicted.append(self._projects.popitem(last=False))
+            else:
+                self._projects.move_to_end(project_id)
+                pool.expected = max(pool.expected - 1, 0)
+                if pool.users:
+                    user_id = pool.users.popleft()
+            fill = not pool.filling and len(pool.users) < self._target(pool)
+            if fill:
+                pool.filling = True
+
+        for old_project_id, old_pool in evicted:
+            self._delete_pooled(old_project_id, old_pool)
+        if fill:
+            self._executor.submit(self._fill, project_id, pool)
+        return user_id
+
+    def _fill(self, project_id, pool):
+        keystone = pool.keystone
+        try:
+            while True:
+                with self._lock:
+                    if (self._projects.get(project_id) is not pool or
+                            len(pool.users) >= self._target(pool)):
+                        return
+                user_id = keystone.create_stack_domain_user(
+                    username=USERNAME_PREFIX + uuid.uuid4().hex,
+                    project_id=project_id,
+                    password=password_gen.generate_openstack_password())
+                with self._lock:
+                    if self._projects.get(project_id) is pool:
+                        pool.users.append(user_id)
+                        continue
+                # The project was released while the user was created
+                self._delete(keystone, project_id, user_id)
+                return
+        except Exception:
+            LOG.exception('Failed to create pooled users for project %s',
+                          project_id)
+        finally:
+            with self._lock:
+                pool.filling = False
+
+    @staticmethod
+    def _delete(keystone, project_id, user_id, credential_id=None):
+        try:
+            if credential_id is not None:
+                keystone.delete_stack_domain_user_keypair(
+                    user_id=user_id, project_id=project_id,
+                    credential_id=credential_id)
+            keystone.delete_stack_domain_user(user_id=user_id,
+                                              project_id=project_id)
+        except Exception:
+            LOG.exception('Failed to delete stack domain user %s', user_id)
+
+    def _delete_pooled(self, project_id, pool):
+        for user_id in pool.users:
+            self._executor.submit(self._delete, pool.keystone, project_id,
+                                  user_id)
+        pool.users.clear()
+
+    def reclaim(self, keystone, project_id, user_id, credential_id=None):
+        """Delete a user, and optionally its keypair, in the background."""
+        self._executor.submit(self._delete, keystone, project_id, user_id,
+                              credential_id)
+
+    def release_project(self, project_id):
+        """Delete the pooled users of a project that is being deleted."""
+        with self._lock:
+            pool = self._projects.pop(project_id, None)
+        if pool is not None:
+            self._delete_pooled(project_id, pool)
+
+    def shutdown(self, wait=True):
+        """Delete all pooled users and stop the background threads."""
+        with self._lock:
+            projects = list(self._projects.items())
+            self._projects.clear()
+        for project_id, pool in projects:
+            self._delete_pooled(project_id, pool)
+        self._executor.shutdown(wait=wait)
+
+
+def delete_leftover_users(keystone, project_id):
+    """Delete any pooled users of a stack domain project that remain.
+
+    This is called before the project is deleted, and finds the users
+    through Keystone so that it also covers those pooled by engines that
+    have since stopped.
+    """
+    keystone.delete_stack_domain_users(project_id, USERNAME_PREFIX)
+
+
+def _create_pool():
+    size = cfg.CONF.stack_user_pool_size
+    if size > 0:
+        return StackUserPool(size)
+
+
+_pool = shared_object.SharedObject(_create_pool)
+
+
+def get_pool():
+    """Return the engine's StackUserPool, or None if pooling is disabled."""
+    return _pool.get()
+
+
+def shutdown():
+    """Delete the users pooled by this engine."""
+    _pool.shutdown()
@@ -41,6 +41,7 @@ class StackDefinition(object):
                                               template.env.params,
                                               template.env.param_defaults)
         self._resource_defns = None
+        self._rsrc_defn_cache = {}
         self._resources = {}
         self._output_defns = None
 
@@ -62,13 +63,25 @@ class StackDefinition(object):
         return self._template.env
 
     def _load_rsrc_defns(self):
-        self._resource_defns = self._template.resource_definitions(self)
+        defns = self._template.resource_definitions(self)
+        # Keep the definitions that have already been loaded individually, so
+        # that callers always see the same object for a resource.
+        defns.update((name, defn)
+                     for name, defn in self._rsrc_defn_cache.items()
+                     if name in defns)
+        self._resource_defns = defns
 
     def resource_definition(self, resource_name):
         """Return the definition of the given resource."""
-        if self._resource_defns is None:
-            self._load_rsrc_defns()
-        return self._resource_defns[resource_name]
+        if self._resource_defns is not None:
+            return self._resource_defns[resource_name]
+
+        # Parse only the requested resource, so that e.g. loading a single
+        # resource does not cost as much as loading the whole template.
+        if resource_name not in self._rsrc_defn_cache:
+            self._rsrc_defn_cache[resource_name] = (
+                self._template.resource_definition(self, resource_name))
+        return self._rsrc_defn_cache[resource_name]
 
     def enabled_rsrc_names(self):
         """Return the set of names of all enabled resources in the template."""
@@ -260,6 +273,7 @@ def update_resource_data(stack_definition, resource_name, resource_data):
     op_defns = stack_definition._output_defns or {}
 
     all_defns = itertools.chain(res_defns.values(),
+                                stack_definition._rsrc_defn_cache.values(),
                                 op_defns.values())
     for defn in all_defns:
         if resource_name in defn.required_resource_names():
@@ -275,6 +289,7 @@ def add_resource(stack_definition, resource_definition):
     stack_definition._resources.pop(resource_name, None)
     stack_definition._resource_data.pop(resource_name, None)
     stack_definition.t.add_resource(resource_definition)
+    stack_definition._rsrc_defn_cache[resource_name] = resource_definition
     if stack_definition._resource_defns is not None:
         stack_definition._resource_defns[resource_name] = resource_definition
 
@@ -285,6 +300,7 @@ def remove_resource(stack_definition, resource_name):
     Remove the resource from the template and eliminate references to it.
     """
     stack_definition.t.remove_resource(resource_name)
+    stack_definition._rsrc_defn_cache.pop(resource_name, None)
     if stack_definition._resource_defns is not None:
         stack_definition._resource_defns.pop(resource_name, None)
     stack_definition._resource_data.pop(resource_name, None)
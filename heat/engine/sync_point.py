@@ -18,6 +18,7 @@ import tenacity
 from oslo_log import log as logging
 
 from heat.common import exception
+from heat.engine import traversal_timing
 from heat.objects import sync_point as sync_point_object
 
 LOG = logging.getLogger(__name__)
@@ -43,6 +44,18 @@ def create(context, entity_id, traversal_id, is_update, stack_id):
     return sync_point_object.SyncPoint.create(context, values)
 
 
+def create_all(context, traversal_id, stack_id, entities):
+    """Creates sync point entries in DB for a number of entities at once.
+
+    :param entities: an iterable of (entity_id, is_update) tuples
+    """
+    values_list = [{'entity_id': entity_id, 'traversal_id': traversal_id,
+                    'is_update': is_update, 'atomic_key': 0,
+                    'stack_id': stack_id, 'input_data': {}}
+                   for entity_id, is_update in entities]
+    sync_point_object.SyncPoint.create_all(context, values_list)
+
+
 def get(context, entity_id, traversal_id, is_update):
     """Retrieves a sync point entry from DB."""
     sync_point = sync_point_object.SyncPoint.get_by_key(context, entity_id,
@@ -172,8 +185,11 @@ def update_sync_point(cnxt, entity_id, current_traversal, is_update,
             cnxt, entity_id, current_traversal, is_update,
             sync_point.atomic_key,
             serialize_input_data(input_data), extra_data)
-        return (input_data, resource_failures,
-                skip_propagate) if rows_updated else None
+        if not rows_updated:
+            traversal_timing.count(current_traversal,
+                                   traversal_timing.SYNC_POINT_CONFLICTS)
+            return None
+        return input_data, resource_failures, skip_propagate
     return _sync()
 
 
@@ -185,10 +201,12 @@ def sync(cnxt, entity_id, current_traversal, is_update, propagate,
     This function updates the sync point with new data and resource failures,
     and calls the propagate callback when all predecessors have reported.
     """
-    result = update_sync_point(
-        cnxt, entity_id, current_traversal, is_update,
-        predecessors, new_data, new_resource_failures,
-        is_skip=is_skip)
+    with traversal_timing.measure(current_traversal,
+                                  traversal_timing.SYNC_POINT):
+        result = update_sync_point(
+            cnxt, entity_id, current_traversal, is_update,
+            predecessors, new_data, new_resource_failures,
+            is_skip=is_skip)
     if result is None:
         # Sync point update failed (possibly deleted by another traversal)
         LOG.warning('[%s] Sync point update failed for entity %s',
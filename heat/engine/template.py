@@ -243,6 +243,15 @@ class Template(collections.abc.Mapping):
         """Return a dictionary of ResourceDefinition objects."""
         pass
 
+    def resource_definition(self, stack, name):
+        """Return the ResourceDefinition of a single resource.
+
+        Raises KeyError if there is no such resource, or if it is disabled by
+        a condition. Template plugins should override this to parse only the
+        requested resource; by default all of the resources are parsed.
+        """
+        return self.resource_definitions(stack)[name]
+
     @abc.abstractmethod
     def add_resource(self, definition, name=None):
         """Add a resource to the template.
@@ -342,7 +351,29 @@ class Template(collections.abc.Mapping):
 
 
 def parse(functions, stack, snippet, path='', template=None):
-    recurse = functools.partial(parse, functions, stack, template=template)
+    return _parse(functions, stack, snippet, path, template, share=True)
+
+
+def _parse(functions, stack, snippet, path, template, share, root=True):
+    """Parse a snippet, sharing any sub-trees that contain no functions.
+
+    If share is True, any dict or list (other than the snippet itself) that
+    contains no functions is returned as-is rather than being copied, so
+    that the parsed data shares its structure with the raw template. The
+    arguments to functions are always copied, since functions may return
+    (parts of) them as their results.
+    """
+    def recurse(snippet, path):
+        return _parse(functions, stack, snippet, path, template, share,
+                      root=False)
+
+    def parse_args(snippet, path=''):
+        return _parse(functions, stack, snippet, path, template, share=False)
+
+    def shared(parsed, items):
+        if share and not root and all(p is v for p, v in items):
+            return snippet
+        return parsed
 
     if isinstance(snippet, collections.abc.Mapping):
         def mkpath(key):
@@ -357,23 +388,29 @@ def parse(functions, stack, snippet, path='', template=None):
                     if (isinstance(Func, type) and
                             issubclass(Func, function.Macro)):
                         return Func(stack, fn_name, args,
-                                    functools.partial(recurse, path=path),
+                                    functools.partial(parse_args, path=path),
                                     template)
                     else:
-                        return Func(stack, fn_name, recurse(args, path))
+                        return Func(stack, fn_name, parse_args(args, path))
                 except (ValueError, TypeError, KeyError) as e:
                     raise exception.StackValidationFailed(
                         path=path,
                         message=str(e))
 
-        return dict((k, recurse(v, mkpath(k)))
-                    for k, v in snippet.items())
+        parsed = dict((k, recurse(v, mkpath(k)))
+                      for k, v in snippet.items())
+        if type(snippet) is not dict:
+            return parsed
+        return shared(parsed, ((parsed[k], v) for k, v in snippet.items()))
     elif (not isinstance(snippet, str) and
           isinstance(snippet, collections.abc.Iterable)):
 
         def mkpath(idx):
             return ''.join([path, '[%d]' % idx])
 
-        return [recurse(v, mkpath(i)) for i, v in enumerate(snippet)]
+        parsed = [recurse(v, mkpath(i)) for i, v in enumerate(snippet)]
+        if type(snippet) is not list:
+            return parsed
+        return shared(parsed, zip(parsed, snippet))
     else:
         return snippet
@@ -20,6 +20,7 @@ from heat.common.i18n import _
 from heat.engine import conditions
 from heat.engine import function
 from heat.engine import output
+from heat.engine import rsrc_defn
 from heat.engine import template
 
 
@@ -159,6 +160,52 @@ class CommonTemplate(template.Template):
         self._conditions_cache = get_cache_stack, conds
         return conds
 
+    def _check_resource_keys(self, snippet):
+        """Raise ValueError if a resource snippet contains invalid keys."""
+        pass
+
+    def _resource_definition(self, stack, name, snippet, conds):
+        """Parse a resource snippet, returning None if it is disabled."""
+        try:
+            self._check_resource_keys(snippet)
+            defn_data = dict(self._rsrc_defn_args(stack, name, snippet))
+        except (TypeError, ValueError, KeyError) as ex:
+            msg = str(ex)
+            raise exception.StackValidationFailed(message=msg)
+
+        defn = rsrc_defn.ResourceDefinition(name, **defn_data)
+        cond_name = defn.condition()
+
+        if cond_name is not None:
+            try:
+                enabled = conds.is_enabled(cond_name)
+            except ValueError as exc:
+                path = [self.RESOURCES, name, self.RES_CONDITION]
+                message = str(exc)
+                raise exception.StackValidationFailed(path=path,
+                                                      message=message)
+            if not enabled:
+                return None
+
+        return defn
+
+    def resource_definitions(self, stack):
+        resources = self.t.get(self.RESOURCES) or {}
+        conds = self.conditions(stack)
+
+        defns = ((name, self._resource_definition(stack, name, snippet,
+                                                  conds))
+                 for name, snippet in resources.items())
+        return {name: defn for name, defn in defns if defn is not None}
+
+    def resource_definition(self, stack, name):
+        resources = self.t.get(self.RESOURCES) or {}
+        defn = self._resource_definition(stack, name, resources[name],
+                                         self.conditions(stack))
+        if defn is None:
+            raise KeyError(name)
+        return defn
+
     def outputs(self, stack):
         conds = self.conditions(stack)
 
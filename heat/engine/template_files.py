@@ -12,22 +12,108 @@
 #    under the License.
 
 import collections
+import threading
 import weakref
 
+from oslo_config import cfg
+
 from heat.common import context
 from heat.common import exception
 from heat.common.i18n import _
 from heat.db import api as db_api
 from heat.objects import raw_template_files
 
-_d = weakref.WeakValueDictionary()
-
 
 class ReadOnlyDict(dict):
     def __setitem__(self, key):
         raise ValueError("Attempted to write to internal TemplateFiles cache")
 
 
+class CacheInfo(collections.namedtuple('CacheInfo', ['hits', 'misses',
+                                                     'entries',
+                                                     'resident_bytes'])):
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _files_size(files):
+    return sum(len(k) + len(v) for k, v in files.items()
+               if isinstance(v, str))
+
+
+class _FilesCache(object):
+    """The files maps of raw_template_files rows, keyed by their ID.
+
+    The rows are never updated, so the maps never need to be invalidated.
+    The most recently used maps are kept, up to a total size of
+    template_files_cache_size bytes; any others are remembered only for as
+    long as a TemplateFiles still refers to them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lru = collections.OrderedDict()
+        self._live = weakref.WeakValueDictionary()
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, files_id):
+        with self._lock:
+            files = self._live.get(files_id)
+            if files is None:
+                return None
+            self._hits += 1
+            if files_id in self._lru:
+                self._lru.move_to_end(files_id)
+            else:
+                self._keep(files_id, files)
+            return files
+
+    def put(self, files_id, files, loaded=False):
+        with self._lock:
+            if loaded:
+                self._misses += 1
+            self._live[files_id] = files
+            if files_id not in self._lru:
+                self._keep(files_id, files)
+
+    def _keep(self, files_id, files):
+        max_bytes = cfg.CONF.template_files_cache_size
+        size = _files_size(files)
+        if size > max_bytes:
+            return
+        self._lru[files_id] = (files, size)
+        self._resident_bytes += size
+        while self._resident_bytes > max_bytes:
+            self._resident_bytes -= self._lru.popitem(last=False)[1][1]
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._lru),
+                             self._resident_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._live.clear()
+            self._resident_bytes = self._hits = self._misses = 0
+
+
+_d = _FilesCache()
+
+
+def cache_info():
+    """Return the hits, misses and resident size of the files cache.
+
+    A hit is a TemplateFiles loading a files map that this engine already
+    holds, and a miss one that has to be read from the database.
+    """
+    return _d.info()
+
+
 class TemplateFiles(collections.abc.Mapping):
 
     def __init__(self, files):
@@ -41,8 +127,7 @@ class TemplateFiles(collections.abc.Mapping):
             return
         if isinstance(files, int):
             self.files_id = files
-            if self.files_id in _d:
-                self.files = _d[self.files_id]
+            self.files = _d.get(self.files_id)
             return
         if not isinstance(files, dict):
             raise ValueError(_('Expected dict, got %(cname)s for files, '
@@ -82,10 +167,7 @@ class TemplateFiles(collections.abc.Mapping):
 
     def _refresh_if_needed(self):
         # retrieve files from DB if needed
-        if self.files_id is None:
-            return
-        if self.files_id in _d:
-            self.files = _d[self.files_id]
+        if self.files_id is None or self.files is not None:
             return
         self._refresh()
 
@@ -94,7 +176,7 @@ class TemplateFiles(collections.abc.Mapping):
         rtf_obj = db_api.raw_template_files_get(ctxt, self.files_id)
         _files_dict = ReadOnlyDict(rtf_obj.files)
         self.files = _files_dict
-        _d[self.files_id] = _files_dict
+        _d.put(self.files_id, _files_dict, loaded=True)
 
     def store(self, ctxt):
         if not self.files or self.files_id is not None:
@@ -106,7 +188,7 @@ class TemplateFiles(collections.abc.Mapping):
         rtf_obj = raw_template_files.RawTemplateFiles.create(
             ctxt, {'files': self.files})
         self.files_id = rtf_obj.id
-        _d[self.files_id] = self.files
+        _d.put(self.files_id, self.files)
         return self.files_id
 
     def update(self, files):
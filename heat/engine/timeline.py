@@ -0,0 +1,232 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per-resource timelines of stack operations.
+
+For each node in the dependency graph of the most recent operation on a stack
+we record when it became ready (i.e. when the last of its dependencies
+completed), when work on it started and when it finished, along with the node
+whose completion made it ready. Following the latter links back from the last
+node to finish gives the critical path through the operation.
+"""
+
+import datetime
+import time
+import uuid
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from heat.common import timeutils as heat_timeutils
+from heat.engine import sync_point
+from heat.objects import stack_timeline as timeline_objects
+from heat.rpc import api as rpc_api
+
+LOG = logging.getLogger(__name__)
+
+# Key under which the time a node became ready is passed to check_resource
+RPC_DATA_KEY = 'timeline'
+
+
+def enabled():
+    return cfg.CONF.record_stack_timeline
+
+
+def now():
+    """Return the current time in integer milliseconds since the epoch."""
+    return int(time.time() * 1000)
+
+
+def node_key(entity, is_update):
+    return sync_point.make_key(entity, is_update)
+
+
+def add_to_rpc_data(data, blocked_by=None, ready=None):
+    """Add the time a node became ready to its check_resource data."""
+    data[RPC_DATA_KEY] = {'ready': ready if ready is not None else now(),
+                          'blocked_by': blocked_by}
+    return data
+
+
+class NodeTiming(object):
+    """The timing of a convergence node that is being worked on."""
+
+    __slots__ = ('ready', 'blocked_by', 'started')
+
+    def __init__(self, ready=None, blocked_by=None):
+        self.started = now()
+        self.ready = ready if ready is not None else self.started
+        self.blocked_by = blocked_by
+
+    @classmethod
+    def from_rpc_data(cls, data):
+        ready_data = (data or {}).get(RPC_DATA_KEY) or {}
+        return cls(ready_data.get('ready'), ready_data.get('blocked_by'))
+
+
+def record_node(cnxt, stack_id, traversal_id, entity_id, is_update,
+                resource_name, timing):
+    """Record the timing of a convergence node that has finished."""
+    values = {'stack_id': stack_id,
+              'traversal_id': traversal_id,
+              'node': node_key(entity_id, is_update),
+              'resource_name': resource_name,
+              'is_update': is_update,
+              'blocked_by': timing.blocked_by,
+              'ready_at': timing.ready,
+              'started_at': timing.started,
+              'finished_at': now()}
+    try:
+        timeline_objects.StackTimeline.create_all(cnxt, [values])
+    except Exception as exc:
+        LOG.warning('[%s] Unable to record timeline of %s: %s',
+                    traversal_id, values['node'], exc)
+
+
+def clear(cnxt, stack_id):
+    """Remove the timeline of any previous operation on a stack."""
+    timeline_objects.StackTimeline.delete_all_by_stack(cnxt, stack_id)
+
+
+def store_legacy(cnxt, stack_id, task_timeline, node_info):
+    """Store the timeline of a legacy DependencyTaskGroup run.
+
+    :param task_timeline: the timeline populated by the DependencyTaskGroup
+    :param node_info: a function that returns the resource name and whether
+                      the node is an update (as opposed to a cleanup) for a
+                      key in the dependency graph
+    """
+    def key(dep_key):
+        return node_key(*node_info(dep_key))
+
+    def ms(t):
+        return int(t * 1000) if t is not None else None
+
+    traversal_id = str(uuid.uuid4())
+    values_list = []
+    for dep_key, (ready, started, finished, blocked_by) in (
+            task_timeline.items()):
+        name, is_update = node_info(dep_key)
+        values_list.append({
+            'stack_id': stack_id,
+            'traversal_id': traversal_id,
+            'node': node_key(name, is_update),
+            'resource_name': name,
+            'is_update': is_update,
+            'blocked_by': key(blocked_by) if blocked_by is not None else None,
+            'ready_at': ms(ready),
+            'started_at': ms(started),
+            'finished_at': ms(finished)})
+
+    try:
+        clear(cnxt, stack_id)
+        timeline_objects.StackTimeline.create_all(cnxt, values_list)
+    except Exception as exc:
+        LOG.warning('Unable to store timeline of stack %s: %s',
+                    stack_id, exc)
+
+
+def critical_path(nodes):
+    """Return the keys of the nodes on the critical path, in order.
+
+    The critical path ends with the last node to finish and is traced back
+    through the node that each one was blocked by.
+    """
+    by_key = dict((n.node, n) for n in nodes)
+    finished = [n for n in nodes if n.finished_at is not None]
+    if not finished:
+        return []
+
+    path = []
+    node = max(finished, key=lambda n: n.finished_at)
+    while node is not None and node.node not in path:
+        path.append(node.node)
+        node = by_key.get(node.blocked_by)
+    path.reverse()
+    return path
+
+
+def _duration(start, end):
+    if start is None or end is None:
+        return None
+    return (end - start) / 1000.0
+
+
+def format_timeline(nodes):
+    """Return the timeline and critical path of a list of timeline nodes."""
+    if not nodes:
+        return None
+
+    nodes = sorted(nodes, key=lambda n: (n.ready_at or 0, n.id))
+    start = min(n.ready_at for n in nodes if n.ready_at is not None)
+    end = max([n.finished_at for n in nodes if n.finished_at is not None],
+              default=None)
+    path = critical_path(nodes)
+    on_path = set(path)
+    names = dict((n.node, n.resource_name) for n in nodes)
+
+    formatted_nodes = []
+    path_wait = path_work = 0.0
+    for n in nodes:
+        wait_time = _duration(n.ready_at, n.started_at)
+        work_time = _duration(n.started_at, n.finished_at)
+        if n.node in on_path:
+            path_wait += wait_time or 0.0
+            path_work += work_time or 0.0
+        formatted_nodes.append({
+            rpc_api.TIMELINE_NODE_ID: n.node,
+            rpc_api.TIMELINE_NODE_RESOURCE_NAME: n.resource_name,
+            rpc_api.TIMELINE_NODE_PHASE: (rpc_api.TIMELINE_PHASE_UPDATE
+                                          if n.is_update else
+                                          rpc_api.TIMELINE_PHASE_CLEANUP),
+            rpc_api.TIMELINE_NODE_BLOCKED_BY: names.get(n.blocked_by),
+            rpc_api.TIMELINE_NODE_READY: _duration(start, n.ready_at),
+            rpc_api.TIMELINE_NODE_STARTED: _duration(start, n.started_at),
+            rpc_api.TIMELINE_NODE_FINISHED: _duration(start, n.finished_at),
+            rpc_api.TIMELINE_NODE_WAIT_TIME: wait_time,
+            rpc_api.TIMELINE_NODE_WORK_TIME: work_time,
+            rpc_api.TIMELINE_NODE_CRITICAL: n.node in on_path,
+        })
+
+    start_time = datetime.datetime.fromtimestamp(start / 1000.0,
+                                                 datetime.timezone.utc)
+    return {
+        rpc_api.TIMELINE_TRAVERSAL_ID: nodes[0].traversal_id,
+        rpc_api.TIMELINE_START_TIME: heat_timeutils.isotime(start_time),
+        rpc_api.TIMELINE_DURATION: _duration(start, end),
+        rpc_api.TIMELINE_CRITICAL_PATH: path,
+        rpc_api.TIMELINE_CRITICAL_PATH_WAIT_TIME: path_wait,
+        rpc_api.TIMELINE_CRITICAL_PATH_WORK_TIME: path_work,
+        rpc_api.TIMELINE_NODES: formatted_nodes,
+    }
+
+
+def get_timeline(cnxt, stack):
+    """Return the timeline of the most recent operation on a stack.
+
+    Returns None if no timeline has been recorded.
+    """
+    nodes = timeline_objects.StackTimeline.get_all_by_stack(cnxt, stack.id)
+    if not nodes:
+        return None
+
+    # Nodes of a previous convergence traversal that were still running when
+    # the current one started may have been recorded since, so prefer the
+    # current traversal where it is present.
+    traversals = set(n.traversal_id for n in nodes)
+    if stack.current_traversal in traversals:
+        traversal_id = stack.current_traversal
+    else:
+        traversal_id = nodes[-1].traversal_id
+    return format_timeline([n for n in nodes
+                            if n.traversal_id == traversal_id])
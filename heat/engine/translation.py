@@ -188,11 +188,11 @@ class Translation(object):
                 self._replaced_props.append(path)
 
     def is_deleted(self, key):
-        return (self.is_active and
+        return (self.is_active and bool(self._deleted_props) and
                 self.cast_key_to_rule(key) in self._deleted_props)
 
     def is_replaced(self, key):
-        return (self.is_active and
+        return (self.is_active and bool(self._replaced_props) and
                 self.cast_key_to_rule(key) in self._replaced_props)
 
     def cast_key_to_rule(self, key):
@@ -200,6 +200,8 @@ class Translation(object):
                          if not item.isdigit()])
 
     def has_translation(self, key):
+        if not (self._rules or self.resolved_translations):
+            return False
         key = self.cast_key_to_rule(key)
         return (self.is_active and
                 (key in self._rules or key in self.resolved_translations))
@@ -0,0 +1,190 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Per-phase timing of convergence traversals.
+
+Each engine keeps, in memory, a histogram of the time spent in each phase of
+the convergence traversals it has recently worked on. The data for a traversal
+is collected from all of the engines that may have taken part in it by
+collect().
+"""
+
+import collections
+import contextlib
+import time
+
+from oslo_log import log as logging
+
+from heat.common import service_utils
+from heat.objects import service as service_objects
+from heat.rpc import listener_client
+
+LOG = logging.getLogger(__name__)
+
+PHASES = (
+    CHECK_RESOURCE, RESOURCE_LOAD, NODE_DATA, SYNC_POINT, PROPAGATE,
+) = (
+    'check_resource', 'resource_load', 'node_data', 'sync_point', 'propagate',
+)
+
+COUNTERS = (
+    SYNC_POINT_CONFLICTS,
+) = (
+    'sync_point_conflicts',
+)
+
+# Number of traversals for which timings are kept in each engine
+MAX_TRAVERSALS = 128
+
+# Upper bounds, in seconds, of the histogram buckets. The last bucket counts
+# everything that is larger.
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+
+class Histogram(object):
+    """A distribution of durations, with fixed bucket boundaries."""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                break
+        else:
+            i = len(BUCKETS)
+        self.buckets[i] += 1
+
+    def merge(self, data):
+        """Add the counts from another histogram's as_dict() output."""
+        if not data['count']:
+            return
+        self.count += data['count']
+        self.total += data['total']
+        if self.min is None or data['min'] < self.min:
+            self.min = data['min']
+        if self.max is None or data['max'] > self.max:
+            self.max = data['max']
+        self.buckets = [a + b for a, b in zip(self.buckets, data['buckets'])]
+
+    def as_dict(self):
+        return {'count': self.count,
+                'total': self.total,
+                'min': self.min,
+                'max': self.max,
+                'buckets': list(self.buckets)}
+
+
+class TraversalTimings(object):
+    """The timings and counters for a single traversal."""
+
+    def __init__(self):
+        self.phases = collections.defaultdict(Histogram)
+        self.counters = collections.Counter()
+
+    def merge(self, data):
+        for phase, hist in data['phases'].items():
+            self.phases[phase].merge(hist)
+        self.counters.update(data['counters'])
+
+    def as_dict(self):
+        return {'phases': {phase: hist.as_dict()
+                           for phase, hist in self.phases.items()},
+                'counters': dict(self.counters),
+                'buckets': list(BUCKETS)}
+
+
+_traversals = collections.OrderedDict()
+
+
+def _timings(traversal_id):
+    try:
+        timings = _traversals[traversal_id]
+    except KeyError:
+        timings = _traversals[traversal_id] = TraversalTimings()
+        while len(_traversals) > MAX_TRAVERSALS:
+            _traversals.popitem(last=False)
+    return timings
+
+
+def record(traversal_id, phase, duration):
+    """Record the duration of one occurrence of a phase of a traversal."""
+    if traversal_id:
+        _timings(traversal_id).phases[phase].add(duration)
+
+
+def count(traversal_id, counter, value=1):
+    """Increment a counter for a traversal."""
+    if traversal_id:
+        _timings(traversal_id).counters[counter] += value
+
+
+@contextlib.contextmanager
+def measure(traversal_id, phase):
+    """Context manager to record the time spent in a phase of a traversal."""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        record(traversal_id, phase, time.monotonic() - start)
+
+
+def get(traversal_id):
+    """Return the timings recorded by this engine for a traversal.
+
+    Returns None if this engine has not recorded anything for the traversal.
+    """
+    timings = _traversals.get(traversal_id)
+    if timings is None:
+        return None
+    return timings.as_dict()
+
+
+def clear():
+    _traversals.clear()
+
+
+def collect(cnxt, traversal_id):
+    """Return the timings for a traversal, aggregated across all engines."""
+    total = TraversalTimings()
+    engines = 0
+    for svc in service_objects.Service.get_all(cnxt):
+        if service_utils.format_service(svc)['status'] != 'up':
+            continue
+        client = listener_client.EngineListenerClient(svc.engine_id)
+        try:
+            data = client.get_traversal_timings(cnxt, traversal_id)
+        except Exception as exc:
+            LOG.warning('Unable to get traversal timings from engine %s: %s',
+                        svc.engine_id, exc)
+            continue
+        if data is not None:
+            total.merge(data)
+            engines += 1
+
+    result = total.as_dict()
+    result['traversal_id'] = traversal_id
+    result['engines'] = engines
+    return result
@@ -18,6 +18,7 @@ from heat.engine import dependencies
 from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import stk_defn
+from heat.engine import timeline
 from heat.objects import resource as resource_objects
 
 LOG = logging.getLogger(__name__)
@@ -34,6 +35,7 @@ class StackUpdate(object):
         self.previous_stack = previous_stack
 
         self.rollback = rollback
+        self.timeline = {} if timeline.enabled() else None
 
         self.existing_snippets = dict((n, r.frozen_definition())
                                       for n, r in self.existing_stack.items()
@@ -59,7 +61,8 @@ class StackUpdate(object):
         updater = scheduler.DependencyTaskGroup(
             self.dependencies(),
             self._resource_update,
-            error_wait_time=get_error_wait_time)
+            error_wait_time=get_error_wait_time,
+            timeline=self.timeline)
 
         if not self.rollback:
             yield from cleanup_prev()
@@ -69,6 +72,14 @@ class StackUpdate(object):
         finally:
             self.previous_stack.reset_dependencies()
 
+    def timeline_node_info(self, res):
+        """Return the name of a resource and whether it is being updated.
+
+        Resources from the existing stack that are not in the new stack, or
+        that are being replaced, are being cleaned up.
+        """
+        return res.name, self.new_stack.get(res.name) is res
+
     def _resource_update(self, res):
         if res.name in self.new_stack and self.new_stack[res.name] is res:
             return self._process_new_resource_update(res)
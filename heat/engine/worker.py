@@ -34,6 +34,7 @@ from heat.engine import node_data
 from heat.engine import scheduler
 from heat.engine import stack as parser
 from heat.engine import sync_point
+from heat.engine import timeline
 from heat.objects import stack as stack_objects
 from heat.rpc import api as rpc_api
 from heat.rpc import worker_client as rpc_client
@@ -213,6 +214,10 @@ class WorkerService(object):
             return self._handle_snapshot_node(
                 cnxt, resource_id, current_traversal, data, is_update)
 
+        node_timing = None
+        if timeline.enabled():
+            node_timing = timeline.NodeTiming.from_rpc_data(data)
+
         in_data = sync_point.deserialize_input_data(data)
         resource_data = node_data.load_resources_data(in_data if is_update
                                                       else {})
@@ -234,7 +239,8 @@ class WorkerService(object):
             cr = check_resource.CheckResource(self.engine_id,
                                               self._rpc_client,
                                               self.thread_group_mgr,
-                                              msg_queue, in_data)
+                                              msg_queue, in_data,
+                                              node_timing=node_timing)
             if current_traversal != stack.current_traversal:
                 LOG.debug('[%s] Traversal cancelled; re-trigerring.',
                           current_traversal)
@@ -55,6 +55,9 @@ class RawTemplate(
         for field in tpl.fields:
             tpl[field] = db_tpl[field]
 
+        # Templates may be stored as references to shared blobs
+        tpl.template = db_api.raw_template_expand(context, tpl.template)
+
         tpl.environment = copy.deepcopy(tpl.environment)
         # If any of the parameters were encrypted, then decrypt them
         if (tpl.environment is not None and
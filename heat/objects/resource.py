@@ -198,6 +198,10 @@ class Resource(
         return cls._from_db_object(cls(context), context,
                                    db_api.resource_create(context, values))
 
+    @classmethod
+    def create_all(cls, context, values_list):
+        return db_api.resource_create_all(context, values_list)
+
     @classmethod
     def replacement(cls, context,
                     existing_res_id,
@@ -280,6 +284,11 @@ class Resource(
             stack_id_only=True)
         return {db_res.stack_id for db_res in resources_db.values()}
 
+    @classmethod
+    def get_state_summary_by_root_stack(cls, context, stack_id):
+        return db_api.resource_get_state_summary_by_root_stack(context,
+                                                               stack_id)
+
     @classmethod
     def purge_deleted(cls, context, stack_id):
         return db_api.resource_purge_deleted(context, stack_id)
@@ -43,8 +43,10 @@ class ResourcePropertiesData(
             rpd[field] = db_rpd[field]
         if data_unencrypted:  # save a little (decryption) processing
             rpd['data'] = data_unencrypted
-        elif db_rpd['encrypted'] and rpd['data'] is not None:
-            rpd['data'] = crypt.decrypted_dict(rpd['data'])
+        else:
+            rpd['data'] = db_api.resource_prop_data_content(db_rpd)
+            if db_rpd['encrypted'] and rpd['data'] is not None:
+                rpd['data'] = crypt.decrypted_dict(rpd['data'])
 
         # TODO(cwolfe) setting the context here should go away, that
         # should have been done with the initialisation of the rpd
@@ -54,19 +56,25 @@ class ResourcePropertiesData(
         rpd.obj_reset_changes()
         return rpd
 
-    @classmethod
-    def create_or_update(cls, context, data, rpd_id=None):
+    @staticmethod
+    def _db_values(data):
         properties_data_encrypted, properties_data = \
             ResourcePropertiesData.encrypt_properties_data(data)
-        values = {'encrypted': properties_data_encrypted,
-                  'data': properties_data}
+        return {'encrypted': properties_data_encrypted,
+                'data': properties_data}
+
+    @classmethod
+    def create_or_update(cls, context, data, rpd_id=None):
         db_obj = db_api.resource_prop_data_create_or_update(
-            context, values, rpd_id)
+            context, cls._db_values(data), rpd_id)
         return cls._from_db_object(cls(), context, db_obj, data)
 
     @classmethod
     def create(cls, context, data):
-        return ResourcePropertiesData.create_or_update(context, data)
+        """Store properties data, sharing any identical data stored."""
+        db_obj = db_api.resource_prop_data_get_or_create(
+            context, cls._db_values(data))
+        return cls._from_db_object(cls(), context, db_obj, data)
 
     @staticmethod
     def encrypt_properties_data(data):
@@ -46,6 +46,9 @@ class SoftwareConfig(
 
         for field in config.fields:
             config[field] = db_config[field]
+
+        # The shared part of the config may be stored separately
+        config.config = db_api.software_config_expand(context, config.config)
         config._context = context
         config.obj_reset_changes()
         return config
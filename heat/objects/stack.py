@@ -159,6 +159,32 @@ class Stack(
             except exception.NotFound:
                 pass
 
+    @classmethod
+    def get_all_summaries(cls, context, limit=None, sort_keys=None,
+                          marker=None, sort_dir=None, filters=None,
+                          show_deleted=False, show_nested=False,
+                          show_hidden=False, tags=None, tags_any=None,
+                          not_tags=None, not_tags_any=None):
+        """Return dicts of the columns needed to list stacks.
+
+        This avoids building a Stack object (and querying its tags) for every
+        stack listed.
+        """
+        return db_api.stack_get_all_summaries(
+            context,
+            limit=limit,
+            sort_keys=sort_keys,
+            marker=marker,
+            sort_dir=sort_dir,
+            filters=filters,
+            show_deleted=show_deleted,
+            show_nested=show_nested,
+            show_hidden=show_hidden,
+            tags=tags,
+            tags_any=tags_any,
+            not_tags=not_tags,
+            not_tags_any=not_tags_any)
+
     @classmethod
     def get_all_by_owner_id(cls, context, owner_id):
         db_stacks = db_api.stack_get_all_by_owner_id(context, owner_id)
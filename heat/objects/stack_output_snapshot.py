@@ -0,0 +1,63 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""StackOutputSnapshot object."""
+
+from oslo_versionedobjects import base
+from oslo_versionedobjects import fields
+
+from heat.db import api as db_api
+from heat.objects import base as heat_base
+from heat.objects import fields as heat_fields
+
+
+class StackOutputSnapshot(
+        heat_base.HeatObject,
+        base.VersionedObjectDictCompat,
+        base.ComparableVersionedObject,
+):
+
+    fields = {
+        'stack_id': fields.StringField(),
+        'root_stack_id': fields.StringField(nullable=True),
+        'version': fields.StringField(),
+        'outputs': heat_fields.JsonField(nullable=True),
+        'created_at': fields.DateTimeField(read_only=True),
+        'updated_at': fields.DateTimeField(nullable=True),
+    }
+
+    @staticmethod
+    def _from_db_object(context, snapshot, db_snapshot):
+        for field in snapshot.fields:
+            snapshot[field] = db_snapshot[field]
+        snapshot._context = context
+        snapshot.obj_reset_changes()
+        return snapshot
+
+    @classmethod
+    def get_by_stack(cls, context, stack_id):
+        db_snapshot = db_api.stack_output_snapshot_get(context, stack_id)
+        if db_snapshot is None:
+            return None
+        return cls._from_db_object(context, cls(), db_snapshot)
+
+    @classmethod
+    def set(cls, context, stack_id, values):
+        db_snapshot = db_api.stack_output_snapshot_set(context, stack_id,
+                                                       values)
+        return cls._from_db_object(context, cls(), db_snapshot)
+
+    @classmethod
+    def delete_all_by_root_stack(cls, context, root_stack_id):
+        return db_api.stack_output_snapshot_delete_all_by_root_stack(
+            context, root_stack_id)
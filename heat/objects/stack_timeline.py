@@ -0,0 +1,64 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""StackTimeline object."""
+
+from oslo_versionedobjects import base
+from oslo_versionedobjects import fields
+
+from heat.db import api as db_api
+from heat.objects import base as heat_base
+
+
+class StackTimeline(
+        heat_base.HeatObject,
+        base.VersionedObjectDictCompat,
+        base.ComparableVersionedObject,
+):
+
+    fields = {
+        'id': fields.IntegerField(),
+        'stack_id': fields.StringField(),
+        'traversal_id': fields.StringField(),
+        'node': fields.StringField(),
+        'resource_name': fields.StringField(nullable=True),
+        'is_update': fields.BooleanField(nullable=True),
+        'blocked_by': fields.StringField(nullable=True),
+        'ready_at': fields.IntegerField(nullable=True),
+        'started_at': fields.IntegerField(nullable=True),
+        'finished_at': fields.IntegerField(nullable=True),
+        'created_at': fields.DateTimeField(read_only=True),
+        'updated_at': fields.DateTimeField(nullable=True),
+    }
+
+    @staticmethod
+    def _from_db_object(context, timeline, db_timeline):
+        for field in timeline.fields:
+            timeline[field] = db_timeline[field]
+        timeline._context = context
+        timeline.obj_reset_changes()
+        return timeline
+
+    @classmethod
+    def create_all(cls, context, values_list):
+        db_api.stack_timeline_create_all(context, values_list)
+
+    @classmethod
+    def get_all_by_stack(cls, context, stack_id, traversal_id=None):
+        return [cls._from_db_object(context, cls(), db_timeline)
+                for db_timeline in db_api.stack_timeline_get_all_by_stack(
+                    context, stack_id, traversal_id)]
+
+    @classmethod
+    def delete_all_by_stack(cls, context, stack_id):
+        return db_api.stack_timeline_delete_all_by_stack(context, stack_id)
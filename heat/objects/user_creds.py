@@ -71,3 +71,9 @@ class UserCreds(
         user_creds_db = db_api.user_creds_get(context, user_creds_id)
         user_creds = cls._from_db_object(cls(), user_creds_db)
         return user_creds
+
+    @classmethod
+    def get_all_of_deleted_stacks(cls, context):
+        return [(str(user_creds_id), project_id)
+                for user_creds_id, project_id in
+                db_api.user_creds_get_all_of_deleted_stacks(context)]
@@ -613,6 +613,19 @@ stacks_policies = [
             }
         ],
         deprecated_rule=deprecated_show_output
+    ),
+    policy.DocumentedRuleDefault(
+        name=POLICY_ROOT % 'timeline',
+        check_str=base.PROJECT_READER,
+        scope_types=['project'],
+        description='Show the timeline of the most recent stack operation.',
+        operations=[
+            {
+                'path': '/v1/{tenant_id}/stacks/{stack_name}/{stack_id}/'
+                'timeline',
+                'method': 'GET'
+            }
+        ]
     )
 ]
 
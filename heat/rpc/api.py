@@ -20,14 +20,14 @@ PARAM_KEYS = (
     PARAM_CLEAR_PARAMETERS, PARAM_GLOBAL_TENANT, PARAM_LIMIT,
     PARAM_NESTED_DEPTH, PARAM_TAGS, PARAM_SHOW_HIDDEN, PARAM_TAGS_ANY,
     PARAM_NOT_TAGS, PARAM_NOT_TAGS_ANY, TEMPLATE_TYPE, PARAM_WITH_DETAIL,
-    RESOLVE_OUTPUTS, PARAM_IGNORE_ERRORS, PARAM_CONVERGE
+    RESOLVE_OUTPUTS, PARAM_IGNORE_ERRORS, PARAM_CONVERGE, REFRESH_OUTPUTS
 ) = (
     'timeout_mins', 'disable_rollback', 'adopt_stack_data',
     'show_deleted', 'show_nested', 'existing',
     'clear_parameters', 'global_tenant', 'limit',
     'nested_depth', 'tags', 'show_hidden', 'tags_any',
     'not_tags', 'not_tags_any', 'template_type', 'with_detail',
-    'resolve_outputs', 'ignore_errors', 'converge'
+    'resolve_outputs', 'ignore_errors', 'converge', 'refresh_outputs'
 )
 
 STACK_KEYS = (
@@ -112,6 +112,7 @@ NOTIFY_KEYS = (
     NOTIFY_DESCRIPTION,
     NOTIFY_UPDATE_AT,
     NOTIFY_TAGS,
+    NOTIFY_TRAVERSAL_TIMINGS,
 ) = (
     'tenant_id',
     'user_id',
@@ -125,6 +126,7 @@ NOTIFY_KEYS = (
     STACK_DESCRIPTION,
     'updated_at',
     STACK_TAGS,
+    'traversal_timings',
 )
 
 VALIDATE_PARAM_KEYS = (
@@ -250,6 +252,54 @@ RESOURCE_SNAPSHOT_KEYS = (
     'creation_time',
 )
 
+TIMELINE_KEYS = (
+    TIMELINE_TRAVERSAL_ID,
+    TIMELINE_START_TIME,
+    TIMELINE_DURATION,
+    TIMELINE_CRITICAL_PATH,
+    TIMELINE_CRITICAL_PATH_WAIT_TIME,
+    TIMELINE_CRITICAL_PATH_WORK_TIME,
+    TIMELINE_NODES,
+) = (
+    'traversal_id',
+    'start_time',
+    'duration',
+    'critical_path',
+    'critical_path_wait_time',
+    'critical_path_work_time',
+    'nodes',
+)
+
+TIMELINE_NODE_KEYS = (
+    TIMELINE_NODE_ID,
+    TIMELINE_NODE_RESOURCE_NAME,
+    TIMELINE_NODE_PHASE,
+    TIMELINE_NODE_BLOCKED_BY,
+    TIMELINE_NODE_READY,
+    TIMELINE_NODE_STARTED,
+    TIMELINE_NODE_FINISHED,
+    TIMELINE_NODE_WAIT_TIME,
+    TIMELINE_NODE_WORK_TIME,
+    TIMELINE_NODE_CRITICAL,
+) = (
+    'id',
+    'resource_name',
+    'phase',
+    'blocked_by',
+    'ready',
+    'started',
+    'finished',
+    'wait_time',
+    'work_time',
+    'critical',
+)
+
+TIMELINE_PHASES = (
+    TIMELINE_PHASE_UPDATE, TIMELINE_PHASE_CLEANUP,
+) = (
+    'update', 'cleanup',
+)
+
 THREAD_MESSAGES = (THREAD_CANCEL,
                    THREAD_CANCEL_WITH_ROLLBACK
                    ) = ('cancel', 'cancel_with_rollback')
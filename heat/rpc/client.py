@@ -60,6 +60,9 @@ class EngineClient(object):
         1.34 - Add migrate_convergence_1 call
         1.35 - Add with_condition to list_template_functions
         1.36 - Add files_container to create/update/preview/validate
+        1.37 - Add get_traversal_timings call
+        1.38 - Add get_stack_timeline call
+        1.39 - Add refresh_outputs to stack show
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -200,18 +203,22 @@ class EngineClient(object):
                                              not_tags_any=not_tags_any),
                          version='1.33')
 
-    def show_stack(self, ctxt, stack_identity, resolve_outputs=True):
+    def show_stack(self, ctxt, stack_identity, resolve_outputs=True,
+                   refresh_outputs=False):
         """Returns detailed information about one or all stacks.
 
         :param ctxt: RPC context.
         :param stack_identity: Name of the stack you want to show, or None to
                                show all
         :param resolve_outputs: If True, stack outputs will be resolved
+        :param refresh_outputs: If True, stored stack outputs will not be
+                                used, but resolved again
         """
         return self.call(ctxt, self.make_msg('show_stack',
                                              stack_identity=stack_identity,
-                                             resolve_outputs=resolve_outputs),
-                         version='1.20')
+                                             resolve_outputs=resolve_outputs,
+                                             refresh_outputs=refresh_outputs),
+                         version='1.39')
 
     def preview_stack(self, ctxt, stack_name, template, params, files,
                       args, environment_files=None, files_container=None):
@@ -833,3 +840,28 @@ class EngineClient(object):
                          self.make_msg('migrate_convergence_1',
                                        stack_id=stack_id),
                          version='1.34')
+
+    def get_traversal_timings(self, ctxt, stack_id, traversal_id=None):
+        """Get the per-phase timings of a convergence traversal.
+
+        :param ctxt: RPC context
+        :param stack_id: ID of the stack
+        :param traversal_id: ID of the traversal; defaults to the stack's
+                             current traversal
+        """
+        return self.call(ctxt,
+                         self.make_msg('get_traversal_timings',
+                                       stack_id=stack_id,
+                                       traversal_id=traversal_id),
+                         version='1.37')
+
+    def get_stack_timeline(self, ctxt, stack_identity):
+        """Get the timeline of the most recent operation on a stack.
+
+        :param ctxt: RPC context
+        :param stack_identity: Name of the stack you want to see.
+        """
+        return self.call(ctxt,
+                         self.make_msg('get_stack_timeline',
+                                       stack_identity=stack_identity),
+                         version='1.38')
@@ -29,6 +29,7 @@ class EngineListenerClient(object):
     API version history::
 
         1.0 - Initial version.
+        1.1 - Add get_traversal_timings.
     """
 
     BASE_RPC_API_VERSION = '1.0'
@@ -46,3 +47,7 @@ class EngineListenerClient(object):
             return self._client.call(ctxt, 'listening')
         except messaging.MessagingTimeout:
             return False
+
+    def get_traversal_timings(self, ctxt, traversal_id):
+        return self._client.prepare(version='1.1').call(
+            ctxt, 'get_traversal_timings', traversal_id=traversal_id)
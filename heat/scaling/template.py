@@ -45,12 +45,13 @@ def member_definitions(old_resources, new_definition,
     for i in range(num_resources):
         if i < len(old_resources):
             old_name, old_definition = old_resources[i]
-            custom_definition = customise(old_name, new_definition)
-            if old_definition != custom_definition and num_replace > 0:
-                num_replace -= 1
-                yield old_name, custom_definition
-            else:
-                yield old_name, old_definition
+            if num_replace > 0:
+                custom_definition = customise(old_name, new_definition)
+                if old_definition != custom_definition:
+                    num_replace -= 1
+                    yield old_name, custom_definition
+                    continue
+            yield old_name, old_definition
         else:
             new_name = get_new_id()
             yield new_name, customise(new_name, new_definition)
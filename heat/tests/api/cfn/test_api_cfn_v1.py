@@ -205,8 +205,9 @@ class CfnStackControllerTest(common.HeatTestCase):
         self.assertEqual('1970-01-01', stack['LastUpdatedTime'])
         self.m_call.assert_called_once_with(
             dummy_req.context, ('show_stack', {'stack_identity': None,
-                                               'resolve_outputs': True}),
-            version='1.20'
+                                               'resolve_outputs': True,
+                                               'refresh_outputs': False}),
+            version='1.39'
         )
 
     def test_describe_no_last_updated_time(self):
@@ -227,8 +228,9 @@ class CfnStackControllerTest(common.HeatTestCase):
         self.assertNotIn('LastUpdatedTime', stack)
         self.m_call.assert_called_once_with(
             dummy_req.context, ('show_stack', {'stack_identity': None,
-                                               'resolve_outputs': True}),
-            version='1.20'
+                                               'resolve_outputs': True,
+                                               'refresh_outputs': False}),
+            version='1.39'
         )
 
     def test_describe(self):
@@ -318,8 +320,9 @@ class CfnStackControllerTest(common.HeatTestCase):
         ), mock.call(
             dummy_req.context,
             ('show_stack', {'stack_identity': identity,
-                            'resolve_outputs': True}),
-            version='1.20'
+                            'resolve_outputs': True,
+                            'refresh_outputs': False}),
+            version='1.39'
         )], self.m_call.call_args_list)
 
     def test_describe_arn(self):
@@ -407,8 +410,9 @@ class CfnStackControllerTest(common.HeatTestCase):
         self.m_call.assert_called_once_with(
             dummy_req.context,
             ('show_stack', {'stack_identity': identity,
-                            'resolve_outputs': True}),
-            version='1.20'
+                            'resolve_outputs': True,
+                            'refresh_outputs': False}),
+            version='1.39'
         )
 
     def test_describe_arn_invalidtenant(self):
@@ -429,8 +433,9 @@ class CfnStackControllerTest(common.HeatTestCase):
         self.assertIsInstance(result, exception.HeatInvalidParameterValueError)
         self.m_call.assert_called_once_with(
             dummy_req.context, ('show_stack', {'stack_identity': identity,
-                                               'resolve_outputs': True},),
-            version='1.20'
+                                               'resolve_outputs': True,
+                                               'refresh_outputs': False},),
+            version='1.39'
         )
 
     def test_describe_aterr(self):
@@ -449,8 +454,9 @@ class CfnStackControllerTest(common.HeatTestCase):
             dummy_req.context, ('identify_stack', {'stack_name': stack_name})
         ), mock.call(
             dummy_req.context, ('show_stack', {'stack_identity': identity,
-                                               'resolve_outputs': True}),
-            version='1.20'
+                                               'resolve_outputs': True,
+                                               'refresh_outputs': False}),
+            version='1.39'
         )], self.m_call.call_args_list)
 
     def test_describe_bad_name(self):
@@ -266,6 +266,20 @@ class RoutesTest(common.HeatTestCase):
             }
         )
 
+    def test_stack_timeline(self):
+        self.assertRoute(
+            self.m,
+            '/aaaa/stacks/teststack/bbbb/timeline',
+            'GET',
+            'timeline',
+            'StackController',
+            {
+                'tenant_id': 'aaaa',
+                'stack_name': 'teststack',
+                'stack_id': 'bbbb'
+            }
+        )
+
     def test_stack_data_template(self):
         self.assertRoute(
             self.m,
@@ -1630,8 +1630,9 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         mock_call.assert_called_once_with(
             req.context,
             ('show_stack', {'stack_identity': dict(identity),
-                            'resolve_outputs': True}),
-            version='1.20'
+                            'resolve_outputs': True,
+                            'refresh_outputs': False}),
+            version='1.39'
         )
 
     def test_show_without_resolve_outputs(self, mock_enforce):
@@ -1695,8 +1696,44 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         mock_call.assert_called_once_with(
             req.context,
             ('show_stack', {'stack_identity': dict(identity),
-                            'resolve_outputs': False}),
-            version='1.20'
+                            'resolve_outputs': False,
+                            'refresh_outputs': False}),
+            version='1.39'
+        )
+
+    def test_show_refresh_outputs(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'show', True)
+        identity = identifier.HeatIdentifier(self.tenant, 'wordpress', '6')
+        req = self._get('/stacks/%(stack_name)s/%(stack_id)s' % identity,
+                        params={'refresh_outputs': 'true'})
+
+        outputs = [{'output_key': 'WebsiteURL',
+                    'description': 'URL for Wordpress wiki',
+                    'output_value': 'http://10.0.0.8/wordpress'}]
+        engine_resp = [
+            {
+                'stack_identity': dict(identity),
+                'stack_name': identity.stack_name,
+                'outputs': outputs,
+                'stack_action': 'CREATE',
+                'stack_status': 'COMPLETE',
+            }
+        ]
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        response = self.controller.show(req,
+                                        tenant_id=identity.tenant,
+                                        stack_name=identity.stack_name,
+                                        stack_id=identity.stack_id)
+
+        self.assertEqual(outputs, response['stack']['outputs'])
+        mock_call.assert_called_once_with(
+            req.context,
+            ('show_stack', {'stack_identity': dict(identity),
+                            'resolve_outputs': True,
+                            'refresh_outputs': True}),
+            version='1.39'
         )
 
     def test_show_notfound(self, mock_enforce):
@@ -1720,8 +1757,9 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
         mock_call.assert_called_once_with(
             req.context,
             ('show_stack', {'stack_identity': dict(identity),
-                            'resolve_outputs': True}),
-            version='1.20'
+                            'resolve_outputs': True,
+                            'refresh_outputs': False}),
+            version='1.39'
         )
 
     # the test_show_invalidtenant for stacks is now dealt with srbac
@@ -2420,6 +2458,44 @@ class StackControllerTest(tools.ControllerTest, common.HeatTestCase):
             version='1.22'
         )
 
+    def test_timeline(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'timeline', True)
+        identity = identifier.HeatIdentifier(self.tenant, 'wordpress', '6')
+        req = self._get('/stacks/%(stack_name)s/%(stack_id)s/timeline' %
+                        identity)
+
+        engine_resp = {'traversal_id': '1234', 'critical_path': ['a:True'],
+                       'nodes': []}
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        ret = self.controller.timeline(req,
+                                       tenant_id=identity.tenant,
+                                       stack_name=identity.stack_name,
+                                       stack_id=identity.stack_id)
+        self.assertEqual({'timeline': engine_resp}, ret)
+
+        mock_call.assert_called_once_with(
+            req.context,
+            ('get_stack_timeline', {'stack_identity': dict(identity)}),
+            version='1.38'
+        )
+
+    def test_timeline_err_denied_policy(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'timeline', False)
+        identity = identifier.HeatIdentifier(self.tenant, 'wordpress', '6')
+        req = self._get('/stacks/%(stack_name)s/%(stack_id)s/timeline' %
+                        identity)
+
+        resp = tools.request_with_middleware(
+            fault.FaultWrapper,
+            self.controller.timeline,
+            req, tenant_id=self.tenant,
+            stack_name=identity.stack_name,
+            stack_id=identity.stack_id)
+        self.assertEqual(403, resp.status_int)
+        self.assertIn('403 Forbidden', str(resp))
+
     def test_abandon(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'abandon', True)
         identity = identifier.HeatIdentifier(self.tenant, 'wordpress', '6')
@@ -106,3 +106,23 @@ class ResourceTemplatesTest(common.HeatTestCase):
             ('old-id-0', {'type': 'Bar'}),
             ('old-id-1', {'type': 'Bar'})]
         self.assertEqual(second_batch_expected, list(templates))
+
+    def test_replace_stops_customising_when_done(self):
+        """Test case for not building definitions that are not needed.
+
+        Once the specified number of replacements has been made, the new
+        definition is not customised for the remaining old resources.
+        """
+        old_resources = [('old-id-%d' % i, {'type': 'Foo'}) for i in range(4)]
+        customised = []
+
+        def customise(name, definition):
+            customised.append(name)
+            return definition
+
+        templates = template.member_definitions(old_resources,
+                                                {'type': 'Bar'}, 4, 1,
+                                                self.next_id, customise)
+        self.assertEqual(['Bar', 'Foo', 'Foo', 'Foo'],
+                         [d['type'] for n, d in templates])
+        self.assertEqual(['old-id-0'], customised)
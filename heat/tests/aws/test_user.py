@@ -23,6 +23,7 @@ from heat.engine import node_data
 from heat.engine.resources.aws.iam import user
 from heat.engine.resources.openstack.heat import access_policy as ap
 from heat.engine import scheduler
+from heat.engine import stack_user_pool
 from heat.engine import stk_defn
 from heat.objects import resource_data as resource_data_object
 from heat.tests import common
@@ -374,6 +375,22 @@ class AccessKeyTest(common.HeatTestCase):
         scheduler.TaskRunner(rsrc.delete)()
         self.assertEqual((rsrc.DELETE, rsrc.COMPLETE), rsrc.state)
 
+    def test_access_key_pooled_user(self):
+        pool = mock.Mock()
+        pool.get.return_value = self.fc.user_id
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+        t = template_format.parse(user_accesskey_template)
+        stack = utils.parse_stack(t)
+
+        user_rsrc = self.create_user(t, stack, 'CfnUser')
+        self.assertEqual({'user_id': self.fc.user_id}, user_rsrc.data())
+        rsrc = self.create_access_key(t, stack, 'HostKeys')
+        self.assertEqual(self.fc.access, rsrc.resource_id)
+        self.assertEqual(self.fc.secret, rsrc._secret)
+
+        scheduler.TaskRunner(rsrc.delete)()
+        self.assertEqual((rsrc.DELETE, rsrc.COMPLETE), rsrc.state)
+
     def test_access_key_get_from_keystone(self):
         self.patchobject(user.AccessKey, 'keystone', return_value=self.fc)
         t = template_format.parse(user_accesskey_template)
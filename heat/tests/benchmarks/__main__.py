@@ -0,0 +1,129 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Run the engine benchmark suite.
+
+Usage::
+
+    python -m heat.tests.benchmarks [--size N ...] [--iterations N]
+                                    [--json FILE] [--baseline FILE]
+                                    [BENCHMARK ...]
+"""
+
+# flake8: noqa: E402
+
+from oslo_service import backend
+backend.init_backend(backend.BackendType.THREADING)
+
+import argparse
+import json
+import platform
+import sys
+
+from heat.tests.benchmarks import base
+from heat.tests.benchmarks import group_benchmarks
+from heat.tests.benchmarks import stack_benchmarks
+from heat.tests.benchmarks import template_benchmarks
+from heat import version
+
+_ROW = '%-22s %7s %10s %10s %10s %10s %12s %10s %8s'
+
+
+def _format_row(result, baseline=None):
+    ratio = ''
+    if baseline is not None:
+        ratio = '%.2fx' % (result.mean / baseline['mean'])
+    return _ROW % (result.name, result.size,
+                   '%.4f' % result.mean,
+                   '%.4f' % result.p50,
+                   '%.4f' % result.p90,
+                   '%.4f' % result.p99,
+                   '%.1f' % result.throughput if result.throughput else '-',
+                   '%.1f' % (result.peak_memory / 1048576.0)
+                   if result.peak_memory is not None else '-',
+                   ratio)
+
+
+def _load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {(r['name'], r['size']): r for r in data['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m heat.tests.benchmarks',
+        description='Benchmark the Heat engine offline, using sqlite and '
+                    'the fake messaging driver.')
+    parser.add_argument('benchmarks', nargs='*', metavar='BENCHMARK',
+                        help='Benchmarks to run (default: all)')
+    parser.add_argument('--list', action='store_true',
+                        help='List the available benchmarks and exit')
+    parser.add_argument('--size', type=int, action='append', dest='sizes',
+                        help='Number of resources; may be repeated '
+                             '(default: per-benchmark sizes)')
+    parser.add_argument('--iterations', type=int, default=5,
+                        help='Timed iterations per size (default: 5)')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='Untimed iterations per size (default: 1)')
+    parser.add_argument('--no-memory', action='store_false',
+                        dest='measure_memory',
+                        help='Skip the peak memory measurement')
+    parser.add_argument('--json', metavar='FILE',
+                        help='Write the results as JSON to FILE')
+    parser.add_argument('--baseline', metavar='FILE',
+                        help='Compare mean latency against a previous JSON '
+                             'result file')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for benchmark_cls in base.all_benchmarks():
+            print('%-22s %s' % (benchmark_cls.name,
+                                benchmark_cls.__doc__.splitlines()[0]))
+        return 0
+
+    if args.benchmarks:
+        try:
+            selected = [base.get_benchmark(n) for n in args.benchmarks]
+        except KeyError as exc:
+            parser.error('Unknown benchmark %s' % exc)
+    else:
+        selected = base.all_benchmarks()
+
+    baseline = _load_baseline(args.baseline) if args.baseline else {}
+
+    print(_ROW % ('benchmark', 'size', 'mean(s)', 'p50(s)', 'p90(s)',
+                  'p99(s)', 'items/s', 'peak(MiB)', 'vs base'))
+    results = []
+    for benchmark_cls in selected:
+        for size in args.sizes or benchmark_cls.sizes:
+            result = base.run_benchmark(benchmark_cls, size,
+                                        iterations=args.iterations,
+                                        warmup=args.warmup,
+                                        measure_memory=args.measure_memory)
+            results.append(result)
+            print(_format_row(result,
+                              baseline.get((result.name, result.size))))
+            sys.stdout.flush()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'heat_version': version.version_info.version_string(),
+                       'python': platform.python_version(),
+                       'results': [r._asdict() for r in results]},
+                      f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
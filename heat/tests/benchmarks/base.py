@@ -0,0 +1,210 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Infrastructure for benchmarking the engine's hot paths offline.
+
+Benchmarks run in a single process against an in-memory sqlite database and
+the fake oslo.messaging driver, so no cloud or external services are needed.
+"""
+
+import collections
+import gc
+import logging
+import math
+import os
+import time
+import tracemalloc
+
+import fixtures
+from oslo_config import cfg
+
+from heat.common import context
+from heat.common import messaging
+from heat.common import policy
+from heat.engine.clients.os import keystone
+from heat.engine.clients.os.keystone import fake_keystoneclient as fake_ks
+from heat.tests import utils
+
+
+_benchmarks = collections.OrderedDict()
+
+
+def register(benchmark_cls):
+    """Class decorator to add a benchmark to the suite."""
+    _benchmarks[benchmark_cls.name] = benchmark_cls
+    return benchmark_cls
+
+
+def all_benchmarks():
+    return list(_benchmarks.values())
+
+
+def get_benchmark(name):
+    return _benchmarks[name]
+
+
+class Benchmark(object):
+    """A single benchmark, parameterised by its size.
+
+    Subclasses implement run(), which is timed once per iteration. Any setup
+    that should not be timed goes in setUp() (once per size) or prepare()
+    (before every iteration).
+    """
+
+    name = None
+    sizes = (100, 1000)
+
+    def __init__(self, size):
+        self.size = size
+
+    def setUp(self):
+        pass
+
+    def prepare(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def tearDown(self):
+        pass
+
+
+class BenchmarkEnvironment(fixtures.Fixture):
+    """A minimal engine environment, as used by the unit tests."""
+
+    def _setUp(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'heat.engine.scheduler.ENABLE_SLEEP', False))
+        self.useFixture(fixtures.FakeLogger(level=logging.WARNING))
+
+        project_dir = os.path.abspath(
+            os.path.join(os.path.dirname(__file__), '../../../'))
+        cfg.CONF.set_default('environment_dir',
+                             os.path.join(project_dir,
+                                          'etc', 'heat', 'environment.d'))
+        cfg.CONF.set_default('template_dir',
+                             os.path.join(project_dir,
+                                          'etc', 'heat', 'templates'))
+        cfg.CONF.set_override('max_resources_per_stack', -1)
+        cfg.CONF.set_override('max_template_size', 64 * 1024 * 1024)
+        self.addCleanup(cfg.CONF.reset)
+
+        messaging.setup('fake://', optional=True)
+        self.addCleanup(messaging.cleanup)
+
+        self.useFixture(fixtures.MockPatchObject(
+            keystone.KeystoneClientPlugin, '_create',
+            return_value=fake_ks.FakeKeystoneClient()))
+        self.useFixture(fixtures.MockPatchObject(
+            policy.ResourceEnforcer, 'enforce'))
+        self.useFixture(fixtures.MockPatchObject(context, 'StoredContext'))
+
+        utils.setup_dummy_db()
+        self.addCleanup(utils.reset_dummy_db)
+
+
+def percentile(sorted_values, pct):
+    """Return the given percentile of a sorted list, by nearest rank."""
+    rank = int(math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[max(rank - 1, 0)]
+
+
+Result = collections.namedtuple('Result', [
+    'name', 'size', 'iterations',
+    'mean', 'min', 'max', 'p50', 'p90', 'p99',
+    'throughput', 'peak_memory',
+])
+
+
+def run_benchmark(benchmark_cls, size, iterations=5, warmup=1,
+                  measure_memory=True):
+    """Run a benchmark at the given size and return a Result.
+
+    Latencies are in seconds, throughput is in items (i.e. ``size`` units)
+    per second, and peak memory is the peak traced Python allocation in
+    bytes during one extra (untimed) iteration.
+    """
+    with BenchmarkEnvironment():
+        benchmark = benchmark_cls(size)
+        benchmark.setUp()
+        try:
+            for i in range(warmup):
+                benchmark.prepare()
+                benchmark.run()
+
+            timings = []
+            for i in range(iterations):
+                benchmark.prepare()
+                gc.collect()
+                start = time.perf_counter()
+                benchmark.run()
+                timings.append(time.perf_counter() - start)
+
+            peak_memory = None
+            if measure_memory:
+                benchmark.prepare()
+                gc.collect()
+                tracemalloc.start()
+                try:
+                    benchmark.run()
+                    peak_memory = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        finally:
+            benchmark.tearDown()
+
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    return Result(name=benchmark_cls.name,
+                  size=size,
+                  iterations=iterations,
+                  mean=mean,
+                  min=timings[0],
+                  max=timings[-1],
+                  p50=percentile(timings, 50),
+                  p90=percentile(timings, 90),
+                  p99=percentile(timings, 99),
+                  throughput=size / mean if mean else None,
+                  peak_memory=peak_memory)
+
+
+def make_template(size, resource_type='OS::Heat::TestResource', fanout=10):
+    """Return a HOT template dict containing ``size`` resources.
+
+    The resources form a tree in which each resource depends on a parent
+    ``fanout`` times less numerous, so that there is both parallelism and
+    dependency ordering to exercise. Resources of type OS::Heat::TestResource
+    reference their parent's attribute through get_attr; others use
+    depends_on.
+    """
+    resources = {}
+    for i in range(size):
+        name = 'r%d' % i
+        if resource_type == 'OS::Heat::TestResource':
+            value = {'list_join': ['-', [{'get_param': 'prefix'}, name]]}
+            if i:
+                parent = 'r%d' % ((i - 1) // fanout)
+                value['list_join'][1].append(
+                    {'get_attr': [parent, 'output']})
+            resources[name] = {'type': resource_type,
+                               'properties': {'value': value}}
+        else:
+            resources[name] = {'type': resource_type}
+            if i:
+                resources[name]['depends_on'] = ['r%d' % ((i - 1) // fanout)]
+    return {
+        'heat_template_version': '2015-10-15',
+        'parameters': {'prefix': {'type': 'string', 'default': 'bench'}},
+        'resources': resources,
+    }
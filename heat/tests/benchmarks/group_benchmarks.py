@@ -0,0 +1,173 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from heat.common import grouputils
+from heat.engine import rsrc_defn
+from heat.engine import stack
+from heat.engine import template
+from heat.scaling import template as scl_template
+from heat.tests.benchmarks import base
+from heat.tests import utils
+
+
+def _member_properties(prefix):
+    return {'name': '%s-%%index%%' % prefix,
+            'tags': ['group', 'member-%index%'],
+            'config': {'flavor': 'm1.small',
+                       'networks': [{'network': 'private'},
+                                    {'network': 'public'}],
+                       'metadata': {'role': 'worker',
+                                    'index': '%index%'}}}
+
+
+class _FakeInspector(object):
+
+    def __init__(self, nested_template):
+        self._template = nested_template
+
+    def template(self):
+        return self._template
+
+    def member_names(self, include_failed=False):
+        return list(self._template.t['resources'])
+
+
+@base.register
+class ResourceGroupRollingUpdate(base.Benchmark):
+    """Plan one batch of a rolling update of a ResourceGroup.
+
+    Every member of the existing nested stack has an out-of-date definition,
+    and a tenth of them are replaced in the batch.
+    """
+
+    name = 'group_rolling_update'
+    sizes = (100, 1000, 10000)
+
+    def setUp(self):
+        ctx = utils.dummy_context()
+        tmpl = template.Template({
+            'heat_template_version': '2015-04-30',
+            'resources': {
+                'group': {
+                    'type': 'OS::Heat::ResourceGroup',
+                    'properties': {
+                        'count': self.size,
+                        'resource_def': {
+                            'type': 'OS::Heat::None',
+                            'properties': _member_properties('new')}}}}})
+        # Resources hold only a weak reference to their Stack
+        self.stack = stack.Stack(ctx, 'bench_group', tmpl)
+        self.group = self.stack['group']
+
+        old_definitions = [
+            (str(i), rsrc_defn.ResourceDefinition(
+                str(i), 'OS::Heat::None',
+                self.group._handle_repl_val(str(i),
+                                            _member_properties('old'))))
+            for i in range(self.size)]
+        inspector = _FakeInspector(
+            scl_template.make_template(old_definitions))
+
+        self._orig_from_parent = grouputils.GroupInspector.__dict__[
+            'from_parent_resource']
+        grouputils.GroupInspector.from_parent_resource = classmethod(
+            lambda cls, parent: inspector)
+
+    def tearDown(self):
+        grouputils.GroupInspector.from_parent_resource = (
+            self._orig_from_parent)
+
+    def run(self):
+        self.group._assemble_for_rolling_update(self.size,
+                                                max(self.size // 10, 1))
+
+
+@base.register
+class ResourceGroupResize(base.Benchmark):
+    """Generate the nested template to add one member to a ResourceGroup."""
+
+    name = 'group_resize'
+    sizes = (100, 1000, 10000)
+
+    def setUp(self):
+        ctx = utils.dummy_context()
+        tmpl = template.Template({
+            'heat_template_version': '2015-04-30',
+            'resources': {
+                'group': {
+                    'type': 'OS::Heat::ResourceGroup',
+                    'properties': {
+                        'count': self.size + 1,
+                        'resource_def': {
+                            'type': 'OS::Heat::None',
+                            'properties': _member_properties('member')}}}}})
+        # Resources hold only a weak reference to their Stack
+        self.stack = stack.Stack(ctx, 'bench_group', tmpl)
+        self.group = self.stack['group']
+
+        definitions = [
+            (str(i), self.group.build_resource_definition(
+                str(i), self.group.get_resource_def()))
+            for i in range(self.size)]
+        nested = stack.Stack(ctx, 'bench_group_nested',
+                             scl_template.make_template(definitions),
+                             action=stack.Stack.CREATE,
+                             status=stack.Stack.COMPLETE)
+        self.group.resource_id = nested.store()
+        self.names = list(self.group._resource_names())
+
+    def run(self):
+        tmpl = self.group._assemble_resized(self.names)
+        assert tmpl is not None
+
+
+@base.register
+class ResourceGroupMemberDefinitions(base.Benchmark):
+    """Parse the definitions of all members of a ResourceGroup.
+
+    This is what the engine does when loading the nested stack of the group,
+    so the peak memory shows the cost of holding the member definitions.
+    """
+
+    name = 'group_member_defns'
+    sizes = (100, 1000, 5000)
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        tmpl = template.Template({
+            'heat_template_version': '2015-04-30',
+            'resources': {
+                'group': {
+                    'type': 'OS::Heat::ResourceGroup',
+                    'properties': {
+                        'count': self.size,
+                        'resource_def': {
+                            'type': 'OS::Heat::None',
+                            'properties': _member_properties('member')}}}}})
+        # Resources hold only a weak reference to their Stack
+        self.stack = stack.Stack(self.ctx, 'bench_group', tmpl)
+        group = self.stack['group']
+        nested = group._assemble_nested(list(group._resource_names()))
+        # As loaded from the database
+        self.nested_template = json.dumps(nested.t)
+
+    def prepare(self):
+        self.nested = stack.Stack(
+            self.ctx, 'bench_group_nested',
+            template.Template(json.loads(self.nested_template)))
+
+    def run(self):
+        definitions = self.nested.t.resource_definitions(self.nested)
+        assert len(list(definitions.values())) == self.size
@@ -0,0 +1,218 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heat.engine import service
+from heat.engine import stack
+from heat.engine import template
+from heat.rpc import worker_client
+from heat.tests.benchmarks import base
+from heat.tests.convergence.framework import engine_wrapper
+from heat.tests.convergence.framework import processes
+from heat.tests import utils
+
+
+def _legacy_stack(ctx, name, size, resource_type):
+    tmpl = template.Template(base.make_template(size, resource_type))
+    stk = stack.Stack(ctx, name, tmpl)
+    stk.store()
+    return stk
+
+
+def _check_complete(stk, action):
+    assert stk.state == (action, stk.COMPLETE), stk.status_reason
+
+
+@base.register
+class StackLoad(base.Benchmark):
+    """Load a stored stack and all of its resources from the database."""
+
+    name = 'stack_load'
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        stk = _legacy_stack(self.ctx, 'bench_load', self.size,
+                            'OS::Heat::None')
+        stk.create()
+        _check_complete(stk, stk.CREATE)
+        self.stack_id = stk.id
+
+    def run(self):
+        stk = stack.Stack.load(self.ctx, stack_id=self.stack_id)
+        assert len(stk.resources) == self.size
+
+
+class LegacyStackAction(base.Benchmark):
+    resource_type = 'OS::Heat::TestResource'
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        self.count = 0
+
+    def _new_stack(self):
+        self.count += 1
+        return _legacy_stack(self.ctx, 'bench_%d' % self.count, self.size,
+                             self.resource_type)
+
+
+@base.register
+class LegacyCreate(LegacyStackAction):
+    """Create a stack using the legacy (non-convergence) engine."""
+
+    name = 'legacy_create'
+
+    def prepare(self):
+        self.stack = self._new_stack()
+
+    def run(self):
+        self.stack.create()
+        _check_complete(self.stack, self.stack.CREATE)
+
+
+@base.register
+class LegacyDelete(LegacyStackAction):
+    """Delete a stack using the legacy (non-convergence) engine."""
+
+    name = 'legacy_delete'
+
+    def prepare(self):
+        self.stack = self._new_stack()
+        self.stack.create()
+
+    def run(self):
+        self.stack.delete()
+        _check_complete(self.stack, self.stack.DELETE)
+
+
+class ConvergenceStackAction(base.Benchmark):
+    """Base class for benchmarks of complete convergence traversals.
+
+    RPC messages to the workers are queued and processed synchronously in the
+    same process by the convergence test framework's event loop.
+    """
+
+    resource_type = 'OS::Heat::TestResource'
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        self.procs = processes.Processes()
+        self.srv = service.EngineService('host', 'engine')
+        self.srv.thread_group_mgr = (
+            engine_wrapper.SynchronousThreadGroupManager())
+        self.srv.worker_service = self.procs.worker
+        self._patch_check_resource()
+        self.count = 0
+
+    def _patch_check_resource(self):
+        self._orig_check_resource = worker_client.WorkerClient.check_resource
+        worker_client.WorkerClient.check_resource = (
+            lambda client, *args, **kwargs:
+                self.procs.worker.check_resource(*args, **kwargs))
+
+    def tearDown(self):
+        worker_client.WorkerClient.check_resource = self._orig_check_resource
+        self.procs.clear()
+
+    def _create(self, tmpl):
+        self.count += 1
+        identity = self.srv.create_stack(self.ctx, 'bench_%d' % self.count,
+                                         tmpl, params={}, files={}, args={})
+        self.procs.event_loop()
+        self._check_complete(identity, stack.Stack.CREATE)
+        return identity
+
+    def _check_complete(self, identity, action):
+        stk = stack.Stack.load(self.ctx, stack_id=identity['stack_id'],
+                               show_deleted=True)
+        _check_complete(stk, action)
+
+    def _template(self, **kwargs):
+        return base.make_template(self.size, self.resource_type, **kwargs)
+
+
+@base.register
+class ConvergenceCreate(ConvergenceStackAction):
+    """Create a stack using the convergence engine."""
+
+    name = 'convergence_create'
+
+    def setUp(self):
+        super(ConvergenceCreate, self).setUp()
+        self.tmpl = self._template()
+
+    def run(self):
+        self._create(self.tmpl)
+
+
+@base.register
+class ConvergenceUpdate(ConvergenceStackAction):
+    """Update every resource in a stack using the convergence engine."""
+
+    name = 'convergence_update'
+
+    def setUp(self):
+        super(ConvergenceUpdate, self).setUp()
+        self.identity = dict(self._create(self._template()))
+        self.updates = 0
+
+    def prepare(self):
+        self.updates += 1
+        self.tmpl = self._template()
+        self.tmpl['parameters']['prefix']['default'] = 'u%d' % self.updates
+
+    def run(self):
+        self.srv.update_stack(self.ctx, self.identity, self.tmpl,
+                              params={}, files={}, args={})
+        self.procs.event_loop()
+        self._check_complete(self.identity, stack.Stack.UPDATE)
+
+
+@base.register
+class ConvergenceDelete(ConvergenceStackAction):
+    """Delete a stack using the convergence engine."""
+
+    name = 'convergence_delete'
+
+    def setUp(self):
+        super(ConvergenceDelete, self).setUp()
+        self.tmpl = self._template()
+
+    def prepare(self):
+        self.identity = dict(self._create(self.tmpl))
+
+    def run(self):
+        self.srv.delete_stack(self.ctx, self.identity)
+        self.procs.event_loop()
+        self._check_complete(self.identity, stack.Stack.DELETE)
+
+
+@base.register
+class ConvergenceSetup(ConvergenceStackAction):
+    """Start a convergence create traversal without processing it.
+
+    This covers storing the stack's resources and the traversal's sync points
+    before the first check_resource messages are sent.
+    """
+
+    name = 'convergence_setup'
+
+    def setUp(self):
+        super(ConvergenceSetup, self).setUp()
+        self.tmpl = self._template()
+
+    def prepare(self):
+        self.procs.clear()
+
+    def run(self):
+        self.count += 1
+        self.srv.create_stack(self.ctx, 'bench_%d' % self.count, self.tmpl,
+                              params={}, files={}, args={})
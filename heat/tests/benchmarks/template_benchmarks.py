@@ -0,0 +1,104 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import yaml
+
+from heat.common import identifier
+from heat.common import template_format
+from heat.engine import function
+from heat.engine import node_data
+from heat.engine import stk_defn
+from heat.engine import template
+from heat.tests.benchmarks import base
+from heat.tests import utils
+
+
+def _stack_identifier():
+    return identifier.HeatIdentifier('test_tenant_id', 'bench', 'bench-id')
+
+
+@base.register
+class TemplateParse(base.Benchmark):
+    """Parse a YAML template string."""
+
+    name = 'template_parse'
+    sizes = (100, 1000, 10000)
+
+    def setUp(self):
+        self.tmpl_str = yaml.safe_dump(base.make_template(self.size))
+
+    def run(self):
+        template_format.parse(self.tmpl_str)
+
+
+@base.register
+class StackDefinitionBuild(base.Benchmark):
+    """Create a StackDefinition and parse all of its resource definitions."""
+
+    name = 'stack_definition'
+    sizes = (100, 1000, 10000)
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        self.tmpl = base.make_template(self.size)
+
+    def run(self):
+        defn = stk_defn.StackDefinition(self.ctx,
+                                        template.Template(self.tmpl),
+                                        _stack_identifier(), None)
+        defn.enabled_rsrc_names()
+
+
+@base.register
+class FunctionResolve(base.Benchmark):
+    """Resolve the properties of every resource in a parsed template."""
+
+    name = 'function_resolve'
+    sizes = (100, 1000, 10000)
+
+    def setUp(self):
+        ctx = utils.dummy_context()
+        tmpl = template.Template(base.make_template(self.size))
+        resources = tmpl.t['resources']
+        resource_data = {
+            name: node_data.NodeData(i, name, None, name,
+                                     {'output': name}, 'CREATE', 'COMPLETE')
+            for i, name in enumerate(resources)}
+        # Functions hold only a weak reference to the StackDefinition
+        self.defn = stk_defn.StackDefinition(ctx, tmpl, _stack_identifier(),
+                                             resource_data)
+        self.snippets = [tmpl.parse(self.defn, snippet['properties'])
+                         for snippet in resources.values()]
+
+    def run(self):
+        for snippet in self.snippets:
+            function.resolve(snippet)
+
+
+@base.register
+class ResourceDefinitionLoad(base.Benchmark):
+    """Parse the definition of a single resource, as Resource.load does."""
+
+    name = 'resource_definition'
+    sizes = (1000, 10000)
+
+    def setUp(self):
+        self.ctx = utils.dummy_context()
+        self.tmpl = base.make_template(self.size)
+        self.name = 'r%d' % (self.size - 1)
+
+    def run(self):
+        defn = stk_defn.StackDefinition(self.ctx,
+                                        template.Template(self.tmpl),
+                                        _stack_identifier(), None)
+        defn.resource_definition(self.name)
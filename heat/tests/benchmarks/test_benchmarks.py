@@ -0,0 +1,81 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import io
+import json
+import os
+
+import fixtures
+import testtools
+
+from heat.tests.benchmarks import __main__ as runner
+from heat.tests.benchmarks import base
+from heat.tests import common
+
+
+class BenchmarkSmokeTest(common.HeatTestCase):
+    """Run every benchmark at a tiny size to check that it still works."""
+
+    scenarios = [(b.name, {'benchmark': b}) for b in base.all_benchmarks()]
+
+    def test_run(self):
+        result = base.run_benchmark(self.benchmark, 3, iterations=2,
+                                    warmup=0)
+        self.assertEqual(self.benchmark.name, result.name)
+        self.assertEqual(2, result.iterations)
+        self.assertLessEqual(result.min, result.p50)
+        self.assertLessEqual(result.p50, result.max)
+        self.assertGreater(result.peak_memory, 0)
+
+
+class BenchmarkRunnerTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(BenchmarkRunnerTest, self).setUp()
+        self.stdout = io.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+
+    def test_list(self):
+        self.assertEqual(0, runner.main(['--list']))
+        names = [line.split()[0]
+                 for line in self.stdout.getvalue().splitlines()]
+        self.assertEqual([b.name for b in base.all_benchmarks()], names)
+        self.assertIn('template_parse', names)
+        self.assertIn('convergence_create', names)
+
+    def test_json(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'results.json')
+        self.assertEqual(0, runner.main(['--size', '2', '--iterations', '1',
+                                         '--warmup', '0', '--json', path,
+                                         'template_parse']))
+        with open(path) as f:
+            data = json.load(f)
+        self.assertEqual(1, len(data['results']))
+        self.assertEqual('template_parse', data['results'][0]['name'])
+        self.assertEqual(2, data['results'][0]['size'])
+
+        self.assertEqual(0, runner.main(['--size', '2', '--iterations', '1',
+                                         '--baseline', path,
+                                         'template_parse']))
+        self.assertIn('x\n', self.stdout.getvalue())
+
+
+class PercentileTest(testtools.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, base.percentile(values, 50))
+        self.assertEqual(99, base.percentile(values, 99))
+        self.assertEqual(100, base.percentile(values, 100))
+        self.assertEqual(1, base.percentile([1], 90))
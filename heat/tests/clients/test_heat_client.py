@@ -921,6 +921,70 @@ class KeystoneClientTest(common.HeatTestCase):
             user='user123', enabled=True)
         self._validate_stub_auth()
 
+    def test_update_stack_domain_user(self):
+        """Test renaming a stack domain user and setting its password."""
+
+        ctx = utils.dummy_context()
+        self.patchobject(ctx, '_create_auth_plugin')
+        ctx.trust_id = None
+
+        # mock keystone client functions
+        self._stub_domain_admin_client()
+
+        heat_ks_client = heat_keystoneclient.KeystoneClient(ctx)
+        heat_ks_client.update_stack_domain_user(user_id='duser123',
+                                                project_id='aproject',
+                                                username='auser',
+                                                password='apassword')
+        self._validate_stub_domain_admin_client()
+        self.mock_ks_v3_client.users.update.assert_called_once_with(
+            user='duser123', name='auser', password='apassword')
+
+        heat_ks_client.update_stack_domain_user(user_id='duser123',
+                                                project_id='aproject')
+        self.assertEqual(1, self.mock_ks_v3_client.users.update.call_count)
+
+    def test_update_stack_domain_user_legacy_fallback(self):
+        """Test renaming a stack domain user, fallback path."""
+        self._clear_domain_override()
+
+        ctx = utils.dummy_context()
+        ctx.trust_id = None
+
+        # mock keystone client functions
+        self._stubs_auth()
+
+        heat_ks_client = heat_keystoneclient.KeystoneClient(ctx)
+        heat_ks_client.update_stack_domain_user(user_id='user123',
+                                                project_id='aproject',
+                                                username='auser')
+        self.mock_ks_v3_client.users.update.assert_called_once_with(
+            user='user123', name='auser')
+        self._validate_stub_auth()
+
+    def test_delete_stack_domain_users(self):
+        """Test deleting the stack domain users with a name prefix."""
+
+        ctx = utils.dummy_context()
+        self.patchobject(ctx, '_create_auth_plugin')
+        ctx.trust_id = None
+
+        # mock keystone client functions
+        self._stub_domain_admin_client()
+        pooled = mock.Mock(id='duser1')
+        pooled.name = 'heat-pool-abc'
+        other = mock.Mock(id='duser2')
+        other.name = 'astack-user-abc'
+        self.mock_ks_v3_client.users.list.return_value = [pooled, other]
+
+        heat_ks_client = heat_keystoneclient.KeystoneClient(ctx)
+        heat_ks_client.delete_stack_domain_users(project_id='aproject',
+                                                 name_prefix='heat-pool-')
+        self._validate_stub_domain_admin_client()
+        self.mock_ks_v3_client.users.list.assert_called_once_with(
+            domain='adomain123', default_project='aproject')
+        self.mock_ks_v3_client.users.delete.assert_called_once_with('duser1')
+
     def test_enable_stack_domain_user_error_project(self):
         """Test enabling a stack domain user, wrong project."""
 
@@ -13,6 +13,8 @@
 """Tests for :module:'heat.engine.clients.os.nova'."""
 
 import collections
+import email
+from email.mime import multipart
 from unittest import mock
 import uuid
 
@@ -24,6 +26,8 @@ from oslo_serialization import jsonutils as json
 import requests
 
 from heat.common import exception
+from heat.engine.clients import client_plugin
+from heat.engine.clients import microversion_mixin
 from heat.engine.clients.os import nova
 from heat.tests import common
 from heat.tests.openstack.nova import fakes as fakes_nova
@@ -84,6 +88,57 @@ class NovaClientPluginTest(NovaClientPluginTestCase):
                          self.nova_plugin.get_max_microversion())
         self.nova_client.versions.get_current.assert_called_once()
 
+    def test_get_max_microversion_shared_between_contexts(self):
+        version_stub = mock.Mock()
+        version_stub.version = '2.50'
+        self.nova_client.versions.get_current.return_value = version_stub
+        self.assertEqual('2.50', self.nova_plugin.get_max_microversion())
+
+        other_plugin = utils.dummy_context().clients.client_plugin('nova')
+        other_plugin._create = mock.Mock()
+        self.assertEqual('2.50', other_plugin.get_max_microversion())
+        other_plugin._create.assert_not_called()
+        self.nova_client.versions.get_current.assert_called_once()
+        self.assertEqual(
+            {('compute', 'microversion', 'created'): 1,
+             ('compute', 'microversion', 'reused'): 1},
+            client_plugin.get_client_counts())
+
+    @mock.patch.object(microversion_mixin.time, 'monotonic')
+    def test_get_max_microversion_expires(self, mock_monotonic):
+        mock_monotonic.return_value = 1000
+        version_stub = mock.Mock()
+        version_stub.version = '2.50'
+        self.nova_client.versions.get_current.return_value = version_stub
+        self.assertEqual('2.50', self.nova_plugin.get_max_microversion())
+
+        version_stub.version = '2.60'
+        other_plugin = utils.dummy_context().clients.client_plugin('nova')
+        other_plugin._create = lambda: self.nova_client
+        mock_monotonic.return_value = (
+            1000 + microversion_mixin.DISCOVERED_MICROVERSION_TTL - 1)
+        self.assertEqual('2.50', other_plugin.get_max_microversion())
+
+        other_plugin = utils.dummy_context().clients.client_plugin('nova')
+        other_plugin._create = lambda: self.nova_client
+        mock_monotonic.return_value = (
+            1000 + microversion_mixin.DISCOVERED_MICROVERSION_TTL)
+        self.assertEqual('2.60', other_plugin.get_max_microversion())
+        self.assertEqual(2, self.nova_client.versions.get_current.call_count)
+
+    def test_get_max_microversion_per_region(self):
+        version_stub = mock.Mock()
+        version_stub.version = '2.50'
+        self.nova_client.versions.get_current.return_value = version_stub
+        self.assertEqual('2.50', self.nova_plugin.get_max_microversion())
+
+        other_plugin = utils.dummy_context(
+            region_name='RegionTwo').clients.client_plugin('nova')
+        other_client = mock.MagicMock()
+        other_client.versions.get_current.return_value.version = '2.40'
+        other_plugin._create = lambda: other_client
+        self.assertEqual('2.40', other_plugin.get_max_microversion())
+
     def test_get_max_microversion_congigured_limit(self):
         self.nova_plugin.max_microversion = '2.30'
         self.assertEqual('2.30', self.nova_plugin.get_max_microversion())
@@ -477,6 +532,80 @@ class NovaClientPluginUserdataTest(NovaClientPluginTestCase):
         self.assertIn('useradd', data)
         self.assertIn('ec2-user', data)
 
+    def test_build_userdata_cached(self):
+        cfg.CONF.set_override('heat_metadata_server_url',
+                              'http://server.test:123')
+        self.patchobject(nova, '_userdata_cache',
+                         new=collections.OrderedDict())
+        mock_mime = self.patchobject(nova, '_assemble_multipart',
+                                     wraps=nova._assemble_multipart)
+        data = self.nova_plugin.build_userdata({'foo': 'bar'}, 'echo hi')
+        self.assertEqual(data, self.nova_plugin.build_userdata(
+            {'foo': 'bar'}, 'echo hi'))
+        self.assertEqual(1, mock_mime.call_count)
+
+        for args, kwargs in [(({'foo': 'baz'}, 'echo hi'), {}),
+                             (({'foo': 'bar'}, 'echo ho'), {}),
+                             (({'foo': 'bar'}, 'echo hi'),
+                              {'instance_user': 'ec2-user'}),
+                             (({'foo': 'bar'}, 'echo hi'),
+                              {'user_data_format': 'SOFTWARE_CONFIG'})]:
+            self.assertNotEqual(data, self.nova_plugin.build_userdata(
+                *args, **kwargs))
+        self.assertEqual(5, mock_mime.call_count)
+
+        cfg.CONF.set_override('instance_connection_is_secure', True)
+        data = self.nova_plugin.build_userdata({'foo': 'bar'}, 'echo hi')
+        self.assertIn('is_secure = True', data)
+
+    def test_build_userdata_mime(self):
+        cfg.CONF.set_override('heat_metadata_server_url',
+                              'http://server.test:123')
+        data = self.nova_plugin.build_userdata({'foo': 'bar'}, 'echo hi',
+                                               instance_user='ec2-user')
+        msg = email.message_from_string(data)
+        parts = [nova._make_subpart(part.get_payload(), part.get_filename(),
+                                    part.get_content_subtype())
+                 for part in msg.get_payload()]
+        self.assertEqual(['cloud-config', 'boothook.sh', 'part-handler.py',
+                          'cfn-userdata', 'loguserdata.py', 'cfn-init-data',
+                          'cfn-metadata-server', 'cfn-boto-cfg'],
+                         [part.get_filename() for part in parts])
+
+        expected = multipart.MIMEMultipart(_subparts=parts)
+        expected.set_boundary(msg.get_boundary())
+        self.assertEqual(expected.as_string(), data)
+
+    def test_assemble_multipart_boundary(self):
+        self.patchobject(nova.random, 'randrange', return_value=1)
+        boundary = '===============0000000000000000001=='
+        data = nova._assemble_multipart(['\n--%s\n' % boundary])
+        self.assertEqual('%s.0' % boundary,
+                         email.message_from_string(data).get_boundary())
+
+    def test_build_userdata_cache_size(self):
+        cfg.CONF.set_override('heat_metadata_server_url',
+                              'http://server.test:123')
+        self.patchobject(nova, '_userdata_cache',
+                         new=collections.OrderedDict())
+        self.patchobject(nova, 'USERDATA_CACHE_SIZE', new=2)
+        for i in range(3):
+            self.nova_plugin.build_userdata({'server': i})
+        self.assertEqual(2, len(nova._userdata_cache))
+
+    def test_build_userdata_software_config_multipart(self):
+        self.patchobject(nova, '_userdata_parts_cache',
+                         new=collections.OrderedDict())
+        userdata = self.nova_plugin.build_userdata(
+            {}, 'echo one', user_data_format='SOFTWARE_CONFIG')
+        mock_parse = self.patchobject(nova.email, 'message_from_string',
+                                      wraps=nova.email.message_from_string)
+        for i in range(3):
+            data = self.nova_plugin.build_userdata(
+                {'server': i}, userdata, user_data_format='SOFTWARE_CONFIG')
+            self.assertEqual(1, data.count('echo one'))
+        self.assertEqual(1, mock_parse.call_count)
+
     def test_build_userdata_with_ignition(self):
         metadata = {"os-collect-config": {"heat": {"password": "***"}}}
         userdata = '{"ignition": {"version": "3.0"}, "storage": {"files": []}}'
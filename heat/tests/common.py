@@ -28,6 +28,8 @@ import testtools
 from heat.common import context
 from heat.common import messaging
 from heat.common import policy
+from heat.engine.clients import client_plugin
+from heat.engine.clients import microversion_mixin
 from heat.engine.clients.os import barbican
 from heat.engine.clients.os import cinder
 from heat.engine.clients.os import glance
@@ -117,6 +119,10 @@ class HeatTestCase(testscenarios.WithScenarios,
         messaging.setup("fake://", optional=True)
         self.addCleanup(messaging.cleanup)
 
+        self.addCleanup(client_plugin.reset_client_counts)
+        self.addCleanup(
+            microversion_mixin.reset_discovered_max_microversions)
+
         tri_names = ['AWS::RDS::DBInstance', 'AWS::CloudWatch::Alarm']
         tris = []
         for name in tri_names:
@@ -213,6 +213,51 @@ class MigrationsWalk(
         columns = {c['name'] for c in inspector.get_columns('snapshot')}
         self.assertIn('action', columns)
 
+    def _check_3f1c7a9d52e4(self, connection):
+        """Test 3f1c7a9d52e4: Add stack_timeline table."""
+        inspector = sqlalchemy.inspect(connection)
+        self.assertIn('stack_timeline', inspector.get_table_names())
+
+        columns = {c['name'] for c in
+                   inspector.get_columns('stack_timeline')}
+        expected_columns = {'id', 'stack_id', 'traversal_id', 'node',
+                            'resource_name', 'is_update', 'blocked_by',
+                            'ready_at', 'started_at', 'finished_at'}
+        self.assertTrue(expected_columns.issubset(columns))
+
+    def _check_5b8e2d4c7a91(self, connection):
+        """Test 5b8e2d4c7a91: Add raw_template_blob table."""
+        inspector = sqlalchemy.inspect(connection)
+        self.assertIn('raw_template_blob', inspector.get_table_names())
+
+        columns = {c['name'] for c in
+                   inspector.get_columns('raw_template_blob')}
+        expected_columns = {'id', 'data', 'compressed', 'refcount',
+                            'created_at', 'updated_at'}
+        self.assertTrue(expected_columns.issubset(columns))
+
+    def _check_7c3e9a1f4b62(self, connection):
+        """Test 7c3e9a1f4b62: Share and compress resource_properties_data."""
+        inspector = sqlalchemy.inspect(connection)
+        columns = {c['name'] for c in
+                   inspector.get_columns('resource_properties_data')}
+        self.assertTrue({'digest', 'compressed_data',
+                         'refcount'}.issubset(columns))
+        indexes = {i['name'] for i in
+                   inspector.get_indexes('resource_properties_data')}
+        self.assertIn('ix_resource_properties_data_digest', indexes)
+
+    def _check_e4a7b9c2d816(self, connection):
+        """Test e4a7b9c2d816: Add stack_output_snapshot table."""
+        inspector = sqlalchemy.inspect(connection)
+        self.assertIn('stack_output_snapshot', inspector.get_table_names())
+
+        columns = {c['name'] for c in
+                   inspector.get_columns('stack_output_snapshot')}
+        expected_columns = {'stack_id', 'root_stack_id', 'version',
+                            'outputs'}
+        self.assertTrue(expected_columns.issubset(columns))
+
 
 class TestMigrationsWalkSQLite(
     MigrationsWalk,
@@ -40,6 +40,9 @@ from heat.engine import resource as rsrc
 from heat.engine import stack as parser
 from heat.engine import template as tmpl
 from heat.engine import template_files
+from heat.objects import raw_template as raw_template_object
+from heat.objects import resource_properties_data as rpd_object
+from heat.objects import software_config as software_config_object
 from heat.tests import common
 from heat.tests.openstack.nova import fakes as fakes_nova
 from heat.tests import utils
@@ -702,6 +705,60 @@ class SqlAlchemyTest(common.HeatTestCase):
                                                              'tag3'])
         self.assertEqual(0, len(st_db))
 
+    def test_stack_get_all_summaries(self):
+        stacks = [self._setup_test_stack('stack_summaries_%d' % i, x)[1]
+                  for i, x in enumerate(UUIDs)]
+        stacks[0].tags = ['tag1', 'tag2']
+        stacks[0].store()
+        stacks[1].tags = ['tag2']
+        stacks[1].store()
+
+        summaries = db_api.stack_get_all_summaries(self.ctx,
+                                                   sort_keys=['name'],
+                                                   sort_dir='asc')
+        self.assertEqual(['stack_summaries_0', 'stack_summaries_1',
+                          'stack_summaries_2'],
+                         [s['name'] for s in summaries])
+        self.assertEqual([['tag1', 'tag2'], ['tag2'], None],
+                         [s['tags'] for s in summaries])
+        st_db = db_api.stack_get(self.ctx, UUIDs[0])
+        for key in ('id', 'tenant', 'action', 'status', 'status_reason',
+                    'created_at', 'updated_at', 'deleted_at', 'username',
+                    'owner_id', 'stack_user_project_id'):
+            self.assertEqual(st_db[key], summaries[0][key])
+
+    def test_stack_get_all_summaries_by_tags(self):
+        stacks = [self._setup_test_stack('stacks_summary_tags_%d' % i, x)[1]
+                  for i, x in enumerate(UUIDs)]
+        stacks[0].tags = ['tag1']
+        stacks[0].store()
+        stacks[1].tags = ['tag1', 'tag2']
+        stacks[1].store()
+        stacks[2].tags = ['tag1', 'tag2', 'tag3']
+        stacks[2].store()
+
+        def names(**kwargs):
+            return sorted(s['name'] for s in
+                          db_api.stack_get_all_summaries(self.ctx, **kwargs))
+
+        self.assertEqual(['stacks_summary_tags_1', 'stacks_summary_tags_2'],
+                         names(tags=['tag1', 'tag2']))
+        self.assertEqual(['stacks_summary_tags_0'],
+                         names(not_tags=['tag1', 'tag2']))
+        self.assertEqual(['stacks_summary_tags_0'],
+                         names(not_tags_any=['tag2', 'tag3']))
+        self.assertEqual(['stacks_summary_tags_2'],
+                         names(tags_any=['tag3'], limit=1))
+
+    def test_stack_get_all_summaries_marker(self):
+        [self._setup_test_stack('stack_summary_marker_%d' % i, x)
+         for i, x in enumerate(UUIDs)]
+
+        summaries = db_api.stack_get_all_summaries(self.ctx, marker=UUID1,
+                                                   sort_keys=['name'],
+                                                   sort_dir='asc')
+        self.assertEqual([UUID2, UUID3], [s['id'] for s in summaries])
+
     def test_stack_get_all_by_tag_with_pagination(self):
         stacks = [self._setup_test_stack('stacks_tag_page_%d' % i, x)[1]
                   for i, x in enumerate(UUIDs)]
@@ -1178,6 +1235,62 @@ class SqlAlchemyTest(common.HeatTestCase):
                "referenced" % config_id)
         self.assertIn(msg, str(err))
 
+    def test_software_config_compact(self):
+        cfg.CONF.set_override('compact_software_config_storage', True)
+        shared = {
+            'outputs': [{'name': 'result'}],
+            'config': '#!/bin/bash\necho "$foo"\n',
+            'options': {}
+        }
+        config_ids = []
+        for server in ('server1', 'server2'):
+            config = dict(shared, inputs=[{'name': 'deploy_server_id',
+                                           'value': server}])
+            sc = db_api.software_config_create(
+                self.ctx, {'name': 'config_mysql',
+                           'tenant': self.ctx.project_id,
+                           'config': config})
+            self.assertEqual(config, sc.config)
+            config_ids.append(sc.id)
+
+        with db_api.context_manager.reader.using(self.ctx):
+            blobs = [(b.id, b.refcount) for b in
+                     self.ctx.session.query(models.RawTemplateBlob)]
+            stored = self.ctx.session.get(models.SoftwareConfig,
+                                          config_ids[0]).config
+        self.assertEqual(1, len(blobs))
+        self.assertEqual(2, blobs[0][1])
+        self.assertEqual({'inputs': [{'name': 'deploy_server_id',
+                                      'value': 'server1'}],
+                          '__heat_compact_config__': blobs[0][0]}, stored)
+
+        sc = software_config_object.SoftwareConfig.get_by_id(self.ctx,
+                                                             config_ids[1])
+        self.assertEqual(dict(shared, inputs=[{'name': 'deploy_server_id',
+                                               'value': 'server2'}]),
+                         sc.config)
+
+        db_api.software_config_delete(self.ctx, config_ids[0])
+        with db_api.context_manager.reader.using(self.ctx):
+            self.assertEqual(1, self.ctx.session.query(
+                models.RawTemplateBlob.refcount).scalar())
+        db_api.software_config_delete(self.ctx, config_ids[1])
+        with db_api.context_manager.reader.using(self.ctx):
+            self.assertEqual(0, self.ctx.session.query(
+                models.RawTemplateBlob).count())
+
+    def test_software_config_compact_read_legacy(self):
+        config = {'inputs': [], 'outputs': [], 'config': 'script',
+                  'options': {}}
+        sc_id = db_api.software_config_create(
+            self.ctx, {'name': 'config_mysql',
+                       'tenant': self.ctx.project_id,
+                       'config': config}).id
+        cfg.CONF.set_override('compact_software_config_storage', True)
+        sc = software_config_object.SoftwareConfig.get_by_id(self.ctx, sc_id)
+        self.assertEqual(config, sc.config)
+        db_api.software_config_delete(self.ctx, sc_id)
+
     def _deployment_values(self):
         tenant_id = self.ctx.project_id
         stack_user_project_id = str(uuid.uuid4())
@@ -1793,6 +1906,114 @@ class DBAPIRawTemplateTest(common.HeatTestCase):
                           self.ctx, tp.id)
 
 
+class DBAPIRawTemplateCompactTest(common.HeatTestCase):
+    def setUp(self):
+        super(DBAPIRawTemplateCompactTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        cfg.CONF.set_override('compact_template_storage', True)
+        self.t = template_format.parse(wp_template)
+
+    def _blobs(self):
+        with db_api.context_manager.reader.using(self.ctx):
+            return dict((b.id, (b.refcount, b.compressed)) for b in
+                        self.ctx.session.query(models.RawTemplateBlob))
+
+    def _stored(self, template_id):
+        with db_api.context_manager.reader.using(self.ctx):
+            return db_api._raw_template_stored(self.ctx, template_id)
+
+    def test_create_compact(self):
+        tp = create_raw_template(self.ctx, template=self.t, environment={})
+        self.assertEqual(self.t, tp.template)
+
+        stored = self._stored(tp.id)
+        self.assertIn(db_api._COMPACT_TEMPLATE, stored)
+        self.assertEqual({'value': '2010-09-09'},
+                         stored['sections']['AWSTemplateFormatVersion'])
+        self.assertEqual(['WebServer'],
+                         list(stored['sections']['Resources']['resources']))
+        # Parameters and one resource
+        self.assertEqual(2, len(self._blobs()))
+
+        loaded = raw_template_object.RawTemplate.get_by_id(self.ctx, tp.id)
+        self.assertEqual(self.t, loaded.template)
+        self.assertEqual(list(self.t), list(loaded.template))
+
+    def test_blobs_shared(self):
+        t2 = copy.deepcopy(self.t)
+        t2['Resources']['Other'] = {'Type': 'OS::Heat::None'}
+        tp1 = create_raw_template(self.ctx, template=self.t, environment={})
+        tp2 = create_raw_template(self.ctx, template=t2)
+        blobs = self._blobs()
+        self.assertEqual(3, len(blobs))
+        self.assertEqual([1, 2, 2], sorted(c for c, z in blobs.values()))
+
+        db_api.raw_template_delete(self.ctx, tp2.id)
+        self.assertEqual([1, 1], sorted(c for c, z in
+                                        self._blobs().values()))
+        db_api.raw_template_delete(self.ctx, tp1.id)
+        self.assertEqual({}, self._blobs())
+
+    def test_update_releases_blobs(self):
+        tp = create_raw_template(self.ctx, template=self.t, environment={})
+        old_blobs = set(self._blobs())
+        t2 = copy.deepcopy(self.t)
+        t2['Resources']['WebServer']['Type'] = 'OS::Heat::None'
+
+        updated = db_api.raw_template_update(self.ctx, tp.id,
+                                             {'template': t2})
+        self.assertEqual(t2, updated.template)
+        new_blobs = set(self._blobs())
+        self.assertEqual(2, len(new_blobs))
+        self.assertEqual(1, len(old_blobs & new_blobs))
+        loaded = raw_template_object.RawTemplate.get_by_id(self.ctx, tp.id)
+        self.assertEqual(t2, loaded.template)
+
+    def test_update_disabled_expands(self):
+        tp = create_raw_template(self.ctx, template=self.t, environment={})
+        cfg.CONF.set_override('compact_template_storage', False)
+        db_api.raw_template_update(self.ctx, tp.id, {'template': self.t})
+        self.assertEqual(self.t, self._stored(tp.id))
+        self.assertEqual({}, self._blobs())
+
+    def test_compressed(self):
+        cfg.CONF.set_override('template_compression_threshold', 1)
+        tp = create_raw_template(self.ctx, template=self.t, environment={})
+        blobs = self._blobs()
+        self.assertTrue(all(z for c, z in blobs.values()))
+        loaded = raw_template_object.RawTemplate.get_by_id(self.ctx, tp.id)
+        self.assertEqual(self.t, loaded.template)
+
+    def test_compact_all(self):
+        cfg.CONF.set_override('compact_template_storage', False)
+        tps = [create_raw_template(self.ctx, template=self.t, environment={})
+               for i in range(3)]
+        self.assertEqual(self.t, self._stored(tps[0].id))
+
+        self.assertEqual(3, db_api.raw_template_compact_all(self.ctx,
+                                                            batch_size=2))
+        self.assertEqual([3, 3], sorted(c for c, z in
+                                        self._blobs().values()))
+        for tp in tps:
+            self.assertIn(db_api._COMPACT_TEMPLATE, self._stored(tp.id))
+            loaded = raw_template_object.RawTemplate.get_by_id(self.ctx,
+                                                               tp.id)
+            self.assertEqual(self.t, loaded.template)
+        self.assertEqual(0, db_api.raw_template_compact_all(self.ctx))
+
+    def test_purge_releases_blobs(self):
+        tp = create_raw_template(self.ctx, template=self.t, environment={})
+        create_stack(self.ctx, tp, create_user_creds(self.ctx),
+                     deleted_at=timeutils.utcnow() - datetime.timedelta(
+                         seconds=10))
+        self.assertEqual(2, len(self._blobs()))
+
+        db_api.purge_deleted(age=1, granularity='seconds')
+        self.assertRaises(exception.NotFound, db_api.raw_template_get,
+                          self.ctx, tp.id)
+        self.assertEqual({}, self._blobs())
+
+
 class DBAPIUserCredsTest(common.HeatTestCase):
     def setUp(self):
         super(DBAPIUserCredsTest, self).setUp()
@@ -1838,6 +2059,25 @@ class DBAPIUserCredsTest(common.HeatTestCase):
         self.assertIn(exp_msg, str(err))
         self.assertEqual(0, mock_delete.call_count)
 
+    def test_user_creds_get_all_of_deleted_stacks(self):
+        template = create_raw_template(self.ctx)
+        kept = create_user_creds(self.ctx)
+        root = create_stack(self.ctx, template, kept,
+                            stack_user_project_id='aproject')
+        nested = create_stack(self.ctx, template, create_user_creds(self.ctx),
+                              owner_id=root.id)
+        live = create_stack(self.ctx, template, create_user_creds(self.ctx))
+        get_all = db_api.user_creds_get_all_of_deleted_stacks
+        db_api.stack_delete(self.ctx, nested.id)
+        self.assertEqual([], get_all(self.ctx))
+
+        db_api.stack_delete(self.ctx, root.id)
+        self.assertEqual([(kept['id'], 'aproject')], get_all(self.ctx))
+
+        db_api.user_creds_delete(self.ctx, kept['id'])
+        self.assertEqual([], get_all(self.ctx))
+        self.assertIsNotNone(db_api.stack_get(self.ctx, live.id))
+
     def test_user_creds_delete_retries(self):
         mock_delete = self.patchobject(session.Session, 'delete')
         # returns StaleDataErrors, so we try delete 3 times
@@ -2566,6 +2806,31 @@ class DBAPIResourceTest(common.HeatTestCase):
         self.assertEqual('{"foo": "123"}', json.dumps(ret_res.rsrc_metadata))
         self.assertEqual(self.stack.id, ret_res.stack_id)
 
+    def test_resource_create_all(self):
+        values_list = [{'name': name,
+                        'action': 'INIT',
+                        'status': 'COMPLETE',
+                        'status_reason': '',
+                        'stack_id': self.stack.id,
+                        'requires': [],
+                        'needed_by': []}
+                       for name in ('res1', 'res2', 'res3')]
+        values_list[1]['uuid'] = UUID1
+
+        created = db_api.resource_create_all(self.ctx, values_list)
+
+        self.assertEqual(3, len(created))
+        self.assertEqual(UUID1, created[1].uuid)
+        for values, res in zip(values_list, created):
+            ret_res = db_api.resource_get(self.ctx, res.id)
+            self.assertEqual(values['name'], ret_res.name)
+            self.assertEqual(res.uuid, ret_res.uuid)
+            self.assertEqual(res.created_at, ret_res.created_at)
+            self.assertEqual(self.stack.id, ret_res.stack_id)
+
+    def test_resource_create_all_empty(self):
+        self.assertEqual([], db_api.resource_create_all(self.ctx, []))
+
     def test_resource_get(self):
         res = create_resource(self.ctx, self.stack)
         ret_res = db_api.resource_get(self.ctx, res.id)
@@ -3097,6 +3362,138 @@ class DBAPIResourceDataTest(common.HeatTestCase):
                           self.resource.id)
 
 
+class DBAPIResourcePropDataTest(common.HeatTestCase):
+    def setUp(self):
+        super(DBAPIResourcePropDataTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.template = create_raw_template(self.ctx)
+        self.user_creds = create_user_creds(self.ctx)
+
+    def _get(self, rpd_id):
+        with db_api.context_manager.reader.using(self.ctx):
+            return self.ctx.session.get(models.ResourcePropertiesData,
+                                        rpd_id)
+
+    def _create_event(self, stack, rpd):
+        return create_event(self.ctx, stack_id=stack.id,
+                            rsrc_prop_data=self._get(rpd.id))
+
+    def test_create_shared(self):
+        rpd1 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'bar'})
+        rpd2 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'bar'})
+        rpd3 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'baz'})
+        self.assertEqual(rpd1.id, rpd2.id)
+        self.assertNotEqual(rpd1.id, rpd3.id)
+        self.assertEqual({'foo': 'bar'}, rpd2.data)
+
+    def test_create_encrypted_not_shared(self):
+        cfg.CONF.set_override('encrypt_parameters_and_properties', True)
+        rpd1 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'bar'})
+        rpd2 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'bar'})
+        self.assertNotEqual(rpd1.id, rpd2.id)
+        self.assertIsNone(self._get(rpd1.id).digest)
+
+    def test_create_or_update_not_shared(self):
+        rpd1 = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                        {'foo': 'bar'})
+        rpd2 = rpd_object.ResourcePropertiesData.create_or_update(
+            self.ctx, {'foo': 'bar'})
+        self.assertNotEqual(rpd1.id, rpd2.id)
+
+    def test_compressed(self):
+        cfg.CONF.set_override('properties_data_compression_threshold', 10)
+        data = {'user_data': 'x' * 100}
+        rpd = rpd_object.ResourcePropertiesData.create(self.ctx, data)
+        db_rpd = self._get(rpd.id)
+        self.assertIsNone(db_rpd.data)
+        self.assertIsNotNone(db_rpd.compressed_data)
+        self.assertEqual(data, rpd_object.ResourcePropertiesData.get_by_id(
+            self.ctx, rpd.id).data)
+
+        small = rpd_object.ResourcePropertiesData.create(self.ctx, {'a': 1})
+        self.assertIsNone(self._get(small.id).compressed_data)
+
+    def test_event_refcount(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        rpd = db_api.resource_prop_data_create(self.ctx,
+                                               {'data': {'foo': 'bar'},
+                                                'encrypted': False})
+        self.assertEqual(0, self._get(rpd.id).refcount)
+        self._create_event(stack, rpd)
+        self._create_event(stack, rpd)
+        self.assertEqual(2, self._get(rpd.id).refcount)
+
+    def test_delete_event_rows(self):
+        stacks = [create_stack(self.ctx, self.template, self.user_creds)
+                  for i in range(2)]
+        shared = db_api.resource_prop_data_create(self.ctx,
+                                                  {'data': {'foo': 'bar'},
+                                                   'encrypted': False})
+        unshared = db_api.resource_prop_data_create(self.ctx,
+                                                    {'data': {'foo': 'baz'},
+                                                     'encrypted': False})
+        self._create_event(stacks[0], shared)
+        self._create_event(stacks[0], unshared)
+        self._create_event(stacks[1], shared)
+
+        with db_api.context_manager.writer.using(self.ctx):
+            self.assertEqual(2, db_api._delete_event_rows(
+                self.ctx, stacks[0].id, 2))
+        self.assertEqual(1, self._get(shared.id).refcount)
+        self.assertIsNone(self._get(unshared.id))
+
+    def test_delete_event_rows_keeps_resource_data(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        resource = create_resource(self.ctx, stack)
+        rpd = self._get(resource.rsrc_prop_data_id)
+        self._create_event(stack, rpd)
+
+        with db_api.context_manager.writer.using(self.ctx):
+            db_api._delete_event_rows(self.ctx, stack.id, 1)
+        rpd = self._get(rpd.id)
+        self.assertIsNotNone(rpd)
+        self.assertEqual(0, rpd.refcount)
+
+    def test_delete_event_rows_keeps_reused_data(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        rpd = rpd_object.ResourcePropertiesData.create(self.ctx,
+                                                       {'foo': 'bar'})
+        self._create_event(stack, rpd)
+        self.assertEqual(rpd.id, rpd_object.ResourcePropertiesData.create(
+            self.ctx, {'foo': 'bar'}).id)
+
+        with db_api.context_manager.writer.using(self.ctx):
+            db_api._delete_event_rows(self.ctx, stack.id, 1)
+        self.assertIsNotNone(self._get(rpd.id))
+
+        self._create_event(stack, rpd)
+        self.patchobject(db_api, '_RPD_REUSE_GRACE_PERIOD',
+                         new=datetime.timedelta(0))
+        with db_api.context_manager.writer.using(self.ctx):
+            db_api._delete_event_rows(self.ctx, stack.id, 1)
+        self.assertIsNone(self._get(rpd.id))
+
+    def test_purge_keeps_shared_data(self):
+        deleted_at = timeutils.utcnow() - datetime.timedelta(seconds=10)
+        stacks = [create_stack(self.ctx, self.template, self.user_creds,
+                               deleted_at=deleted_at),
+                  create_stack(self.ctx, self.template, self.user_creds)]
+        shared = db_api.resource_prop_data_create(self.ctx,
+                                                  {'data': {'foo': 'bar'},
+                                                   'encrypted': False})
+        self._create_event(stacks[0], shared)
+        self._create_event(stacks[0], shared)
+        self._create_event(stacks[1], shared)
+
+        db_api.purge_deleted(age=1, granularity='seconds')
+        self.assertEqual(1, self._get(shared.id).refcount)
+
+
 class DBAPIEventTest(common.HeatTestCase):
     def setUp(self):
         super(DBAPIEventTest, self).setUp()
@@ -3564,6 +3961,121 @@ class DBAPISyncPointTest(common.HeatTestCase):
                                   traversal_id=self.stack.current_traversal)
             self.assertEqual(len(self.resources) * 21, add.call_count)
 
+    def test_sync_point_create_all(self):
+        values_list = [{'entity_id': entity_id,
+                        'traversal_id': self.stack.current_traversal,
+                        'is_update': True,
+                        'atomic_key': 0,
+                        'stack_id': self.stack.id,
+                        'input_data': {}}
+                       for entity_id in [r.id for r in self.resources] +
+                       [self.stack.id]]
+
+        db_api.sync_point_create_all(self.ctx, values_list)
+
+        for values in values_list:
+            ret_sync_point = db_api.sync_point_get(
+                self.ctx, values['entity_id'],
+                self.stack.current_traversal, True)
+            self.assertIsNotNone(ret_sync_point)
+            self.assertEqual(str(values['entity_id']),
+                             ret_sync_point.entity_id)
+            self.assertEqual(0, ret_sync_point.atomic_key)
+            self.assertEqual({}, ret_sync_point.input_data)
+
+
+class DBAPIStackTimelineTest(common.HeatTestCase):
+    def setUp(self):
+        super(DBAPIStackTimelineTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.template = create_raw_template(self.ctx)
+        self.user_creds = create_user_creds(self.ctx)
+        self.stack = create_stack(self.ctx, self.template, self.user_creds)
+
+    def _values(self, node, traversal_id='t1'):
+        return {'stack_id': self.stack.id, 'traversal_id': traversal_id,
+                'node': node, 'resource_name': node, 'is_update': True,
+                'ready_at': 1000, 'started_at': 1500, 'finished_at': 2000}
+
+    def test_stack_timeline_create_get(self):
+        db_api.stack_timeline_create_all(
+            self.ctx, [self._values('a'), self._values('b'),
+                       self._values('c', traversal_id='t2')])
+
+        nodes = db_api.stack_timeline_get_all_by_stack(self.ctx,
+                                                       self.stack.id)
+        self.assertEqual(['a', 'b', 'c'], [n.node for n in nodes])
+        self.assertEqual(1500, nodes[0].started_at)
+
+        nodes = db_api.stack_timeline_get_all_by_stack(self.ctx,
+                                                       self.stack.id, 't2')
+        self.assertEqual(['c'], [n.node for n in nodes])
+
+    def test_stack_timeline_create_all_empty(self):
+        db_api.stack_timeline_create_all(self.ctx, [])
+        self.assertEqual([], db_api.stack_timeline_get_all_by_stack(
+            self.ctx, self.stack.id))
+
+    def test_stack_timeline_delete_all_by_stack(self):
+        db_api.stack_timeline_create_all(
+            self.ctx, [self._values('a'), self._values('b')])
+
+        self.assertEqual(2, db_api.stack_timeline_delete_all_by_stack(
+            self.ctx, self.stack.id))
+        self.assertEqual([], db_api.stack_timeline_get_all_by_stack(
+            self.ctx, self.stack.id))
+
+
+class DBAPIStackOutputSnapshotTest(common.HeatTestCase):
+    def setUp(self):
+        super(DBAPIStackOutputSnapshotTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.template = create_raw_template(self.ctx)
+        self.user_creds = create_user_creds(self.ctx)
+        self.stack = create_stack(self.ctx, self.template, self.user_creds)
+
+    def _set(self, stack_id, version, outputs):
+        return db_api.stack_output_snapshot_set(
+            self.ctx, stack_id,
+            {'root_stack_id': self.stack.id, 'version': version,
+             'outputs': outputs})
+
+    def test_stack_output_snapshot_set_get(self):
+        self.assertIsNone(db_api.stack_output_snapshot_get(self.ctx,
+                                                           self.stack.id))
+
+        self._set(self.stack.id, 'v1', [{'output_key': 'a'}])
+        self._set(self.stack.id, 'v2', [{'output_key': 'b'}])
+
+        snapshot = db_api.stack_output_snapshot_get(self.ctx, self.stack.id)
+        self.assertEqual('v2', snapshot.version)
+        self.assertEqual([{'output_key': 'b'}], snapshot.outputs)
+
+    def test_stack_output_snapshot_delete_all_by_root_stack(self):
+        nested = create_stack(self.ctx, self.template, self.user_creds,
+                              owner_id=self.stack.id)
+        self._set(self.stack.id, 'v1', [])
+        self._set(nested.id, 'v1', [])
+
+        self.assertEqual(2,
+                         db_api.stack_output_snapshot_delete_all_by_root_stack(
+                             self.ctx, self.stack.id))
+        self.assertIsNone(db_api.stack_output_snapshot_get(self.ctx,
+                                                           nested.id))
+
+    def test_resource_get_state_summary_by_root_stack(self):
+        res = create_resource(self.ctx, self.stack,
+                              root_stack_id=self.stack.id)
+        summary = db_api.resource_get_state_summary_by_root_stack(
+            self.ctx, self.stack.id)
+        self.assertEqual(1, len(summary))
+
+        db_api.resource_update_and_save(self.ctx, res.id,
+                                        {'status': 'FAILED'})
+        self.assertNotEqual(summary,
+                            db_api.resource_get_state_summary_by_root_stack(
+                                self.ctx, self.stack.id))
+
 
 class DBAPICryptParamsPropsTest(common.HeatTestCase):
     def setUp(self):
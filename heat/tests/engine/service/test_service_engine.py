@@ -19,7 +19,9 @@ from oslo_utils import timeutils
 
 from heat.common import context
 from heat.common import service_utils
+from heat.engine.clients import client_plugin
 from heat.engine import service
+from heat.engine import template_files
 from heat.engine import worker
 from heat.objects import service as service_objects
 from heat.rpc import worker_api
@@ -39,7 +41,7 @@ class ServiceEngineTest(common.HeatTestCase):
 
     def test_make_sure_rpc_version(self):
         self.assertEqual(
-            '1.36',
+            '1.39',
             service.EngineService.RPC_API_VERSION,
             ('RPC version is changed, please update this test to new version '
              'and make sure additional test cases are added for RPC APIs '
@@ -127,6 +129,51 @@ class ServiceEngineTest(common.HeatTestCase):
         msg = 'Service %s update failed' % self.eng.service_id
         self.assertIn(msg, self.LOG.output)
 
+    @mock.patch.object(service_objects.Service, 'update_by_id')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_service_manage_report_client_counts(self, mock_admin_context,
+                                                 mock_service_update):
+        self.eng.service_id = 'mock_id'
+        mock_admin_context.return_value = self.ctx
+        self.patchobject(client_plugin, 'get_client_counts',
+                         return_value={('compute', 'client', 'reused'): 5,
+                                       ('compute', 'client', 'created'): 2})
+        self.patchobject(template_files, 'cache_info',
+                         return_value=template_files.CacheInfo(0, 0, 0, 0))
+        mock_debug = self.patchobject(service.LOG, 'debug')
+        self.eng.service_manage_report()
+        counts = mock_debug.call_args[0][1]['counts']
+        self.assertEqual('compute client created: 2, '
+                         'compute client reused: 5', counts)
+
+    @mock.patch.object(service_objects.Service, 'update_by_id')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_service_manage_report_files_cache(self, mock_admin_context,
+                                               mock_service_update):
+        self.eng.service_id = 'mock_id'
+        mock_admin_context.return_value = self.ctx
+        self.patchobject(template_files, 'cache_info',
+                         return_value=template_files.CacheInfo(3, 1, 2, 100))
+        mock_debug = self.patchobject(service.LOG, 'debug')
+        self.eng.service_manage_report()
+        self.assertEqual({'service_id': 'mock_id', 'hits': 3, 'misses': 1,
+                          'hit_rate': 0.75, 'entries': 2, 'bytes': 100},
+                         mock_debug.call_args[0][1])
+
+    @mock.patch.object(service_objects.Service, 'update_by_id')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_service_manage_report_files_cache_unused(self,
+                                                      mock_admin_context,
+                                                      mock_service_update):
+        self.eng.service_id = 'mock_id'
+        mock_admin_context.return_value = self.ctx
+        self.patchobject(template_files, 'cache_info',
+                         return_value=template_files.CacheInfo(0, 0, 0, 0))
+        mock_debug = self.patchobject(service.LOG, 'debug')
+        self.eng.service_manage_report()
+        self.assertNotIn('Template files cache',
+                         str(mock_debug.call_args_list))
+
     def test_stop_rpc_server(self):
         with mock.patch.object(self.eng,
                                '_rpc_server') as mock_rpc_server:
@@ -146,6 +193,7 @@ class ServiceEngineTest(common.HeatTestCase):
             rpc_server_method):
         self.patchobject(self.eng, 'service_manage_cleanup')
         self.patchobject(self.eng, 'reset_stack_status')
+        self.patchobject(self.eng, 'finish_stack_cleanup')
         self.eng.start()
 
         # engine id
@@ -302,6 +350,7 @@ class ServiceEngineTest(common.HeatTestCase):
         cfg.CONF.set_default('periodic_interval', 60)
         self.patchobject(self.eng, 'service_manage_cleanup')
         self.patchobject(self.eng, 'reset_stack_status')
+        self.patchobject(self.eng, 'finish_stack_cleanup')
         self.patchobject(self.eng, 'service_manage_report')
 
         self.eng.start()
@@ -730,7 +730,7 @@ class SoftwareConfigServiceTest(common.HeatTestCase):
         deployments = {'deploy': 'this'}
         md_sd.return_value = deployments
 
-        f = self.engine.software_config._push_metadata_software_deployments
+        f = self.engine.software_config._update_metadata_software_deployments
         self.patchobject(f.retry, 'sleep')
         self.assertRaises(
             exception.ConcurrentTransaction,
@@ -821,6 +821,69 @@ class SoftwareConfigServiceTest(common.HeatTestCase):
         queue.post.assert_called_once_with(
             {'body': result_metadata, 'ttl': 3600})
 
+    @mock.patch.object(service_software_config.SoftwareConfigService,
+                       '_update_metadata_software_deployments')
+    @mock.patch.object(service_software_config.threading, 'Timer')
+    def test_push_metadata_software_deployments_delayed(self, timer, upd):
+        cfg.CONF.set_override('deployment_metadata_push_delay', 2)
+        swc = service_software_config.SoftwareConfigService()
+        ctx2 = utils.dummy_context()
+
+        swc._push_metadata_software_deployments(self.ctx, '1234', None)
+        swc._push_metadata_software_deployments(self.ctx, '1234', None)
+        swc._push_metadata_software_deployments(ctx2, '1234', 'project1')
+        swc._push_metadata_software_deployments(self.ctx, '5678', None)
+
+        self.assertEqual(2, timer.call_count)
+        timer.assert_any_call(2, swc._metadata_pusher._run, args=('1234',))
+        upd.assert_not_called()
+
+        swc._metadata_pusher._run('1234')
+        upd.assert_called_once_with(ctx2, '1234', 'project1')
+
+    @mock.patch.object(service_software_config.SoftwareConfigService,
+                       '_update_metadata_software_deployments')
+    @mock.patch.object(service_software_config.threading, 'Timer')
+    def test_push_metadata_software_deployments_during_push(self, timer,
+                                                            upd):
+        cfg.CONF.set_override('deployment_metadata_push_delay', 2)
+        swc = service_software_config.SoftwareConfigService()
+
+        def push_again(cnxt, server_id, stack_user_project_id):
+            if upd.call_count == 1:
+                swc._push_metadata_software_deployments(cnxt, server_id,
+                                                        None)
+                swc._push_metadata_software_deployments(cnxt, server_id,
+                                                        None)
+                raise exception.ConcurrentTransaction(action='test')
+
+        upd.side_effect = push_again
+        swc._push_metadata_software_deployments(self.ctx, '1234', None)
+        swc._metadata_pusher._run('1234')
+
+        self.assertEqual(1, timer.call_count)
+        self.assertEqual(2, upd.call_count)
+
+        # Once idle, a new request starts a new timer
+        swc._push_metadata_software_deployments(self.ctx, '1234', None)
+        self.assertEqual(2, timer.call_count)
+
+    @mock.patch.object(service_software_config.SoftwareConfigService,
+                       '_update_metadata_software_deployments')
+    @mock.patch.object(service_software_config.threading, 'Timer')
+    def test_push_metadata_software_deployments_stop(self, timer, upd):
+        cfg.CONF.set_override('deployment_metadata_push_delay', 2)
+        swc = service_software_config.SoftwareConfigService()
+
+        swc._push_metadata_software_deployments(self.ctx, '1234', None)
+        swc.stop()
+
+        timer.return_value.cancel.assert_called_once_with()
+        upd.assert_called_once_with(self.ctx, '1234', None)
+
+        swc.stop()
+        upd.assert_called_once_with(self.ctx, '1234', None)
+
     @mock.patch.object(service_software_config.SoftwareConfigService,
                        'signal_software_deployment')
     @mock.patch.object(swift.SwiftClientPlugin, '_create')
@@ -0,0 +1,75 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_config import cfg
+
+from heat.engine import action_pool
+from heat.tests import common
+
+
+class ActionPoolTest(common.HeatTestCase):
+    def setUp(self):
+        super(ActionPoolTest, self).setUp()
+        self.addCleanup(action_pool.shutdown)
+
+    def _get_pool(self):
+        return action_pool.get_pool()
+
+    def _resource(self, res_type, client_name=None):
+        res = mock.Mock(default_client_name=client_name)
+        res.type.return_value = res_type
+        return res
+
+    def test_disabled(self):
+        self.assertIsNone(self._get_pool())
+
+    def test_shared(self):
+        cfg.CONF.set_override('resource_action_workers', 2)
+        pool = self._get_pool()
+        self.assertEqual(2, pool.max_workers)
+        self.assertIs(pool, self._get_pool())
+
+    def test_configured_once(self):
+        cfg.CONF.set_override('resource_action_workers', 2)
+        pool = self._get_pool()
+        cfg.CONF.set_override('resource_action_concurrency_limits',
+                              {'nova': 1})
+        self.assertIs(pool, self._get_pool())
+        self.assertEqual({}, pool.limits)
+
+    def test_resource_limits(self):
+        pool = action_pool.ActionPool(1, {'OS::Nova::*': 2,
+                                          'OS::Nova::Server': 1,
+                                          'neutron': 3})
+        self.addCleanup(pool.shutdown)
+
+        server = pool.resource_limits(self._resource('OS::Nova::Server',
+                                                     'nova'))
+        self.assertEqual([2, 1], [s._value for s in server])
+        port = pool.resource_limits(self._resource('OS::Neutron::Port',
+                                                   'neutron'))
+        self.assertEqual([3], [s._value for s in port])
+        self.assertEqual([], pool.resource_limits(
+            self._resource('OS::Heat::None')))
+
+    def test_resource_limits_shared(self):
+        pool = action_pool.ActionPool(1, {'nova': 1})
+        self.addCleanup(pool.shutdown)
+
+        first = pool.resource_limits(self._resource('OS::Nova::Server',
+                                                    'nova'))
+        second = pool.resource_limits(self._resource('OS::Nova::KeyPair',
+                                                     'nova'))
+        self.assertEqual(first, second)
@@ -29,6 +29,7 @@ from heat.engine import scheduler
 from heat.engine import snapshots
 from heat.engine import stack
 from heat.engine import sync_point
+from heat.engine import timeline
 from heat.engine import worker
 from heat.objects import snapshot as snapshot_object
 from heat.rpc import api as rpc_api
@@ -257,6 +258,31 @@ class CheckWorkflowUpdateTest(common.HeatTestCase):
             self.resource.id,
             mock.ANY, True, None, stack.NODE_TYPE_RESOURCE)
 
+    @mock.patch.object(timeline, 'record_node')
+    def test_is_update_traversal_records_timeline(
+            self, mock_rn, mock_cru, mock_crc, mock_pcr, mock_csc):
+        cfg.CONF.set_override('record_stack_timeline', True)
+        data = timeline.add_to_rpc_data({'input_data': {}},
+                                        blocked_by='1:True', ready=1000)
+        self.worker.check_resource(
+            self.ctx, self.resource.id, self.stack.current_traversal, data,
+            self.is_update, None)
+        mock_rn.assert_called_once_with(
+            self.ctx, self.stack.id, self.stack.current_traversal,
+            self.resource.id, self.is_update, 'A', mock.ANY)
+        timing = mock_rn.call_args[0][6]
+        self.assertEqual(1000, timing.ready)
+        self.assertEqual('1:True', timing.blocked_by)
+
+    @mock.patch.object(timeline, 'record_node')
+    def test_is_update_traversal_timeline_disabled(
+            self, mock_rn, mock_cru, mock_crc, mock_pcr, mock_csc):
+        self.worker.check_resource(
+            self.ctx, self.resource.id, self.stack.current_traversal, {},
+            self.is_update, None)
+        self.assertTrue(mock_cru.called)
+        self.assertFalse(mock_rn.called)
+
     @mock.patch.object(resource.Resource, 'load')
     @mock.patch.object(resource.Resource, 'make_replacement')
     @mock.patch.object(stack.Stack, 'time_remaining')
@@ -856,6 +882,24 @@ class MiscMethodsTest(common.HeatTestCase):
             ('A', True), {}, True, None)
         self.assertTrue(mock_sync.called)
 
+    @mock.patch.object(timeline, 'now', return_value=1234)
+    def test_propagate_check_resource_timeline(self, mock_now):
+        cfg.CONF.set_override('record_stack_timeline', True)
+        rpc_client = mock.Mock()
+
+        def sync(cnxt, entity_id, traversal, is_update, propagate, *args,
+                 **kwargs):
+            propagate(entity_id, {'input_data': {}}, None, False)
+
+        self.patchobject(sync_point, 'sync', side_effect=sync)
+        check_resource.propagate_check_resource(
+            self.ctx, rpc_client, 5,
+            self.stack.current_traversal, mock.ANY,
+            stack.ConvergenceNode(4, True), {}, True, None)
+        data = rpc_client.check_resource.call_args[0][3]
+        self.assertEqual({'ready': 1234, 'blocked_by': '4:True'},
+                         data[timeline.RPC_DATA_KEY])
+
     @mock.patch.object(resource.Resource, 'create_convergence')
     @mock.patch.object(resource.Resource, 'update_convergence')
     def test_check_resource_update_init_action(self, mock_update, mock_create):
@@ -11,8 +11,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import contextlib
 import itertools
+import threading
 import time
 from unittest import mock
 
@@ -262,6 +264,28 @@ class DependencyTaskGroupTest(common.HeatTestCase):
         self.assertRaises(exception.CircularDependencyException,
                           scheduler.DependencyTaskGroup, d)
 
+    def test_timeline(self):
+        steps = {'a': 1, 'b': 3, 'last': 1}
+
+        def task(key):
+            for i in range(steps[key]):
+                yield
+
+        deps = dependencies.Dependencies([('last', 'a'), ('last', 'b')])
+        timeline = {}
+        tg = scheduler.DependencyTaskGroup(deps, task, timeline=timeline)
+        scheduler.TaskRunner(tg)(wait_time=None)
+
+        self.assertEqual({'a', 'b', 'last'}, set(timeline))
+        for ready, started, finished, blocked_by in timeline.values():
+            self.assertLessEqual(ready, started)
+            self.assertLessEqual(started, finished)
+        self.assertIsNone(timeline['a'][3])
+        self.assertIsNone(timeline['b'][3])
+        self.assertEqual(timeline['a'][0], timeline['b'][0])
+        self.assertEqual('b', timeline['last'][3])
+        self.assertEqual(timeline['b'][2], timeline['last'][0])
+
     def test_aggregate_exceptions_raises_all_at_the_end(self):
         def run_tasks_with_exceptions(e1=None, e2=None):
             self.aggregate_exceptions = True
@@ -421,6 +445,128 @@ class DependencyTaskGroupTest(common.HeatTestCase):
         self.assertIs(e2, exc)
 
 
+class DependencyTaskGroupExecutorTest(DependencyTaskGroupTest):
+    def setUp(self):
+        super(DependencyTaskGroupExecutorTest, self).setUp()
+        self.executor = futures.ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+
+    @contextlib.contextmanager
+    def _dep_test(self, *edges):
+        dummy = DummyTask(getattr(self, 'steps', 3))
+
+        deps = dependencies.Dependencies(edges)
+
+        tg = scheduler.DependencyTaskGroup(
+            deps, dummy, reverse=self.reverse_order,
+            error_wait_time=self.error_wait_time,
+            aggregate_exceptions=self.aggregate_exceptions,
+            executor=self.executor)
+
+        tracker = StepTracker()
+
+        yield tracker
+
+        dummy.do_step = mock.Mock(side_effect=tracker.side_effect)
+        scheduler.TaskRunner(tg)(wait_time=None)
+
+        tracker.verify_calls(dummy.do_step)
+
+    def test_slow_step_does_not_block(self):
+        unblocked = threading.Event()
+
+        def task_func(arg):
+            if arg == 'A':
+                self.assertTrue(unblocked.wait(5))
+                yield
+            else:
+                yield
+                unblocked.set()
+
+        deps = dependencies.Dependencies((('A', None), ('B', None)))
+        tg = scheduler.DependencyTaskGroup(deps, task_func,
+                                           executor=self.executor)
+        scheduler.TaskRunner(tg)(wait_time=None)
+        self.assertTrue(unblocked.is_set())
+
+    def test_limits(self):
+        limit = threading.BoundedSemaphore(1)
+        lock = threading.Lock()
+        active = []
+        started = []
+
+        def task_func(arg):
+            with lock:
+                started.append((arg, set(active)))
+                active.append(arg)
+            yield
+            yield
+            with lock:
+                active.remove(arg)
+
+        tasks = (('A', None), ('B', None), ('C', None), ('D', 'A'))
+        deps = dependencies.Dependencies(tasks)
+        limits = {'A': [limit], 'B': [limit], 'C': []}
+        tg = scheduler.DependencyTaskGroup(deps, task_func,
+                                           executor=self.executor,
+                                           limits=lambda k: limits.get(k, []))
+        scheduler.TaskRunner(tg)(wait_time=None)
+
+        self.assertEqual(4, len(started))
+        for key, concurrent in started:
+            if key in ('A', 'B'):
+                self.assertFalse({'A', 'B'} & concurrent)
+        self.assertEqual([], active)
+        self.assertTrue(limit.acquire(blocking=False))
+
+    def test_limits_released_on_exception(self):
+        limit = threading.BoundedSemaphore(2)
+
+        def task_func(arg):
+            yield
+            if arg == 'A':
+                raise ValueError(arg)
+            yield
+
+        tasks = (('A', None), ('B', None), ('C', 'B'))
+        deps = dependencies.Dependencies(tasks)
+        tg = scheduler.DependencyTaskGroup(deps, task_func,
+                                           executor=self.executor,
+                                           limits=lambda k: [limit])
+        self.assertRaises(ValueError, scheduler.TaskRunner(tg),
+                          wait_time=None)
+        self.assertTrue(limit.acquire(blocking=False))
+        self.assertTrue(limit.acquire(blocking=False))
+
+    def _throw_during_slow_step(self, timeline=None):
+        release = threading.Event()
+
+        def task_func(arg):
+            self.assertTrue(release.wait(5))
+            yield
+
+        deps = dependencies.Dependencies((('A', None),))
+        tg = scheduler.DependencyTaskGroup(deps, task_func,
+                                           aggregate_exceptions=True,
+                                           timeline=timeline,
+                                           executor=self.executor)
+        task = tg()
+        next(task)
+        error = ValueError()
+        task.throw(error)
+        release.set()
+        exc = self.assertRaises(scheduler.ExceptionGroup, list, task)
+        self.assertEqual([error], exc.exceptions)
+
+    def test_throw_during_slow_step(self):
+        self._throw_during_slow_step()
+
+    def test_throw_during_slow_step_timeline(self):
+        timeline = {}
+        self._throw_during_slow_step(timeline)
+        self.assertIsNotNone(timeline['A'][2])
+
+
 class TaskTest(common.HeatTestCase):
 
     def setUp(self):
@@ -1233,6 +1379,57 @@ class TaskSleepTest(common.HeatTestCase):
         self.mock_sleep.assert_not_called()
 
 
+class RateLimiterTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(RateLimiterTest, self).setUp()
+        scheduler.ENABLE_SLEEP = True
+        self.mock_sleep = self.patchobject(time, 'sleep',
+                                           return_value=None)
+        self.mock_time = self.patchobject(time, 'monotonic',
+                                          return_value=100.0)
+
+    def test_burst(self):
+        limiter = scheduler.RateLimiter(10, burst=3)
+        for i in range(3):
+            limiter.wait()
+        self.mock_sleep.assert_not_called()
+
+        limiter.wait()
+        self.mock_sleep.assert_called_once_with(0.1)
+
+    def test_rate(self):
+        limiter = scheduler.RateLimiter(2, burst=1)
+        limiter.wait()
+        self.mock_sleep.assert_not_called()
+
+        # The time slept is counted as refilling the bucket
+        limiter.wait()
+        self.mock_sleep.assert_called_once_with(0.5)
+        self.mock_time.return_value = 100.5
+        limiter.wait()
+        self.mock_sleep.assert_called_with(0.5)
+
+        # Tokens accumulate while idle, up to the burst size
+        self.mock_sleep.reset_mock()
+        self.mock_time.return_value = 110.0
+        limiter.wait()
+        self.mock_sleep.assert_not_called()
+
+    def test_unlimited(self):
+        limiter = scheduler.RateLimiter(0)
+        for i in range(10):
+            limiter.wait()
+        self.mock_sleep.assert_not_called()
+
+    def test_sleep_disabled(self):
+        scheduler.ENABLE_SLEEP = False
+        limiter = scheduler.RateLimiter(1)
+        for i in range(3):
+            limiter.wait()
+        self.mock_sleep.assert_not_called()
+
+
 class TimeoutTest(common.HeatTestCase):
     def test_compare(self):
         task = scheduler.TaskRunner(DummyTask())
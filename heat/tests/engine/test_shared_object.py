@@ -0,0 +1,41 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from heat.engine import shared_object
+from heat.tests import common
+
+
+class SharedObjectTest(common.HeatTestCase):
+
+    def test_disabled(self):
+        create = mock.Mock(return_value=None)
+        shared = shared_object.SharedObject(create)
+        self.assertIsNone(shared.get())
+        shared.shutdown()
+
+        create.return_value = mock.Mock()
+        self.assertIs(create.return_value, shared.get())
+
+    def test_created_once(self):
+        create = mock.Mock(side_effect=lambda: mock.Mock())
+        shared = shared_object.SharedObject(create)
+        obj = shared.get()
+        self.assertIs(obj, shared.get())
+        create.assert_called_once_with()
+
+        shared.shutdown(wait=False)
+        obj.shutdown.assert_called_once_with(wait=False)
+        self.assertIsNot(obj, shared.get())
+        self.assertEqual(2, create.call_count)
@@ -0,0 +1,66 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_config import cfg
+
+from heat.engine import stack_reaper
+from heat.tests import common
+
+
+class StackReaperTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(StackReaperTest, self).setUp()
+        self.patchobject(stack_reaper, 'RETRY_MAX_WAIT', new=0)
+        self.reaper = stack_reaper.StackReaper(1)
+        self.addCleanup(self.reaper.shutdown)
+
+    def test_submit(self):
+        task = mock.Mock()
+        self.reaper.submit('do it', task, 'a', 'b').result()
+        task.assert_called_once_with('a', 'b')
+
+    def test_retry(self):
+        task = mock.Mock(side_effect=[Exception('boom'), None])
+        self.reaper.submit('do it', task).result()
+        self.assertEqual(2, task.call_count)
+
+    def test_give_up(self):
+        task = mock.Mock(side_effect=Exception('boom'))
+        self.assertIsNone(self.reaper.submit('do it', task).result())
+        self.assertEqual(stack_reaper.RETRY_ATTEMPTS, task.call_count)
+        self.assertIn('Failed to do it', self.LOG.output)
+
+
+class GetReaperTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(GetReaperTest, self).setUp()
+        self.addCleanup(stack_reaper.shutdown)
+
+    def test_disabled(self):
+        self.assertIsNone(stack_reaper.get_reaper())
+
+    def test_created_once(self):
+        cfg.CONF.set_override('stack_cleanup_workers', 2)
+        reaper = stack_reaper.get_reaper()
+        self.assertEqual(2, reaper.max_workers)
+        self.assertIs(reaper, stack_reaper.get_reaper())
+
+        cfg.CONF.set_override('stack_cleanup_workers', 0)
+        self.assertIs(reaper, stack_reaper.get_reaper())
+
+        stack_reaper.shutdown()
+        self.assertIsNone(stack_reaper.get_reaper())
@@ -0,0 +1,219 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+import itertools
+import threading
+from unittest import mock
+
+from oslo_config import cfg
+
+from heat.engine.clients.os.keystone import fake_keystoneclient as fake_ks
+from heat.engine.clients.os.keystone import heat_keystoneclient as hkc
+from heat.engine import stack_user_pool
+from heat.tests import common
+
+
+class LocalKeystone(fake_ks.FakeKeystoneClient):
+    """A fake Keystone that keeps track of the users it holds."""
+
+    def __init__(self):
+        super(LocalKeystone, self).__init__()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.users = {}
+        self.credentials = {}
+        self.fail_create = False
+
+    def create_stack_domain_user(self, username, project_id, password=None):
+        if self.fail_create:
+            raise Exception('keystone is down')
+        with self._lock:
+            user_id = 'user%d' % next(self._ids)
+            self.users[user_id] = {'name': username, 'project': project_id,
+                                   'password': password}
+        return user_id
+
+    def update_stack_domain_user(self, user_id, project_id, username=None,
+                                 password=None):
+        user = self.users[user_id]
+        if username is not None:
+            user['name'] = username
+        if password is not None:
+            user['password'] = password
+
+    def delete_stack_domain_user(self, user_id, project_id):
+        with self._lock:
+            del self.users[user_id]
+
+    def delete_stack_domain_users(self, project_id, name_prefix):
+        with self._lock:
+            for user_id, user in list(self.users.items()):
+                if (user['project'] == project_id and
+                        user['name'].startswith(name_prefix)):
+                    del self.users[user_id]
+
+    def create_stack_domain_user_keypair(self, user_id, project_id):
+        with self._lock:
+            kp = hkc.AccessKey(id='cred%d' % next(self._ids),
+                               access='access', secret='secret')
+            self.credentials[kp.id] = user_id
+        return kp
+
+    def delete_stack_domain_user_keypair(self, user_id, project_id,
+                                         credential_id):
+        with self._lock:
+            assert self.credentials.pop(credential_id) == user_id
+
+
+class StackUserPoolTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(StackUserPoolTest, self).setUp()
+        self.keystone = LocalKeystone()
+        self.pool = stack_user_pool.StackUserPool(3, max_workers=1)
+        self.addCleanup(self.pool.shutdown)
+
+    def _wait(self):
+        # The pool has a single worker, so this runs after everything
+        # submitted before it
+        self.pool._executor.submit(lambda: None).result()
+
+    def _get(self, project_id, expected=10):
+        return self.pool.get(self.keystone, project_id, lambda: expected)
+
+    def test_get_fills_pool(self):
+        self.assertIsNone(self._get('project1'))
+        self._wait()
+        self.assertEqual(3, len(self.keystone.users))
+        self.assertEqual({}, self.keystone.credentials)
+        for user in self.keystone.users.values():
+            self.assertEqual('project1', user['project'])
+            self.assertTrue(user['name'].startswith('heat-pool-'))
+
+        user_id = self._get('project1')
+        self.assertIn(user_id, self.keystone.users)
+        self._wait()
+        self.assertEqual(4, len(self.keystone.users))
+
+    def test_fill_only_as_needed(self):
+        count_expected = mock.Mock(return_value=2)
+        get = functools.partial(self.pool.get, self.keystone, 'project1',
+                                count_expected)
+        self.assertIsNone(get())
+        self._wait()
+        self.assertEqual(2, len(self.keystone.users))
+
+        self.assertIsNotNone(get())
+        self.assertIsNotNone(get())
+        self._wait()
+        # Both of the users created in advance have been taken
+        self.assertEqual(2, len(self.keystone.users))
+        count_expected.assert_called_once_with()
+
+    def test_no_other_users_needed(self):
+        self.assertIsNone(self._get('project1', expected=0))
+        self._wait()
+        self.assertEqual({}, self.keystone.users)
+
+    def test_release_project(self):
+        self._get('project1')
+        self._get('project2')
+        self._wait()
+        self.assertEqual(6, len(self.keystone.users))
+
+        self.pool.release_project('project1')
+        self._wait()
+        self.assertEqual({'project2'}, set(
+            user['project'] for user in self.keystone.users.values()))
+
+    def test_release_project_while_filling(self):
+        event = threading.Event()
+        self.pool._executor.submit(event.wait)
+        self._get('project1')
+        self.pool.release_project('project1')
+        event.set()
+        self._wait()
+        self.assertEqual({}, self.keystone.users)
+
+    def test_reclaim(self):
+        user_id = self.keystone.create_stack_domain_user('user', 'project1')
+        kp = self.keystone.create_stack_domain_user_keypair(user_id,
+                                                            'project1')
+        self.pool.reclaim(self.keystone, 'project1', user_id, kp.id)
+        self._wait()
+        self.assertEqual({}, self.keystone.users)
+        self.assertEqual({}, self.keystone.credentials)
+
+    def test_evict_least_recently_used_project(self):
+        self.patchobject(stack_user_pool, 'MAX_PROJECTS', new=2)
+        self._get('project1')
+        self._get('project2')
+        self._wait()
+        self._get('project1')
+        self._get('project3')
+        self._wait()
+        self.assertEqual({'project1', 'project3'}, set(
+            user['project'] for user in self.keystone.users.values()))
+
+    def test_fill_failure(self):
+        self.keystone.fail_create = True
+        self.assertIsNone(self._get('project1'))
+        self._wait()
+        self.assertEqual({}, self.keystone.users)
+
+        self.keystone.fail_create = False
+        self.assertIsNone(self._get('project1'))
+        self._wait()
+        self.assertEqual(3, len(self.keystone.users))
+
+    def test_shutdown(self):
+        self._get('project1')
+        self._wait()
+        self.pool.shutdown()
+        self.assertEqual({}, self.keystone.users)
+
+    def test_delete_leftover_users(self):
+        self._get('project1')
+        self._get('project2')
+        self._wait()
+        user_id = self.keystone.create_stack_domain_user('user', 'project1')
+
+        # Another engine finds the users left over by this one
+        stack_user_pool.delete_leftover_users(self.keystone, 'project1')
+        self.assertEqual({'project2'}, set(
+            user['project'] for user in self.keystone.users.values()
+            if user['name'].startswith('heat-pool-')))
+        self.assertIn(user_id, self.keystone.users)
+
+
+class GetPoolTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(GetPoolTest, self).setUp()
+        self.addCleanup(stack_user_pool.shutdown)
+
+    def test_disabled(self):
+        self.assertIsNone(stack_user_pool.get_pool())
+
+    def test_created_once(self):
+        cfg.CONF.set_override('stack_user_pool_size', 5)
+        pool = stack_user_pool.get_pool()
+        self.assertEqual(5, pool.size)
+        self.assertIs(pool, stack_user_pool.get_pool())
+
+        cfg.CONF.set_override('stack_user_pool_size', 10)
+        self.assertIs(pool, stack_user_pool.get_pool())
+
+        stack_user_pool.shutdown()
+        self.assertEqual(10, stack_user_pool.get_pool().size)
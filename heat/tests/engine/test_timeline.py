@@ -0,0 +1,184 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_config import cfg
+
+from heat.engine import timeline
+from heat.objects import stack as stack_object
+from heat.objects import stack_timeline as timeline_objects
+from heat.tests import common
+from heat.tests.engine import tools
+from heat.tests import utils
+
+
+class TimelineTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(TimelineTest, self).setUp()
+        cfg.CONF.set_override('record_stack_timeline', True)
+        self.ctx = utils.dummy_context()
+        self.stack = tools.get_stack('test_stack', self.ctx,
+                                     template=tools.string_template_five,
+                                     convergence=False)
+        self.stack.store()
+
+    def _node(self, name, ready, started, finished, blocked_by=None,
+              traversal_id='t1'):
+        return {'stack_id': self.stack.id,
+                'traversal_id': traversal_id,
+                'node': timeline.node_key(name, True),
+                'resource_name': name,
+                'is_update': True,
+                'blocked_by': (timeline.node_key(blocked_by, True)
+                               if blocked_by else None),
+                'ready_at': ready,
+                'started_at': started,
+                'finished_at': finished}
+
+    def _store(self, *nodes):
+        timeline_objects.StackTimeline.create_all(self.ctx, list(nodes))
+
+    def test_get_timeline(self):
+        self._store(self._node('A', 1000, 1000, 2000),
+                    self._node('B', 1000, 1500, 4000),
+                    self._node('C', 4000, 4500, 5000, blocked_by='B'),
+                    self._node('D', 5000, 5000, 5500, blocked_by='C'),
+                    self._node('E', 5000, 5200, 7000, blocked_by='C'))
+
+        result = timeline.get_timeline(self.ctx, self.stack)
+
+        self.assertEqual('t1', result['traversal_id'])
+        self.assertEqual(6.0, result['duration'])
+        self.assertEqual(['A:True', 'B:True', 'C:True', 'D:True', 'E:True'],
+                         [n['id'] for n in result['nodes']])
+        self.assertEqual(['B:True', 'C:True', 'E:True'],
+                         result['critical_path'])
+        self.assertAlmostEqual(1.2, result['critical_path_wait_time'])
+        self.assertAlmostEqual(4.8, result['critical_path_work_time'])
+
+        node_c = result['nodes'][2]
+        self.assertEqual({'id': 'C:True',
+                          'resource_name': 'C',
+                          'phase': 'update',
+                          'blocked_by': 'B',
+                          'ready': 3.0,
+                          'started': 3.5,
+                          'finished': 4.0,
+                          'wait_time': 0.5,
+                          'work_time': 0.5,
+                          'critical': True}, node_c)
+        self.assertFalse(result['nodes'][0]['critical'])
+
+    def test_get_timeline_unfinished(self):
+        self._store(self._node('A', 1000, 1000, None))
+
+        result = timeline.get_timeline(self.ctx, self.stack)
+
+        self.assertIsNone(result['duration'])
+        self.assertEqual([], result['critical_path'])
+        self.assertIsNone(result['nodes'][0]['work_time'])
+
+    def test_get_timeline_none(self):
+        self.assertIsNone(timeline.get_timeline(self.ctx, self.stack))
+
+    def test_get_timeline_current_traversal(self):
+        self.stack.current_traversal = 't1'
+        self._store(self._node('A', 1000, 1000, 2000, traversal_id='t1'),
+                    self._node('B', 1000, 1000, 2000, traversal_id='t0'))
+
+        result = timeline.get_timeline(self.ctx, self.stack)
+
+        self.assertEqual('t1', result['traversal_id'])
+        self.assertEqual(['A:True'], [n['id'] for n in result['nodes']])
+
+    def test_critical_path_cycle(self):
+        nodes = [mock.Mock(node='a', blocked_by='b', finished_at=2),
+                 mock.Mock(node='b', blocked_by='a', finished_at=1)]
+        self.assertEqual(['b', 'a'], timeline.critical_path(nodes))
+
+    def test_legacy_create(self):
+        self.stack.create()
+        self.assertEqual((self.stack.CREATE, self.stack.COMPLETE),
+                         self.stack.state)
+
+        result = timeline.get_timeline(self.ctx, self.stack)
+
+        nodes = dict((n['resource_name'], n) for n in result['nodes'])
+        self.assertEqual(set('ABCDE'), set(nodes))
+        for n in nodes.values():
+            self.assertEqual('update', n['phase'])
+        self.assertIsNone(nodes['A']['blocked_by'])
+        self.assertIn(nodes['C']['blocked_by'], ('A', 'B'))
+        self.assertEqual('C', nodes['D']['blocked_by'])
+        self.assertEqual('C', nodes['E']['blocked_by'])
+        self.assertEqual(3, len(result['critical_path']))
+        self.assertEqual('C:True', result['critical_path'][1])
+
+    def test_legacy_delete_replaces_create(self):
+        self.stack.create()
+        create_traversal = timeline.get_timeline(
+            self.ctx, self.stack)['traversal_id']
+
+        stack_id = self.stack.id
+        self.stack.delete()
+
+        s = stack_object.Stack.get_by_id(self.ctx, stack_id,
+                                         show_deleted=True)
+        result = timeline.get_timeline(self.ctx, s)
+        self.assertNotEqual(create_traversal, result['traversal_id'])
+        nodes = dict((n['resource_name'], n) for n in result['nodes'])
+        self.assertEqual(set('ABCDE'), set(nodes))
+        self.assertEqual('cleanup', nodes['A']['phase'])
+        self.assertIn(nodes['C']['blocked_by'], ('D', 'E'))
+
+    def test_legacy_disabled(self):
+        cfg.CONF.set_override('record_stack_timeline', False)
+        self.stack.create()
+        self.assertIsNone(timeline.get_timeline(self.ctx, self.stack))
+
+    def test_node_timing_from_rpc_data(self):
+        data = timeline.add_to_rpc_data({'input_data': {}},
+                                        blocked_by='1:True', ready=1000)
+        timing = timeline.NodeTiming.from_rpc_data(data)
+        self.assertEqual(1000, timing.ready)
+        self.assertEqual('1:True', timing.blocked_by)
+        self.assertIsNotNone(timing.started)
+
+    def test_node_timing_no_rpc_data(self):
+        timing = timeline.NodeTiming.from_rpc_data({'input_data': {}})
+        self.assertEqual(timing.started, timing.ready)
+        self.assertIsNone(timing.blocked_by)
+
+    def test_record_node(self):
+        timing = timeline.NodeTiming(ready=1000, blocked_by='1:True')
+        timeline.record_node(self.ctx, self.stack.id, 't1', 2, True, 'B',
+                             timing)
+
+        nodes = timeline_objects.StackTimeline.get_all_by_stack(
+            self.ctx, self.stack.id)
+        self.assertEqual(1, len(nodes))
+        self.assertEqual('2:True', nodes[0].node)
+        self.assertEqual('B', nodes[0].resource_name)
+        self.assertEqual('1:True', nodes[0].blocked_by)
+        self.assertEqual(1000, nodes[0].ready_at)
+        self.assertEqual(timing.started, nodes[0].started_at)
+        self.assertGreaterEqual(nodes[0].finished_at, timing.started)
+
+    @mock.patch.object(timeline_objects.StackTimeline, 'create_all',
+                       side_effect=Exception('boom'))
+    def test_record_node_failure_ignored(self, mock_create):
+        timeline.record_node(self.ctx, self.stack.id, 't1', 2, True, 'B',
+                             timeline.NodeTiming())
+        self.assertTrue(mock_create.called)
@@ -0,0 +1,158 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import oslo_messaging as messaging
+
+from heat.common import service_utils
+from heat.engine import service
+from heat.engine import stack as parser
+from heat.engine import sync_point
+from heat.engine import traversal_timing
+from heat.objects import service as service_objects
+from heat.rpc import listener_client
+from heat.tests import common
+from heat.tests.engine import tools
+from heat.tests import utils
+
+
+class HistogramTest(common.HeatTestCase):
+
+    def test_add(self):
+        hist = traversal_timing.Histogram()
+        for duration in (0.0005, 0.002, 0.002, 100):
+            hist.add(duration)
+        data = hist.as_dict()
+        self.assertEqual(4, data['count'])
+        self.assertAlmostEqual(100.0045, data['total'])
+        self.assertEqual(0.0005, data['min'])
+        self.assertEqual(100, data['max'])
+        self.assertEqual(1, data['buckets'][0])
+        self.assertEqual(2, data['buckets'][1])
+        self.assertEqual(1, data['buckets'][-1])
+        self.assertEqual(4, sum(data['buckets']))
+
+    def test_merge(self):
+        hist1 = traversal_timing.Histogram()
+        hist1.add(0.5)
+        hist2 = traversal_timing.Histogram()
+        hist2.add(0.02)
+        hist2.add(2)
+        hist1.merge(hist2.as_dict())
+        hist1.merge(traversal_timing.Histogram().as_dict())
+        data = hist1.as_dict()
+        self.assertEqual(3, data['count'])
+        self.assertAlmostEqual(2.52, data['total'])
+        self.assertEqual(0.02, data['min'])
+        self.assertEqual(2, data['max'])
+        self.assertEqual(3, sum(data['buckets']))
+
+
+class TraversalTimingTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(TraversalTimingTest, self).setUp()
+        self.addCleanup(traversal_timing.clear)
+
+    def test_measure(self):
+        with traversal_timing.measure('trav', traversal_timing.NODE_DATA):
+            pass
+        traversal_timing.count('trav', traversal_timing.SYNC_POINT_CONFLICTS)
+        data = traversal_timing.get('trav')
+        self.assertEqual(1, data['phases']['node_data']['count'])
+        self.assertEqual({'sync_point_conflicts': 1}, data['counters'])
+        self.assertIsNone(traversal_timing.get('other'))
+
+    def test_measure_exception(self):
+        def fail():
+            with traversal_timing.measure('trav',
+                                          traversal_timing.CHECK_RESOURCE):
+                raise ValueError
+        self.assertRaises(ValueError, fail)
+        data = traversal_timing.get('trav')
+        self.assertEqual(1, data['phases']['check_resource']['count'])
+
+    def test_no_traversal(self):
+        traversal_timing.record('', traversal_timing.NODE_DATA, 1)
+        traversal_timing.record(None, traversal_timing.NODE_DATA, 1)
+        self.assertIsNone(traversal_timing.get(''))
+        self.assertIsNone(traversal_timing.get(None))
+
+    def test_bounded(self):
+        self.patchobject(traversal_timing, 'MAX_TRAVERSALS', new=2)
+        for trav in ('a', 'b', 'c'):
+            traversal_timing.record(trav, traversal_timing.NODE_DATA, 1)
+        self.assertIsNone(traversal_timing.get('a'))
+        self.assertIsNotNone(traversal_timing.get('b'))
+        self.assertIsNotNone(traversal_timing.get('c'))
+
+    @mock.patch.object(service_utils, 'format_service')
+    @mock.patch.object(service_objects.Service, 'get_all')
+    def test_collect(self, mock_get_all, mock_format):
+        engines = [mock.Mock(engine_id=e) for e in ('e1', 'e2', 'e3', 'e4')]
+        mock_get_all.return_value = engines
+        mock_format.side_effect = [{'status': 'up'}, {'status': 'up'},
+                                   {'status': 'down'}, {'status': 'up'}]
+
+        hist = traversal_timing.Histogram()
+        hist.add(1)
+        data = {'phases': {'node_data': hist.as_dict()},
+                'counters': {'sync_point_conflicts': 2}}
+        responses = {'e1': data, 'e2': None, 'e4': data}
+        self.patchobject(
+            listener_client.EngineListenerClient, 'get_traversal_timings',
+            autospec=True,
+            side_effect=lambda client, ctxt, trav: responses[
+                client._client.server])
+        mock_rpc = self.patch('heat.common.messaging.get_rpc_client')
+        mock_rpc.side_effect = lambda topic, version, server: mock.Mock(
+            prepare=mock.Mock(return_value=mock.Mock(server=server)))
+
+        result = traversal_timing.collect(utils.dummy_context(), 'trav')
+        self.assertEqual('trav', result['traversal_id'])
+        self.assertEqual(2, result['engines'])
+        self.assertEqual(2, result['phases']['node_data']['count'])
+        self.assertEqual({'sync_point_conflicts': 4}, result['counters'])
+
+    def test_listener_dispatch(self):
+        self.patch('heat.common.messaging.get_rpc_server')
+        listener = service.EngineListener('a-host', 'engine-007',
+                                          mock.Mock())
+        listener.start()
+        dispatcher = messaging.RPCDispatcher([listener],
+                                             messaging.NoOpSerializer())
+        traversal_timing.record('trav', traversal_timing.NODE_DATA, 1)
+
+        incoming = mock.Mock(ctxt={}, client_timeout=None, message={
+            'method': 'get_traversal_timings',
+            'args': {'traversal_id': 'trav'},
+            'version': '1.1'})
+        result = dispatcher.dispatch(incoming)
+        self.assertEqual(1, result['phases']['node_data']['count'])
+
+    def test_convergence_create(self):
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.converge_stack(stack.t, action=stack.CREATE)
+        resource = stack['A']
+        graph = stack.convergence_dependencies.graph()
+        resource_key = parser.ConvergenceNode(resource.id, True)
+        sync_point.sync(utils.dummy_context(), resource.id,
+                        stack.current_traversal, True, mock.Mock(),
+                        set(graph[resource_key]),
+                        {parser.ConvergenceNode(3, True): None})
+
+        data = traversal_timing.get(stack.current_traversal)
+        self.assertEqual(1, data['phases']['sync_point']['count'])
@@ -283,6 +283,30 @@ class CinderVolumeTest(vt_base.VolumeTestCase):
 
         self.cinder_fc.volumes.get.assert_called_with('vol-123')
 
+    def test_cinder_resolve_attributes_together(self):
+        self.stack_name = 'test_cvolume_resolve_attributes_stack'
+
+        fv = vt_base.FakeVolume(
+            'available', availability_zone='zone1', size=1,
+            name='name', metadata={'key': 'value'})
+
+        self._mock_create_volume(vt_base.FakeVolume('creating'),
+                                 self.stack_name,
+                                 extra_get_mocks=[fv])
+
+        stack = utils.parse_stack(self.t, stack_name=self.stack_name)
+        rsrc = self.create_volume(self.t, stack, 'volume')
+        self.cinder_fc.volumes.get.reset_mock()
+
+        self.assertEqual({'availability_zone': 'zone1',
+                          'size': '1',
+                          'display_name': 'name',
+                          'metadata_values': {'key': 'value'}},
+                         rsrc.resolve_attributes(['availability_zone',
+                                                  'size', 'display_name',
+                                                  'metadata_values']))
+        self.cinder_fc.volumes.get.assert_called_once_with('vol-123')
+
     def test_cinder_attachment(self):
         self.stack_name = 'test_cvolume_attach_stack'
         fva = vt_base.FakeVolume('in-use')
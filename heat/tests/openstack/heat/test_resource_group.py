@@ -23,6 +23,7 @@ from heat.engine import node_data
 from heat.engine.resources.openstack.heat import resource_group
 from heat.engine import rsrc_defn
 from heat.engine import scheduler
+from heat.objects import stack as stack_object
 from heat.tests import common
 from heat.tests import utils
 
@@ -572,6 +573,27 @@ class ResourceGroupTest(common.HeatTestCase):
             res_prop['listprop'] = list(res_prop['listprop'])
         self.assertEqual(expect, nested)
 
+    def test_build_resource_definition_shares_unindexed(self):
+        stack = utils.parse_stack(template_repl)
+        snip = stack.t.resource_definitions(stack)['group1']
+        resg = resource_group.ResourceGroup('test', snip, stack)
+        unindexed = {'a': ['x', 'y'], 'b': {'c': 'z'}}
+        res_def = {'type': 'ResourceWithListProp',
+                   'metadata': {'m': 'v'},
+                   'properties': {'Foo': 'Bar_%index%',
+                                  'listprop': ['%index%_0', 'same'],
+                                  'other': unindexed}}
+
+        defn = resg.build_resource_definition('3', res_def)
+
+        props = defn._properties
+        self.assertEqual({'Foo': 'Bar_3',
+                          'listprop': ['3_0', 'same'],
+                          'other': unindexed}, props)
+        self.assertIs(unindexed, props['other'])
+        self.assertEqual(['%index%_0', 'same'],
+                         res_def['properties']['listprop'])
+
     def test_custom_index_var(self):
         templ = copy.deepcopy(template_repl)
         templ['resources']['group1']['properties']['index_var'] = "__foo__"
@@ -821,6 +843,129 @@ class ResourceGroupTest(common.HeatTestCase):
         resgrp.handle_update(snip, mock.Mock(), {})
         self.assertTrue(resgrp._assemble_nested.called)
 
+    def _resized_group(self, nested_status='COMPLETE',
+                       version='2015-04-30'):
+        self.stack = utils.parse_stack(template)
+        snip = self.stack.t.resource_definitions(self.stack)['group1']
+        resgrp = resource_group.ResourceGroup('test', snip, self.stack)
+        resgrp.resource_id = 'nested-id'
+        current = {
+            'heat_template_version': version,
+            'resources': {
+                '0': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Old'}},
+                '1': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Old'}},
+                '2': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Old'}}},
+            'outputs': {'refs_map': {'value': {}}},
+        }
+        nested = mock.Mock(status=nested_status)
+        nested.raw_template.template = current
+        self.patchobject(stack_object.Stack, 'get_by_id', return_value=nested)
+        return resgrp
+
+    def test_assemble_resized(self):
+        resgrp = self._resized_group()
+        build = self.patchobject(resgrp, 'build_resource_definition',
+                                 wraps=resgrp.build_resource_definition)
+
+        tmpl = resgrp._assemble_resized(['0', '2', '3'])
+
+        expected = {
+            'heat_template_version': '2015-04-30',
+            'resources': {
+                '0': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Old'}},
+                '2': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Old'}},
+                '3': {'type': 'OverwrittenFnGetRefIdType',
+                      'properties': {'Foo': 'Bar'}}},
+            'outputs': {
+                'refs_map': {
+                    'value': {
+                        '0': {'get_resource': '0'},
+                        '2': {'get_resource': '2'},
+                        '3': {'get_resource': '3'}}}},
+        }
+        self.assertEqual(expected, tmpl.t)
+        self.assertEqual(1, build.call_count)
+
+    def test_assemble_resized_res_def_updating(self):
+        resgrp = self._resized_group()
+        self.patchobject(resgrp, 'data',
+                         return_value={'resource_def_updating': 'True'})
+        self.assertIsNone(resgrp._assemble_resized(['0']))
+
+    def test_assemble_resized_nested_not_complete(self):
+        resgrp = self._resized_group(nested_status='FAILED')
+        self.assertIsNone(resgrp._assemble_resized(['0']))
+
+    def test_assemble_resized_other_version(self):
+        resgrp = self._resized_group(version='2013-05-23')
+        self.assertIsNone(resgrp._assemble_resized(['0']))
+
+    def test_handle_update_resize_incremental(self):
+        resgrp = self._resized_group()
+        resgrp._assemble_nested = mock.Mock()
+        self.patchobject(scheduler.TaskRunner, 'start')
+        snip = resgrp.t
+        resgrp.handle_update(snip, mock.Mock(), {'count': 3})
+        self.assertFalse(resgrp._assemble_nested.called)
+
+    def test_handle_update_res_def_changed_not_incremental(self):
+        resgrp = self._resized_group()
+        resgrp.data_set = mock.Mock()
+        resgrp._assemble_nested = mock.Mock()
+        resgrp._assemble_resized = mock.Mock()
+        self.patchobject(scheduler.TaskRunner, 'start')
+        snip = resgrp.t
+        resgrp.handle_update(snip, mock.Mock(), {'resource_def': {}})
+        self.assertTrue(resgrp._assemble_nested.called)
+        self.assertFalse(resgrp._assemble_resized.called)
+
+    def test_handle_update_index_var_changed_not_incremental(self):
+        resgrp = self._resized_group()
+        resgrp.data_set = mock.Mock()
+        resgrp._assemble_nested = mock.Mock()
+        resgrp._assemble_resized = mock.Mock()
+        self.patchobject(scheduler.TaskRunner, 'start')
+        snip = resgrp.t
+        resgrp.handle_update(snip, mock.Mock(),
+                             {'count': 4, 'index_var': '%num%'})
+        self.assertTrue(resgrp._assemble_nested.called)
+        self.assertFalse(resgrp._assemble_resized.called)
+        resgrp.data_set.assert_called_once_with('resource_def_updating',
+                                                'True')
+
+    def test_handle_update_removal_policies_incremental(self):
+        resgrp = self._resized_group()
+        resgrp.data_set = mock.Mock()
+        resgrp._assemble_nested = mock.Mock()
+        self.patchobject(scheduler.TaskRunner, 'start')
+        snip = resgrp.t
+        resgrp.handle_update(snip, mock.Mock(),
+                             {'count': 2, 'removal_policies': []})
+        self.assertFalse(resgrp._assemble_nested.called)
+        resgrp.data_set.assert_not_called()
+
+    def test_res_def_updating_until_complete(self):
+        resgrp = self._resized_group()
+        self.stack.store()
+        resgrp.store()
+        self.patchobject(resgrp, '_try_rolling_update', return_value=None)
+        self.patchobject(resgrp, '_assemble_nested')
+        self.patchobject(scheduler.TaskRunner, 'start')
+        self.patchobject(scheduler.TaskRunner, 'step', return_value=False)
+        checkers = resgrp.handle_update(resgrp.t, mock.Mock(),
+                                        {'resource_def': {}})
+        self.assertFalse(resgrp.check_update_complete(checkers))
+        self.assertEqual('True', resgrp.data()['resource_def_updating'])
+
+        scheduler.TaskRunner.step.return_value = True
+        self.assertTrue(resgrp.check_update_complete(checkers))
+        self.assertNotIn('resource_def_updating', resgrp.data())
+
 
 class ResourceGroupSkiplistTest(common.HeatTestCase):
     """This class tests ResourceGroup._name_skiplist()."""
@@ -1435,6 +1580,7 @@ class RollingUpdateTest(common.HeatTestCase):
         tmpl_diff = updated_grp.update_template_diff(
             updated_grp_json, current_grp_json)
 
+        self.current_grp.data_set = mock.Mock()
         self.current_grp._replace = mock.Mock(return_value=[])
         self.current_grp._assemble_nested = mock.Mock()
         self.patchobject(scheduler.TaskRunner, 'start')
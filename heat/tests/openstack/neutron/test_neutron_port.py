@@ -717,6 +717,34 @@ class NeutronPortTest(common.HeatTestCase):
         self.assertRaises(exception.InvalidTemplateAttribute,
                           port.FnGetAtt, 'Foo')
 
+    def test_resolve_attributes_together(self):
+        t = template_format.parse(neutron_port_template)
+        t['resources']['port']['properties'].pop('fixed_ips')
+        stack = utils.parse_stack(t)
+
+        self.find_mock.return_value = 'net1234'
+        self.create_mock.return_value = {'port': {
+            'status': 'BUILD',
+            'id': 'fc68ea2c-b60b-4b4f-bd82-94ec81110766'
+        }}
+        self.port_show_mock.return_value = {'port': {
+            'status': 'DOWN',
+            'network_id': 'net1234',
+            'mac_address': 'fa:16:3e:75:67:60',
+        }}
+
+        port = stack['port']
+        scheduler.TaskRunner(port.create)()
+        self.port_show_mock.reset_mock()
+
+        self.assertEqual({'status': 'DOWN',
+                          'network_id': 'net1234',
+                          'mac_address': 'fa:16:3e:75:67:60'},
+                         port.resolve_attributes(['status', 'network_id',
+                                                  'mac_address']))
+        self.port_show_mock.assert_called_once_with(
+            'fc68ea2c-b60b-4b4f-bd82-94ec81110766')
+
     def test_subnet_attribute_exception(self):
         t = template_format.parse(neutron_port_template)
         t['resources']['port']['properties'].pop('fixed_ips')
@@ -3535,6 +3535,36 @@ class ServersTest(common.HeatTestCase):
         self.assertEqual(expect_networks,
                          server._resolve_any_attribute("networks"))
 
+    def test_resolve_attributes_together(self):
+        return_server = self.fc.servers.list()[1]
+        server = self._create_test_server(return_server,
+                                          'srv_resolve_attrs')
+
+        server.resource_id = '1234'
+        mock_get = self.patchobject(self.fc.servers, 'get',
+                                    return_value=return_server)
+        values = server.resolve_attributes(['accessIPv4', 'first_address',
+                                            'instance_name', 'show', 'name'])
+        mock_get.assert_called_once_with('1234')
+        self.assertEqual({'accessIPv4', 'first_address', 'instance_name',
+                          'show'}, set(values))
+        self.assertEqual('192.0.2.0', values['accessIPv4'])
+        self.assertEqual('4.5.6.7', values['first_address'])
+        self.assertEqual('sample-server2', values['instance_name'])
+        self.assertEqual(server._show_resource(), values['show'])
+        self.assertIn('os_collect_config', values['show'])
+
+    def test_resolve_attributes_together_server_not_found(self):
+        return_server = self.fc.servers.list()[1]
+        server = self._create_test_server(return_server,
+                                          'srv_resolve_attrs')
+
+        server.resource_id = '1234'
+        self.patchobject(self.fc.servers, 'get',
+                         side_effect=fakes_nova.fake_exception())
+        self.assertEqual({'accessIPv4': ''},
+                         server.resolve_attributes(['accessIPv4', 'show']))
+
     def test_empty_instance_user(self):
         """Test Nova server doesn't set instance_user in build_userdata
 
@@ -276,6 +276,17 @@ class TestRequestContext(common.HeatTestCase):
         self.assertIsInstance(cache2, Class2)
         self.assertEqual(2, len(ctx._object_cache))
 
+    def test_keystone_session_shares_connection_pool(self):
+        ctx1 = context.RequestContext.from_dict(self.ctx)
+        ctx2 = context.RequestContext.from_dict(self.ctx)
+        http1 = ctx1._keystone_session.session
+        http2 = ctx2._keystone_session.session
+        self.assertIsNot(http1, http2)
+        self.assertIs(http1.get_adapter('https://'),
+                      http2.get_adapter('https://'))
+        self.assertIs(http1.get_adapter('http://'),
+                      http2.get_adapter('https://'))
+
 
 class RequestContextMiddlewareTest(common.HeatTestCase):
 
@@ -10,12 +10,13 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-
+from unittest import mock
 
 from heat.common import exception
 from heat.engine import constraints
 from heat.engine import environment
 from heat.tests import common
+from heat.tests import utils
 
 
 class SchemaTest(common.HeatTestCase):
@@ -580,3 +581,71 @@ class CustomConstraintTest(common.HeatTestCase):
 
         constraint = constraints.CustomConstraint("zero", environment=self.env)
         self.assertEqual("zero", constraint["custom_constraint"])
+
+
+class PrefetchCustomConstraintsTest(common.HeatTestCase):
+
+    def setUp(self):
+        super(PrefetchCustomConstraintsTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.lookup = mock.Mock()
+
+        lookup = self.lookup
+
+        class FooConstraint(constraints.BaseCustomConstraint):
+            def validate_with_client(self, client, value):
+                lookup(value)
+                if value == 'bad':
+                    raise exception.EntityNotFound(entity='Foo', name=value)
+
+        self.env = environment.Environment({})
+        self.env.register_constraint('foo', FooConstraint)
+        self.constraint = constraints.CustomConstraint('foo',
+                                                       environment=self.env)
+
+    def _prefetch(self, values, max_workers=4):
+        constraints.prefetch_custom_constraints(
+            self.ctx, [(self.constraint, v) for v in values], max_workers)
+
+    def test_prefetch_deduplicated(self):
+        self._prefetch(['a', 'b', 'a', 'b', 'a'])
+        self.assertEqual(2, self.lookup.call_count)
+        self.assertEqual({'a', 'b'},
+                         set(c.args[0] for c in self.lookup.call_args_list))
+
+    def test_prefetched_not_looked_up_again(self):
+        self._prefetch(['a'])
+        self.assertIsNone(self.constraint.validate('a', context=self.ctx))
+        self.assertEqual(1, self.lookup.call_count)
+
+        self._prefetch(['a'])
+        self.assertEqual(1, self.lookup.call_count)
+
+    def test_prefetch_invalid_reported_on_validation(self):
+        self._prefetch(['bad'])
+        error = self.assertRaises(ValueError, self.constraint.validate,
+                                  'bad', context=self.ctx)
+        self.assertIn('The Foo (bad) could not be found', str(error))
+        self.assertEqual(2, self.lookup.call_count)
+
+    def test_prefetch_scoped_to_context(self):
+        self._prefetch(['a'])
+        self.assertIsNone(self.constraint.validate(
+            'a', context=utils.dummy_context()))
+        self.assertEqual(2, self.lookup.call_count)
+
+    def test_prefetch_lookup_error_ignored(self):
+        self.lookup.side_effect = Exception('boom')
+        self._prefetch(['a'])
+        self.assertEqual(1, self.lookup.call_count)
+        self.assertFalse(
+            self.ctx.cache(constraints.ValidatedValues).is_valid(
+                self.constraint.custom_constraint.__class__, 'a'))
+
+    def test_prefetch_disabled(self):
+        self._prefetch(['a'], max_workers=0)
+        self.assertEqual(0, self.lookup.call_count)
+
+    def test_prefetch_unhashable(self):
+        self._prefetch([['a']])
+        self.assertEqual(0, self.lookup.call_count)
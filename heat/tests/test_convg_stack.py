@@ -18,8 +18,10 @@ from oslo_config import cfg
 
 from heat.common import template_format
 from heat.engine import environment
+from heat.engine import scheduler
 from heat.engine import stack as parser
 from heat.engine import template as templatem
+from heat.engine import timeline
 from heat.objects import raw_template as raw_template_object
 from heat.objects import resource as resource_objects
 from heat.objects import snapshot as snapshot_objects
@@ -89,6 +91,37 @@ class StackConvergenceCreateUpdateDeleteTest(common.HeatTestCase):
                     abandon=False))
         self.assertEqual(expected_calls, mock_cr.mock_calls)
 
+    @mock.patch.object(timeline, 'now', return_value=1234)
+    def test_conv_stack_create_records_ready_time(self, mock_now, mock_cr):
+        cfg.CONF.set_override('record_stack_timeline', True)
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                convergence=True)
+        stack.store()
+
+        stack.converge_stack(template=stack.t, action=stack.CREATE)
+        mock_cr.assert_called_once_with(
+            stack.context, 1, stack.current_traversal,
+            {'input_data': {},
+             'timeline': {'ready': 1234, 'blocked_by': None}},
+            True, None, False, node_type='resource', abandon=False)
+
+    @mock.patch.object(scheduler.RateLimiter, 'wait')
+    def test_conv_stack_create_kickoff_rate_limited(self, mock_wait,
+                                                    mock_cr):
+        cfg.CONF.set_override('convergence_kickoff_rate', 5)
+        stack = tools.get_stack('test_stack', utils.dummy_context(),
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+
+        with mock.patch.object(scheduler, 'RateLimiter',
+                               wraps=scheduler.RateLimiter) as mock_rl:
+            stack.converge_stack(template=stack.t, action=stack.CREATE)
+        mock_rl.assert_called_once_with(5, 100)
+        # One wait per leaf, before each is triggered
+        self.assertEqual(2, mock_cr.call_count)
+        self.assertEqual(2, mock_wait.call_count)
+
     def test_conv_string_five_instance_stack_create(self, mock_cr):
         stack = tools.get_stack('test_stack', utils.dummy_context(),
                                 template=tools.string_template_five,
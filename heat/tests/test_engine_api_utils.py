@@ -413,6 +413,37 @@ class FormatTest(common.HeatTestCase):
             'parent': None}
         self.assertEqual(expected_stack_info, info)
 
+    def test_format_stack_summary(self):
+        summary = {
+            'id': 'aaaa-bbbb', 'name': 'test_stack',
+            'tenant': 'test_tenant_id', 'action': 'CREATE',
+            'status': 'COMPLETE', 'status_reason': 'done',
+            'created_at': datetime(1970, 1, 1), 'updated_at': None,
+            'deleted_at': None, 'username': 'test_username',
+            'owner_id': None, 'stack_user_project_id': None,
+            'tags': ['tag1']}
+        info = api.format_stack_summary(summary)
+
+        expected_stack_info = {
+            'creation_time': '1970-01-01T00:00:00Z',
+            'deletion_time': None,
+            'description': '',
+            'stack_action': 'CREATE',
+            'stack_name': 'test_stack',
+            'stack_owner': 'test_username',
+            'stack_status': 'COMPLETE',
+            'stack_status_reason': 'done',
+            'stack_user_project_id': None,
+            'tags': ['tag1'],
+            'stack_identity': {
+                'path': '',
+                'stack_id': 'aaaa-bbbb',
+                'stack_name': 'test_stack',
+                'tenant': 'test_tenant_id'},
+            'updated_time': None,
+            'parent': None}
+        self.assertEqual(expected_stack_info, info)
+
     def test_format_stack_created_time(self):
         self.stack.created_time = None
         info = api.format_stack(self.stack)
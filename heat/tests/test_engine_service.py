@@ -24,6 +24,7 @@ from heat.common import exception
 from heat.common import identifier
 from heat.common import policy
 from heat.common import template_format
+from heat.engine import api
 from heat.engine.cfn import template as cfntemplate
 from heat.engine import environment
 from heat.engine.hot import functions as hot_functions
@@ -32,7 +33,12 @@ from heat.engine import resource as res
 from heat.engine import service
 from heat.engine import stack as parser
 from heat.engine import template as templatem
+from heat.engine import timeline
+from heat.engine import traversal_timing
+from heat.objects import resource as res_object
 from heat.objects import stack as stack_object
+from heat.objects import stack_output_snapshot as output_object
+from heat.objects import user_creds as ucreds_object
 from heat.rpc import api as rpc_api
 from heat.tests import common
 from heat.tests.engine import tools
@@ -452,7 +458,7 @@ class StackServiceTest(common.HeatTestCase):
             self.assertIn('description', s)
             self.assertEqual('', s['description'])
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_passes_marker_info(self, mock_stack_get_all):
         limit = object()
         marker = object()
@@ -474,7 +480,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_passes_filtering_info(self, mock_stack_get_all):
         filters = {'foo': 'bar'}
         self.eng.list_stacks(self.ctx, filters=filters)
@@ -492,7 +498,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_passes_filter_translated(self, mock_stack_get_all):
         filters = {'stack_name': 'bar'}
         self.eng.list_stacks(self.ctx, filters=filters)
@@ -511,7 +517,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_show_nested(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, show_nested=True)
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -528,7 +534,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_show_deleted(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, show_deleted=True)
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -545,7 +551,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_show_hidden(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, show_hidden=True)
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -562,7 +568,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_tags(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, tags=['foo', 'bar'])
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -579,7 +585,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_tags_any(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, tags_any=['foo', 'bar'])
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -596,7 +602,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=mock.ANY,
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_not_tags(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, not_tags=['foo', 'bar'])
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -613,7 +619,7 @@ class StackServiceTest(common.HeatTestCase):
                                                    not_tags=['foo', 'bar'],
                                                    not_tags_any=mock.ANY)
 
-    @mock.patch.object(stack_object.Stack, 'get_all')
+    @mock.patch.object(stack_object.Stack, 'get_all_summaries')
     def test_stack_list_not_tags_any(self, mock_stack_get_all):
         self.eng.list_stacks(self.ctx, not_tags_any=['foo', 'bar'])
         mock_stack_get_all.assert_called_once_with(self.ctx,
@@ -1090,6 +1096,55 @@ class StackServiceTest(common.HeatTestCase):
         # Verify
         self.assertEqual(files, found)
 
+    def test_get_traversal_timings(self):
+        stack = tools.get_stack('timings_stack', self.ctx,
+                                template=tools.string_template_five,
+                                convergence=True)
+        stack.store()
+        mock_collect = self.patchobject(traversal_timing, 'collect')
+
+        found = self.eng.get_traversal_timings(self.ctx, stack.id)
+        self.assertEqual(mock_collect.return_value, found)
+        mock_collect.assert_called_once_with(self.ctx,
+                                             stack.current_traversal)
+
+        self.eng.get_traversal_timings(self.ctx, stack.id, 'other')
+        mock_collect.assert_called_with(self.ctx, 'other')
+
+    def test_get_traversal_timings_legacy(self):
+        stack = tools.get_stack('timings_stack', self.ctx,
+                                template=tools.string_template_five)
+        stack.store()
+        ex = self.assertRaises(dispatcher.ExpectedException,
+                               self.eng.get_traversal_timings,
+                               self.ctx, stack.id)
+        self.assertEqual(exception.NotSupported, ex.exc_info[0])
+
+    def test_get_traversal_timings_not_found(self):
+        ex = self.assertRaises(dispatcher.ExpectedException,
+                               self.eng.get_traversal_timings,
+                               self.ctx, 'missing')
+        self.assertEqual(exception.EntityNotFound, ex.exc_info[0])
+
+    def test_get_stack_timeline(self):
+        stack = tools.get_stack('timeline_stack', self.ctx,
+                                template=tools.string_template_five)
+        stack.store()
+        mock_get = self.patchobject(timeline, 'get_timeline')
+
+        found = self.eng.get_stack_timeline(self.ctx, stack.identifier())
+        self.assertEqual(mock_get.return_value, found)
+        self.assertEqual(stack.id, mock_get.call_args[0][1].id)
+
+    def test_get_stack_timeline_not_recorded(self):
+        stack = tools.get_stack('timeline_stack', self.ctx,
+                                template=tools.string_template_five)
+        stack.store()
+        ex = self.assertRaises(dispatcher.ExpectedException,
+                               self.eng.get_stack_timeline,
+                               self.ctx, stack.identifier())
+        self.assertEqual(exception.NotFound, ex.exc_info[0])
+
     def test_stack_show_output(self):
         t = template_format.parse(tools.wp_template)
         t['outputs'] = {'test': {'value': 'first', 'description': 'sec'},
@@ -1133,6 +1188,62 @@ class StackServiceTest(common.HeatTestCase):
              'output_value': None},
             output)
 
+    def test_stack_describe_output_snapshot(self):
+        cfg.CONF.set_override('cache_stack_outputs', True)
+        t = {'heat_template_version': '2015-04-30',
+             'resources': {'A': {'type': 'GenericResourceType'}},
+             'outputs': {'test': {'value': {'get_resource': 'A'}}}}
+        stack = parser.Stack(self.ctx, 'service_output_snapshot_stack',
+                             templatem.Template(t))
+        stack.store()
+        stack.create()
+        # Legacy stacks persist the final state when the lock is released
+        stack._persist_state()
+        identity = stack.identifier()
+
+        resolve = self.patchobject(api, 'format_stack_outputs',
+                                   wraps=api.format_stack_outputs)
+        expected = [{'output_key': 'test', 'output_value': 'A',
+                     'description': 'No description given'}]
+
+        for i in range(2):
+            sl = self.eng.show_stack(self.ctx, identity)
+            self.assertEqual(expected, sl[0]['outputs'])
+        self.assertEqual(1, resolve.call_count)
+
+        sl = self.eng.show_stack(self.ctx, identity, refresh_outputs=True)
+        self.assertEqual(expected, sl[0]['outputs'])
+        self.assertEqual(2, resolve.call_count)
+
+        # A change to a resource makes the stored outputs stale
+        res_object.Resource.update_by_id(self.ctx, stack['A'].id,
+                                         {'action': 'CHECK'})
+        self.eng.show_stack(self.ctx, identity)
+        self.eng.show_stack(self.ctx, identity)
+        self.assertEqual(3, resolve.call_count)
+
+        # as does signalling the stack
+        stack.invalidate_output_snapshots()
+        self.eng.show_stack(self.ctx, identity)
+        self.assertEqual(4, resolve.call_count)
+
+    def test_stack_describe_output_snapshot_disabled(self):
+        t = {'heat_template_version': '2015-04-30',
+             'outputs': {'test': {'value': 'first'}}}
+        stack = parser.Stack(self.ctx, 'service_output_snapshot_stack',
+                             templatem.Template(t))
+        stack.store()
+        stack.create()
+        stack._persist_state()
+
+        resolve = self.patchobject(api, 'format_stack_outputs',
+                                   wraps=api.format_stack_outputs)
+        self.eng.show_stack(self.ctx, stack.identifier())
+        self.eng.show_stack(self.ctx, stack.identifier())
+        self.assertEqual(2, resolve.call_count)
+        self.assertIsNone(output_object.StackOutputSnapshot.get_by_stack(
+            self.ctx, stack.id))
+
     def test_stack_list_all_empty(self):
         sl = self.eng.list_stacks(self.ctx)
 
@@ -1384,6 +1495,23 @@ class StackServiceTest(common.HeatTestCase):
             fake_stack.reset_stack_and_resources_in_progress, reason
         )
 
+    @mock.patch.object(ucreds_object.UserCreds, 'get_all_of_deleted_stacks')
+    @mock.patch.object(parser.Stack, 'finish_cleanup')
+    @mock.patch.object(context, 'get_admin_context')
+    def test_engine_finish_stack_cleanup(self, mock_admin_context,
+                                         mock_finish, mock_get_all):
+        mock_admin_context.return_value = self.ctx
+        mock_get_all.return_value = [('1', 'aproject'), ('2', None)]
+        mock_finish.side_effect = [Exception('boom'), None]
+
+        self.eng.finish_stack_cleanup()
+
+        mock_get_all.assert_called_once_with(self.ctx)
+        mock_finish.assert_has_calls([mock.call(self.ctx, '1', 'aproject'),
+                                      mock.call(self.ctx, '2', None)])
+        self.assertIn('Failed to finish the cleanup of stored credentials 1',
+                      self.LOG.output)
+
     def test_parse_adopt_stack_data_without_parameters(self):
         cfg.CONF.set_override('enable_stack_adopt', True)
         template = {"heat_template_version": "2015-04-30",
@@ -147,7 +147,7 @@ class EventTest(EventCommon):
         rpd1_id = self.resource._rsrc_prop_data_id
 
         rpd2 = rpd_object.ResourcePropertiesData.create(
-            self.ctx, {'encrypted': False, 'data': {'foo': 'bar'}})
+            self.ctx, {'encrypted': False, 'data': {'foo': 'bar2'}})
         rpd2_id = rpd2.id
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
                         'arizona', rpd2_id, rpd2.data,
@@ -155,7 +155,7 @@ class EventTest(EventCommon):
         e.store()
 
         rpd3 = rpd_object.ResourcePropertiesData.create(
-            self.ctx, {'encrypted': False, 'data': {'foo': 'bar'}})
+            self.ctx, {'encrypted': False, 'data': {'foo': 'bar3'}})
         rpd3_id = rpd3.id
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
                         'arkansas', rpd3_id, rpd3.data,
@@ -163,7 +163,7 @@ class EventTest(EventCommon):
         e.store()
 
         rpd4 = rpd_object.ResourcePropertiesData.create(
-            self.ctx, {'encrypted': False, 'data': {'foo': 'bar'}})
+            self.ctx, {'encrypted': False, 'data': {'foo': 'bar4'}})
         rpd4_id = rpd4.id
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
                         'arkansas', rpd4_id, rpd4.data,
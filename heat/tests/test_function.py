@@ -12,6 +12,7 @@
 #    under the License.
 
 import copy
+import itertools
 import uuid
 
 
@@ -77,6 +78,18 @@ class FunctionTest(common.HeatTestCase):
         func2 = TestFunction(None, 'blarg', ['wibble', 'quux'])
         self.assertTrue(func1 == func2)  # noqa: H204
 
+    def test_template_functions_have_slots(self):
+        mgr = template._get_template_extension_manager()
+        for name in mgr.names():
+            tmpl_cls = mgr[name].plugin
+            fn_classes = itertools.chain(
+                tmpl_cls.functions.values(),
+                tmpl_cls.condition_functions.values())
+            for fn_cls in filter(lambda c: isinstance(c, type), fn_classes):
+                for cls in fn_cls.__mro__[:-1]:
+                    self.assertIn('__slots__', vars(cls),
+                                  '%s of %s' % (cls.__name__, name))
+
     def test_function_str_value(self):
         func1 = TestFunction(None, 'foo', ['bar', 'baz'])
         expected = '%s %s' % ("<heat.tests.test_function.TestFunction",
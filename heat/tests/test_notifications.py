@@ -13,10 +13,13 @@
 
 from unittest import mock
 
+from oslo_config import cfg
 from oslo_utils import timeutils
 
 from heat.common import timeutils as heat_timeutils
+from heat.engine import api
 from heat.engine import notification
+from heat.engine import traversal_timing
 from heat.tests import common
 from heat.tests import utils
 
@@ -62,6 +65,47 @@ class StackTest(common.HeatTestCase):
              'tags': ['tag1', 'tag2'],
              'updated_at': heat_timeutils.isotime(updated_time)})
 
+    def _traversal_stack(self, status):
+        st = mock.Mock()
+        st.context = self.ctx
+        st.status = status
+        st.action = 'CREATE'
+        st.IN_PROGRESS = 'IN_PROGRESS'
+        st.COMPLETE = 'COMPLETE'
+        st.convergence = True
+        st.current_traversal = 'trav-id'
+        return st
+
+    def test_send_traversal_timings(self):
+        cfg.CONF.set_override('notify_traversal_timings', True)
+        self.patchobject(api, 'format_notification_body',
+                         side_effect=lambda stack: {})
+        collect = self.patchobject(traversal_timing, 'collect')
+        notify = self.patchobject(notification, 'notify')
+
+        notification.stack.send(self._traversal_stack('COMPLETE'))
+        collect.assert_called_once_with(self.ctx, 'trav-id')
+        notify.assert_called_once_with(
+            self.ctx, 'stack.create.end', 'INFO',
+            {'traversal_timings': collect.return_value})
+
+        notify.reset_mock()
+        notification.stack.send(self._traversal_stack('IN_PROGRESS'))
+        notify.assert_called_once_with(
+            self.ctx, 'stack.create.start', 'INFO', {})
+        self.assertEqual(1, collect.call_count)
+
+    def test_send_traversal_timings_disabled(self):
+        self.patchobject(api, 'format_notification_body',
+                         side_effect=lambda stack: {})
+        collect = self.patchobject(traversal_timing, 'collect')
+        notify = self.patchobject(notification, 'notify')
+
+        notification.stack.send(self._traversal_stack('COMPLETE'))
+        self.assertFalse(collect.called)
+        notify.assert_called_once_with(
+            self.ctx, 'stack.create.end', 'INFO', {})
+
 
 class AutoScaleTest(common.HeatTestCase):
     def setUp(self):
@@ -1269,6 +1269,41 @@ class PropertiesTest(common.HeatTestCase):
         except exception.StackValidationFailed:
             self.fail("Constraints should not have been evaluated.")
 
+    def test_custom_constraint_values(self):
+        image = constraints.CustomConstraint('glance.image')
+        network = constraints.CustomConstraint('neutron.network')
+        schema = {
+            'image': properties.Schema(properties.Schema.STRING,
+                                       constraints=[image]),
+            'unset': properties.Schema(properties.Schema.STRING,
+                                       constraints=[image]),
+            'networks': properties.Schema(
+                properties.Schema.LIST,
+                schema=properties.Schema(
+                    properties.Schema.MAP,
+                    schema={
+                        'network': properties.Schema(
+                            properties.Schema.STRING,
+                            constraints=[network]),
+                        'fixed_ip': properties.Schema(
+                            properties.Schema.STRING)})),
+            'broken': properties.Schema(properties.Schema.INTEGER,
+                                        constraints=[image]),
+        }
+        props = properties.Properties(schema, {
+            'image': 'cirros',
+            'networks': [{'network': 'private', 'fixed_ip': '10.0.0.2'},
+                         {'fixed_ip': '10.0.0.3'},
+                         {'network': 'public'}],
+            'broken': 'not-an-integer',
+        })
+
+        self.assertEqual([(image, 'cirros'),
+                          (network, 'private'),
+                          (network, 'public')],
+                         sorted(props.custom_constraint_values(),
+                                key=lambda cv: cv[1]))
+
     def test_schema_from_params(self):
         params_snippet = {
             "DBUsername": {
@@ -1910,6 +1945,23 @@ class PropertiesValidationTest(common.HeatTestCase):
         self.assertEqual('Property error: foo[0]: Unknown Property bar',
                          str(ex))
 
+    def test_nested_properties_resolved_once_when_validated(self):
+        child_schema = {'Key': {'Type': 'String',
+                                'Required': True},
+                        'Value': {'Type': 'Boolean',
+                                  'Default': True}}
+        list_schema = {'Type': 'Map', 'Schema': child_schema}
+        schema = {'foo': {'Type': 'List', 'Schema': list_schema}}
+
+        data = {'foo': [{'Key': 'Test%d' % i} for i in range(3)]}
+        props = properties.Properties(schema, data)
+        get_value = self.patchobject(properties.Property, 'get_value',
+                                     autospec=True,
+                                     side_effect=properties.Property.get_value)
+        self.assertIsNone(props.validate())
+        # One value for the list, and three for each of its items
+        self.assertEqual(10, get_value.call_count)
+
     def test_nested_properties_schema_invalid_property_in_map(self):
         child_schema = {'Key': {'Type': 'String',
                                 'Required': True},
@@ -216,6 +216,28 @@ class ResourceTest(common.HeatTestCase):
             self.assertEqual("INIT", res.action)
             self.assertIs(False, resource_get.called)
 
+    def test_store_all(self):
+        tmpl = rsrc_defn.ResourceDefinition('test_resource', 'Foo')
+        stored = generic_rsrc.GenericResource('stored', tmpl, self.stack)
+        stored.store()
+        new_rsrcs = [generic_rsrc.GenericResource(name, tmpl, self.stack)
+                     for name in ('new1', 'new2')]
+
+        with mock.patch.object(stored, 'store') as mock_store:
+            resource.Resource.store_all(self.stack.context,
+                                        [stored] + new_rsrcs)
+        mock_store.assert_called_once_with()
+
+        for res in new_rsrcs:
+            self.assertIsNotNone(res.id)
+            self.assertIsNotNone(res.created_time)
+            db_res = resource_objects.Resource.get_obj(self.stack.context,
+                                                       res.id)
+            self.assertEqual(res.name, db_res.name)
+            self.assertEqual(res.uuid, db_res.uuid)
+            self.assertEqual(self.stack.id, db_res.stack_id)
+            self.assertEqual(res.root_stack_id, db_res.root_stack_id)
+
     def test_resource_new_err(self):
         snippet = rsrc_defn.ResourceDefinition('aresource',
                                                'NoExistResourceType')
@@ -2659,6 +2681,55 @@ class ResourceTest(common.HeatTestCase):
             # Make sure this isn't AssertionError
             self.assertRaises(MyException, res.FnGetAtt, 'Foo')
 
+    def _resource_for_bulk_attributes_tests(self):
+        tmpl = template.Template({
+            'heat_template_version': '2013-05-23',
+            'resources': {
+                'res': {
+                    'type': 'GenericResourceType'
+                }
+            },
+            'outputs': {
+                'out1': {'value': {'get_attr': ['res', 'foo']}},
+                'out2': {'value': {'get_attr': ['res', 'Foo']}},
+            }
+        })
+        self.stack = parser.Stack(utils.dummy_context(), 'test', tmpl)
+        res = self.stack['res']
+        res.action = res.CREATE
+        return res
+
+    def test_node_data_resolves_attributes_together(self):
+        res = self._resource_for_bulk_attributes_tests()
+        resolve_all = self.patchobject(generic_rsrc.GenericResource,
+                                       'resolve_attributes',
+                                       return_value={'foo': 'bulk'})
+        resolve = self.patchobject(res, '_resolve_attribute',
+                                   return_value='single')
+
+        node_data = res.node_data(for_resources=False, for_outputs=True)
+
+        self.assertEqual(1, resolve_all.call_count)
+        self.assertEqual({'foo', 'Foo'}, set(resolve_all.call_args[0][0]))
+        self.assertEqual('bulk', node_data.attribute('foo'))
+        self.assertEqual('single', node_data.attribute('Foo'))
+        resolve.assert_called_once_with('Foo')
+        # Values that were resolved together are cached as usual
+        self.assertEqual('bulk', res.attributes.cached_attrs['foo'])
+
+    def test_node_data_resolve_attributes_together_fails(self):
+        res = self._resource_for_bulk_attributes_tests()
+        self.patchobject(generic_rsrc.GenericResource, 'resolve_attributes',
+                         side_effect=Exception('boom'))
+        resolve = self.patchobject(res, '_resolve_attribute',
+                                   return_value='single')
+
+        node_data = res.node_data(for_resources=False, for_outputs=True)
+
+        self.assertEqual('single', node_data.attribute('foo'))
+        self.assertEqual('single', node_data.attribute('Foo'))
+        self.assertEqual(2, resolve.call_count)
+
     def test_show_resource(self):
         # check default function _show_resource
         stack = self.create_resource_for_attributes_tests()
@@ -140,7 +140,8 @@ class EngineRpcAPITestCase(common.HeatTestCase):
 
     def test_show_stack(self):
         self._test_engine_api('show_stack', 'call', stack_identity='wordpress',
-                              resolve_outputs=True)
+                              resolve_outputs=True, refresh_outputs=False,
+                              version='1.39')
 
     def test_preview_stack(self):
         self._test_engine_api('preview_stack', 'call', stack_name='wordpress',
@@ -409,3 +410,13 @@ class EngineRpcAPITestCase(common.HeatTestCase):
         self._test_engine_api(
             'get_files', 'call', stack_identity=self.identity,
             version='1.32')
+
+    def test_get_traversal_timings(self):
+        self._test_engine_api(
+            'get_traversal_timings', 'call', stack_id='a-stack-id',
+            traversal_id='a-traversal-id', version='1.37')
+
+    def test_get_stack_timeline(self):
+        self._test_engine_api(
+            'get_stack_timeline', 'call', stack_identity=self.identity,
+            version='1.38')
@@ -69,3 +69,18 @@ class ListenerClientTest(common.HeatTestCase):
         self.assertFalse(ret)
         mock_prepare_client.call.assert_called_once_with(mock_cnxt,
                                                          'listening')
+
+    @mock.patch('heat.common.messaging.get_rpc_client',
+                return_value=mock.Mock())
+    def test_get_traversal_timings(self, rpc_client_method):
+        mock_prepare_client = rpc_client_method.return_value.prepare()
+        mock_cnxt = mock.Mock()
+
+        listener_client = rpc_client.EngineListenerClient('engine-007')
+        ret = listener_client.get_traversal_timings(mock_cnxt, 'trav-id')
+
+        mock_prepare_client.prepare.assert_called_once_with(version='1.1')
+        versioned_client = mock_prepare_client.prepare.return_value
+        versioned_client.call.assert_called_once_with(
+            mock_cnxt, 'get_traversal_timings', traversal_id='trav-id')
+        self.assertEqual(versioned_client.call.return_value, ret)
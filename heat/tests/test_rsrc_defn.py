@@ -218,6 +218,24 @@ class ResourceDefinitionTest(common.HeatTestCase):
 
         self.assertEqual(expected_hot, rd.render_hot())
 
+    def test_render_hot_shares_data_without_functions(self):
+        props = {'Foo': cfn_funcs.Join(None, 'Fn::Join', ['a', ['b', 'r']]),
+                 'Blarg': {'wibble': ['quux']}}
+        rd = rsrc_defn.ResourceDefinition('rsrc', 'SomeType',
+                                          properties=props,
+                                          metadata={'Baz': ['quux']})
+
+        rendered = rd.render_hot()
+        self.assertIsNot(props, rendered['properties'])
+        self.assertIs(props['Blarg'], rendered['properties']['Blarg'])
+        self.assertIs(rd._metadata, rendered['metadata'])
+
+    def test_slots(self):
+        rd = self.make_me_one_with_everything()
+        self.assertRaises(AttributeError, setattr, rd, 'foo', 'bar')
+        self.assertRaises(AttributeError, setattr,
+                          rd._properties['Foo'], 'foo', 'bar')
+
     def test_render_hot_empty(self):
         rd = rsrc_defn.ResourceDefinition('rsrc', 'SomeType')
 
@@ -259,6 +277,22 @@ class ResourceDefinitionTest(common.HeatTestCase):
         self.assertNotEqual(rd1, rd2)
         self.assertNotEqual(hash(rd1), hash(rd2))
 
+    def test_hash_external_id_retain(self):
+        rd1 = rsrc_defn.ResourceDefinition('rsrc', 'SomeType',
+                                           external_id='abc')
+        rd2 = rsrc_defn.ResourceDefinition('rsrc', 'SomeType',
+                                           external_id='abc',
+                                           deletion_policy='Retain')
+        self.assertEqual(rd1, rd2)
+        self.assertEqual(hash(rd1), hash(rd2))
+
+    def test_not_equal_not_rendered(self):
+        rd1 = rsrc_defn.ResourceDefinition('rsrc', 'SomeType', {'Foo': 1})
+        rd2 = rsrc_defn.ResourceDefinition('rsrc', 'SomeType', {'Foo': 2})
+        self.assertNotEqual(rd1, rd2)
+        self.assertIsNone(rd1._rendering)
+        self.assertIsNone(rd2._rendering)
+
 
 class ResourceDefinitionDiffTest(common.HeatTestCase):
     def test_properties_diff(self):
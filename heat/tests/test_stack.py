@@ -30,6 +30,7 @@ from heat.common import template_format
 from heat.common import timeutils
 from heat.db import api as db_api
 from heat.db.api import MYSQL_TEXT_BYTE_LIMIT
+from heat.engine import action_pool
 from heat.engine.clients.os import keystone
 from heat.engine.clients.os.keystone import fake_keystoneclient as fake_ks
 from heat.engine.clients.os import nova
@@ -281,6 +282,48 @@ class StackTest(common.HeatTestCase):
         self.assertIsNone(self.stack.resource_get('C'))
         self.assertIsNone(self.stack.resource_get('D'))
 
+    @mock.patch.object(resource_objects.Resource, 'get_all_by_stack')
+    def test_resources_db_lookup_once(self, gabs):
+        tpl = {'HeatTemplateFormatVersion': '2012-12-12',
+               'Resources':
+               {'A': {'Type': 'GenericResourceType'},
+                'B': {'Type': 'GenericResourceType'},
+                'C': {'Type': 'GenericResourceType'}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tpl),
+                                 status_reason='blarg')
+        self.stack.store()
+        gabs.return_value = {}
+
+        self.assertEqual(3, len(self.stack.resources))
+        gabs.assert_called_once_with(self.ctx, self.stack.id)
+        # An empty result is still not cached for later lookups
+        self.assertIsNone(self.stack._db_resources)
+
+    def test_resource_definition_parsed_individually(self):
+        tpl = {'heat_template_version': '2016-10-14',
+               'resources': {'A': {'type': 'GenericResourceType'},
+                             'B': {'type': 'GenericResourceType',
+                                   'depends_on': 'A'}}}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tpl))
+
+        with mock.patch.object(self.stack.t, 'resource_definitions',
+                               wraps=self.stack.t.resource_definitions
+                               ) as mock_defns:
+            defn_b = self.stack.defn.resource_definition('B')
+            self.assertEqual('B', defn_b.name)
+            self.assertEqual({'A'}, set(defn_b.required_resource_names()))
+            self.assertIs(defn_b, self.stack.defn.resource_definition('B'))
+            self.assertRaises(KeyError,
+                              self.stack.defn.resource_definition, 'C')
+            mock_defns.assert_not_called()
+
+            # Loading all definitions keeps the one already loaded
+            self.assertEqual({'A', 'B'}, self.stack.defn.enabled_rsrc_names())
+            mock_defns.assert_called_once_with(self.stack.defn)
+            self.assertIs(defn_b, self.stack.defn.resource_definition('B'))
+
     @mock.patch.object(resource_objects.Resource, 'get_all_by_stack')
     def test_iter_resources(self, mock_db_call):
         tpl = {'HeatTemplateFormatVersion': '2012-12-12',
@@ -1244,6 +1287,29 @@ class StackTest(common.HeatTestCase):
         self.assertEqual('Resource CREATE failed: The Referenced Attribute '
                          '(a foo) is incorrect.', self.stack.status_reason)
 
+    def test_create_with_action_workers(self):
+        cfg.CONF.set_override('resource_action_workers', 2)
+        # The in-memory test database allows only one transaction at a time
+        cfg.CONF.set_override('resource_action_concurrency_limits',
+                              {'*': 1})
+        self.addCleanup(action_pool.shutdown)
+        tmpl = {'HeatTemplateFormatVersion': '2012-12-12',
+                'Resources': {
+                    'AResource': {'Type': 'GenericResourceType'},
+                    'BResource': {'Type': 'GenericResourceType'},
+                    'CResource': {'Type': 'ResourceWithPropsType',
+                                  'Properties': {
+                                      'Foo': {'Ref': 'AResource'}}}}}
+        self.stack = stack.Stack(self.ctx, 'action_workers_test_stack',
+                                 template.Template(tmpl))
+        self.stack.store()
+        self.stack.create()
+
+        self.assertEqual((stack.Stack.CREATE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertEqual('AResource',
+                         self.stack['CResource'].properties['Foo'])
+
     def test_stack_create_timeout(self):
         def dummy_task():
             while True:
@@ -2141,6 +2207,90 @@ class StackTest(common.HeatTestCase):
                                  template.Template(tmpl))
         self.assertIsNone(self.stack.validate())
 
+    def _test_validate_custom_constraints(self):
+        tmpl = {
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': dict(
+                ('R%d' % i, {'Type': 'ResourceWithCustomConstraint',
+                             'Metadata': {'index': i},
+                             'Properties': {'Foo': 'net%d' % (i % 2)}})
+                for i in range(4))
+        }
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tmpl))
+        path = ('heat.engine.clients.os.neutron.neutron_constraints.'
+                'NetworkConstraint.validate_with_client')
+        with mock.patch(path) as mock_validate:
+            self.assertIsNone(self.stack.validate())
+        return sorted(c.args[1] for c in mock_validate.call_args_list)
+
+    def test_validate_custom_constraints_prefetched(self):
+        self.assertEqual(['net0', 'net1'],
+                         self._test_validate_custom_constraints())
+
+    def test_validate_custom_constraints_no_prefetch(self):
+        cfg.CONF.set_override('constraint_lookup_workers', 0)
+        self.assertEqual(['net0', 'net0', 'net1', 'net1'],
+                         self._test_validate_custom_constraints())
+
+    def _test_validate_nested_stacks(self, nested_template):
+        tmpl = {
+            'HeatTemplateFormatVersion': '2012-12-12',
+            'Resources': dict(
+                ('R%d' % i, {'Type': 'nested.yaml',
+                             'Metadata': {'index': i},
+                             'Properties': {'foo': 'x%d' % (i % 2)}})
+                for i in range(4))
+        }
+        files = {'nested.yaml': json.dumps(nested_template)}
+        self.stack = stack.Stack(self.ctx, 'test_stack',
+                                 template.Template(tmpl, files=files))
+        validate = stack.Stack.validate
+        with mock.patch.object(stack.Stack, 'validate', autospec=True,
+                               side_effect=validate) as mock_validate:
+            self.stack.validate()
+        return [c.args[0].nested_depth for c in mock_validate.call_args_list]
+
+    def test_validate_nested_stacks_deduplicated(self):
+        nested_template = {
+            'heat_template_version': '2015-04-30',
+            'parameters': {'foo': {'type': 'string'}},
+            'resources': {'r': {'type': 'OS::Heat::None'}},
+        }
+        self.assertEqual([0, 1, 1],
+                         self._test_validate_nested_stacks(nested_template))
+
+    def test_validate_nested_stacks_sequential_deduplicated(self):
+        cfg.CONF.set_override('nested_validation_workers', 0)
+        self.test_validate_nested_stacks_deduplicated()
+
+    def test_validate_nested_stacks_failure(self):
+        nested_template = {
+            'heat_template_version': '2015-04-30',
+            'parameters': {'foo': {'type': 'string'}},
+            'resources': {'r': {'type': 'OS::Heat::None',
+                                'depends_on': 'missing'}},
+        }
+        ex = self.assertRaises(exception.StackValidationFailed,
+                               self._test_validate_nested_stacks,
+                               nested_template)
+        self.assertIn('missing', str(ex))
+
+    def test_nested_stack_validations_failure_not_recorded(self):
+        nested = mock.Mock(nested_depth=1)
+        nested.t.t = {'resources': {}}
+        nested.t.files = {}
+        nested.env.env_as_dict.return_value = {}
+        nested.validate.side_effect = [exception.StackValidationFailed(
+            message='bad'), None, None]
+        validations = stack.NestedStackValidations()
+
+        self.assertRaises(exception.StackValidationFailed,
+                          validations.validate, nested)
+        validations.validate(nested)
+        validations.validate(nested)
+        self.assertEqual(2, nested.validate.call_count)
+
     def test_param_validate_value(self):
         tmpl = template_format.parse("""
         HeatTemplateFormatVersion: '2012-12-12'
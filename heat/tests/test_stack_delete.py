@@ -12,11 +12,13 @@
 #    under the License.
 
 import copy
+import threading
 import time
 from unittest import mock
 
 import fixtures
 from keystoneauth1 import exceptions as kc_exceptions
+from oslo_config import cfg
 from oslo_log import log as logging
 
 from heat.common import exception
@@ -27,6 +29,8 @@ from heat.engine.clients.os.keystone import fake_keystoneclient as fake_ks
 from heat.engine.clients.os.keystone import heat_keystoneclient as hkc
 from heat.engine import scheduler
 from heat.engine import stack
+from heat.engine import stack_reaper
+from heat.engine import stack_user_pool
 from heat.engine import template
 from heat.objects import snapshot as snapshot_object
 from heat.objects import stack as stack_object
@@ -424,6 +428,28 @@ class StackTest(common.HeatTestCase):
         fkc.delete_stack_domain_project.assert_called_once_with(
             project_id='aproject456')
 
+    def test_delete_deletes_pooled_users(self):
+        fkc = fake_ks.FakeKeystoneClient()
+        fkc.delete_stack_domain_users = mock.Mock()
+        fkc.delete_stack_domain_project = mock.Mock()
+        self.patchobject(keystone.KeystoneClientPlugin, '_create',
+                         return_value=fkc)
+        pool = mock.Mock()
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+
+        self.stack = stack.Stack(self.ctx, 'delete_pool', self.tmpl,
+                                 stack_user_project_id='aproject456')
+        self.stack.store()
+        self.stack.delete()
+
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        pool.release_project.assert_called_once_with('aproject456')
+        fkc.delete_stack_domain_users.assert_called_once_with(
+            'aproject456', stack_user_pool.USERNAME_PREFIX)
+        fkc.delete_stack_domain_project.assert_called_once_with(
+            project_id='aproject456')
+
     def test_delete_rollback(self):
         self.stack = stack.Stack(self.ctx, 'delete_rollback_test',
                                  self.tmpl, disable_rollback=False)
@@ -549,3 +575,118 @@ class StackTest(common.HeatTestCase):
         self.assertEqual((stack.Stack.DELETE, stack.Stack.FAILED),
                          self.stack.state)
         self.assertIn('Error deleting project', self.stack.status_reason)
+
+    def _hold_stack_reaper(self):
+        cfg.CONF.set_override('stack_cleanup_workers', 1)
+        self.addCleanup(stack_reaper.shutdown)
+        event = threading.Event()
+        self.addCleanup(event.set)
+        stack_reaper.get_reaper().submit('wait', event.wait)
+        return event
+
+    def test_delete_trust_in_background(self):
+        cfg.CONF.set_override('deferred_auth_method', 'trusts')
+        fkc = self.stub_keystoneclient()
+        fkc.delete_trust = mock.Mock()
+        fkc.delete_stack_domain_project = mock.Mock()
+        held = self._hold_stack_reaper()
+
+        self.stack = stack.Stack(self.ctx, 'delete_test', self.tmpl,
+                                 stack_user_project_id='aproject456')
+        stack_id = self.stack.store()
+        user_creds_id = self.stack.user_creds_id
+
+        self.stack.delete()
+
+        # The stack delete completes before the project and trust are
+        # deleted, and until then the deleted stack still refers to the
+        # stored credentials
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertIsNone(stack_object.Stack.get_by_id(self.ctx, stack_id))
+        fkc.delete_trust.assert_not_called()
+        fkc.delete_stack_domain_project.assert_not_called()
+        get_all = ucreds_object.UserCreds.get_all_of_deleted_stacks
+        self.assertEqual([(user_creds_id, 'aproject456')],
+                         get_all(self.ctx))
+
+        held.set()
+        stack_reaper.shutdown()
+        fkc.delete_stack_domain_project.assert_called_once_with(
+            project_id='aproject456')
+        fkc.delete_trust.assert_called_once_with('atrust')
+        self.assertIsNone(ucreds_object.UserCreds.get_by_id(self.ctx,
+                                                            user_creds_id))
+        self.assertEqual([], get_all(self.ctx))
+
+    def test_delete_trust_in_background_gives_up(self):
+        cfg.CONF.set_override('deferred_auth_method', 'trusts')
+        self.patchobject(stack_reaper, 'RETRY_ATTEMPTS', new=2)
+        self.patchobject(stack_reaper, 'RETRY_MAX_WAIT', new=0)
+        fkc = self.stub_keystoneclient()
+        fkc.delete_trust = mock.Mock(
+            side_effect=kc_exceptions.ServiceUnavailable())
+        held = self._hold_stack_reaper()
+
+        self.stack = stack.Stack(self.ctx, 'delete_test', self.tmpl)
+        self.stack.store()
+        user_creds_id = self.stack.user_creds_id
+        self.stack.delete()
+        held.set()
+        stack_reaper.shutdown()
+
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertEqual(2, fkc.delete_trust.call_count)
+        self.assertIsNotNone(ucreds_object.UserCreds.get_by_id(
+            self.ctx, user_creds_id))
+
+        # The credentials are still there for another attempt later
+        fkc.delete_trust.side_effect = None
+        stack.Stack.finish_cleanup(utils.dummy_context(), user_creds_id,
+                                   None)
+        self.assertEqual(3, fkc.delete_trust.call_count)
+        self.assertIsNone(ucreds_object.UserCreds.get_by_id(self.ctx,
+                                                            user_creds_id))
+
+    def test_delete_project_in_background_gives_up(self):
+        self.patchobject(stack_reaper, 'RETRY_ATTEMPTS', new=2)
+        self.patchobject(stack_reaper, 'RETRY_MAX_WAIT', new=0)
+        fkc = self.stub_keystoneclient()
+        fkc.delete_stack_domain_project = mock.Mock(
+            side_effect=kc_exceptions.ServiceUnavailable())
+        held = self._hold_stack_reaper()
+
+        self.stack = stack.Stack(self.ctx, 'delete_test', self.tmpl,
+                                 stack_user_project_id='aproject456')
+        self.stack.store()
+        user_creds_id = self.stack.user_creds_id
+        self.stack.delete()
+        held.set()
+        stack_reaper.shutdown()
+
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        self.assertEqual(2, fkc.delete_stack_domain_project.call_count)
+        get_all = ucreds_object.UserCreds.get_all_of_deleted_stacks
+        self.assertEqual([(user_creds_id, 'aproject456')],
+                         get_all(self.ctx))
+
+    def test_delete_abandon_not_deferred(self):
+        fkc = self.stub_keystoneclient()
+        fkc.delete_stack_domain_project = mock.Mock()
+        held = self._hold_stack_reaper()
+
+        self.stack = stack.Stack(self.ctx, 'delete_test', self.tmpl,
+                                 stack_user_project_id='aproject456')
+        self.stack.store()
+        user_creds_id = self.stack.user_creds_id
+        self.stack.delete(abandon=True)
+        held.set()
+        stack_reaper.shutdown()
+
+        self.assertEqual((stack.Stack.DELETE, stack.Stack.COMPLETE),
+                         self.stack.state)
+        fkc.delete_stack_domain_project.assert_not_called()
+        self.assertIsNone(ucreds_object.UserCreds.get_by_id(self.ctx,
+                                                            user_creds_id))
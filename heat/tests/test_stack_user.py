@@ -19,8 +19,10 @@ from heat.common import exception
 from heat.common import short_id
 from heat.common import template_format
 from heat.engine.clients.os.keystone import fake_keystoneclient as fake_ks
+from heat.engine.clients.os.keystone import heat_keystoneclient as hkc
 from heat.engine.resources import stack_user
 from heat.engine import scheduler
+from heat.engine import stack_user_pool
 from heat.objects import resource_data as resource_data_object
 from heat.tests import common
 from heat.tests import utils
@@ -98,6 +100,94 @@ class StackUserTest(common.HeatTestCase):
         self.fc.create_stack_domain_user.assert_called_once_with(
             password=None, project_id=project_id, username=expected_username)
 
+    def test_handle_create_pooled_user(self):
+        stack_name = 'stackuser_crpool'
+        project_id = 'aprojectpool'
+        rsrc = self._user_create(stack_name=stack_name,
+                                 project_id=project_id,
+                                 user_id='auser123',
+                                 create_project=False)
+        pool = mock.Mock()
+        pool.get.return_value = 'apooleduser'
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+
+        scheduler.TaskRunner(rsrc.create)()
+        self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        rs_data = resource_data_object.ResourceData.get_all(rsrc)
+        self.assertEqual({'user_id': 'apooleduser'}, rs_data)
+        pool.get.assert_called_once_with(self.fc, project_id,
+                                         rsrc._other_stack_users)
+        expected_username = '%s-%s-%s' % (stack_name, 'user', 'aabbcc')
+        self.fc.update_stack_domain_user.assert_called_once_with(
+            user_id='apooleduser', project_id=project_id,
+            username=expected_username, password=None)
+        self.fc.create_stack_domain_user.assert_not_called()
+
+        # The keypair is only created for resources that need one
+        self.fc.create_stack_domain_user_keypair.assert_not_called()
+        self.fc.create_stack_domain_user_keypair.return_value = (
+            hkc.AccessKey(id='acred', access='anaccess', secret='asecret'))
+        kp = rsrc._create_keypair()
+        self.assertEqual('anaccess', kp.access)
+        self.fc.create_stack_domain_user_keypair.assert_called_once_with(
+            user_id='apooleduser', project_id=project_id)
+
+    def test_handle_create_pooled_user_deleted(self):
+        rsrc = self._user_create(stack_name='stackuser_crpooldel',
+                                 project_id='aprojectpool',
+                                 user_id='auser123',
+                                 create_project=False)
+        pool = mock.Mock()
+        pool.get.return_value = 'apooleduser'
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+        self.fc.update_stack_domain_user.side_effect = kc_exceptions.NotFound
+
+        scheduler.TaskRunner(rsrc.create)()
+        self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        rs_data = resource_data_object.ResourceData.get_all(rsrc)
+        self.assertEqual({'user_id': 'auser123'}, rs_data)
+
+    def test_other_stack_users(self):
+        t = template_format.parse(user_template)
+        t['resources']['user2'] = {'type': 'StackUserResourceType'}
+        t['resources']['other'] = {'type': 'GenericResourceType'}
+        stack = utils.parse_stack(t)
+        self.assertEqual(1, stack['user']._other_stack_users())
+
+    def test_handle_create_pool_empty(self):
+        rsrc = self._user_create(stack_name='stackuser_crpoolempty',
+                                 project_id='aprojectpool',
+                                 user_id='auser123',
+                                 create_project=False)
+        pool = mock.Mock()
+        pool.get.return_value = None
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+
+        scheduler.TaskRunner(rsrc.create)()
+        self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        rs_data = resource_data_object.ResourceData.get_all(rsrc)
+        self.assertEqual({'user_id': 'auser123'}, rs_data)
+        self.fc.update_stack_domain_user.assert_not_called()
+
+    def test_handle_delete_pooled(self):
+        project_id = 'aprojectdel'
+        rsrc = self._user_create(stack_name='stackuser_testdelpool',
+                                 project_id=project_id,
+                                 user_id='auserdel')
+        scheduler.TaskRunner(rsrc.create)()
+        rsrc.data_set('credential_id', 'acred', redact=True)
+
+        pool = mock.Mock()
+        self.patchobject(stack_user_pool, 'get_pool', return_value=pool)
+        scheduler.TaskRunner(rsrc.delete)()
+        self.assertEqual((rsrc.DELETE, rsrc.COMPLETE), rsrc.state)
+        pool.reclaim.assert_called_once_with(self.fc, project_id, 'auserdel',
+                                             'acred')
+        self.fc.delete_stack_domain_user.assert_not_called()
+        self.fc.delete_stack_domain_user_keypair.assert_not_called()
+        self.assertRaises(exception.NotFound,
+                          resource_data_object.ResourceData.get_all, rsrc)
+
     def test_handle_delete(self):
         stack_name = 'stackuser_testdel'
         project_id = 'aprojectdel'
@@ -274,6 +274,18 @@ class ParserTest(common.HeatTestCase):
         self.assertEqual(raw['blarg'], parsed['blarg'])
         self.assertIsNot(raw, parsed)
 
+    def test_parse_shares_data_without_functions(self):
+        tmpl = template.Template(mapping_template)
+        raw = {'data': {'foo': ['bar', 'baz']},
+               'fn': {'quux': {'Fn::Join': [' ', ['foo', ['bar']]]}}}
+        parsed = tmpl.parse(None, raw)
+        self.assertIsNot(raw, parsed)
+        self.assertIs(raw['data'], parsed['data'])
+        self.assertIsNot(raw['fn'], parsed['fn'])
+        self.assertIsInstance(parsed['fn']['quux'], function.Function)
+        self.assertIsNot(raw['fn']['quux']['Fn::Join'][1][1],
+                         parsed['fn']['quux'].args[1][1])
+
 
 class TestTemplateConditionParser(common.HeatTestCase):
 
@@ -403,6 +415,17 @@ class TestTemplateConditionParser(common.HeatTestCase):
         ex = self.assertRaises(ValueError, conds.is_enabled, 111)
         self.assertIn('Invalid condition "111"', str(ex))
 
+    def test_res_definition_disabled(self):
+        stk = stack.Stack(self.ctx, 'test_res_defn_disabled', self.tmpl)
+        self.assertRaises(KeyError, self.tmpl.resource_definition, stk, 'r1')
+        self.assertRaises(KeyError, self.tmpl.resource_definition, stk,
+                          'missing')
+
+        self.tmpl.t['parameters']['env_type']['default'] = 'prod'
+        stk = stack.Stack(self.ctx, 'test_res_defn_enabled', self.tmpl)
+        defn = self.tmpl.resource_definition(stk, 'r1')
+        self.assertEqual('GenericResourceType', defn.resource_type)
+
     def test_res_condition_using_boolean(self):
         tmpl = copy.deepcopy(self.tmpl)
         # test condition name is boolean
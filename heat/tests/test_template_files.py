@@ -10,6 +10,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
+from oslo_config import cfg
+
+from heat.db import api as db_api
 from heat.engine import template_files
 from heat.tests import common
 from heat.tests import utils
@@ -20,26 +25,65 @@ template_files_1 = {'template file 1': 'Contents of template 1',
 
 class TestTemplateFiles(common.HeatTestCase):
 
+    def setUp(self):
+        super(TestTemplateFiles, self).setUp()
+        template_files._d.clear()
+        self.ctx = utils.dummy_context()
+
     def test_cache_miss(self):
-        ctx = utils.dummy_context()
+        cfg.CONF.set_override('template_files_cache_size', 0)
         tf1 = template_files.TemplateFiles(template_files_1)
-        tf1.store(ctx)
-        # As this is the only reference to the value in _d, deleting
-        # t1.files will cause the value to get removed from _d (due to
-        # it being a WeakValueDictionary.
-        del tf1.files
-        self.assertNotIn(tf1.files_id, template_files._d)
+        files_id = tf1.store(self.ctx)
+        # Files that the cache does not keep are only remembered while a
+        # TemplateFiles refers to them
+        del tf1
+        tf2 = template_files.TemplateFiles(files_id)
+        self.assertIsNone(tf2.files)
         # this will cause the cache refresh
         self.assertEqual(template_files_1['template file 1'],
-                         tf1['template file 1'])
-        self.assertEqual(template_files_1, template_files._d[tf1.files_id])
+                         tf2['template file 1'])
+        self.assertEqual(template_files_1, tf2.files)
+        self.assertEqual((0, 1), template_files.cache_info()[:2])
+
+    def test_cache_hit(self):
+        tf1 = template_files.TemplateFiles(template_files_1)
+        files_id = tf1.store(self.ctx)
+        del tf1
+        mock_get = self.patchobject(db_api, 'raw_template_files_get')
+        tf2 = template_files.TemplateFiles(files_id)
+        self.assertEqual(template_files_1, dict(tf2))
+        mock_get.assert_not_called()
+        info = template_files.cache_info()
+        self.assertEqual((1, 0, 1), info[:3])
+        self.assertEqual(1.0, info.hit_rate)
+        self.assertEqual(sum(len(k) + len(v)
+                             for k, v in template_files_1.items()),
+                         info.resident_bytes)
+
+    def test_cache_evicts_least_recently_used(self):
+        size = sum(len(k) + len(v) for k, v in template_files_1.items())
+        cfg.CONF.set_override('template_files_cache_size', 2 * size)
+        ids = [template_files.TemplateFiles(template_files_1).store(self.ctx)
+               for i in range(3)]
+        info = template_files.cache_info()
+        self.assertEqual((2, 2 * size), info[2:])
+
+        mock_get = self.patchobject(db_api, 'raw_template_files_get',
+                                    return_value=mock.Mock(
+                                        files=template_files_1))
+        self.assertIsNotNone(template_files.TemplateFiles(ids[2]).files)
+        self.assertIsNotNone(template_files.TemplateFiles(ids[1]).files)
+        self.assertIsNone(template_files.TemplateFiles(ids[0]).files)
+        self.assertEqual(template_files_1,
+                         dict(template_files.TemplateFiles(ids[0])))
+        mock_get.assert_called_once_with(mock.ANY, ids[0])
 
-    def test_d_weakref_behaviour(self):
-        ctx = utils.dummy_context()
+    def test_cache_disabled(self):
+        cfg.CONF.set_override('template_files_cache_size', 0)
         tf1 = template_files.TemplateFiles(template_files_1)
-        tf1.store(ctx)
-        tf2 = template_files.TemplateFiles(tf1)
-        del tf1.files
-        self.assertIn(tf2.files_id, template_files._d)
-        del tf2.files
-        self.assertNotIn(tf2.files_id, template_files._d)
+        files_id = tf1.store(self.ctx)
+        tf2 = template_files.TemplateFiles(files_id)
+        self.assertIs(tf1.files, tf2.files)
+        self.assertEqual((0, 0), template_files.cache_info()[2:])
+        del tf1, tf2
+        self.assertIsNone(template_files.TemplateFiles(files_id).files)